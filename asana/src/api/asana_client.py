@@ -5,9 +5,18 @@ import time
 import logging
 from typing import Dict, List, Optional, Any, Generator
 from datetime import datetime
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,8 +41,6 @@ class AsanaClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries with exponential backoff
         retry_strategy = Retry(
             total=5,
@@ -41,9 +48,7 @@ class AsanaClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set authentication headers
         session.headers.update({
@@ -16,6 +16,16 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class AsanaRateLimitError(Exception):
     """Asana rate limit exceeded"""
@@ -79,7 +89,7 @@ class AsanaProductionClient:
         if not self.access_token:
             raise AsanaAuthError("ASANA_ACCESS_TOKEN or ASANA_OAUTH_TOKEN required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.access_token}',
             'Accept': 'application/json',
@@ -141,25 +151,24 @@ class AsanaProductionClient:
         
         try:
             if files:
-                # For file uploads, don't send Content-Type header
-                headers = self.session.headers.copy()
-                del headers['Content-Type']
+                # For file uploads, unset the session's JSON Content-Type so
+                # requests writes the multipart boundary itself. Deleting it
+                # from a copy is not enough: the session merges it back in.
+                headers = {'Content-Type': None}
                 response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
                     data=data,  # Use data instead of json for multipart
                     files=files,
-                    headers=headers,
-                    timeout=30
+                    headers=headers
                 )
             else:
                 response = self.session.request(
                     method=method,
                     url=url,
                     params=params,
-                    json=data,
-                    timeout=30
+                    json=data
                 )
             
             # Check for rate limit response
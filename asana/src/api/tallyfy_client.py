@@ -13,8 +13,8 @@ _sys.path.insert(
     _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_captures
+from shared.http_transport import create_session
 
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
@@ -53,17 +53,13 @@ class TallyfyClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries
         retry_strategy = Retry(
             total=5,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set headers
         session.headers.update({
@@ -114,6 +110,32 @@ class TallyfyClient:
         response.raise_for_status()
         return response.json()
     
+    def list_members(self, per_page: int = 100) -> List[Dict[str, Any]]:
+        """List every member of the organization.
+        
+        Follows ``meta.pagination`` when the response is paginated.
+        
+        Args:
+            per_page: Members requested per page
+            
+        Returns:
+            List of member objects
+        """
+        members = []
+        page = 1
+        while True:
+            response = self.session.get(f"{self.base_url}/members",
+                                       params={'organization_id': self.organization_id,
+                                               'page': page, 'per_page': per_page})
+            response.raise_for_status()
+            body = response.json()
+            members.extend(body.get('data', []))
+            
+            pagination = body.get('meta', {}).get('pagination', {})
+            if page >= pagination.get('total_pages', page):
+                return members
+            page += 1
+    
     def get_member_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get member by email.
         
@@ -123,12 +145,7 @@ class TallyfyClient:
         Returns:
             Member object or None
         """
-        response = self.session.get(f"{self.base_url}/members", 
-                                   params={'organization_id': self.organization_id})
-        response.raise_for_status()
-        
-        members = response.json().get('data', [])
-        for member in members:
+        for member in self.list_members():
             if member.get("email") == email:
                 return member
         return None
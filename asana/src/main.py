@@ -5,6 +5,7 @@ import sys
 import argparse
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -24,6 +25,10 @@ from utils.validator import MigrationValidator
 from utils.logger_config import setup_logger
 from utils.checkpoint import CheckpointManager
 
+# The repo root holds the shared package; api.tallyfy_client has already put it
+# on sys.path.
+from shared.http_transport import configured_concurrency
+
 logger = logging.getLogger(__name__)
 
 
@@ -392,6 +397,13 @@ class AsanaMigrationOrchestrator:
     def migrate_users(self, dry_run: bool = False) -> Dict[str, Any]:
         """Migrate users from Asana to Tallyfy.
         
+        The organization's existing members are fetched once and users whose
+        email already belongs to one are mapped to it without an API call, so
+        a re-run does not re-invite anyone. The remaining users are invited
+        concurrently, MAX_WORKERS at a time. Mappings and checkpoints are
+        written in one batch at the end; a user invited before an interrupted
+        run is matched as an existing member on the next one.
+        
         Args:
             dry_run: Preview without creating users
             
@@ -403,6 +415,7 @@ class AsanaMigrationOrchestrator:
         results = {
             'total': 0,
             'migrated': 0,
+            'existing': 0,
             'skipped': 0,
             'failed': 0,
             'errors': []
@@ -413,69 +426,115 @@ class AsanaMigrationOrchestrator:
         results['total'] = len(users)
         
         # Get already processed users if resuming
-        processed_users = self.checkpoint_manager.get_processed_items('users', 'user')
+        processed_users = set(self.checkpoint_manager.get_processed_items('users', 'user'))
         
-        task = self.progress_tracker.start_phase('Users', len(users))
+        self.progress_tracker.start_phase('Users', len(users))
         
+        # Validate and transform everything first; invitations are keyed by
+        # email so two Asana users sharing an address cost one invite.
+        pending = {}
         for user in users:
+            if user['gid'] in processed_users:
+                results['skipped'] += 1
+                self.progress_tracker.update_phase('Users', 1)
+                continue
+            
+            if not self.validator.validate_user(user):
+                results['failed'] += 1
+                results['errors'].append(f"Invalid user: {user.get('name')}")
+                self.progress_tracker.update_phase('Users', 1)
+                continue
+            
             try:
-                # Skip if already processed
-                if user['gid'] in processed_users:
-                    results['skipped'] += 1
-                    self.progress_tracker.update_phase('Users', 1)
-                    continue
-                
-                # Validate user
-                if not self.validator.validate_user(user):
-                    results['failed'] += 1
-                    results['errors'].append(f"Invalid user: {user.get('name')}")
-                    continue
-                
-                # Transform user
                 tallyfy_member = self.user_transformer.transform_user(user)
-                
-                if not dry_run:
-                    # Create user in Tallyfy
-                    created_member = self.tallyfy_client.create_member(
-                        email=tallyfy_member["text"],
-                        first_name=tallyfy_member['first_name'],
-                        last_name=tallyfy_member['last_name'],
-                        role=tallyfy_member['role']
-                    )
-                    
-                    # Save mapping
-                    self.id_mapper.add_user_mapping(
-                        asana_gid=user['gid'],
-                        tallyfy_id=created_member.get('id'),
-                        email=tallyfy_member["text"],
-                        name=user.get('name'),
-                        role=tallyfy_member['role']
-                    )
-                    
-                    # Save checkpoint
-                    self.checkpoint_manager.save_item_checkpoint(
-                        'users', 'user', user['gid'], 'completed'
-                    )
-                
-                results['migrated'] += 1
-                self.progress_tracker.record_success('users', user.get('name'))
-                
             except Exception as e:
-                logger.error(f"Failed to migrate user {user.get('name')}: {e}")
-                results['failed'] += 1
-                results['errors'].append(str(e))
-                self.progress_tracker.record_failure('users', user.get('name'), e)
+                self._record_user_failure(results, user, e)
+                continue
             
-            self.progress_tracker.update_phase('Users', 1)
+            pending.setdefault(tallyfy_member["text"].lower(), []).append((user, tallyfy_member))
+        
+        if dry_run:
+            for group in pending.values():
+                for user, _ in group:
+                    results['migrated'] += 1
+                    self.progress_tracker.record_success('users', user.get('name'))
+                    self.progress_tracker.update_phase('Users', 1)
+        else:
+            existing = {}
+            if pending:
+                for member in self.tallyfy_client.list_members():
+                    if member.get('email'):
+                        existing.setdefault(member['email'].lower(), member)
+            
+            mappings = []
+            
+            def map_group(group, member_id):
+                for user, tallyfy_member in group:
+                    mappings.append({
+                        'asana_gid': user['gid'],
+                        'tallyfy_id': member_id,
+                        'email': tallyfy_member["text"],
+                        'name': user.get('name'),
+                        'role': tallyfy_member['role'],
+                    })
+                    results['migrated'] += 1
+                    self.progress_tracker.record_success('users', user.get('name'))
+                    self.progress_tracker.update_phase('Users', 1)
+            
+            invites = {}
+            for email, group in pending.items():
+                if email in existing:
+                    results['existing'] += len(group)
+                    map_group(group, existing[email].get('id'))
+                else:
+                    invites[email] = group
+            
+            if invites:
+                with ThreadPoolExecutor(max_workers=min(configured_concurrency(), len(invites))) as pool:
+                    futures = {}
+                    for group in invites.values():
+                        tallyfy_member = group[0][1]
+                        future = pool.submit(
+                            self.tallyfy_client.create_member,
+                            email=tallyfy_member["text"],
+                            first_name=tallyfy_member['first_name'],
+                            last_name=tallyfy_member['last_name'],
+                            role=tallyfy_member['role']
+                        )
+                        futures[future] = group
+                    for future in as_completed(futures):
+                        group = futures[future]
+                        try:
+                            created_member = future.result()
+                        except Exception as e:
+                            for user, _ in group:
+                                self._record_user_failure(results, user, e)
+                            continue
+                        map_group(group, (created_member or {}).get('id'))
+            
+            self.id_mapper.add_user_mappings(mappings)
+            self.checkpoint_manager.save_item_checkpoints(
+                'users', 'user', [m['asana_gid'] for m in mappings], 'completed'
+            )
         
         self.progress_tracker.complete_phase('Users')
         self.target_counts['users'] = results['migrated']
         
         return results
     
+    def _record_user_failure(self, results: Dict[str, Any], user: Dict[str, Any], error: Exception) -> None:
+        logger.error(f"Failed to migrate user {user.get('name')}: {error}")
+        results['failed'] += 1
+        results['errors'].append(str(error))
+        self.progress_tracker.record_failure('users', user.get('name'), error)
+        self.progress_tracker.update_phase('Users', 1)
+    
     def migrate_teams(self, dry_run: bool = False) -> Dict[str, Any]:
         """Migrate teams to Tallyfy groups.
         
+        Members are resolved from the finished user mapping, then the groups
+        are created concurrently, MAX_WORKERS at a time.
+        
         Args:
             dry_run: Preview without creating groups
             
@@ -499,8 +558,21 @@ class AsanaMigrationOrchestrator:
         # Get user mappings
         user_mappings = self.id_mapper.get_all_user_mappings()
         
-        task = self.progress_tracker.start_phase('Teams', len(teams))
+        self.progress_tracker.start_phase('Teams', len(teams))
+        
+        def record_failure(team, error):
+            logger.error(f"Failed to migrate team {team.get('name')}: {error}")
+            results['failed'] += 1
+            results['errors'].append(str(error))
+            self.progress_tracker.record_failure('teams', team.get('name'), error)
+            self.progress_tracker.update_phase('Teams', 1)
         
+        def record_success(team):
+            results['migrated'] += 1
+            self.progress_tracker.record_success('teams', team.get('name'))
+            self.progress_tracker.update_phase('Teams', 1)
+        
+        groups = []
         for team in teams:
             try:
                 # Get team members (would need additional API call)
@@ -509,39 +581,42 @@ class AsanaMigrationOrchestrator:
                 
                 # Transform team
                 tallyfy_group = self.user_transformer.transform_team(team, team_members)
-                
-                if not dry_run:
-                    # Map member IDs
-                    member_ids = []
-                    for asana_gid in tallyfy_group['members']:
-                        tallyfy_id = user_mappings.get(asana_gid)
-                        if tallyfy_id:
-                            member_ids.append(tallyfy_id)
-                    
-                    if member_ids:
-                        # Create group in Tallyfy
-                        created_group = self.tallyfy_client.create_group(
-                            name=tallyfy_group['name'],
-                            member_ids=member_ids
-                        )
-                        
-                        # Save mapping
-                        self.id_mapper.add_team_mapping(
-                            asana_gid=team['gid'],
-                            tallyfy_id=created_group.get('id'),
-                            name=team.get('name')
-                        )
-                
-                results['migrated'] += 1
-                self.progress_tracker.record_success('teams', team.get('name'))
-                
             except Exception as e:
-                logger.error(f"Failed to migrate team {team.get('name')}: {e}")
-                results['failed'] += 1
-                results['errors'].append(str(e))
-                self.progress_tracker.record_failure('teams', team.get('name'), e)
+                record_failure(team, e)
+                continue
             
-            self.progress_tracker.update_phase('Teams', 1)
+            # Map member IDs
+            member_ids = [
+                user_mappings[asana_gid]
+                for asana_gid in tallyfy_group['members']
+                if user_mappings.get(asana_gid)
+            ]
+            if dry_run or not member_ids:
+                record_success(team)
+            else:
+                groups.append((team, tallyfy_group['name'], member_ids))
+        
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(configured_concurrency(), len(groups))) as pool:
+                futures = {
+                    pool.submit(self.tallyfy_client.create_group, name=name, member_ids=member_ids): team
+                    for team, name, member_ids in groups
+                }
+                for future in as_completed(futures):
+                    team = futures[future]
+                    try:
+                        created_group = future.result()
+                    except Exception as e:
+                        record_failure(team, e)
+                        continue
+                    
+                    # Save mapping
+                    self.id_mapper.add_team_mapping(
+                        asana_gid=team['gid'],
+                        tallyfy_id=created_group.get('id'),
+                        name=team.get('name')
+                    )
+                    record_success(team)
         
         self.progress_tracker.complete_phase('Teams')
         self.target_counts['teams'] = results['migrated']
@@ -181,6 +181,31 @@ class CheckpointManager:
                  json.dumps(data) if data else None))
             conn.commit()
     
+    def save_item_checkpoints(self, phase: str, item_type: str,
+                              item_ids: List[str], status: str = 'completed') -> None:
+        """Save checkpoints for many items in one transaction.
+        
+        Args:
+            phase: Current phase
+            item_type: Type of item (user, project, task, etc.)
+            item_ids: Item identifiers
+            status: Processing status
+        """
+        if not self.current_run_id:
+            raise ValueError("No active migration run")
+        if not item_ids:
+            return
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO item_checkpoints 
+                (run_id, phase, item_type, item_id, status, data)
+                VALUES (?, ?, ?, ?, ?, NULL)
+            ''', [(self.current_run_id, phase, item_type, item_id, status)
+                  for item_id in item_ids])
+            conn.commit()
+    
     def get_processed_items(self, phase: str, item_type: str) -> List[str]:
         """Get list of already processed items.
         
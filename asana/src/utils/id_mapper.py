@@ -130,6 +130,26 @@ class IDMapper:
             conn.commit()
             logger.debug(f"Mapped user {asana_gid} -> {tallyfy_id}")
     
+    def add_user_mappings(self, mappings: List[Dict[str, Any]]) -> None:
+        """Add many user ID mappings in one transaction.
+        
+        Args:
+            mappings: Dicts with the keyword arguments of add_user_mapping
+        """
+        if not mappings:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO user_mappings 
+                (asana_gid, tallyfy_id, email, name, role, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(m['asana_gid'], m['tallyfy_id'], m.get('email'), m.get('name'),
+                   m.get('role'), json.dumps(m['metadata']) if m.get('metadata') else None)
+                  for m in mappings])
+            conn.commit()
+            logger.debug(f"Mapped {len(mappings)} users")
+    
     def add_team_mapping(self, asana_gid: str, tallyfy_id: str,
                         name: str = None, metadata: Dict = None) -> None:
         """Add team/group ID mapping.
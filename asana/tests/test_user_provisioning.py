@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Tests for the Asana users and teams phases.
+
+The users phase used to invite every user with its own create_member call,
+one at a time, and never looked at who was already in the Tallyfy
+organization. These tests pin the replacement. Existing members are fetched
+once and matched by email without an invite. The remaining users are invited
+concurrently, and a re-run invites nobody twice. The teams phase then creates
+its groups concurrently from the finished user mapping.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import main
+from src.transformers.user_transformer import UserTransformer
+from src.utils.checkpoint import CheckpointManager
+from src.utils.id_mapper import IDMapper
+from src.utils.progress_tracker import ProgressTracker
+from src.utils.validator import MigrationValidator
+
+
+def user(gid, email, name=None):
+    return {'gid': gid, 'email': email, 'name': name or gid.title()}
+
+
+USERS = [
+    user('u1', 'ann@example.com'),
+    user('u2', 'Bob@Example.com'),
+    user('u3', 'cat@example.com'),
+    user('u4', 'dan@example.com'),
+    user('u5', 'eve@example.com'),
+    user('u6', 'bob@example.com', name='Bob again'),
+    {'gid': 'u7', 'name': 'No Email'},
+]
+
+
+class FakeAsana:
+    def __init__(self, users=(), teams=()):
+        self.users = list(users)
+        self.teams = list(teams)
+
+    def get_users(self, workspace_gid):
+        return list(self.users)
+
+    def get_teams(self, workspace_gid):
+        return list(self.teams)
+
+
+class FakeTallyfy:
+    """Records calls and how many create calls were in flight at once."""
+
+    def __init__(self, members=(), fail_emails=(), delay=0.05):
+        self.members = list(members)
+        self.fail_emails = set(fail_emails)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.list_calls = 0
+        self.invited = []
+        self.groups = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def list_members(self):
+        self.list_calls += 1
+        return list(self.members)
+
+    def _call(self, record, value):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                record.append(value)
+
+    def create_member(self, email, first_name, last_name, role='member'):
+        self._call(self.invited, email)
+        if email in self.fail_emails:
+            raise RuntimeError('422 from the API')
+        member = {'id': f'm_{email}', 'email': email}
+        with self.lock:
+            self.members.append(member)
+        return member
+
+    def create_group(self, name, member_ids):
+        self._call(self.groups, (name, tuple(sorted(member_ids))))
+        return {'id': f'g_{name}'}
+
+
+class TeamTransformer(UserTransformer):
+    """Takes a team's members from the fixture; the real phase has no members API yet."""
+
+    def transform_team(self, asana_team, team_members):
+        return super().transform_team(asana_team, [{'gid': gid} for gid in asana_team['member_gids']])
+
+
+class ProvisioningTest(unittest.TestCase):
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.id_mapper = IDMapper(os.path.join(workdir.name, 'ids.db'))
+        self.checkpoints = CheckpointManager(os.path.join(workdir.name, 'checkpoints'))
+        self.checkpoints.start_migration('ws', {})
+        os.environ['MAX_WORKERS'] = '4'
+        self.addCleanup(os.environ.pop, 'MAX_WORKERS')
+
+    def orchestrator(self, tallyfy, asana):
+        orchestrator = main.AsanaMigrationOrchestrator.__new__(main.AsanaMigrationOrchestrator)
+        orchestrator.asana_client = asana
+        orchestrator.tallyfy_client = tallyfy
+        orchestrator.user_transformer = TeamTransformer()
+        orchestrator.id_mapper = self.id_mapper
+        orchestrator.validator = MigrationValidator(self.id_mapper)
+        orchestrator.checkpoint_manager = self.checkpoints
+        orchestrator.progress_tracker = ProgressTracker(use_rich=False, disable=True)
+        orchestrator.workspace_gid = 'ws'
+        orchestrator.target_counts = {}
+        return orchestrator
+
+    def test_existing_members_are_mapped_without_an_invite(self):
+        tallyfy = FakeTallyfy(members=[{'id': 'm_ann', 'email': 'ANN@example.com'},
+                                       {'id': 'm_bob', 'email': 'bob@example.com'}])
+        results = self.orchestrator(tallyfy, FakeAsana(USERS)).migrate_users()
+
+        self.assertEqual(tallyfy.list_calls, 1)
+        self.assertEqual(sorted(tallyfy.invited), ['cat@example.com', 'dan@example.com', 'eve@example.com'])
+        self.assertEqual(results['existing'], 3)
+        self.assertEqual(results['migrated'], 6)
+        self.assertEqual(results['failed'], 1)
+
+        mappings = self.id_mapper.get_all_user_mappings()
+        self.assertEqual(mappings['u1'], 'm_ann')
+        self.assertEqual(mappings['u2'], 'm_bob')
+        self.assertEqual(mappings['u6'], 'm_bob')
+        self.assertEqual(mappings['u3'], 'm_cat@example.com')
+
+    def test_invites_run_concurrently_and_share_an_address(self):
+        tallyfy = FakeTallyfy()
+        self.orchestrator(tallyfy, FakeAsana(USERS)).migrate_users()
+
+        self.assertEqual(len(tallyfy.invited), 5)
+        self.assertEqual(tallyfy.peak, 4)
+        mappings = self.id_mapper.get_all_user_mappings()
+        self.assertEqual(mappings['u2'], mappings['u6'])
+
+    def test_a_failed_invite_is_reported_and_retried_on_the_next_run(self):
+        tallyfy = FakeTallyfy(fail_emails={'cat@example.com'})
+        first = self.orchestrator(tallyfy, FakeAsana(USERS)).migrate_users()
+        self.assertEqual(first['failed'], 2)
+        self.assertIn('422 from the API', first['errors'])
+        self.assertNotIn('u3', self.id_mapper.get_all_user_mappings())
+        self.assertNotIn('u3', self.checkpoints.get_processed_items('users', 'user'))
+
+        retry = FakeTallyfy(members=tallyfy.members)
+        second = self.orchestrator(retry, FakeAsana(USERS)).migrate_users()
+        self.assertEqual(retry.invited, ['cat@example.com'])
+        self.assertEqual(second['skipped'], 5)
+        self.assertEqual(second['migrated'], 1)
+
+    def test_a_user_invited_before_an_interruption_is_not_invited_again(self):
+        tallyfy = FakeTallyfy(members=[{'id': 'm_cat', 'email': 'cat@example.com'}])
+        self.orchestrator(tallyfy, FakeAsana(USERS)).migrate_users()
+        self.assertNotIn('cat@example.com', tallyfy.invited)
+
+    def test_dry_run_makes_no_api_calls(self):
+        tallyfy = FakeTallyfy()
+        results = self.orchestrator(tallyfy, FakeAsana(USERS)).migrate_users(dry_run=True)
+        self.assertEqual((tallyfy.list_calls, tallyfy.invited), (0, []))
+        self.assertEqual(results['migrated'], 6)
+
+    def test_groups_are_created_concurrently_from_the_mapping(self):
+        tallyfy = FakeTallyfy()
+        teams = [{'gid': f't{n}', 'name': f'Team {n}', 'member_gids': ['u1', 'u3', 'nobody']}
+                 for n in range(6)]
+        teams.append({'gid': 't_empty', 'name': 'Empty', 'member_gids': ['nobody']})
+        orchestrator = self.orchestrator(tallyfy, FakeAsana(USERS, teams))
+        orchestrator.migrate_users()
+
+        results = orchestrator.migrate_teams()
+
+        self.assertEqual(results['migrated'], 7)
+        self.assertEqual(len(tallyfy.groups), 6)
+        self.assertEqual(tallyfy.peak, 4)
+        self.assertEqual(set(ids for _, ids in tallyfy.groups),
+                         {('m_ann@example.com', 'm_cat@example.com')})
+        self.assertEqual(self.id_mapper.get_team_mapping('t5'), 'g_Team 5')
+        self.assertIsNone(self.id_mapper.get_team_mapping('t_empty'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,16 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import time
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,7 +45,7 @@ class BasecampClient:
         
         self.base_url = f'https://3.basecampapi.com/{self.account_id}'
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.access_token}',
             'User-Agent': f'{self.client_id} (migration@tallyfy.com)',
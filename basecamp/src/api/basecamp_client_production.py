@@ -7,14 +7,28 @@ Implements actual Basecamp API v3 with proper authentication, rate limiting, and
 import os
 import time
 import json
+import threading
 import requests
-from typing import Dict, List, Any, Optional, Generator, Union
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Any, Optional, Generator, Union
+from datetime import datetime
 from urllib.parse import urlencode
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import configured_concurrency, create_session
+
 
 class BasecampRateLimitError(Exception):
     """Basecamp rate limit exceeded"""
@@ -66,7 +80,7 @@ class BasecampProductionClient:
         if not self.access_token or not self.account_id:
             raise BasecampAuthError("BASECAMP_ACCESS_TOKEN and BASECAMP_ACCOUNT_ID required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.access_token}',
             'Accept': 'application/json',
@@ -74,34 +88,46 @@ class BasecampProductionClient:
             'User-Agent': 'Tallyfy Migrator (support@tallyfy.com)'
         })
         
-        # Rate limiting tracking
-        self.request_times = []
+        # Rate limiting: start times booked for the most recent requests,
+        # shared by every thread using this client
+        self._rate_lock = threading.Lock()
+        self._request_slots = deque(maxlen=self.RATE_LIMITS['requests_per_10_seconds'])
+        self._paused_until = 0.0
         
-        # Cache for frequently used data
+        # Cache for frequently used data. Projects and docks are keyed by
+        # str(project_id), so an ID read from config matches one from the API.
         self.project_cache = {}
         self.people_cache = {}
+        self._docks: Dict[str, Dict[str, Dict[str, Any]]] = {}
         
         self.logger = logging.getLogger(__name__)
     
     def _check_rate_limit(self):
-        """Check and enforce Basecamp rate limits"""
-        now = datetime.now()
-        
-        # Remove requests older than 10 seconds
-        self.request_times = [
-            t for t in self.request_times 
-            if now - t < timedelta(seconds=10)
-        ]
-        
-        # Check 50 requests per 10 seconds limit
-        if len(self.request_times) >= self.RATE_LIMITS['requests_per_10_seconds']:
-            wait_time = 10 - (now - self.request_times[0]).total_seconds()
-            if wait_time > 0:
-                self.logger.warning(f"Rate limit reached. Waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-                self.request_times = []
+        """
+        Wait for the next request slot within Basecamp's rate limit
         
-        self.request_times.append(now)
+        Each caller books its start time under a lock, no earlier than 10
+        seconds after the request 50 places before it, then sleeps outside the
+        lock, so concurrent workers share one budget.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._paused_until)
+            if self._request_slots:
+                slot = max(slot, self._request_slots[-1])
+            if len(self._request_slots) == self._request_slots.maxlen:
+                slot = max(slot, self._request_slots[0] + 10)
+            self._request_slots.append(slot)
+        
+        wait_time = slot - now
+        if wait_time > 0:
+            self.logger.warning(f"Rate limit reached. Waiting {wait_time:.2f}s")
+            time.sleep(wait_time)
+    
+    def _pause_requests(self, seconds: float):
+        """Hold every thread's next request after a 429"""
+        with self._rate_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
     
     def _refresh_access_token(self):
         """Refresh OAuth access token"""
@@ -116,7 +142,10 @@ class BasecampProductionClient:
             'client_secret': self.client_secret
         }
         
-        response = requests.post(url, data=data)
+        # Form-encoded, and without the expired bearer token.
+        response = self.session.post(
+            url, data=data, headers={'Authorization': None, 'Content-Type': None}
+        )
         if response.status_code == 200:
             token_data = response.json()
             self.access_token = token_data['access_token']
@@ -132,9 +161,9 @@ class BasecampProductionClient:
         wait=wait_exponential(multiplier=1, min=4, max=10),
         retry=retry_if_exception_type((requests.RequestException, BasecampRateLimitError))
     )
-    def _make_request(self, method: str, endpoint: str, params: Dict = None, 
-                     data: Dict = None) -> Any:
-        """Make authenticated request to Basecamp API"""
+    def _send(self, method: str, endpoint: str, params: Dict = None,
+              data: Dict = None) -> Optional[requests.Response]:
+        """Send an authenticated request; returns None for a 404"""
         self._check_rate_limit()
         
         # Build URL with account ID
@@ -148,15 +177,14 @@ class BasecampProductionClient:
                 method=method,
                 url=url,
                 params=params,
-                json=data,
-                timeout=30
+                json=data
             )
             
             # Check for rate limit response
             if response.status_code == 429:
                 retry_after = int(response.headers.get('Retry-After', 10))
                 self.logger.warning(f"Rate limited. Retry after {retry_after}s")
-                time.sleep(retry_after)
+                self._pause_requests(retry_after)
                 raise BasecampRateLimitError("Rate limit exceeded")
             
             # Try refreshing token if unauthorized
@@ -167,26 +195,13 @@ class BasecampProductionClient:
                         method=method,
                         url=url,
                         params=params,
-                        json=data,
-                        timeout=30
+                        json=data
                     )
                 else:
                     raise BasecampAuthError("Authentication failed and couldn't refresh token")
             
             response.raise_for_status()
-            
-            # Parse response
-            if response.text:
-                result = response.json()
-                
-                # Handle pagination info
-                if 'Link' in response.headers:
-                    next_link = self._parse_link_header(response.headers['Link'])
-                    if next_link:
-                        result = {'data': result, 'next': next_link}
-                
-                return result
-            return None
+            return response
             
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -195,6 +210,38 @@ class BasecampProductionClient:
                 self.logger.error(f"HTTP error: {e}")
                 raise
     
+    def _make_request(self, method: str, endpoint: str, params: Dict = None, 
+                     data: Dict = None) -> Any:
+        """
+        Make authenticated request to Basecamp API
+        
+        Returns the parsed body of this one response. Collections are paged;
+        read them with ``_paginate`` so later pages are not dropped.
+        """
+        response = self._send(method, endpoint, params, data)
+        if response is not None and response.text:
+            return response.json()
+        return None
+    
+    def _paginate(self, endpoint: str, params: Dict = None) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield every record of a paged collection, following ``Link: rel="next"``
+        
+        Pages are fetched lazily, one at a time as the previous page is
+        consumed, so only one page is ever held in memory. A collection that
+        does not exist (404) yields nothing.
+        """
+        url = endpoint
+        while url:
+            response = self._send('GET', url, params)
+            if response is None:
+                return
+            if response.text:
+                yield from response.json()
+            url = self._parse_link_header(response.headers.get('Link', ''))
+            # The next link carries the query string itself
+            params = None
+    
     def _parse_link_header(self, link_header: str) -> Optional[str]:
         """Parse Link header for next page URL"""
         if not link_header:
@@ -227,7 +274,7 @@ class BasecampProductionClient:
     
     def get_people(self) -> List[Dict[str, Any]]:
         """Get all people in account"""
-        people = self._make_request('GET', '/people')
+        people = list(self._paginate('/people'))
         
         # Cache people
         for person in people:
@@ -253,31 +300,32 @@ class BasecampProductionClient:
         # Status can be: active, archived, trashed
         params = {'status': status}
         
-        projects = self._make_request('GET', '/projects', params)
+        projects = list(self._paginate('/projects', params))
         
         # Cache projects
         for project in projects:
-            self.project_cache[project['id']] = project
+            self.project_cache[str(project['id'])] = project
         
         return projects
     
     def get_project(self, project_id: int) -> Dict[str, Any]:
         """Get detailed project information"""
         # Check cache first
-        if project_id in self.project_cache:
-            return self.project_cache[project_id]
+        key = str(project_id)
+        if key in self.project_cache:
+            return self.project_cache[key]
         
         project = self._make_request('GET', f'/projects/{project_id}')
         
         if project:
-            self.project_cache[project_id] = project
+            self.project_cache[key] = project
         
         return project
     
     def get_project_tools(self, project_id: int) -> List[Dict[str, Any]]:
         """Get all tools (apps) enabled for a project"""
         # This returns the dock - list of enabled tools
-        project = self.get_project(project_id)
+        project = self.get_project(project_id) or {}
         return project.get('dock', [])
     
     def get_todo_lists(self, project_id: int, status: str = 'active') -> List[Dict[str, Any]]:
@@ -287,43 +335,59 @@ class BasecampProductionClient:
             return []
         
         params = {'status': status}
-        return self._make_request('GET', f'/buckets/{project_id}/todosets/{todoset["id"]}/todolists', params)
+        return list(self._paginate(f'/buckets/{project_id}/todosets/{todoset["id"]}/todolists', params))
+    
+    def iter_todos(self, project_id: int, todolist_id: int) -> Generator[Dict[str, Any], None, None]:
+        """Stream todos in a todo list, page by page"""
+        return self._paginate(f'/buckets/{project_id}/todolists/{todolist_id}/todos')
     
     def get_todos(self, project_id: int, todolist_id: int) -> List[Dict[str, Any]]:
         """Get todos in a todo list"""
-        return self._make_request('GET', f'/buckets/{project_id}/todolists/{todolist_id}/todos')
+        return list(self.iter_todos(project_id, todolist_id))
     
     def get_todo(self, project_id: int, todo_id: int) -> Dict[str, Any]:
         """Get detailed todo information"""
         return self._make_request('GET', f'/buckets/{project_id}/todos/{todo_id}')
     
-    def get_messages(self, project_id: int) -> List[Dict[str, Any]]:
-        """Get messages (posts) in a project"""
+    def iter_messages(self, project_id: int) -> Generator[Dict[str, Any], None, None]:
+        """Stream messages (posts) in a project, page by page"""
         message_board = self._get_message_board(project_id)
         if not message_board:
-            return []
+            return iter(())
         
-        return self._make_request('GET', f'/buckets/{project_id}/message_boards/{message_board["id"]}/messages')
+        return self._paginate(f'/buckets/{project_id}/message_boards/{message_board["id"]}/messages')
+    
+    def get_messages(self, project_id: int) -> List[Dict[str, Any]]:
+        """Get messages (posts) in a project"""
+        return list(self.iter_messages(project_id))
     
     def get_message(self, project_id: int, message_id: int) -> Dict[str, Any]:
         """Get detailed message information"""
         return self._make_request('GET', f'/buckets/{project_id}/messages/{message_id}')
     
+    def iter_documents(self, project_id: int) -> Generator[Dict[str, Any], None, None]:
+        """Stream documents in a project, page by page"""
+        vault = self._get_vault(project_id)
+        if not vault:
+            return iter(())
+        
+        return self._paginate(f'/buckets/{project_id}/vaults/{vault["id"]}/documents')
+    
     def get_documents(self, project_id: int) -> List[Dict[str, Any]]:
         """Get documents in a project"""
+        return list(self.iter_documents(project_id))
+    
+    def iter_uploads(self, project_id: int) -> Generator[Dict[str, Any], None, None]:
+        """Stream uploads (files) in a project, page by page"""
         vault = self._get_vault(project_id)
         if not vault:
-            return []
+            return iter(())
         
-        return self._make_request('GET', f'/buckets/{project_id}/vaults/{vault["id"]}/documents')
+        return self._paginate(f'/buckets/{project_id}/vaults/{vault["id"]}/uploads')
     
     def get_uploads(self, project_id: int) -> List[Dict[str, Any]]:
         """Get uploads (files) in a project"""
-        vault = self._get_vault(project_id)
-        if not vault:
-            return []
-        
-        return self._make_request('GET', f'/buckets/{project_id}/vaults/{vault["id"]}/uploads')
+        return list(self.iter_uploads(project_id))
     
     def get_campfires(self, project_id: int) -> List[Dict[str, Any]]:
         """Get campfire chats in a project"""
@@ -331,7 +395,7 @@ class BasecampProductionClient:
         if not chat:
             return []
         
-        return self._make_request('GET', f'/buckets/{project_id}/chats/{chat["id"]}/lines')
+        return list(self._paginate(f'/buckets/{project_id}/chats/{chat["id"]}/lines'))
     
     def get_schedule_entries(self, project_id: int) -> List[Dict[str, Any]]:
         """Get schedule entries in a project"""
@@ -339,7 +403,7 @@ class BasecampProductionClient:
         if not schedule:
             return []
         
-        return self._make_request('GET', f'/buckets/{project_id}/schedules/{schedule["id"]}/entries')
+        return list(self._paginate(f'/buckets/{project_id}/schedules/{schedule["id"]}/entries'))
     
     def get_questionnaires(self, project_id: int) -> List[Dict[str, Any]]:
         """Get questionnaires (check-in questions) in a project"""
@@ -347,11 +411,48 @@ class BasecampProductionClient:
         if not questionnaire:
             return []
         
-        return self._make_request('GET', f'/buckets/{project_id}/questionnaires/{questionnaire["id"]}/questions')
+        return list(self._paginate(f'/buckets/{project_id}/questionnaires/{questionnaire["id"]}/questions'))
+    
+    def iter_comments(self, project_id: int, recording_id: int) -> Generator[Dict[str, Any], None, None]:
+        """Stream comments on any recording, page by page"""
+        return self._paginate(f'/buckets/{project_id}/recordings/{recording_id}/comments')
     
     def get_comments(self, project_id: int, recording_id: int) -> List[Dict[str, Any]]:
         """Get comments on any recording (todo, message, etc.)"""
-        return self._make_request('GET', f'/buckets/{project_id}/recordings/{recording_id}/comments')
+        return list(self.iter_comments(project_id, recording_id))
+    
+    def attach_comments(self, project_id: int, recordings: List[Dict[str, Any]],
+                        max_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Set ``comments`` on each recording, fetching only where there are any
+        
+        Recordings carry ``comments_count``; those at zero get an empty list
+        without a request. The rest (including any without a count) are
+        fetched concurrently, within the shared rate limit.
+        
+        Args:
+            project_id: Project (bucket) the recordings belong to
+            recordings: Todos, messages or other commentable recordings
+            max_workers: Concurrent fetches (defaults to ``MAX_WORKERS``)
+            
+        Returns:
+            ``{'fetched': ..., 'skipped': ...}`` recording counts
+        """
+        to_fetch = []
+        for recording in recordings:
+            if recording.get('comments_count') == 0:
+                recording['comments'] = []
+            else:
+                to_fetch.append(recording)
+        
+        if to_fetch:
+            workers = min(max_workers or configured_concurrency(), len(to_fetch))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                comments = pool.map(lambda r: self.get_comments(project_id, r['id']), to_fetch)
+                for recording, recording_comments in zip(to_fetch, comments):
+                    recording['comments'] = recording_comments
+        
+        return {'fetched': len(to_fetch), 'skipped': len(recordings) - len(to_fetch)}
     
     def get_events(self, project_id: int = None, since: datetime = None) -> List[Dict[str, Any]]:
         """Get events (activity feed)"""
@@ -365,17 +466,31 @@ class BasecampProductionClient:
         else:
             endpoint = '/events'
         
-        return self._make_request('GET', endpoint, params)
+        return list(self._paginate(endpoint, params))
     
     # ============= HELPER METHODS FOR TOOLS =============
     
+    def _get_dock(self, project_id: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the project's dock indexed by lower-cased tool name
+        
+        Resolved once per project for the life of the client: every tool
+        lookup goes through here, and a project without a dock (or one that
+        no longer exists) is remembered as empty rather than fetched again.
+        """
+        key = str(project_id)
+        dock = self._docks.get(key)
+        if dock is None:
+            dock = {}
+            for tool in self.get_project_tools(project_id):
+                # The first tool of a name wins, as the old linear scan did
+                dock.setdefault(tool['name'].lower(), tool)
+            self._docks[key] = dock
+        return dock
+    
     def _get_tool(self, project_id: int, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific tool from project dock"""
-        tools = self.get_project_tools(project_id)
-        for tool in tools:
-            if tool['name'].lower() == tool_name.lower():
-                return tool
-        return None
+        return self._get_dock(project_id).get(tool_name.lower())
     
     def _get_todoset(self, project_id: int) -> Optional[Dict[str, Any]]:
         """Get todoset tool for project"""
@@ -403,79 +518,83 @@ class BasecampProductionClient:
     
     # ============= BATCH OPERATIONS =============
     
-    def get_all_data(self) -> Dict[str, Any]:
-        """
-        Get all data for migration
-        
-        Returns:
-            Complete data structure for migration
-        """
-        self.logger.info("Starting complete Basecamp data export")
-        
+    # Comments are fetched for this many streamed recordings at a time.
+    COMMENT_BATCH = 50
+    
+    EXPORT_TOTALS = ('total_projects', 'total_todos', 'total_messages',
+                     'total_documents', 'comment_requests_avoided')
+    
+    def _export_header(self) -> Dict[str, Any]:
+        """Start an export: account-wide data and zeroed totals"""
         data = {
             'export_date': datetime.utcnow().isoformat(),
             'authorization': self.get_authorization(),
             'people': [],
             'projects': [],
-            'total_projects': 0,
-            'total_todos': 0,
-            'total_messages': 0,
-            'total_documents': 0
         }
+        data.update(dict.fromkeys(self.EXPORT_TOTALS, 0))
         
         # Get people
         self.logger.info("Fetching people...")
         data['people'] = self.get_people()
+        return data
+    
+    def _with_comments(self, project_id: int, recordings: Iterable[Dict[str, Any]],
+                       totals: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        """Yield streamed recordings with ``comments`` attached, a batch at a time"""
+        recordings = iter(recordings)
+        while True:
+            batch = list(islice(recordings, self.COMMENT_BATCH))
+            if not batch:
+                return
+            counts = self.attach_comments(project_id, batch)
+            totals['comment_requests_avoided'] += counts['skipped']
+            yield from batch
+    
+    def iter_project_data(self, totals: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the full export of each active project, one project at a time
         
+        Every collection is consumed from its page stream, so only the
+        project being yielded is held, besides the project list itself.
+        ``totals`` is updated as it goes.
+        """
         # Get projects
         self.logger.info("Fetching projects...")
-        projects = self.get_projects(status='active')
-        
-        for project in projects:
+        for project in self.get_projects(status='active'):
             self.logger.info(f"Processing project: {project['name']}")
             
             # Get full project details
             project_data = self.get_project(project['id'])
             
-            # Get todo lists
+            # Get todo lists, with each list's todos and their comments
             project_data['todo_lists'] = []
-            todo_lists = self.get_todo_lists(project['id'])
-            
-            for todolist in todo_lists:
+            for todolist in self.get_todo_lists(project['id']):
                 self.logger.info(f"  Processing todo list: {todolist['title']}")
                 
                 todolist_data = todolist.copy()
-                
-                # Get todos
-                todos = self.get_todos(project['id'], todolist['id'])
-                todolist_data['todos'] = todos
-                data['total_todos'] += len(todos)
-                
-                # Get comments for each todo
-                for todo in todos:
-                    todo['comments'] = self.get_comments(project['id'], todo['id'])
+                todolist_data['todos'] = list(self._with_comments(
+                    project['id'], self.iter_todos(project['id'], todolist['id']), totals
+                ))
+                totals['total_todos'] += len(todolist_data['todos'])
                 
                 project_data['todo_lists'].append(todolist_data)
             
-            # Get messages
+            # Get messages and their comments
             self.logger.info(f"  Fetching messages...")
-            messages = self.get_messages(project['id'])
-            project_data['messages'] = messages
-            data['total_messages'] += len(messages)
-            
-            # Get comments for each message
-            for message in messages:
-                message['comments'] = self.get_comments(project['id'], message['id'])
+            project_data['messages'] = list(self._with_comments(
+                project['id'], self.iter_messages(project['id']), totals
+            ))
+            totals['total_messages'] += len(project_data['messages'])
             
             # Get documents
             self.logger.info(f"  Fetching documents...")
-            documents = self.get_documents(project['id'])
-            project_data['documents'] = documents
-            data['total_documents'] += len(documents)
+            project_data['documents'] = list(self.iter_documents(project['id']))
+            totals['total_documents'] += len(project_data['documents'])
             
             # Get uploads
             self.logger.info(f"  Fetching uploads...")
-            project_data['uploads'] = self.get_uploads(project['id'])
+            project_data['uploads'] = list(self.iter_uploads(project['id']))
             
             # Get schedule entries
             self.logger.info(f"  Fetching schedule...")
@@ -489,15 +608,70 @@ class BasecampProductionClient:
             self.logger.info(f"  Fetching events...")
             project_data['events'] = self.get_events(project_id=project['id'])
             
+            totals['total_projects'] += 1
+            yield project_data
+    
+    def _log_export_totals(self, totals: Dict[str, Any]):
+        self.logger.info(f"Export complete: {totals['total_projects']} projects, {totals['total_todos']} todos")
+        self.logger.info(f"Skipped {totals['comment_requests_avoided']} comment requests for recordings without comments")
+    
+    def get_all_data(self) -> Dict[str, Any]:
+        """
+        Get all data for migration
+        
+        Holds the whole account in memory; :meth:`export_all_data` writes the
+        same structure to a file one project at a time instead.
+        
+        Returns:
+            Complete data structure for migration
+        """
+        self.logger.info("Starting complete Basecamp data export")
+        
+        data = self._export_header()
+        for project_data in self.iter_project_data(data):
             data['projects'].append(project_data)
-            data['total_projects'] += 1
+        
+        self._log_export_totals(data)
+        return data
+    
+    def export_all_data(self, path: str) -> Dict[str, Any]:
+        """
+        Write the :meth:`get_all_data` structure to ``path`` as JSON
+        
+        Each project is serialized as soon as it is fetched and then
+        dropped, so memory is bounded by the largest project rather than
+        the account.
+        
+        Args:
+            path: File to write
             
-            # Rate limit pause between projects
-            time.sleep(1)
+        Returns:
+            The export's totals
+        """
+        self.logger.info(f"Starting complete Basecamp data export to {path}")
         
-        self.logger.info(f"Export complete: {data['total_projects']} projects, {data['total_todos']} todos")
+        header = self._export_header()
+        totals = {key: header[key] for key in self.EXPORT_TOTALS}
         
-        return data
+        with open(path, 'w') as f:
+            f.write('{')
+            for key in ('export_date', 'authorization', 'people'):
+                f.write(f'{json.dumps(key)}: {json.dumps(header[key], default=str)}, ')
+            del header
+            
+            f.write('"projects": [')
+            for n, project_data in enumerate(self.iter_project_data(totals)):
+                if n:
+                    f.write(', ')
+                json.dump(project_data, f, default=str)
+            f.write(']')
+            
+            for key in self.EXPORT_TOTALS:
+                f.write(f', {json.dumps(key)}: {totals[key]}')
+            f.write('}')
+        
+        self._log_export_totals(totals)
+        return totals
     
     # ============= PARADIGM SHIFT HELPERS =============
     
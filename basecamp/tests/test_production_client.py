@@ -0,0 +1,315 @@
+"""Tests for the Basecamp production client's request economy.
+
+Basecamp allows 50 requests per 10 seconds, so the export must not spend
+requests it does not need, and pages every collection through `Link`
+headers, so it must not stop at the first page either. These tests serve an
+account from memory through `_send` and count what the client asks for: each
+project's dock is resolved once, however many tools are looked up and however
+the project ID is spelled; every page of a collection is read, and lazily;
+comments are fetched only for recordings that have some, and concurrently.
+The file export writes each project before fetching the next.
+The rate limiter is tested on its own against a fake clock.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api import basecamp_client_production as production
+from src.api.basecamp_client_production import BasecampProductionClient
+
+DOCK = [
+    {'id': 11, 'name': 'todoset', 'title': 'To-dos'},
+    {'id': 12, 'name': 'message_board', 'title': 'Message Board'},
+    {'id': 13, 'name': 'vault', 'title': 'Docs & Files'},
+    {'id': 14, 'name': 'schedule', 'title': 'Schedule'},
+    {'id': 15, 'name': 'questionnaire', 'title': 'Check-ins'},
+    {'id': 16, 'name': 'chat', 'title': 'Campfire'},
+]
+
+
+def paged(endpoint, records, page_size):
+    """Routes serving `records` at `endpoint` in pages linked by `Link` headers."""
+    routes = {}
+    url = endpoint
+    for start in range(0, len(records), page_size):
+        next_url = f'https://3.basecampapi.com/999{endpoint}.json?page={start // page_size + 2}'
+        last = start + page_size >= len(records)
+        routes[url] = (records[start:start + page_size], None if last else next_url)
+        url = next_url
+    return routes
+
+
+class FakeBasecamp(BasecampProductionClient):
+    """
+    An account served from memory: {endpoint or URL: body}, where a body may
+    be a (body, next_url) pair to send a `Link: rel="next"` header.
+    """
+
+    def __init__(self, routes, latency=0.0):
+        env = {'BASECAMP_ACCESS_TOKEN': 'token', 'BASECAMP_ACCOUNT_ID': '999'}
+        with patch.dict(os.environ, env):
+            super().__init__()
+        self.routes = routes
+        self.latency = latency
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._count_lock = threading.Lock()
+
+    def _send(self, method, endpoint, params=None, data=None):
+        with self._count_lock:
+            self.calls.append(endpoint)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            return self._respond(endpoint)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+
+    def _respond(self, endpoint):
+        if endpoint not in self.routes:
+            return None
+        body, next_url = self.routes[endpoint], None
+        if isinstance(body, tuple):
+            body, next_url = body
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode()
+        if next_url:
+            response.headers['Link'] = f'<{next_url}>; rel="next"'
+        return response
+
+
+class TestDockLookups(unittest.TestCase):
+
+    def test_dock_is_fetched_once_per_project(self):
+        client = FakeBasecamp({'/projects/1': {'id': 1, 'name': 'P', 'dock': DOCK}})
+
+        self.assertEqual(client._get_todoset(1)['id'], 11)
+        self.assertEqual(client._get_message_board(1)['id'], 12)
+        self.assertEqual(client._get_vault('1')['id'], 13)
+        self.assertEqual(client._get_schedule(1)['id'], 14)
+        self.assertEqual(client._get_questionnaire(1)['id'], 15)
+        self.assertEqual(client._get_chat(1)['id'], 16)
+
+        self.assertEqual(client.calls, ['/projects/1'])
+
+    def test_projects_listing_fills_the_cache(self):
+        client = FakeBasecamp({'/projects': [{'id': 1, 'name': 'P', 'dock': DOCK}]})
+
+        client.get_projects()
+        client._get_vault('1')
+
+        self.assertEqual(client.calls, ['/projects'])
+
+    def test_missing_project_is_not_fetched_again(self):
+        client = FakeBasecamp({})
+
+        self.assertIsNone(client._get_todoset(7))
+        self.assertIsNone(client._get_vault(7))
+        self.assertEqual(client.get_todo_lists(7), [])
+
+        self.assertEqual(client.calls, ['/projects/7'])
+
+    def test_first_tool_of_a_name_wins_and_names_are_case_insensitive(self):
+        dock = [{'id': 1, 'name': 'Vault'}, {'id': 2, 'name': 'vault'}]
+        client = FakeBasecamp({'/projects/1': {'id': 1, 'dock': dock}})
+
+        self.assertEqual(client._get_tool(1, 'VAULT')['id'], 1)
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_every_page_of_todos_is_read(self):
+        todos = [{'id': i} for i in range(120)]
+        client = FakeBasecamp(paged('/buckets/1/todolists/5/todos', todos, 50))
+
+        self.assertEqual(client.get_todos(1, 5), todos)
+        self.assertEqual(len(client.calls), 3)
+
+    def test_pages_are_fetched_only_as_records_are_consumed(self):
+        todos = [{'id': i} for i in range(120)]
+        client = FakeBasecamp(paged('/buckets/1/todolists/5/todos', todos, 50))
+
+        stream = client.iter_todos(1, 5)
+        first = [next(stream) for _ in range(50)]
+
+        self.assertEqual(first, todos[:50])
+        self.assertEqual(len(client.calls), 1)
+        next(stream)
+        self.assertEqual(len(client.calls), 2)
+
+    def test_project_collections_return_lists_not_page_wrappers(self):
+        messages = [{'id': i} for i in range(30)]
+        routes = {'/projects/1': {'id': 1, 'dock': DOCK}}
+        routes.update(paged('/buckets/1/message_boards/12/messages', messages, 15))
+        routes.update(paged('/buckets/1/recordings/3/comments', [{'id': 'c'}] * 4, 3))
+        routes.update(paged('/people', [{'id': i} for i in range(5)], 2))
+        client = FakeBasecamp(routes)
+
+        self.assertEqual(client.get_messages(1), messages)
+        self.assertEqual(len(client.get_comments(1, 3)), 4)
+        self.assertEqual(len(client.get_people()), 5)
+        self.assertEqual(client.get_documents(1), [])
+
+    def test_single_requests_return_the_body_even_with_a_next_link(self):
+        with patch.dict(os.environ, {'BASECAMP_ACCESS_TOKEN': 't', 'BASECAMP_ACCOUNT_ID': '999'}):
+            client = BasecampProductionClient()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'[{"id": 1}]'
+        response.headers['Link'] = '<https://3.basecampapi.com/999/people.json?page=2>; rel="next"'
+        client.session.request = MagicMock(return_value=response)
+
+        self.assertEqual(client._make_request('GET', '/people'), [{'id': 1}])
+
+    def test_only_a_next_link_continues(self):
+        client = FakeBasecamp({})
+        header = '<https://x/prev>; rel="prev", <https://x/first>; rel="first"'
+
+        self.assertIsNone(client._parse_link_header(header))
+        self.assertEqual(client._parse_link_header(f'{header}, <https://x/2>; rel="next"'), 'https://x/2')
+
+
+class TestCommentFetching(unittest.TestCase):
+
+    def account(self, latency=0.0):
+        todos = [{'id': i, 'comments_count': 1 if i % 5 == 0 else 0} for i in range(20)]
+        messages = [{'id': 100, 'comments_count': 2}, {'id': 101, 'comments_count': 0}]
+        routes = {
+            '/authorization': {},
+            '/people': [],
+            '/projects': [{'id': 1, 'name': 'P', 'dock': DOCK}],
+            '/buckets/1/todosets/11/todolists': [{'id': 5, 'title': 'L'}],
+            '/buckets/1/todolists/5/todos': todos,
+            '/buckets/1/message_boards/12/messages': messages,
+        }
+        for recording_id in (0, 5, 10, 15, 100):
+            routes[f'/buckets/1/recordings/{recording_id}/comments'] = [{'id': f'c{recording_id}'}]
+        return FakeBasecamp(routes, latency=latency)
+
+    def comment_calls(self, client):
+        return [endpoint for endpoint in client.calls if endpoint.endswith('/comments')]
+
+    def test_recordings_without_comments_are_not_fetched(self):
+        client = self.account()
+
+        data = client.get_all_data()
+
+        self.assertEqual(len(self.comment_calls(client)), 5)
+        self.assertEqual(data['comment_requests_avoided'], 17)
+        todos = data['projects'][0]['todo_lists'][0]['todos']
+        self.assertEqual(todos[5]['comments'], [{'id': 'c5'}])
+        self.assertEqual(todos[1]['comments'], [])
+        self.assertEqual(data['projects'][0]['messages'][0]['comments'], [{'id': 'c100'}])
+
+    def test_recordings_without_a_count_are_fetched(self):
+        client = FakeBasecamp({'/buckets/1/recordings/9/comments': [{'id': 'c'}]})
+        recordings = [{'id': 9}]
+
+        counts = client.attach_comments(1, recordings)
+
+        self.assertEqual(counts, {'fetched': 1, 'skipped': 0})
+        self.assertEqual(recordings[0]['comments'], [{'id': 'c'}])
+
+    def test_comment_fetches_overlap(self):
+        client = FakeBasecamp({}, latency=0.02)
+        recordings = [{'id': i, 'comments_count': 3} for i in range(12)]
+
+        client.attach_comments(1, recordings, max_workers=4)
+
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 4)
+        self.assertTrue(all(r['comments'] == [] for r in recordings))
+
+
+class TestExportToFile(unittest.TestCase):
+
+    def account(self):
+        routes = {'/authorization': {}, '/people': [{'id': 7}],
+                  '/projects': [{'id': 1, 'name': 'P1', 'dock': DOCK},
+                                {'id': 2, 'name': 'P2', 'dock': DOCK}]}
+        for project_id in (1, 2):
+            routes[f'/buckets/{project_id}/todosets/11/todolists'] = [{'id': 5, 'title': 'L'}]
+            routes.update(paged(f'/buckets/{project_id}/todolists/5/todos',
+                                [{'id': i, 'comments_count': 0} for i in range(120)], 50))
+            routes[f'/buckets/{project_id}/message_boards/12/messages'] = [{'id': 100, 'comments_count': 1}]
+            routes[f'/buckets/{project_id}/recordings/100/comments'] = [{'id': 'c'}]
+        return FakeBasecamp(routes)
+
+    def test_file_matches_the_in_memory_export(self):
+        in_memory = self.account().get_all_data()
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'export.json')
+            totals = self.account().export_all_data(path)
+            with open(path) as f:
+                written = json.load(f)
+
+        for data in (in_memory, written):
+            data.pop('export_date')
+        self.assertEqual(written, in_memory)
+        self.assertEqual(totals['total_todos'], 240)
+        self.assertEqual(totals['comment_requests_avoided'], 240)
+
+    def test_each_project_is_written_before_the_next_is_fetched(self):
+        client = self.account()
+        written = []
+        dump = production.json.dump
+
+        def record(project_data, f, **kwargs):
+            written.append((project_data['id'], len(client.calls)))
+            dump(project_data, f, **kwargs)
+
+        with tempfile.TemporaryDirectory() as workdir, \
+                patch.object(production.json, 'dump', record):
+            client.export_all_data(os.path.join(workdir, 'export.json'))
+
+        (first, calls_before_first_dump), (second, _) = written
+        self.assertEqual((first, second), (1, 2))
+        self.assertFalse(any(call.startswith('/buckets/2/') for call in client.calls[:calls_before_first_dump]))
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimit(unittest.TestCase):
+
+    def test_no_more_than_50_requests_in_any_10_seconds(self):
+        client = FakeBasecamp({})
+        clock = FakeClock()
+        starts = []
+
+        with patch.object(production.time, 'monotonic', clock.monotonic), \
+                patch.object(production.time, 'sleep', clock.sleep):
+            for _ in range(175):
+                client._check_rate_limit()
+                starts.append(clock.now)
+
+        for i in range(50, len(starts)):
+            self.assertGreaterEqual(starts[i] - starts[i - 50], 10)
+        self.assertEqual(starts[-1] - starts[0], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
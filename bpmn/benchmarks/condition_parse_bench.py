@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled, cached condition parsing vs. the old four-regex parse.
+
+Parses a synthetic corpus of sequence-flow conditions -- a few dozen distinct
+expressions repeated across many flows, as enterprise exports are -- with the
+old ``_parse_condition_expression`` body and the current one. Checks that
+every expression the old parser understood parses identically, reports how
+many it left for manual review that now parse, and times both, with the
+condition cache cold and warm.
+
+Usage::
+
+    python bpmn/benchmarks/condition_parse_bench.py --flows 200000 --distinct 40
+"""
+
+import argparse
+import gc
+import os
+import random
+import re
+import sys
+import time
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+from tallyfy_generator import TallyfyTemplateGenerator, compile_condition  # noqa: E402
+
+
+def legacy_parse(generator, expression):
+    """The old ``_parse_condition_expression``."""
+    if not expression:
+        return None
+
+    expression = expression.replace('<![CDATA[', '').replace(']]>', '').strip()
+
+    patterns = [
+        r'\$\{(\w+)\s*==\s*["\']?(\w+)["\']?\}',
+        r'\$\{(\w+)\s*>\s*(\d+)\}',
+        r'\$\{(\w+)\s*<\s*(\d+)\}',
+        r'\$\{(\w+)\s*!=\s*["\']?(\w+)["\']?\}',
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, expression)
+        if match:
+            field = match.group(1)
+            value = match.group(2)
+
+            if '==' in expression:
+                operator = 'equals'
+            elif '!=' in expression:
+                operator = 'not_equals'
+            elif '>' in expression:
+                operator = 'greater_than'
+            elif '<' in expression:
+                operator = 'less_than'
+            else:
+                operator = 'equals'
+
+            return {
+                'field_alias': generator._sanitize_alias(field),
+                'operator': operator,
+                'value': value
+            }
+
+    return {
+        'field_alias': 'manual_check',
+        'operator': 'equals',
+        'value': 'true',
+        'note': f"Original condition: {expression}"
+    }
+
+
+SHAPES = [
+    "${{{field} == '{word}'}}",
+    '${{{field} == "{word}"}}',
+    '${{{field} != {word}}}',
+    '${{{field} > {number}}}',
+    '${{{field} < {number}}}',
+    '<![CDATA[${{{field} == {word}}}]]>',
+    '${{{field} >= {number}}}',
+    '${{{field} <= {number}}}',
+    "${{{field} == '{word} {word}' && {other} > {number}}}",
+    '${{{field} == {word} || {other} == {word}}}',
+    '${{{field}.total > {number}.5}}',
+    '${{{field}.isEmpty()}}',
+]
+FIELDS = ['decision', 'order_value', 'approved', 'region', 'risk_score', 'tier']
+WORDS = ['approve', 'reject', 'true', 'false', 'emea', 'gold']
+
+
+def make_corpus(flows, distinct, seed=43):
+    rng = random.Random(seed)
+    expressions = sorted({
+        rng.choice(SHAPES).format(field=rng.choice(FIELDS), other=rng.choice(FIELDS),
+                                  word=rng.choice(WORDS), number=rng.randrange(1, 100_000))
+        for _ in range(distinct * 4)
+    })[:distinct]
+    # Skewed like real exports: a few expressions dominate.
+    weights = [1 / (rank + 1) for rank in range(len(expressions))]
+    return expressions, rng.choices(expressions, weights=weights, k=flows)
+
+
+def timed(parse, corpus):
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        results = [parse(expression) for expression in corpus]
+        return results, time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--flows', type=int, default=200_000, help='conditions in the corpus')
+    parser.add_argument('--distinct', type=int, default=40, help='distinct expressions among them')
+    args = parser.parse_args()
+
+    generator = TallyfyTemplateGenerator()
+    expressions, corpus = make_corpus(args.flows, args.distinct)
+
+    old = {e: legacy_parse(generator, e) for e in expressions}
+    new = {e: generator._parse_condition_expression(e) for e in expressions}
+    understood = [e for e in expressions if old[e]['field_alias'] != 'manual_check']
+    mismatched = [e for e in understood if new[e] != old[e]]
+    if mismatched:
+        sys.exit(f'parsed differently from the old parser: {mismatched}')
+    recovered = [e for e in expressions
+                 if old[e]['field_alias'] == 'manual_check' and new[e].get('field_alias') != 'manual_check']
+
+    _, legacy_seconds = timed(lambda e: legacy_parse(generator, e), corpus)
+    compile_condition.cache_clear()
+    _, cold_seconds = timed(generator._parse_condition_expression, corpus)
+    _, warm_seconds = timed(generator._parse_condition_expression, corpus)
+
+    per_flow = lambda seconds: seconds / max(len(corpus), 1) * 1e6  # noqa: E731
+    print(f'{len(corpus):,} conditions, {len(expressions)} distinct')
+    print(f'  understood by the old parser   {len(understood):4} (all parse identically)')
+    print(f'  newly parsed instead of manual {len(recovered):4}')
+    print(f'  four regexes per flow (old)    {legacy_seconds:7.3f} s {per_flow(legacy_seconds):6.2f} us/flow')
+    print(f'  compiled, cache cold           {cold_seconds:7.3f} s {per_flow(cold_seconds):6.2f} us/flow')
+    print(f'  compiled, cache warm           {warm_seconds:7.3f} s {per_flow(warm_seconds):6.2f} us/flow')
+
+
+if __name__ == '__main__':
+    main()
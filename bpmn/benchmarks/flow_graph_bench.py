@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: iterative Tarjan flow-graph pass vs. the old recursive cycle check.
+
+Builds chains of increasing length, with a flow from the last node back to
+the first so the whole chain is one loop, and runs the old recursive
+``_has_cycles`` and ``analyze_flow_graph`` on each. The recursive check raises
+``RecursionError`` once the chain outgrows the interpreter's recursion limit;
+the Tarjan pass reports loops, reachability and longest path for every size
+in time linear in the chain.
+
+Usage::
+
+    python bpmn/benchmarks/flow_graph_bench.py --nodes 1000 10000 100000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+from flow_graph import analyze_flow_graph  # noqa: E402
+
+
+def legacy_has_cycles(graph):
+    """The old ``BPMNComplexityAnalyzer._has_cycles``."""
+    visited = set()
+    rec_stack = set()
+
+    def visit(node):
+        if node in rec_stack:
+            return True
+        if node in visited:
+            return False
+
+        visited.add(node)
+        rec_stack.add(node)
+
+        for neighbor in graph.get(node, []):
+            if visit(neighbor):
+                return True
+
+        rec_stack.remove(node)
+        return False
+
+    for node in graph:
+        if node not in visited:
+            if visit(node):
+                return True
+    return False
+
+
+def looped_chain(length):
+    graph = {f'n{i}': [f'n{i + 1}'] for i in range(length - 1)}
+    graph[f'n{length - 1}'] = ['n0']
+    return graph
+
+
+def timed(function, *args, **kwargs):
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        return result, time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='chain lengths, in nodes')
+    args = parser.parse_args()
+
+    print(f'recursion limit {sys.getrecursionlimit()}')
+    print(f'{"nodes":>8}   {"recursive":>14} {"tarjan":>10} {"loop size":>10} {"longest":>8}')
+    for length in args.nodes:
+        graph = looped_chain(length)
+        try:
+            found, legacy_seconds = timed(legacy_has_cycles, graph)
+            legacy = f'{legacy_seconds:.3f}s' if found else 'missed loop'
+        except RecursionError:
+            legacy = 'RecursionError'
+        analysis, seconds = timed(analyze_flow_graph, graph, roots=['n0'])
+        if len(analysis.reached) != length or len(analysis.loop_members) != length:
+            sys.exit(f'the Tarjan pass lost nodes at {length}')
+        print(f'{length:>8,}   {legacy:>14} {seconds:>9.3f}s {len(analysis.loops[0]):>10,} '
+              f'{analysis.longest_path:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: indexed TallyfyTemplateGenerator vs. the old per-lookup scans.
+
+Generates templates from synthetic diagrams of increasing size twice -- with
+``TemplateIndex``, and with a stand-in that answers the same lookups by
+scanning the flows and steps as the old code did -- checks the templates are
+identical, and reports the time for each. The indexed times grow linearly
+with the diagram; the scanning times grow with its square.
+
+Usage::
+
+    python bpmn/benchmarks/template_generator_bench.py --tasks 1000 4000 16000
+"""
+
+import argparse
+import gc
+import itertools
+import os
+import sys
+import time
+from unittest.mock import patch
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+import tallyfy_generator  # noqa: E402
+from tallyfy_generator import TallyfyTemplateGenerator  # noqa: E402
+
+
+class _Scan:
+    def __init__(self, find):
+        self.find = find
+
+    def get(self, key, default=None):
+        found = self.find(key)
+        return default if found is None else found
+
+
+class ScanningIndex:
+    """The old lookups: a scan of every flow or step per query."""
+
+    def __init__(self, process, steps=None):
+        flows = process.get('elements', {}).get('flows', [])
+        self._steps = list(steps or [])
+        self.outgoing = _Scan(lambda key: [f for f in flows if f.get('sourceRef') == key] or None)
+        self.steps = _Scan(lambda key: next((s for s in self._steps if s['bpmn_element_id'] == key), None))
+
+    def add_step(self, step):
+        self._steps.append(step)
+
+
+def make_process(task_count, lanes=8):
+    """A chain of tasks with a gateway, form, and timer every few tasks."""
+    tasks, gateways, events, flows = [], [], [], []
+    previous = 'start'
+    for i in range(task_count):
+        task_id = f'task_{i}'
+        task = {'id': task_id, 'name': f'Task {i}', 'type': 'userTask', 'forms': []}
+        if i % 5 == 0:
+            task['forms'] = [{'id': f'field_{i}', 'label': f'Field {i}', 'type': 'string'}]
+        tasks.append(task)
+
+        if i % 10 == 5:
+            gateway_id = f'gateway_{i}'
+            kind = 'exclusiveGateway' if i % 20 == 5 else 'parallelGateway'
+            gateways.append({'id': gateway_id, 'name': f'Gateway {i}', 'type': kind,
+                             'outgoing': [f'flow_{i}_a', f'flow_{i}_b']})
+            flows.append({'id': f'flow_{i}_in', 'sourceRef': previous, 'targetRef': gateway_id})
+            flows.append({'id': f'flow_{i}_a', 'sourceRef': gateway_id, 'targetRef': task_id,
+                          'condition': '${amount > 1000}' if kind == 'exclusiveGateway' else None})
+            flows.append({'id': f'flow_{i}_b', 'sourceRef': gateway_id, 'targetRef': f'task_{i - 1}',
+                          'condition': '${amount < 1000}' if kind == 'exclusiveGateway' else None})
+        else:
+            flows.append({'id': f'flow_{i}', 'sourceRef': previous, 'targetRef': task_id, 'condition': None})
+        previous = task_id
+
+        if i % 10 == 0:
+            events.append({'id': f'timer_{i}', 'category': 'boundary', 'eventType': 'timer',
+                           'attachedTo': task_id, 'duration': 'P2D'})
+
+    return {
+        'id': f'bench_{task_count}',
+        'name': 'Benchmark process',
+        'elements': {
+            'tasks': tasks,
+            'gateways': gateways,
+            'events': events,
+            'flows': flows,
+            'lanes': [
+                {'id': f'lane_{n}', 'name': f'Lane {n}', 'flowNodeRefs': [t['id'] for t in tasks[n::lanes]]}
+                for n in range(lanes)
+            ],
+        },
+    }
+
+
+def generate(process, index_class):
+    """Generate one template with deterministic IDs; returns (template, seconds)."""
+    counter = itertools.count()
+    with patch.object(tallyfy_generator, 'TemplateIndex', index_class), \
+            patch.object(TallyfyTemplateGenerator, '_generate_id',
+                         lambda self, base='': f'{base or "generated"}_{next(counter)}'):
+        generator = TallyfyTemplateGenerator()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            template = generator.generate_template(process, {})
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+    template['migration_metadata'].pop('migration_date')
+    return template, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tasks', type=int, nargs='+', default=[1_000, 4_000, 16_000],
+                        help='diagram sizes, in tasks')
+    args = parser.parse_args()
+
+    print(f'{"tasks":>8} {"flows":>8}   {"scanning":>10} {"indexed":>10} {"speedup":>8}')
+    for task_count in args.tasks:
+        process = make_process(task_count)
+        scanned, scanning_seconds = generate(process, ScanningIndex)
+        indexed, indexed_seconds = generate(make_process(task_count), tallyfy_generator.TemplateIndex)
+        if scanned != indexed:
+            sys.exit(f'indexed template differs from the scanning one at {task_count} tasks')
+        print(f'{task_count:>8,} {len(process["elements"]["flows"]):>8,}   '
+              f'{scanning_seconds:>9.2f}s {indexed_seconds:>9.3f}s {scanning_seconds / indexed_seconds:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
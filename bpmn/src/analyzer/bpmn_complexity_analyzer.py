@@ -3,11 +3,18 @@ BPMN Complexity Analyzer
 Realistic assessment of BPMN to Tallyfy migration feasibility
 """
 
+import os
+import sys
 import xml.etree.ElementTree as ET
 import logging
 from typing import Dict, List, Tuple, Any
 from pathlib import Path
 
+# flow_graph lives in src/, which is not on the path when this module is run
+# as a script.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flow_graph import analyze_flow_graph
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +89,7 @@ class BPMNComplexityAnalyzer:
         self.warnings = []
         self.recommendations = []
         self.critical_issues = []
+        self.process_flows = []
     
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -186,7 +194,7 @@ class BPMNComplexityAnalyzer:
     def _check_complex_patterns(self, process_elem):
         """Check for complex patterns that are hard to migrate"""
         
-        # Check for loops (back edges in flow)
+        # Check for loops, unreachable elements and chain length
         sequence_flows = process_elem.findall('.//bpmn:sequenceFlow', self.namespaces)
         flow_graph = {}
         for flow in sequence_flows:
@@ -196,10 +204,29 @@ class BPMNComplexityAnalyzer:
                 flow_graph[source] = []
             flow_graph[source].append(target)
         
-        if self._has_cycles(flow_graph):
+        # Boundary events start their own paths, like start events do
+        entry_points = [
+            elem.get('id')
+            for tag in ('startEvent', 'boundaryEvent')
+            for elem in process_elem.findall(f'.//bpmn:{tag}', self.namespaces)
+        ]
+        analysis = analyze_flow_graph(flow_graph, roots=entry_points)
+        self.process_flows.append({
+            'process_id': process_elem.get('id'),
+            'loops': analysis.loops,
+            'unreachable': analysis.unreachable if entry_points else [],
+            'longest_path': analysis.longest_path
+        })
+        
+        if analysis.has_cycles:
             self.critical_issues.append("LOOP DETECTED: Process contains loops which cannot be directly migrated to Tallyfy")
             self.complexity_score += 20
         
+        if entry_points and analysis.unreachable:
+            self.warnings.append(
+                f"{len(analysis.unreachable)} element(s) cannot be reached from a start event and will not be migrated"
+            )
+        
         # Check for event subprocesses
         event_subs = process_elem.findall(".//bpmn:subProcess[@triggeredByEvent='true']", self.namespaces)
         if event_subs:
@@ -220,31 +247,8 @@ class BPMNComplexityAnalyzer:
             self.complexity_score += 2 * len(complex_conditions)
     
     def _has_cycles(self, graph: Dict[str, List[str]]) -> bool:
-        """Simple cycle detection"""
-        visited = set()
-        rec_stack = set()
-        
-        def visit(node):
-            if node in rec_stack:
-                return True
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if visit(neighbor):
-                    return True
-            
-            rec_stack.remove(node)
-            return False
-        
-        for node in graph:
-            if node not in visited:
-                if visit(node):
-                    return True
-        return False
+        """Cycle detection"""
+        return analyze_flow_graph(graph).has_cycles
     
     def _generate_report(self) -> Dict[str, Any]:
         """Generate analysis report"""
@@ -304,7 +308,8 @@ class BPMNComplexityAnalyzer:
             'critical_issues': self.critical_issues,
             'warnings': self.warnings,
             'recommendations': self.recommendations,
-            'element_breakdown': self.elements_found
+            'element_breakdown': self.elements_found,
+            'process_flows': self.process_flows
         }
     
     def print_report(self, report: Dict[str, Any]):
@@ -3,6 +3,8 @@ BPMN 2.0 XML Parser and Client
 Handles reading and parsing BPMN diagram files
 """
 
+import os
+import sys
 import xml.etree.ElementTree as ET
 import logging
 import json
@@ -10,6 +12,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+# flow_graph lives in src/. This module is imported both via `main.py` (which
+# puts src/ on the path) and as `src.api.bpmn_client` by tests.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from flow_graph import FlowGraphAnalysis, analyze_flow_graph
+
 logger = logging.getLogger(__name__)
 
 
@@ -590,8 +597,16 @@ class BPMNClient:
         """Get element by its ID"""
         return self.elements_by_id.get(element_id)
     
-    def get_process_flow(self, process_id: str) -> List[Dict[str, Any]]:
-        """Get the execution flow for a process"""
+    def analyze_process_flow(self, process_id: str) -> Optional[FlowGraphAnalysis]:
+        """
+        Analyze a process's sequence flows from its start events
+        
+        Flows are followed only out of elements this client parsed, as
+        get_process_flow always has.
+        
+        Returns:
+            FlowGraphAnalysis, or None if the process does not exist
+        """
         
         process = None
         for p in self.processes:
@@ -600,40 +615,35 @@ class BPMNClient:
                 break
         
         if not process:
-            return []
+            return None
         
         # Build flow graph
         flow_graph = {}
         for seq_flow in process['sequence_flows']:
             source = seq_flow['source_ref']
+            if not self.get_element_by_id(source):
+                continue
             if source not in flow_graph:
                 flow_graph[source] = []
-            flow_graph[source].append(seq_flow)
+            flow_graph[source].append(seq_flow['target_ref'])
         
         # Find start events
-        start_events = [e for e in process['events'] if e['position'] == 'start']
+        start_events = [e['id'] for e in process['events'] if e['position'] == 'start']
         
-        # Build execution flow
-        flow = []
-        visited = set()
+        return analyze_flow_graph(flow_graph, roots=start_events)
+    
+    def get_process_flow(self, process_id: str) -> List[Dict[str, Any]]:
+        """Get the execution flow for a process"""
         
-        def traverse(element_id):
-            if element_id in visited:
-                return
-            visited.add(element_id)
-            
+        analysis = self.analyze_process_flow(process_id)
+        if analysis is None:
+            return []
+        
+        flow = []
+        for element_id in analysis.reached:
             element = self.get_element_by_id(element_id)
             if element:
                 flow.append(element['data'])
-                
-                # Follow outgoing flows
-                if element_id in flow_graph:
-                    for seq_flow in flow_graph[element_id]:
-                        traverse(seq_flow['target_ref'])
-        
-        # Start traversal from start events
-        for start_event in start_events:
-            traverse(start_event['id'])
         
         return flow
     
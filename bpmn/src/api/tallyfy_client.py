@@ -23,6 +23,7 @@ sys.path.insert(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_capture, normalize_captures
+from shared.http_transport import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class TallyfyClient:
         self.organization_id = organization_id
         self.organization_slug = organization_slug
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             
@@ -123,7 +124,10 @@ class TallyfyClient:
         }
         
         try:
-            response = requests.post(auth_url, json=auth_data)
+            # Through the pooled session, but without a stale bearer token.
+            response = self.session.post(
+                auth_url, json=auth_data, headers={'Authorization': None}
+            )
             response.raise_for_status()
             
             token_data = response.json()
@@ -656,23 +660,17 @@ class TallyfyClient:
             files = {"file": f}
             endpoint = f'/{entity_type}s/{entity_id}/attachments'
             
-            # Temporarily remove JSON content type for file_upload upload
-            original_content_type = self.session.headers.get('Content-Type')
-            del self.session.headers['Content-Type']
+            # Unset the JSON content type for this request only; mutating the
+            # shared session's headers would race with concurrent callers.
+            result = self._make_request(
+                'POST', endpoint, files=files, headers={'Content-Type': None}
+            )
             
-            try:
-                result = self._make_request('POST', endpoint, files=files)
-                
-                self.stats['data_imported'].setdefault('files', 0)
-                self.stats['data_imported']['files'] += 1
-                
-                logger.info(f"Uploaded file: {file_path}")
-                return result
-                
-            finally:
-                # Restore content type
-                if original_content_type:
-                    self.session.headers['Content-Type'] = original_content_type
+            self.stats['data_imported'].setdefault('files', 0)
+            self.stats['data_imported']['files'] += 1
+            
+            logger.info(f"Uploaded file: {file_path}")
+            return result
     
     # Webhook Methods
     def create_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
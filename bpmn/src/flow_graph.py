@@ -0,0 +1,127 @@
+"""
+Sequence-flow graph analysis
+One iterative Tarjan pass over a process's flow graph, shared by the
+complexity analyzer and the BPMN client
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+
+@dataclass
+class FlowGraphAnalysis:
+    """What one pass over a flow graph found"""
+
+    # Nodes reached from the roots, in depth-first preorder: the order a
+    # recursive walk following each node's flows in document order visits them.
+    reached: List[Hashable] = field(default_factory=list)
+    # Nodes no root reaches, in discovery order.
+    unreachable: List[Hashable] = field(default_factory=list)
+    # Strongly connected components that form a loop: more than one node, or
+    # a node with a flow to itself. Members are in discovery order.
+    loops: List[List[Hashable]] = field(default_factory=list)
+    # Nodes on the longest chain through the graph, each loop counting as a
+    # single stage.
+    longest_path: int = 0
+
+    @property
+    def has_cycles(self) -> bool:
+        return bool(self.loops)
+
+    @property
+    def loop_members(self) -> set:
+        return {node for loop in self.loops for node in loop}
+
+
+def analyze_flow_graph(successors: Dict[Hashable, Sequence[Hashable]],
+                       roots: Iterable[Hashable] = (),
+                       nodes: Optional[Iterable[Hashable]] = None) -> FlowGraphAnalysis:
+    """
+    Find loops, reachability and the longest path in one linear sweep
+
+    The walk keeps its own stack of successor iterators instead of recursing,
+    so chains of any length stay within Python's recursion limit.
+
+    Args:
+        successors: Each node's flow targets, in document order
+        roots: Nodes the process starts from; the walk begins at these
+        nodes: Every node to account for; defaults to all sources and targets
+
+    Returns:
+        FlowGraphAnalysis for the graph
+    """
+    if nodes is None:
+        nodes = dict.fromkeys(
+            node for source, targets in successors.items() for node in (source, *targets)
+        )
+
+    index: Dict[Hashable, int] = {}
+    low: Dict[Hashable, int] = {}
+    on_stack = set()
+    stack: List[Hashable] = []
+    component_of: Dict[Hashable, int] = {}
+    depth: List[int] = []
+    analysis = FlowGraphAnalysis()
+
+    def emit_component(root):
+        # Tarjan emits components sinks first, so every component a flow
+        # leaves this one for already has its depth.
+        members = []
+        while True:
+            node = stack.pop()
+            on_stack.discard(node)
+            members.append(node)
+            if node == root:
+                break
+        members.reverse()
+        number = len(depth)
+        for node in members:
+            component_of[node] = number
+        deepest = 0
+        for node in members:
+            for target in successors.get(node, ()):
+                if component_of[target] != number:
+                    deepest = max(deepest, depth[component_of[target]])
+        depth.append(deepest + 1)
+        if len(members) > 1 or root in successors.get(root, ()):
+            analysis.loops.append(members)
+
+    def walk(start):
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(successors.get(start, ())))]
+        while work:
+            node, targets = work[-1]
+            for target in targets:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(successors.get(target, ()))))
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    emit_component(node)
+
+    for root in roots:
+        if root not in index:
+            walk(root)
+    reached = len(index)
+
+    for node in nodes:
+        if node not in index:
+            walk(node)
+
+    # index is filled in discovery order.
+    discovered = list(index)
+    analysis.reached = discovered[:reached]
+    analysis.unreachable = discovered[reached:]
+    analysis.longest_path = max(depth, default=0)
+    return analysis
@@ -5,7 +5,9 @@ AI-powered migration tool using Claude API for intelligent transformation decisi
 """
 
 import os
+import re
 import sys
+import copy
 import json
 import logging
 import argparse
@@ -24,6 +26,53 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Distinct element shapes sent to the model per call.
+AI_BATCH_SIZE = 20
+
+# Stands in for an attribute value that is the id of another element.
+REFERENCE_PLACEHOLDER = '<ref>'
+
+ANALYSIS_SYSTEM_PROMPT = """You are an expert in BPMN to Tallyfy migration. Analyze BPMN elements and provide migration strategies.
+                
+Tallyfy supports:
+- 5 task types: task, approval, expiring, email, expiring_email
+- 10 field types: text, textarea, radio, dropdown, multiselect, date, email, file, table, assignees_form
+- Conditional rules: IF-THEN with show/hide actions
+- No true parallelism, loops, or complex events
+
+Respond with JSON only. Each decision follows this structure:
+{
+    "confidence": 0.0-1.0,
+    "strategy": "direct|transform|partial|unsupported",
+    "tallyfy_mapping": {...},
+    "manual_steps": [...],
+    "warnings": [...],
+    "reasoning": "..."
+}"""
+
+
+def _shape_attributes(element: Dict[str, Any], element_ids: set) -> Dict[str, Any]:
+    """An element's attributes without its id and name, references masked"""
+    return {
+        key: REFERENCE_PLACEHOLDER if value in element_ids else value
+        for key, value in (element.get('attributes') or {}).items()
+        if key not in ('id', 'name')
+    }
+
+
+def element_signature(element: Dict[str, Any], element_ids: set = frozenset()) -> str:
+    """
+    Structural signature of a BPMN element: what the AI decision depends on
+    
+    Two elements share a signature when they differ only in id, name, and
+    which elements they reference (attribute values found in element_ids).
+    """
+    return json.dumps(
+        [element.get('type'), _shape_attributes(element, element_ids)],
+        sort_keys=True, default=str
+    )
+
+
 @dataclass
 class MigrationDecision:
     """Represents an AI migration decision"""
@@ -74,53 +123,77 @@ class ClaudeAIMigrationAssistant:
         Returns:
             MigrationDecision with AI recommendations
         """
-        # Check cache first
-        cache_key = f"{element.get('type')}_{element.get('id')}"
-        if cache_key in self.decisions_cache:
-            self.stats['cached_decisions'] += 1
-            return self.decisions_cache[cache_key]
+        return self.analyze_bpmn_elements([element], [context])[0]
+    
+    def analyze_bpmn_elements(self, elements: List[Dict[str, Any]],
+                              contexts: Optional[List[Dict[str, Any]]] = None) -> List[MigrationDecision]:
+        """
+        Analyze many BPMN elements, one AI decision per distinct shape
+        
+        Elements are grouped by element_signature, so elements that differ only
+        in id, name or the ids they reference share one decision. Shapes not
+        yet in the cache are sent AI_BATCH_SIZE to a prompt, and each decision
+        is fanned back out to every element of its shape.
+        
+        Args:
+            elements: BPMN element data
+            contexts: Surrounding process context, one per element
+            
+        Returns:
+            One MigrationDecision per element, in order
+        """
+        contexts = contexts or [{} for _ in elements]
+        element_ids = {e.get('id') for e in elements}
+        signatures = [element_signature(e, element_ids) for e in elements]
+        
+        pending = {}
+        for signature, element in zip(signatures, elements):
+            if signature in self.decisions_cache or signature in pending:
+                self.stats['cached_decisions'] += 1
+            else:
+                pending[signature] = element
         
-        # Use AI if available
         if self.client:
-            decision = self._ai_analyze_element(element, context)
+            shapes = list(pending.items())
+            for start in range(0, len(shapes), AI_BATCH_SIZE):
+                self.decisions_cache.update(self._ai_analyze_shapes(shapes[start:start + AI_BATCH_SIZE], element_ids))
         else:
-            decision = self._fallback_analyze_element(element, context)
-            self.stats['fallback_decisions'] += 1
-        
-        # Cache decision
-        self.decisions_cache[cache_key] = decision
-        return decision
+            # The fallback reads nothing but type and name, so it is applied
+            # per element below.
+            self.decisions_cache.update(dict.fromkeys(pending))
+        
+        decisions = []
+        for signature, element, context in zip(signatures, elements, contexts):
+            data = self.decisions_cache[signature]
+            if data is None:
+                self.stats['fallback_decisions'] += 1
+                decisions.append(self._fallback_analyze_element(element, context))
+            else:
+                decisions.append(self._decision_from_data(data, element))
+        return decisions
     
-    def _ai_analyze_element(self, element: Dict[str, Any], context: Dict[str, Any]) -> MigrationDecision:
-        """Use Claude AI to analyze element"""
+    def _ai_analyze_shapes(self, shapes: List[Tuple[str, Dict[str, Any]]],
+                           element_ids: set) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Use Claude AI to analyze a batch of element shapes in one call
+        
+        Returns the parsed decision data per signature; None for a shape the
+        response did not cover, which then gets the fallback analysis.
+        """
         
         self.stats['ai_calls'] += 1
         
-        # Prepare prompt
-        prompt = self._create_analysis_prompt(element, context)
+        keys = {f's{n}': signature for n, (signature, _) in enumerate(shapes)}
+        prompt = self._create_batch_prompt(
+            [(key, element) for key, (_, element) in zip(keys, shapes)], element_ids
+        )
         
+        results = dict.fromkeys(keys.values())
         try:
             response = self.client.messages.create(
                 model="claude-haiku-4-5-20251001",
-                max_tokens=1000,
+                max_tokens=min(8192, 500 + 400 * len(shapes)),
                 temperature=0,
-                system="""You are an expert in BPMN to Tallyfy migration. Analyze BPMN elements and provide migration strategies.
-                
-Tallyfy supports:
-- 5 task types: task, approval, expiring, email, expiring_email
-- 10 field types: text, textarea, radio, dropdown, multiselect, date, email, file, table, assignees_form
-- Conditional rules: IF-THEN with show/hide actions
-- No true parallelism, loops, or complex events
-
-Respond with JSON only, following this structure:
-{
-    "confidence": 0.0-1.0,
-    "strategy": "direct|transform|partial|unsupported",
-    "tallyfy_mapping": {...},
-    "manual_steps": [...],
-    "warnings": [...],
-    "reasoning": "..."
-}""",
+                system=ANALYSIS_SYSTEM_PROMPT,
                 messages=[
                     {
                         "role": "user",
@@ -129,61 +202,76 @@ Respond with JSON only, following this structure:
                 ]
             )
             
-            # Parse AI response
-            result = self._parse_ai_response(response.content[0].text, element)
-            return result
+            for key, data in self._parse_batch_response(response.content[0].text).items():
+                if key in keys and isinstance(data, dict):
+                    results[keys[key]] = data
             
         except Exception as e:
             logger.error(f"AI analysis failed: {e}")
-            return self._fallback_analyze_element(element, context)
+        
+        missing = sum(1 for data in results.values() if data is None)
+        if missing:
+            logger.warning(f"AI analysis returned no decision for {missing} of {len(shapes)} shapes; using fallback")
+        return results
     
-    def _create_analysis_prompt(self, element: Dict[str, Any], context: Dict[str, Any]) -> str:
-        """Create detailed prompt for AI analysis"""
+    def _create_batch_prompt(self, shapes: List[Tuple[str, Dict[str, Any]]], element_ids: set) -> str:
+        """Create the prompt for a batch of element shapes"""
+        
+        described = [
+            {
+                'key': key,
+                'type': element.get('type'),
+                'attributes': _shape_attributes(element, element_ids),
+            }
+            for key, element in shapes
+        ]
         
-        return f"""Analyze this BPMN element for Tallyfy migration:
-
-Element Type: {element.get('type')}
-Element ID: {element.get('id')}
-Element Name: {element.get('name', 'Unnamed')}
+        return f"""Analyze these BPMN element shapes for Tallyfy migration.
 
-Element Details:
-{json.dumps(element, indent=2)}
+Each shape stands for every element of that type with those attributes. Ids
+and names are omitted, and references to other elements are shown as "{REFERENCE_PLACEHOLDER}";
+step titles are filled in from each element's own name.
 
-Context:
-- Previous element: {context.get('previous', 'None')}
-- Next elements: {context.get('next', [])}
-- Lane/Pool: {context.get('lane', 'None')}
-- Process complexity: {context.get('complexity', 'Unknown')}
+Shapes:
+{json.dumps(described, indent=2, default=str)}
 
-Determine the best migration strategy and provide specific Tallyfy mapping."""
+Respond with one JSON object that maps each shape's "key" to a decision in the
+structure above. Include every key."""
     
-    def _parse_ai_response(self, response_text: str, element: Dict[str, Any]) -> MigrationDecision:
-        """Parse AI response into MigrationDecision"""
+    def _parse_batch_response(self, response_text: str) -> Dict[str, Any]:
+        """Parse a batch response into decision data keyed by shape key"""
         
         try:
-            # Extract JSON from response
-            import re
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
-                data = json.loads(response_text)
-            
-            return MigrationDecision(
-                element_type=element.get('type'),
-                element_id=element.get('id'),
-                element_name=element.get('name', 'Unnamed'),
-                confidence=float(data.get('confidence', 0.5)),
-                strategy=data.get('strategy', 'unsupported'),
-                tallyfy_mapping=data.get('tallyfy_mapping', {}),
-                manual_steps=data.get('manual_steps', []),
-                warnings=data.get('warnings', []),
-                ai_reasoning=data.get('reasoning', 'No reasoning provided')
-            )
-            
+            data = json.loads(json_match.group() if json_match else response_text)
         except Exception as e:
             logger.error(f"Failed to parse AI response: {e}")
-            return self._fallback_analyze_element(element, {})
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def _decision_from_data(self, data: Dict[str, Any], element: Dict[str, Any]) -> MigrationDecision:
+        """Build one element's decision from its shape's decision data"""
+        
+        tallyfy_mapping = copy.deepcopy(data.get('tallyfy_mapping', {}))
+        if isinstance(tallyfy_mapping, dict) and 'title' in tallyfy_mapping:
+            tallyfy_mapping['title'] = element.get('name') or tallyfy_mapping['title']
+        
+        try:
+            confidence = float(data.get('confidence', 0.5))
+        except (TypeError, ValueError):
+            confidence = 0.5
+        
+        return MigrationDecision(
+            element_type=element.get('type'),
+            element_id=element.get('id'),
+            element_name=element.get('name', 'Unnamed'),
+            confidence=confidence,
+            strategy=data.get('strategy', 'unsupported'),
+            tallyfy_mapping=tallyfy_mapping,
+            manual_steps=list(data.get('manual_steps', [])),
+            warnings=list(data.get('warnings', [])),
+            ai_reasoning=data.get('reasoning', 'No reasoning provided')
+        )
     
     def _fallback_analyze_element(self, element: Dict[str, Any], context: Dict[str, Any]) -> MigrationDecision:
         """Fallback analysis without AI"""
@@ -291,7 +379,6 @@ Respond with specific, actionable recommendations in JSON format."""
             
             # Parse response
             text = response.content[0].text
-            import re
             json_match = re.search(r'\{.*\}', text, re.DOTALL)
             if json_match:
                 return json.loads(json_match.group())
@@ -358,10 +445,13 @@ class BPMNToTallyfyMigrationAssistant:
             
             # Get AI optimization suggestions
             if self.ai_assistant.client:
+                decisions = (self.migration_results['successful_migrations'] +
+                             self.migration_results['partial_migrations'] +
+                             self.migration_results['failed_migrations'])
                 optimization = self.ai_assistant.suggest_process_optimization({
                     'task_count': len(self.migration_results['successful_migrations']),
-                    'gateway_count': sum(1 for e in self.migration_results['elements_analyzed'] 
-                                        if 'gateway' in str(e).lower()),
+                    'gateway_count': sum(1 for d in decisions
+                                        if 'gateway' in str(d.element_type).lower()),
                     'unsupported_count': len(self.migration_results['failed_migrations'])
                 })
                 self.migration_results['optimization_suggestions'] = optimization
@@ -407,15 +497,19 @@ class BPMNToTallyfyMigrationAssistant:
         """Migrate a single process"""
         logger.info(f"Migrating process: {process['name']}")
         
-        for element in process['elements']:
-            self.migration_results['elements_analyzed'] += 1
-            
-            # Get context for AI
-            context = self._build_element_context(element, process)
-            
-            # Get migration decision from AI
-            decision = self.ai_assistant.analyze_bpmn_element(element, context)
-            
+        elements = process['elements']
+        self.migration_results['elements_analyzed'] += len(elements)
+        
+        # Get context for AI
+        contexts = [
+            self._build_element_context(element, process, position)
+            for position, element in enumerate(elements)
+        ]
+        
+        # Get migration decisions from AI, one per distinct element shape
+        decisions = self.ai_assistant.analyze_bpmn_elements(elements, contexts)
+        
+        for decision in decisions:
             # Categorize result
             if decision.strategy == 'direct':
                 self.migration_results['successful_migrations'].append(decision)
@@ -424,13 +518,14 @@ class BPMNToTallyfyMigrationAssistant:
             else:
                 self.migration_results['failed_migrations'].append(decision)
     
-    def _build_element_context(self, element: Dict[str, Any], process: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_element_context(self, element: Dict[str, Any], process: Dict[str, Any],
+                               position: int) -> Dict[str, Any]:
         """Build context for element analysis"""
         return {
             'process_name': process['name'],
             'process_id': process['id'],
             'total_elements': len(process['elements']),
-            'element_position': process['elements'].index(element)
+            'element_position': position
         }
     
     def _generate_tallyfy_template(self) -> Dict[str, Any]:
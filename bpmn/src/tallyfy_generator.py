@@ -7,11 +7,111 @@ Addresses all gaps identified in MIGRATION_GAPS_AND_ISSUES.md
 
 import json
 import hashlib
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone
 import re
 
 
+_ALIAS_INVALID = re.compile(r'[^a-zA-Z0-9_]')
+
+# Condition expressions: an optional ${...} or #{...} wrapper around clauses
+# joined by && or ||. One clause is `field op literal`, where the literal is
+# a quoted string, a number or a bare word.
+_CONDITION_WRAPPER = re.compile(r'^[$#]\{(.*)\}$', re.DOTALL)
+_CONDITION_CLAUSE = re.compile(r"""
+    \s*(?P<field>[A-Za-z_]\w*(?:\.\w+)*)
+    \s*(?P<op>==|!=|>=|<=|>|<)
+    \s*(?:'(?P<single>[^']*)'|"(?P<double>[^"]*)"|(?P<bare>-?\d+(?:\.\d+)?|\w+))
+    \s*(?P<join>&&|\|\||$)
+""", re.VERBOSE)
+# Tallyfy has no inclusive comparisons, and the rules of an automation are
+# all required, so there is no way to say a > b or a == b. >= and <= are
+# therefore outside the grammar, and so is ||.
+_CONDITION_OPERATORS = {
+    '==': 'equals',
+    '!=': 'not_equals',
+    '>': 'greater_than',
+    '<': 'less_than',
+}
+
+# ((field_alias, operator, value), ...), all required; None if not understood
+CompiledCondition = Optional[Tuple[Tuple[str, str, str], ...]]
+
+
+def sanitize_alias(name: str) -> str:
+    """Sanitize a field name for use as an alias"""
+    # Remove special characters, convert to lowercase
+    alias = _ALIAS_INVALID.sub('_', name).lower()
+
+    # Ensure it starts with a letter
+    if alias and not alias[0].isalpha():
+        alias = 'field_' + alias
+
+    return alias or 'field'
+
+
+@lru_cache(maxsize=4096)
+def compile_condition(expression: str) -> CompiledCondition:
+    """
+    Compile a normalised condition expression in one pass over its clauses
+
+    Exports repeat a handful of expressions across thousands of flows, so
+    results are cached by expression text. Returns None for anything outside
+    the grammar -- parentheses, negation, method calls, ``||``, ``>=``/``<=``.
+    """
+    wrapped = _CONDITION_WRAPPER.match(expression)
+    body = wrapped.group(1).strip() if wrapped else expression
+
+    clauses = []
+    join = None
+    position = 0
+    while position < len(body):
+        clause = _CONDITION_CLAUSE.match(body, position)
+        if clause is None or clause.end() == position:
+            return None
+        operator = _CONDITION_OPERATORS.get(clause.group('op'))
+        join = clause.group('join')
+        if operator is None or join == '||':
+            return None
+        value = clause.group('single')
+        if value is None:
+            value = clause.group('double')
+        if value is None:
+            value = clause.group('bare')
+        clauses.append((sanitize_alias(clause.group('field')), operator, value))
+        position = clause.end()
+
+    # A trailing && has no clause to join
+    if not clauses or join:
+        return None
+    return tuple(clauses)
+
+
+class TemplateIndex:
+    """
+    Lookups for one template, built once by ``generate_template``
+
+    ``outgoing`` maps a source element ID to its sequence flows, in document
+    order; ``steps`` maps a BPMN element ID to the first step generated from
+    it. Steps are registered with :meth:`add_step` as they are generated.
+    """
+
+    __slots__ = ('outgoing', 'steps')
+
+    def __init__(self, process: Dict[str, Any], steps: Optional[List[Dict[str, Any]]] = None):
+        self.outgoing: Dict[Any, List[Dict[str, Any]]] = {}
+        for flow in process.get('elements', {}).get('flows', []):
+            self.outgoing.setdefault(flow.get('sourceRef'), []).append(flow)
+
+        self.steps: Dict[Any, Dict[str, Any]] = {}
+        for step in steps or []:
+            self.add_step(step)
+
+    def add_step(self, step: Dict[str, Any]):
+        self.steps.setdefault(step.get('bpmn_element_id'), step)
+
+
 class TallyfyTemplateGenerator:
     """
     Generates complete Tallyfy template JSON with all required fields
@@ -109,6 +209,10 @@ class TallyfyTemplateGenerator:
             }
         }
         
+        # Flows by source and steps by element, indexed once so every pass
+        # below is a lookup rather than a scan
+        index = TemplateIndex(bpmn_process)
+        
         # Generate steps from tasks
         step_mapping = {}
         position = 0
@@ -116,25 +220,26 @@ class TallyfyTemplateGenerator:
         for element in bpmn_process.get('elements', {}).get('tasks', []):
             step = self._generate_step(element, position)
             template['steps'].append(step)
+            index.add_step(step)
             step_mapping[element['id']] = step['id']
             position += 1
         
         # Generate automation rules from gateways
         for gateway in bpmn_process.get('elements', {}).get('gateways', []):
-            automations = self._generate_gateway_automations(gateway, step_mapping, bpmn_process)
+            automations = self._generate_gateway_automations(gateway, step_mapping, bpmn_process, index)
             template['automated_actions'].extend(automations)
         
         # Add form fields to appropriate steps
-        self._attach_form_fields(template, bpmn_process)
+        self._attach_form_fields(template, bpmn_process, index)
         
         # Generate rules from sequence flow conditions
         self._generate_flow_conditions(template, bpmn_process, step_mapping)
         
         # Handle lanes as groups
-        self._generate_groups_from_lanes(template, bpmn_process)
+        self._generate_groups_from_lanes(template, bpmn_process, index)
         
         # Process timer events as deadlines
-        self._process_timer_events(template, bpmn_process)
+        self._process_timer_events(template, bpmn_process, index)
         
         # Validate and clean template
         self._validate_template(template)
@@ -232,17 +337,19 @@ class TallyfyTemplateGenerator:
     def _generate_gateway_automations(self, 
                                      gateway: Dict[str, Any], 
                                      step_mapping: Dict[str, str],
-                                     process: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                     process: Dict[str, Any],
+                                     index: Optional[TemplateIndex] = None) -> List[Dict[str, Any]]:
         """Generate automation rules from gateway"""
         automations = []
+        if index is None:
+            index = TemplateIndex(process)
         
         if gateway['type'] == 'exclusiveGateway':
             # Create decision field
             decision_field_id = f"gateway_{gateway['id']}_decision"
             
             # Find outgoing flows
-            flows = [f for f in process.get('elements', {}).get('flows', [])
-                    if f.get('sourceRef') == gateway['id']]
+            flows = index.outgoing.get(gateway['id'], [])
             
             for i, flow in enumerate(flows):
                 target = flow.get('targetRef')
@@ -268,14 +375,18 @@ class TallyfyTemplateGenerator:
                     if flow.get('condition'):
                         condition = self._parse_condition_expression(flow['condition'])
                         if condition:
-                            automation['rules'][0].update(condition)
+                            clauses = condition.get('conditions', [condition])
+                            automation['rules'][0].update(clauses[0])
+                            for n, clause in enumerate(clauses[1:], 1):
+                                automation['rules'].append(
+                                    dict(clause, id=self._generate_id(f"condition_{flow['id']}_{n}"))
+                                )
                     
                     automations.append(automation)
         
         elif gateway['type'] == 'parallelGateway':
             # For parallel gateway, show all outgoing paths
-            flows = [f for f in process.get('elements', {}).get('flows', [])
-                    if f.get('sourceRef') == gateway['id']]
+            flows = index.outgoing.get(gateway['id'], [])
             
             if flows:
                 automation = {
@@ -325,15 +436,18 @@ class TallyfyTemplateGenerator:
         
         return field
     
-    def _attach_form_fields(self, template: Dict[str, Any], process: Dict[str, Any]):
+    def _attach_form_fields(self, template: Dict[str, Any], process: Dict[str, Any],
+                            index: Optional[TemplateIndex] = None):
         """Attach form fields to appropriate steps"""
         
+        if index is None:
+            index = TemplateIndex(process, template['steps'])
+        
         # Process any forms defined in tasks
         for task in process.get('elements', {}).get('tasks', []):
             if task.get('forms'):
                 # Find corresponding step
-                step = next((s for s in template['steps'] 
-                           if s['bpmn_element_id'] == task['id']), None)
+                step = index.steps.get(task['id'])
                 
                 if step:
                     for form in task['forms']:
@@ -425,7 +539,7 @@ class TallyfyTemplateGenerator:
                         'id': self._generate_id(f"flow_rule_{flow['id']}"),
                         'name': f"Condition: {flow.get('name', 'Flow condition')}",
                         'description': f"From {source} to {target}",
-                        'rules': [condition],
+                        'rules': condition.get('conditions', [condition]),
                         'actions': [{
                             'id': self._generate_id(f"flow_action_{flow['id']}"),
                             'type': 'show',
@@ -435,7 +549,15 @@ class TallyfyTemplateGenerator:
                     template['automated_actions'].append(automation)
     
     def _parse_condition_expression(self, expression: str) -> Optional[Dict[str, Any]]:
-        """Parse BPMN condition expression to Tallyfy rule"""
+        """
+        Parse BPMN condition expression to Tallyfy rule
+
+        A single comparison gives one rule. Comparisons joined by ``&&`` give
+        ``{'conditions': [rule, ...]}``, one automation rule each, all of
+        which must hold. Anything else -- including ``||`` and ``>=``/``<=``,
+        which would need OR between rules -- gives a ``manual_check`` rule
+        carrying the original.
+        """
         
         if not expression:
             return None
@@ -443,41 +565,15 @@ class TallyfyTemplateGenerator:
         # Remove CDATA wrapper if present
         expression = expression.replace('<![CDATA[', '').replace(']]>', '').strip()
         
-        # Try to parse common patterns
-        patterns = [
-            # ${variable == value}
-            r'\$\{(\w+)\s*==\s*["\']?(\w+)["\']?\}',
-            # ${variable > value}
-            r'\$\{(\w+)\s*>\s*(\d+)\}',
-            # ${variable < value}
-            r'\$\{(\w+)\s*<\s*(\d+)\}',
-            # ${variable != value}
-            r'\$\{(\w+)\s*!=\s*["\']?(\w+)["\']?\}',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, expression)
-            if match:
-                field = match.group(1)
-                value = match.group(2)
-                
-                # Determine operator
-                if '==' in expression:
-                    operator = 'equals'
-                elif '!=' in expression:
-                    operator = 'not_equals'
-                elif '>' in expression:
-                    operator = 'greater_than'
-                elif '<' in expression:
-                    operator = 'less_than'
-                else:
-                    operator = 'equals'
-                
-                return {
-                    'field_alias': self._sanitize_alias(field),
-                    'operator': operator,
-                    'value': value
-                }
+        compiled = compile_condition(expression)
+        if compiled is not None:
+            rules = [
+                {'field_alias': field_alias, 'operator': operator, 'value': value}
+                for field_alias, operator, value in compiled
+            ]
+            if len(rules) == 1:
+                return rules[0]
+            return {'conditions': rules}
         
         # Fallback: create a text note about the condition
         return {
@@ -487,9 +583,13 @@ class TallyfyTemplateGenerator:
             'note': f"Original condition: {expression}"
         }
     
-    def _generate_groups_from_lanes(self, template: Dict[str, Any], process: Dict[str, Any]):
+    def _generate_groups_from_lanes(self, template: Dict[str, Any], process: Dict[str, Any],
+                                    index: Optional[TemplateIndex] = None):
         """Generate groups from BPMN lanes"""
         
+        if index is None:
+            index = TemplateIndex(process, template['steps'])
+        
         template['groups'] = []
         
         for lane in process.get('elements', {}).get('lanes', []):
@@ -503,17 +603,20 @@ class TallyfyTemplateGenerator:
             
             # Assign steps to groups based on lane references
             for ref in lane.get('flowNodeRefs', []):
-                step = next((s for s in template['steps'] 
-                           if s['bpmn_element_id'] == ref), None)
+                step = index.steps.get(ref)
                 if step:
                     step['assignees'].append({
                         'type': 'group',
                         'group_id': group['id']
                     })
     
-    def _process_timer_events(self, template: Dict[str, Any], process: Dict[str, Any]):
+    def _process_timer_events(self, template: Dict[str, Any], process: Dict[str, Any],
+                              index: Optional[TemplateIndex] = None):
         """Process timer events and add deadlines to steps"""
         
+        if index is None:
+            index = TemplateIndex(process, template['steps'])
+        
         timer_events = [
             e for e in process.get('elements', {}).get('events', [])
             if e.get('eventType') == 'timer'
@@ -525,8 +628,7 @@ class TallyfyTemplateGenerator:
             
             if deadline and event.get('attachedTo'):
                 # Find the task this timer is attached to
-                step = next((s for s in template['steps']
-                           if s['bpmn_element_id'] == event['attachedTo']), None)
+                step = index.steps.get(event['attachedTo'])
                 if step:
                     step['deadline'] = deadline
     
@@ -612,16 +714,7 @@ class TallyfyTemplateGenerator:
     
     def _sanitize_alias(self, name: str) -> str:
         """Sanitize field name for alias"""
-        
-        # Remove special characters, convert to lowercase
-        alias = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-        alias = alias.lower()
-        
-        # Ensure it starts with a letter
-        if alias and not alias[0].isalpha():
-            alias = 'field_' + alias
-        
-        return alias or 'field'
+        return sanitize_alias(name)
     
     def _generate_id(self, base: str = '') -> str:
         """Generate unique ID"""
@@ -5,11 +5,46 @@ Transforms BPMN processes into Tallyfy templates
 
 import logging
 import hashlib
+from collections import deque
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Element collections in lookup precedence: an ID present in more than one
+# resolves to the first.
+ELEMENT_COLLECTIONS = (('tasks', 'task'), ('gateways', 'gateway'), ('events', 'event'))
+
+
+class ProcessIndex:
+    """
+    ID-keyed lookups for one process, built once and shared by every pass
+
+    ``elements`` maps each task, gateway and event ID to its element type
+    and element; ``flow_graph`` is the sequence-flow adjacency list.
+    """
+
+    __slots__ = ('elements', 'flow_graph')
+
+    def __init__(self, process: Dict[str, Any]):
+        self.elements: Dict[str, tuple] = {}
+        for collection, element_type in ELEMENT_COLLECTIONS:
+            for element in process.get(collection, []):
+                self.elements.setdefault(element['id'], (element_type, element))
+
+        self.flow_graph: Dict[str, List[str]] = {}
+        for flow in process.get('sequence_flows', []):
+            self.flow_graph.setdefault(flow['source_ref'], []).append(flow['target_ref'])
+
+    def find(self, element_id: str) -> Optional[Dict[str, Any]]:
+        """Element by ID, tagged with its ``element_type``; None if absent"""
+        found = self.elements.get(element_id)
+        if found is None:
+            return None
+        element_type, element = found
+        element['element_type'] = element_type
+        return element
+
 
 class ProcessTransformer:
     """Transform BPMN processes to Tallyfy templates"""
@@ -94,8 +129,8 @@ class ProcessTransformer:
         if bpmn_process.get('lanes'):
             tallyfy_template['groups'] = self._transform_lanes(bpmn_process['lanes'])
         
-        # Build flow graph for sequence analysis
-        flow_graph = self._build_flow_graph(bpmn_process)
+        # Index elements and flows once; every pass below looks them up here
+        index = ProcessIndex(bpmn_process)
         
         # Find start events
         start_events = [e for e in bpmn_process.get('events', []) if e['position'] == 'start']
@@ -104,11 +139,11 @@ class ProcessTransformer:
         if start_events:
             # Start from start events and follow flow
             transformed_elements = self._transform_from_start(
-                bpmn_process, start_events, flow_graph
+                bpmn_process, start_events, index
             )
         else:
             # No explicit start events, transform all elements
-            transformed_elements = self._transform_all_elements(bpmn_process)
+            transformed_elements = self._transform_all_elements(bpmn_process, index)
         
         # Add transformed elements to template
         tallyfy_template['steps'] = transformed_elements['steps']
@@ -129,7 +164,7 @@ class ProcessTransformer:
         # Update statistics
         self.stats['processes_transformed'] += 1
         self.stats['tasks_created'] += len(tallyfy_template['steps'])
-        self.stats['rules_created'] += len(tallyfy_template['rules'])
+        self.stats['rules_created'] += len(tallyfy_template.get('rules', []))
         
         # Store ID mapping
         if self.id_mapper:
@@ -141,9 +176,13 @@ class ProcessTransformer:
     
     def _transform_from_start(self, process: Dict[str, Any], 
                             start_events: List[Dict[str, Any]], 
-                            flow_graph: Dict[str, List[str]]) -> Dict[str, Any]:
+                            index: Optional[ProcessIndex] = None) -> Dict[str, Any]:
         """Transform elements following the flow from start events"""
         
+        if index is None:
+            index = ProcessIndex(process)
+        flow_graph = index.flow_graph
+        
         steps = []
         rules = []
         webhooks = []
@@ -151,7 +190,7 @@ class ProcessTransformer:
         position_counter = 0
         
         # Queue for BFS traversal
-        queue = []
+        queue = deque()
         
         # Add all start events to queue
         for start_event in start_events:
@@ -159,7 +198,7 @@ class ProcessTransformer:
         
         # Process queue
         while queue:
-            element_id, position = queue.pop(0)
+            element_id, position = queue.popleft()
             
             if element_id in visited:
                 continue
@@ -167,7 +206,7 @@ class ProcessTransformer:
             visited.add(element_id)
             
             # Find element in process
-            element = self._find_element(process, element_id)
+            element = index.find(element_id)
             if not element:
                 continue
             
@@ -207,9 +246,13 @@ class ProcessTransformer:
             'webhooks': webhooks
         }
     
-    def _transform_all_elements(self, process: Dict[str, Any]) -> Dict[str, Any]:
+    def _transform_all_elements(self, process: Dict[str, Any],
+                                index: Optional[ProcessIndex] = None) -> Dict[str, Any]:
         """Transform all elements when no clear flow is defined"""
         
+        if index is None:
+            index = ProcessIndex(process)
+        
         steps = []
         rules = []
         webhooks = []
@@ -223,7 +266,7 @@ class ProcessTransformer:
             position_counter += 1
         
         # Transform gateways
-        flow_graph = self._build_flow_graph(process)
+        flow_graph = index.flow_graph
         for gateway in process.get('gateways', []):
             gateway['element_type'] = 'gateway'
             gateway_result = self._transform_gateway(gateway, position_counter, flow_graph)
@@ -598,45 +641,6 @@ class ProcessTransformer:
     
     # Helper methods
     
-    def _build_flow_graph(self, process: Dict[str, Any]) -> Dict[str, List[str]]:
-        """Build adjacency list from sequence flows"""
-        
-        graph = {}
-        
-        for flow in process.get('sequence_flows', []):
-            source = flow['source_ref']
-            target = flow['target_ref']
-            
-            if source not in graph:
-                graph[source] = []
-            
-            graph[source].append(target)
-        
-        return graph
-    
-    def _find_element(self, process: Dict[str, Any], element_id: str) -> Optional[Dict[str, Any]]:
-        """Find element by ID in process"""
-        
-        # Check tasks
-        for task in process.get('tasks', []):
-            if task['id'] == element_id:
-                task['element_type'] = 'task'
-                return task
-        
-        # Check gateways
-        for gateway in process.get('gateways', []):
-            if gateway['id'] == element_id:
-                gateway['element_type'] = 'gateway'
-                return gateway
-        
-        # Check events
-        for event in process.get('events', []):
-            if event['id'] == element_id:
-                event['element_type'] = 'event'
-                return event
-        
-        return None
-    
     def _get_outgoing_flows(self, element_id: str, flow_graph: Dict[str, List[str]]) -> List[Dict[str, Any]]:
         """Get outgoing sequence flows for an element"""
         
@@ -0,0 +1,138 @@
+"""Tests for the shared sequence-flow graph pass.
+
+The complexity analyzer's cycle check and ``BPMNClient.get_process_flow``
+each walked the flow graph recursively, so a chain longer than Python's
+recursion limit raised. Both now use one iterative Tarjan pass. These tests
+pin what it reports -- loops, reachability, longest path -- that the client's
+flow keeps the recursive walk's order, and that chains far past the recursion
+limit -- 100k nodes for the graph pass and the analyzer -- complete.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, VENDOR_ROOT)
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+from flow_graph import analyze_flow_graph
+from src.analyzer.bpmn_complexity_analyzer import BPMNComplexityAnalyzer
+from src.api.bpmn_client import BPMNClient
+
+
+def chain(length):
+    return {f'n{i}': [f'n{i + 1}'] for i in range(length - 1)}
+
+
+def bpmn_chain(length, loop_back=False):
+    """start -> t0 -> ... -> t{length-1} -> end, as BPMN XML."""
+    tasks = ''.join(f'<userTask id="t{i}" name="Task {i}"/>' for i in range(length))
+    refs = ['start'] + [f't{i}' for i in range(length)] + ['end']
+    flows = ''.join(f'<sequenceFlow id="f{i}" sourceRef="{a}" targetRef="{b}"/>'
+                    for i, (a, b) in enumerate(zip(refs, refs[1:])))
+    if loop_back:
+        flows += f'<sequenceFlow id="back" sourceRef="t{length - 1}" targetRef="t0"/>'
+    return ('<definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL">'
+            '<process id="p" name="Chain"><startEvent id="start"/>'
+            f'{tasks}<endEvent id="end"/>{flows}</process></definitions>')
+
+
+class AnalyzeFlowGraphTest(unittest.TestCase):
+
+    def test_loops_reachability_and_longest_path(self):
+        graph = {
+            'start': ['a'],
+            'a': ['b', 'end'],
+            'b': ['c'],
+            'c': ['a', 'c'],
+            'orphan': ['end'],
+        }
+        analysis = analyze_flow_graph(graph, roots=['start'])
+
+        self.assertEqual(analysis.reached, ['start', 'a', 'b', 'c', 'end'])
+        self.assertEqual(analysis.unreachable, ['orphan'])
+        self.assertEqual(analysis.loops, [['a', 'b', 'c']])
+        self.assertEqual(analysis.loop_members, {'a', 'b', 'c'})
+        # start, the a-b-c loop as one stage, end
+        self.assertEqual(analysis.longest_path, 3)
+
+    def test_self_loop_is_a_loop_and_a_dag_has_none(self):
+        self.assertEqual(analyze_flow_graph({'a': ['a']}).loops, [['a']])
+        analysis = analyze_flow_graph({'a': ['b', 'c'], 'b': ['d'], 'c': ['d']})
+        self.assertFalse(analysis.has_cycles)
+        self.assertEqual(analysis.longest_path, 3)
+
+    def test_100k_node_chain_is_within_the_recursion_limit(self):
+        analysis = analyze_flow_graph(chain(100_000), roots=['n0'])
+        self.assertEqual(len(analysis.reached), 100_000)
+        self.assertEqual(analysis.longest_path, 100_000)
+
+        looped = chain(100_000)
+        looped['n99999'] = ['n0']
+        analysis = analyze_flow_graph(looped, roots=['n0'])
+        self.assertEqual(len(analysis.loops), 1)
+        self.assertEqual(len(analysis.loops[0]), 100_000)
+
+
+class BPMNClientFlowTest(unittest.TestCase):
+
+    def test_flow_keeps_recursive_walk_order(self):
+        client = BPMNClient()
+        client.load_string(
+            '<definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL">'
+            '<process id="p"><startEvent id="s"/><exclusiveGateway id="x"/>'
+            '<userTask id="a"/><userTask id="b"/><userTask id="c"/><endEvent id="e"/>'
+            '<sequenceFlow id="1" sourceRef="s" targetRef="x"/>'
+            '<sequenceFlow id="2" sourceRef="x" targetRef="a"/>'
+            '<sequenceFlow id="3" sourceRef="x" targetRef="b"/>'
+            '<sequenceFlow id="4" sourceRef="a" targetRef="c"/>'
+            '<sequenceFlow id="5" sourceRef="b" targetRef="c"/>'
+            '<sequenceFlow id="6" sourceRef="c" targetRef="e"/>'
+            '</process></definitions>')
+
+        self.assertEqual([e['id'] for e in client.get_process_flow('p')], ['s', 'x', 'a', 'c', 'e', 'b'])
+        self.assertEqual(client.get_process_flow('missing'), [])
+
+    def test_flow_longer_than_the_recursion_limit(self):
+        # Parsing, not the walk, bounds the size here: the client scans every
+        # boundary event per task.
+        length = sys.getrecursionlimit() * 3
+        client = BPMNClient()
+        client.load_string(bpmn_chain(length, loop_back=True))
+
+        self.assertEqual(len(client.get_process_flow('p')), length + 2)
+        self.assertEqual(len(client.analyze_process_flow('p').loop_members), length)
+
+
+class ComplexityAnalyzerFlowTest(unittest.TestCase):
+
+    def analyze(self, xml):
+        with tempfile.NamedTemporaryFile('w', suffix='.bpmn', delete=False) as handle:
+            handle.write(xml)
+        self.addCleanup(os.remove, handle.name)
+        return BPMNComplexityAnalyzer().analyze_file(handle.name)
+
+    def test_long_looping_chain_reports_the_loop(self):
+        report = self.analyze(bpmn_chain(100_000, loop_back=True))
+
+        self.assertNotIn('error', report)
+        self.assertTrue(any(i.startswith('LOOP DETECTED') for i in report['critical_issues']))
+        flows = report['process_flows'][0]
+        self.assertEqual(len(flows['loops'][0]), 100_000)
+        self.assertEqual(flows['longest_path'], 3)
+
+    def test_unreachable_elements_are_warned_about(self):
+        xml = bpmn_chain(3).replace(
+            '</process>', '<userTask id="lost"/><sequenceFlow id="x" sourceRef="lost" targetRef="t2"/></process>')
+        report = self.analyze(xml)
+
+        self.assertEqual(report['process_flows'][0]['unreachable'], ['lost'])
+        self.assertEqual(report['process_flows'][0]['longest_path'], 5)
+        self.assertFalse(any(i.startswith('LOOP') for i in report['critical_issues']))
+        self.assertTrue(any('cannot be reached' in w for w in report['warnings']))
+
+
+if __name__ == '__main__':
+    unittest.main()
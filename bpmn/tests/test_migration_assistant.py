@@ -0,0 +1,138 @@
+"""Tests for the AI migration assistant's batched element analysis.
+
+Each element used to cost its own model call, cached only by ``type_id``, and
+its context position came from ``list.index`` -- O(N^2) over a diagram. These
+tests pin the batching that replaced it: elements that differ only in id,
+name and the elements they reference share one decision, shapes are sent
+``AI_BATCH_SIZE`` to a call, every element gets its shape's decision under
+its own id and name, and positions come from enumeration.
+"""
+
+import json
+import os
+import re
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+try:
+    import migration_assistant
+except ImportError:  # anthropic is not installed
+    migration_assistant = None
+
+
+class FakeClaude:
+    """Answers every shape key in a batch prompt with a direct task mapping."""
+
+    def __init__(self, skip_keys=()):
+        self.prompts = []
+        self.skip_keys = set(skip_keys)
+        self.messages = self
+
+    def create(self, **request):
+        prompt = request['messages'][0]['content']
+        self.prompts.append(prompt)
+        keys = re.findall(r'"key": "(s\d+)"', prompt)
+        answer = {
+            key: {'confidence': 0.9, 'strategy': 'direct',
+                  'tallyfy_mapping': {'type': 'task', 'title': 'Generic'}, 'reasoning': key}
+            for key in keys if key not in self.skip_keys
+        }
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(answer))])
+
+
+def element(element_id, element_type='userTask', name=None, **attributes):
+    return {'type': element_type, 'id': element_id, 'name': name,
+            'attributes': dict(attributes, id=element_id, **({'name': name} if name else {}))}
+
+
+def diagram(count, shapes):
+    """count tasks cycling through `shapes` distinct attribute sets, chained by flows."""
+    elements = []
+    for i in range(count):
+        elements.append(element(f't{i}', name=f'Task {i}', assignee=f'role_{i % shapes}'))
+        if i:
+            elements.append(element(f'f{i}', 'sequenceFlow', sourceRef=f't{i - 1}', targetRef=f't{i}'))
+    return elements
+
+
+@unittest.skipIf(migration_assistant is None, 'anthropic is not installed')
+class BatchedAnalysisTest(unittest.TestCase):
+
+    def assistant(self, client):
+        assistant = migration_assistant.ClaudeAIMigrationAssistant.__new__(
+            migration_assistant.ClaudeAIMigrationAssistant)
+        assistant.client = client
+        assistant.decisions_cache = {}
+        assistant.stats = {'ai_calls': 0, 'cached_decisions': 0, 'fallback_decisions': 0}
+        return assistant
+
+    def test_model_calls_scale_with_distinct_shapes(self):
+        client = FakeClaude()
+        assistant = self.assistant(client)
+        elements = diagram(5_000, shapes=45)
+
+        decisions = assistant.analyze_bpmn_elements(elements)
+
+        # 45 task shapes and one flow shape, 20 to a call.
+        self.assertEqual(len(client.prompts), 3)
+        self.assertEqual(assistant.stats['ai_calls'], 3)
+        self.assertEqual(assistant.stats['cached_decisions'], len(elements) - 46)
+        self.assertEqual([d.element_id for d in decisions], [e['id'] for e in elements])
+        self.assertEqual(decisions[0].tallyfy_mapping['title'], 'Task 0')
+        self.assertEqual(decisions[89].tallyfy_mapping['title'], 'Task 45')
+        self.assertIsNot(decisions[0].tallyfy_mapping, decisions[89].tallyfy_mapping)
+
+        assistant.analyze_bpmn_elements(diagram(100, shapes=45))
+        self.assertEqual(len(client.prompts), 3)
+
+    def test_references_and_names_do_not_split_shapes(self):
+        elements = diagram(3, shapes=1)
+        ids = {e['id'] for e in elements}
+        signatures = {migration_assistant.element_signature(e, ids) for e in elements}
+        self.assertEqual(len(signatures), 2)
+        self.assertNotIn('t0', ''.join(signatures))
+
+        outside = element('x', 'sequenceFlow', sourceRef='t0', targetRef='elsewhere')
+        self.assertNotIn(migration_assistant.element_signature(outside, ids), signatures)
+
+    def test_unanswered_shapes_fall_back(self):
+        assistant = self.assistant(FakeClaude(skip_keys={'s1'}))
+        decisions = assistant.analyze_bpmn_elements(
+            [element('a', name='A'), element('g', 'exclusiveGateway', name='G')])
+
+        self.assertEqual(decisions[0].strategy, 'direct')
+        self.assertEqual(decisions[1].strategy, 'transform')
+        self.assertEqual(decisions[1].element_id, 'g')
+        self.assertEqual(assistant.stats['fallback_decisions'], 1)
+
+    def test_without_a_client_every_element_gets_the_fallback(self):
+        assistant = self.assistant(None)
+        decisions = assistant.analyze_bpmn_elements([element('a', name='A'), element('b', name='B')])
+
+        self.assertEqual([d.tallyfy_mapping['title'] for d in decisions], ['A', 'B'])
+        self.assertEqual(assistant.stats['fallback_decisions'], 2)
+
+    def test_process_contexts_use_enumerated_positions(self):
+        migrator = migration_assistant.BPMNToTallyfyMigrationAssistant.__new__(
+            migration_assistant.BPMNToTallyfyMigrationAssistant)
+        migrator.ai_assistant = self.assistant(None)
+        migrator.migration_results = {'elements_analyzed': 0, 'successful_migrations': [],
+                                      'partial_migrations': [], 'failed_migrations': []}
+        seen = []
+        analyze = migrator.ai_assistant.analyze_bpmn_elements
+        migrator.ai_assistant.analyze_bpmn_elements = lambda e, c: seen.extend(c) or analyze(e, c)
+
+        # Equal elements: list.index would give every one position 0.
+        same = element('dup', name='Same')
+        migrator._migrate_process({'id': 'p', 'name': 'P', 'elements': [same, dict(same), dict(same)]})
+
+        self.assertEqual([c['element_position'] for c in seen], [0, 1, 2])
+        self.assertEqual(migrator.migration_results['elements_analyzed'], 3)
+        self.assertEqual(len(migrator.migration_results['successful_migrations']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Tests for the BPMN ProcessTransformer's flow traversal.
+
+The transformer walks each process breadth-first from its start events. It
+used to look every dequeued ID up by scanning tasks, gateways and events in
+turn, and to dequeue with ``list.pop(0)``, so a diagram of N elements cost
+O(N^2). These tests pin the traversal order and lookup precedence the index
+must preserve, and that transform time grows linearly with diagram size.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transformers.process_transformer import ProcessIndex, ProcessTransformer
+
+
+def flow(source, target):
+    return {'id': f'{source}->{target}', 'source_ref': source, 'target_ref': target}
+
+
+def task(task_id, name=None):
+    return {'id': task_id, 'name': name or task_id, 'type': 'userTask'}
+
+
+def chain_process(length):
+    """start -> t0 -> t1 -> ... -> end, with a parallel split every 100 tasks."""
+    tasks, gateways, flows = [], [], []
+    previous = 'start'
+    for i in range(length):
+        if i % 100 == 50:
+            gateway_id = f'g{i}'
+            gateways.append({'id': gateway_id, 'type': 'parallelGateway',
+                             'gateway_direction': 'Diverging'})
+            flows.append(flow(previous, gateway_id))
+            previous = gateway_id
+        tasks.append(task(f't{i}'))
+        flows.append(flow(previous, f't{i}'))
+        previous = f't{i}'
+    flows.append(flow(previous, 'end'))
+    return {
+        'id': f'chain_{length}',
+        'name': 'Chain',
+        'tasks': tasks,
+        'gateways': gateways,
+        'events': [
+            {'id': 'start', 'type': 'none', 'position': 'start'},
+            {'id': 'end', 'type': 'none', 'position': 'end'},
+        ],
+        'sequence_flows': flows,
+    }
+
+
+class TraversalTest(unittest.TestCase):
+
+    def test_breadth_first_order_from_start(self):
+        process = {
+            'id': 'p',
+            'tasks': [task('a'), task('b'), task('c'), task('d')],
+            'gateways': [{'id': 'x', 'type': 'exclusiveGateway', 'gateway_direction': 'Diverging'}],
+            'events': [{'id': 's', 'type': 'none', 'position': 'start'},
+                       {'id': 'e', 'type': 'none', 'position': 'end'}],
+            'sequence_flows': [flow('s', 'a'), flow('a', 'x'), flow('x', 'c'), flow('x', 'b'),
+                               flow('c', 'd'), flow('b', 'd'), flow('d', 'e')],
+        }
+        template = ProcessTransformer().transform_process(process)
+
+        self.assertEqual([s['bpmn_ref']['id'] for s in template['steps']], ['a', 'c', 'b', 'd'])
+        self.assertEqual([r['action']['step_id'] for r in template['rules']], ['c', 'b'])
+
+    def test_unreached_and_unknown_elements_are_skipped(self):
+        process = {
+            'id': 'p',
+            'tasks': [task('a'), task('orphan')],
+            'events': [{'id': 's', 'type': 'none', 'position': 'start'}],
+            'sequence_flows': [flow('s', 'a'), flow('a', 'missing')],
+        }
+        template = ProcessTransformer().transform_process(process)
+
+        self.assertEqual([s['bpmn_ref']['id'] for s in template['steps']], ['a'])
+        self.assertNotIn('element_type', process['tasks'][1])
+
+    def test_index_keeps_collection_precedence(self):
+        process = {
+            'tasks': [task('dup')],
+            'gateways': [{'id': 'dup', 'type': 'exclusiveGateway'}, {'id': 'g', 'type': 'parallelGateway'}],
+            'events': [{'id': 'g', 'type': 'none', 'position': 'start'}],
+        }
+        index = ProcessIndex(process)
+
+        self.assertIs(index.find('dup'), process['tasks'][0])
+        self.assertEqual(index.find('dup')['element_type'], 'task')
+        self.assertEqual(index.find('g')['element_type'], 'gateway')
+        self.assertIsNone(index.find('nope'))
+
+    def test_subprocess_steps_are_inlined(self):
+        process = chain_process(3)
+        process['subprocesses'] = [{
+            'id': 'sub', 'name': 'Sub', 'tasks': [task('s1'), task('s2')],
+            'sequence_flows': [flow('s1', 's2')],
+        }]
+        template = ProcessTransformer().transform_process(process)
+
+        self.assertEqual([s['bpmn_ref']['id'] for s in template['steps']], ['t0', 't1', 't2', 's1', 's2'])
+        self.assertEqual(template['steps'][-1]['group_name'], 'Sub')
+
+
+class ScalingTest(unittest.TestCase):
+
+    def transform_seconds(self, length):
+        best = float('inf')
+        for _ in range(3):
+            process = chain_process(length)
+            started = time.perf_counter()
+            ProcessTransformer().transform_process(process)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def test_50k_element_diagram_transforms_in_linear_time(self):
+        template = ProcessTransformer().transform_process(chain_process(50_000))
+        self.assertEqual(len([s for s in template['steps'] if 'bpmn_ref' in s]), 50_000)
+
+        small = self.transform_seconds(10_000)
+        large = self.transform_seconds(50_000)
+        # Linear is ~5x; the old quadratic traversal was ~25x.
+        self.assertLess(large / small, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""Tests for TallyfyTemplateGenerator's per-template indexes and conditions.
+
+Gateway automations, form fields, lane groups and timer deadlines each used
+to find their flows or steps by scanning the whole template. They now share
+one ``TemplateIndex``. These tests pin what the scans did: flows keep their
+document order, and an element ID resolves to the first step generated from it.
+
+Condition expressions are parsed by a compiled, cached grammar. Every
+expression the old four-regex parser understood must parse the same; the
+grammar adds ``&&`` chains, quoted strings and dotted fields. ``||`` and
+``>=``/``<=`` would need OR between automation rules, which Tallyfy does not
+have, so they stay on manual review.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from tallyfy_generator import TallyfyTemplateGenerator, TemplateIndex, compile_condition
+
+
+def process():
+    return {
+        'id': 'p',
+        'name': 'Order',
+        'elements': {
+            'tasks': [
+                {'id': 'review', 'name': 'Review', 'type': 'userTask',
+                 'forms': [{'id': 'amount', 'label': 'Amount', 'type': 'long'}]},
+                {'id': 'approve', 'name': 'Approve', 'type': 'userTask'},
+                {'id': 'reject', 'name': 'Reject', 'type': 'userTask'},
+                {'id': 'ship', 'name': 'Ship', 'type': 'serviceTask'},
+            ],
+            'gateways': [
+                {'id': 'decide', 'name': 'Decide', 'type': 'exclusiveGateway', 'outgoing': ['f2', 'f3']},
+                {'id': 'split', 'name': 'Split', 'type': 'parallelGateway'},
+            ],
+            'events': [
+                {'id': 'sla', 'eventType': 'timer', 'attachedTo': 'approve', 'duration': 'P3D'},
+            ],
+            'flows': [
+                {'id': 'f1', 'sourceRef': 'review', 'targetRef': 'decide'},
+                {'id': 'f2', 'sourceRef': 'decide', 'targetRef': 'reject', 'condition': '${amount > 1000}'},
+                {'id': 'f3', 'sourceRef': 'decide', 'targetRef': 'approve', 'condition': '${amount < 1000}'},
+                {'id': 'f4', 'sourceRef': 'approve', 'targetRef': 'split'},
+                {'id': 'f5', 'sourceRef': 'split', 'targetRef': 'ship'},
+                {'id': 'f6', 'sourceRef': 'split', 'targetRef': 'missing'},
+            ],
+            'lanes': [
+                {'id': 'sales', 'name': 'Sales', 'flowNodeRefs': ['review', 'decide']},
+                {'id': 'ops', 'name': 'Ops', 'flowNodeRefs': ['approve', 'ship', 'reject']},
+            ],
+        },
+    }
+
+
+class TemplateIndexTest(unittest.TestCase):
+
+    def test_outgoing_flows_keep_document_order(self):
+        index = TemplateIndex(process())
+        self.assertEqual([f['id'] for f in index.outgoing['decide']], ['f2', 'f3'])
+        self.assertEqual(index.outgoing.get('ship', []), [])
+
+    def test_element_resolves_to_first_step(self):
+        first = {'bpmn_element_id': 'a', 'title': 'first'}
+        index = TemplateIndex(process(), [first, {'bpmn_element_id': 'a', 'title': 'second'}])
+        self.assertIs(index.steps['a'], first)
+
+
+class GenerateTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.template = TallyfyTemplateGenerator().generate_template(process(), {})
+        self.steps = {s['bpmn_element_id']: s for s in self.template['steps']}
+
+    def test_gateway_paths_follow_flow_order(self):
+        decide = [a for a in self.template['automated_actions'] if a['name'].startswith('Decide')]
+        self.assertEqual([a['actions'][0]['step_id'] for a in decide],
+                         [self.steps['reject']['id'], self.steps['approve']['id']])
+        self.assertEqual([a['rules'][0]['operator'] for a in decide], ['greater_than', 'less_than'])
+
+        split = next(a for a in self.template['automated_actions'] if a['name'] == 'Split')
+        self.assertEqual([a['step_id'] for a in split['actions']], [self.steps['ship']['id']])
+
+    def test_forms_lanes_and_timers_reach_their_steps(self):
+        self.assertEqual([c['label'] for c in self.steps['review']['captures']], ['Amount'])
+        self.assertEqual(self.steps['approve']['deadline'], {'step': 'start_run', 'unit': 'day', 'value': 3})
+
+        groups = {g['name']: g['id'] for g in self.template['groups']}
+        self.assertEqual(self.steps['review']['assignees'], [{'type': 'group', 'group_id': groups['Sales']}])
+        for element_id in ('approve', 'ship', 'reject'):
+            self.assertEqual(self.steps[element_id]['assignees'],
+                             [{'type': 'group', 'group_id': groups['Ops']}])
+
+
+def rule(field_alias, operator, value):
+    return {'field_alias': field_alias, 'operator': operator, 'value': value}
+
+
+class ConditionParsingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.parse = TallyfyTemplateGenerator()._parse_condition_expression
+
+    def test_single_comparisons_parse_as_before(self):
+        self.assertEqual(self.parse("${decision == 'approve'}"), rule('decision', 'equals', 'approve'))
+        self.assertEqual(self.parse('${decision == "reject"}'), rule('decision', 'equals', 'reject'))
+        self.assertEqual(self.parse('${Amount > 1000}'), rule('amount', 'greater_than', '1000'))
+        self.assertEqual(self.parse('${amount<5}'), rule('amount', 'less_than', '5'))
+        self.assertEqual(self.parse('<![CDATA[ ${approved != false} ]]>'),
+                         rule('approved', 'not_equals', 'false'))
+
+    def test_string_literals_and_dotted_fields(self):
+        self.assertEqual(self.parse("${region == 'North America'}"), rule('region', 'equals', 'North America'))
+        self.assertEqual(self.parse("${note == 'a && b'}"), rule('note', 'equals', 'a && b'))
+        self.assertEqual(self.parse('${order.total > 10.5}'), rule('order_total', 'greater_than', '10.5'))
+
+    def test_and_chains_become_required_rules(self):
+        self.assertEqual(self.parse("${tier == 'gold' && amount > 100 && region != 'emea'}"), {
+            'conditions': [rule('tier', 'equals', 'gold'), rule('amount', 'greater_than', '100'),
+                           rule('region', 'not_equals', 'emea')],
+        })
+
+    def test_unsupported_expressions_need_manual_review(self):
+        for expression in ('${a == 1 || b == 2}', '${amount <= 1000}', '${amount >= 1000}',
+                           '${a == 1 && b == 2 || c == 3}', '${a >= 1 && b == 2}', '${a == 1 &&}',
+                           '${items.isEmpty()}', '${(a == 1)}', '${approved}'):
+            with self.subTest(expression=expression):
+                self.assertEqual(self.parse(expression)['field_alias'], 'manual_check')
+                self.assertIn(expression, self.parse(expression)['note'])
+
+    def test_results_are_cached_but_not_shared(self):
+        compile_condition.cache_clear()
+        first = self.parse('${a == 1}')
+        first['value'] = 'changed'
+        self.assertEqual(self.parse('${a == 1}'), rule('a', 'equals', '1'))
+        self.assertEqual(compile_condition.cache_info().hits, 1)
+
+    def test_compound_conditions_become_automation_rules(self):
+        bpmn = process()
+        bpmn['elements']['flows'][1]['condition'] = "${amount > 1000 && tier == 'gold'}"
+        template = TallyfyTemplateGenerator().generate_template(bpmn, {})
+
+        gateway_rule = next(a for a in template['automated_actions'] if a['name'] == 'Decide - Path 1')
+        self.assertEqual([(r['operator'], r['value']) for r in gateway_rule['rules']],
+                         [('greater_than', '1000'), ('equals', 'gold')])
+        self.assertTrue(all(r.get('id') for r in gateway_rule['rules']))
+
+        flow_rules = [a for a in template['automated_actions'] if a['name'].startswith('Condition')
+                      and len(a['rules']) == 2]
+        self.assertEqual(len(flow_rules), 1)
+        self.assertFalse(any('match' in a for a in template['automated_actions']))
+
+    def test_or_conditions_are_left_for_manual_review(self):
+        bpmn = process()
+        bpmn['elements']['flows'][1]['condition'] = '${amount >= 1000}'
+        template = TallyfyTemplateGenerator().generate_template(bpmn, {})
+
+        gateway_rule = next(a for a in template['automated_actions'] if a['name'] == 'Decide - Path 1')
+        self.assertEqual(len(gateway_rule['rules']), 1)
+        self.assertEqual(gateway_rule['rules'][0]['field_alias'], 'manual_check')
+
+
+if __name__ == '__main__':
+    unittest.main()
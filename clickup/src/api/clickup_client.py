@@ -10,6 +10,16 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import json
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +38,7 @@ class ClickUpClient:
         self.workspace_id = workspace_id
         self.base_url = "https://api.clickup.com/api/v2"
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': api_key,
             'Content-Type': 'application/json'
@@ -7,14 +7,27 @@ Implements actual ClickUp API v2 with proper authentication, rate limiting, and
 import os
 import time
 import json
+import threading
 import requests
-from typing import Dict, List, Any, Optional, Generator, Union
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Generator, Union, Callable
+from datetime import datetime
 from urllib.parse import urlencode
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import configured_concurrency, create_session
+
 
 class ClickUpRateLimitError(Exception):
     """ClickUp rate limit exceeded"""
@@ -26,6 +39,14 @@ class ClickUpAuthError(Exception):
     pass
 
 
+class ClickUpExportError(Exception):
+    """An export finished with items it could not fetch"""
+
+    def __init__(self, message: str, errors: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.errors = errors
+
+
 class ClickUpViewType(str, Enum):
     """ClickUp view types"""
     LIST = "list"
@@ -82,6 +103,9 @@ class ClickUpProductionClient:
         'burst_limit': 20
     }
     
+    # Tasks per page on the task list endpoints
+    TASK_PAGE_SIZE = 100
+    
     def __init__(self):
         """Initialize ClickUp client with actual authentication"""
         self.api_key = os.getenv('CLICKUP_API_KEY')
@@ -89,17 +113,19 @@ class ClickUpProductionClient:
         if not self.api_key:
             raise ClickUpAuthError("CLICKUP_API_KEY required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': self.api_key,
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         })
         
-        # Rate limiting tracking
-        self.request_times = []
-        self.minute_start = datetime.now()
-        self.requests_this_minute = 0
+        # Rate limiting: start times booked for the most recent requests,
+        # shared by every thread using this client
+        self._rate_lock = threading.Lock()
+        self._minute_slots = deque(maxlen=self.RATE_LIMITS['requests_per_minute'])
+        self._second_slots = deque(maxlen=self.RATE_LIMITS['requests_per_second'])
+        self._paused_until = 0.0
         
         # Cache for workspace/team data
         self.workspace_cache = {}
@@ -108,36 +134,36 @@ class ClickUpProductionClient:
         self.logger = logging.getLogger(__name__)
     
     def _check_rate_limit(self):
-        """Check and enforce ClickUp rate limits"""
-        now = datetime.now()
-        
-        # Reset minute counter
-        if now - self.minute_start > timedelta(minutes=1):
-            self.requests_this_minute = 0
-            self.minute_start = now
-        
-        # Check requests per minute
-        if self.requests_this_minute >= self.RATE_LIMITS['requests_per_minute']:
-            wait_time = 60 - (now - self.minute_start).seconds
-            self.logger.warning(f"Rate limit reached. Waiting {wait_time}s")
-            time.sleep(wait_time)
-            self.requests_this_minute = 0
-            self.minute_start = datetime.now()
-        
-        # Check requests per second (sliding window)
-        self.request_times = [
-            t for t in self.request_times 
-            if now - t < timedelta(seconds=1)
-        ]
-        
-        if len(self.request_times) >= self.RATE_LIMITS['requests_per_second']:
-            wait_time = 1 - (now - self.request_times[0]).total_seconds()
-            if wait_time > 0:
-                time.sleep(wait_time)
-                self.request_times = []
+        """
+        Wait for the next request slot within ClickUp's rate limits.
         
-        self.request_times.append(now)
-        self.requests_this_minute += 1
+        Each caller books its start time under a lock, no earlier than a minute
+        after the request 100 places before it and a second after the one 10
+        places before it, then sleeps outside the lock. Concurrent workers
+        therefore share one budget rather than each spending all of it.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._paused_until)
+            if self._minute_slots:
+                slot = max(slot, self._minute_slots[-1])
+            if len(self._minute_slots) == self._minute_slots.maxlen:
+                slot = max(slot, self._minute_slots[0] + 60)
+            if len(self._second_slots) == self._second_slots.maxlen:
+                slot = max(slot, self._second_slots[0] + 1)
+            self._minute_slots.append(slot)
+            self._second_slots.append(slot)
+        
+        wait_time = slot - now
+        if wait_time > 0:
+            if wait_time > 1:
+                self.logger.warning(f"Rate limit reached. Waiting {wait_time:.1f}s")
+            time.sleep(wait_time)
+    
+    def _pause_requests(self, seconds: float):
+        """Hold every thread's next request after a 429"""
+        with self._rate_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
     
     @retry(
         stop=stop_after_attempt(3),
@@ -157,15 +183,19 @@ class ClickUpProductionClient:
                 url=url,
                 params=params,
                 json=data,
-                files=files,
-                timeout=30
+                files=files
             )
             
             # Check for rate limit response
             if response.status_code == 429:
-                retry_after = int(response.headers.get('X-RateLimit-Reset', 60))
-                self.logger.warning(f"Rate limited. Retry after {retry_after}s")
-                time.sleep(retry_after)
+                # X-RateLimit-Reset is the epoch second the window resets
+                try:
+                    reset = float(response.headers.get('X-RateLimit-Reset', 0))
+                except ValueError:
+                    reset = 0
+                retry_after = min(max(reset - time.time(), 1), 60) if reset else 60
+                self.logger.warning(f"Rate limited. Retry after {retry_after:.0f}s")
+                self._pause_requests(retry_after)
                 raise ClickUpRateLimitError("Rate limit exceeded")
             
             response.raise_for_status()
@@ -270,16 +300,18 @@ class ClickUpProductionClient:
     
     def get_tasks(self, list_id: str = None, team_id: str = None, 
                  include_closed: bool = False, include_subtasks: bool = True,
-                 page: int = 0) -> Dict[str, Any]:
+                 page: int = 0, date_updated_gt: Union[datetime, int, None] = None) -> Dict[str, Any]:
         """
         Get tasks from list or entire workspace
         
         Args:
             list_id: List to get tasks from
-            team_id: Team to get all tasks from
+            team_id: Team to get all tasks from (the filtered team tasks endpoint)
             include_closed: Include closed/archived tasks
             include_subtasks: Include subtasks in response
             page: Page number for pagination
+            date_updated_gt: Only tasks updated after this datetime or
+                Unix time in milliseconds
         """
         params = {
             'archived': include_closed,
@@ -287,12 +319,15 @@ class ClickUpProductionClient:
             'subtasks': include_subtasks,
             'page': page
         }
+        if isinstance(date_updated_gt, datetime):
+            date_updated_gt = int(date_updated_gt.timestamp() * 1000)
+        if date_updated_gt is not None:
+            params['date_updated_gt'] = date_updated_gt
         
         if list_id:
             endpoint = f'/list/{list_id}/task'
         elif team_id:
-            params['team_id'] = team_id
-            endpoint = '/team/{team_id}/task'
+            endpoint = f'/team/{team_id}/task'
         else:
             raise ValueError("Either list_id or team_id required")
         
@@ -434,179 +469,176 @@ class ClickUpProductionClient:
     
     # ============= BATCH OPERATIONS =============
     
-    def batch_get_tasks(self, list_id: str, batch_size: int = 100) -> Generator[List[Dict], None, None]:
+    def iter_task_pages(self, list_id: str = None, team_id: str = None,
+                        include_closed: bool = False, include_subtasks: bool = True,
+                        date_updated_gt: Union[datetime, int, None] = None) -> Generator[List[Dict], None, None]:
         """
-        Get tasks in batches to handle large lists
+        Yield every page of a list's (or a whole team's) tasks, in order, until exhausted
         
-        Args:
-            list_id: List ID
-            batch_size: Number of tasks per batch
-            
-        Yields:
-            Batches of tasks
+        ClickUp returns at most 100 tasks per page and marks the final one with
+        ``last_page``; when that flag is absent a short page ends the listing.
+        Arguments are those of ``get_tasks``.
         """
         page = 0
         
         while True:
-            response = self.get_tasks(list_id=list_id, page=page)
+            response = self.get_tasks(list_id=list_id, team_id=team_id, include_closed=include_closed,
+                                      include_subtasks=include_subtasks, page=page,
+                                      date_updated_gt=date_updated_gt) or {}
             tasks = response.get('tasks', [])
             
             if not tasks:
                 break
             
-            # Yield in batches
-            for i in range(0, len(tasks), batch_size):
-                yield tasks[i:i + batch_size]
+            yield tasks
             
-            # Check if there are more pages
-            if not response.get('last_page', True):
-                page += 1
-                time.sleep(0.5)  # Rate limit pause
-            else:
+            last_page = response.get('last_page')
+            if last_page or (last_page is None and len(tasks) < self.TASK_PAGE_SIZE):
                 break
+            page += 1
+    
+    def batch_get_tasks(self, list_id: str, batch_size: int = 100) -> Generator[List[Dict], None, None]:
+        """
+        Get tasks in batches to handle large lists
+        
+        Args:
+            list_id: List ID
+            batch_size: Number of tasks per batch
+            
+        Yields:
+            Batches of tasks
+        """
+        for tasks in self.iter_task_pages(list_id):
+            for i in range(0, len(tasks), batch_size):
+                yield tasks[i:i + batch_size]
     
-    def get_all_data(self, team_id: str, include_archived: bool = False) -> Dict[str, Any]:
+    def enrich_task(self, task: Dict[str, Any], refetch: bool = True, comments: bool = True,
+                    time_entries: bool = True) -> Dict[str, Any]:
+        """
+        Full task detail with its comments, time entries and dependencies
+        
+        Args:
+            task: Task as returned by a task listing
+            refetch: Fetch the task and its dependencies again. Tasks from the
+                team endpoint already carry full detail, so pass False for those;
+                dependencies are then read from the task's own
+                ``dependencies`` and ``linked_tasks``.
+            comments: Fetch the task's comments
+            time_entries: Fetch the task's time entries
+        """
+        if refetch:
+            task_detail = self.get_task(task['id']) or dict(task)
+            task_detail['dependencies'] = self.get_dependencies(task['id'])
+        else:
+            task_detail = dict(task)
+            task_detail['dependencies'] = task_dependencies(task)
+        if comments:
+            task_detail['comments'] = self.get_task_comments(task['id'])
+        if time_entries:
+            task_detail['time_entries'] = self.get_task_time_entries(task['id'])
+        return task_detail
+    
+    def get_all_data(self, team_id: str, include_archived: bool = False,
+                     max_workers: Optional[int] = None, **export_options: Any) -> Dict[str, Any]:
         """
         Get all data for migration
         
+        Holds every task in memory; use ``export_to_directory`` for large
+        workspaces.
+        
         Args:
             team_id: Team (workspace) to export
             include_archived: Include archived items
+            max_workers: Concurrent requests (defaults to ``MAX_WORKERS``)
+            **export_options: ``sweep``, ``updated_since``, ``include_comments``
+                and ``include_time_entries``; see ``export_to_directory``
             
         Returns:
             Complete data structure for migration
+            
+        Raises:
+            ClickUpExportError: If any item could not be fetched
         """
-        self.logger.info("Starting complete ClickUp data export")
+        tasks_by_list: Dict[str, List[Dict[str, Any]]] = {}
         
-        data = {
-            'export_date': datetime.utcnow().isoformat(),
-            'team': self.get_team(team_id),
-            'spaces': [],
-            'members': [],
-            'goals': [],
-            'tags': [],
-            'total_lists': 0,
-            'total_tasks': 0,
-            'total_folders': 0
-        }
+        def collect(list_id: str, task: Dict[str, Any]):
+            # Each list is paged by one worker, so its tasks arrive in order
+            tasks_by_list.setdefault(list_id, []).append(task)
         
-        # Get team members
-        self.logger.info("Fetching team members...")
-        team_data = self._make_request('GET', f'/team/{team_id}')
-        data['members'] = team_data.get('team', {}).get('members', [])
+        export = _WorkspaceExport(self, include_archived=include_archived, max_workers=max_workers,
+                                  **export_options)
+        data = export.run(team_id, collect)
         
-        # Get goals
-        self.logger.info("Fetching goals...")
-        data['goals'] = self.get_goals(team_id)
+        for list_data in _iter_exported_lists(data):
+            list_data['tasks'] = tasks_by_list.pop(str(list_data.get('id')), [])
         
-        # Get spaces
-        self.logger.info("Fetching spaces...")
-        spaces = self.get_spaces(team_id, archived=include_archived)
+        export.raise_for_errors()
+        return data
+    
+    def export_to_directory(self, team_id: str, output_dir: str, include_archived: bool = False,
+                            max_workers: Optional[int] = None, sweep: bool = False,
+                            updated_since: Union[datetime, int, None] = None,
+                            include_comments: bool = True,
+                            include_time_entries: bool = True) -> Dict[str, Any]:
+        """
+        Export a workspace to disk, streaming tasks as they are fetched
+        
+        Writes ``tasks.jsonl`` -- one ``{"list_id": ..., "task": ...}`` line per
+        enriched task, each list's tasks in ClickUp's order -- and, once the
+        walk finishes, ``hierarchy.json`` with the team, spaces, folders and
+        lists (each list carries ``task_count`` rather than its tasks), the
+        totals and any errors.
+        
+        By default each list is paged and every task fetched again for its
+        full detail and dependencies. With ``sweep`` the tasks of the whole
+        workspace come from the team endpoint instead, 100 per request with
+        subtasks and custom fields, and are bucketed to their lists locally;
+        only comments and time entries, which that endpoint does not carry,
+        are fetched per task, and either can be turned off. A sweep with both
+        off costs one request per 100 tasks instead of four per task.
         
-        for space in spaces:
-            if not include_archived and space.get('archived'):
-                continue
-            
-            self.logger.info(f"Processing space: {space['name']}")
-            
-            space_data = self.get_space(space['id'])
-            space_data['tags'] = self.get_tags(space['id'])
-            space_data['folders'] = []
-            space_data['lists'] = []  # For folderless lists
-            
-            # Get folders
-            folders = self.get_folders(space['id'], archived=include_archived)
-            
-            for folder in folders:
-                if not include_archived and folder.get('archived'):
-                    continue
-                
-                self.logger.info(f"  Processing folder: {folder['name']}")
-                
-                folder_data = self.get_folder(folder['id'])
-                folder_data['lists'] = []
-                
-                # Get lists in folder
-                lists = self.get_lists(folder_id=folder['id'], archived=include_archived)
-                
-                for list_item in lists:
-                    if not include_archived and list_item.get('archived'):
-                        continue
-                    
-                    self.logger.info(f"    Processing list: {list_item['name']}")
-                    
-                    list_data = self.get_list(list_item['id'])
-                    
-                    # Get custom fields
-                    list_data['custom_fields'] = self.get_custom_fields(list_item['id'])
-                    
-                    # Get views
-                    list_data['views'] = self.get_views(list_id=list_item['id'])
-                    
-                    # Get automations
-                    list_data['automations'] = self.get_automations(list_item['id'])
-                    
-                    # Get tasks
-                    list_data['tasks'] = []
-                    task_count = 0
-                    
-                    for task_batch in self.batch_get_tasks(list_item['id']):
-                        for task in task_batch:
-                            # Get additional task details
-                            task_detail = self.get_task(task['id'])
-                            
-                            # Get comments
-                            task_detail['comments'] = self.get_task_comments(task['id'])
-                            
-                            # Get time entries
-                            task_detail['time_entries'] = self.get_task_time_entries(task['id'])
-                            
-                            # Get dependencies
-                            task_detail['dependencies'] = self.get_dependencies(task['id'])
-                            
-                            list_data['tasks'].append(task_detail)
-                            task_count += 1
-                        
-                        # Rate limit pause
-                        time.sleep(1)
-                    
-                    data['total_tasks'] += task_count
-                    folder_data['lists'].append(list_data)
-                    data['total_lists'] += 1
-                    
-                    self.logger.info(f"      Processed {task_count} tasks")
-                
-                space_data['folders'].append(folder_data)
-                data['total_folders'] += 1
+        Args:
+            team_id: Team (workspace) to export
+            output_dir: Directory to write into; created if missing
+            include_archived: Include archived items
+            max_workers: Concurrent requests (defaults to ``MAX_WORKERS``)
+            sweep: Fetch tasks through the team endpoint
+            updated_since: Only tasks updated after this datetime or Unix
+                time in milliseconds (``date_updated_gt``)
+            include_comments: Fetch each task's comments
+            include_time_entries: Fetch each task's time entries
             
-            # Get folderless lists
-            folderless_lists = self.get_lists(space_id=space['id'], archived=include_archived)
+        Returns:
+            The ``hierarchy.json`` content
             
-            for list_item in folderless_lists:
-                if not include_archived and list_item.get('archived'):
-                    continue
-                
-                self.logger.info(f"  Processing folderless list: {list_item['name']}")
-                
-                list_data = self.get_list(list_item['id'])
-                list_data['custom_fields'] = self.get_custom_fields(list_item['id'])
-                list_data['views'] = self.get_views(list_id=list_item['id'])
-                list_data['automations'] = self.get_automations(list_item['id'])
-                list_data['tasks'] = []
-                
-                # Get tasks (simplified for folderless lists)
-                response = self.get_tasks(list_id=list_item['id'])
-                for task in response.get('tasks', []):
-                    list_data['tasks'].append(task)
-                    data['total_tasks'] += 1
-                
-                space_data['lists'].append(list_data)
-                data['total_lists'] += 1
+        Raises:
+            ClickUpExportError: If any item could not be fetched. Both files
+                are still written with everything that was.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        write_lock = threading.Lock()
+        task_counts: Dict[str, int] = {}
+        
+        with open(os.path.join(output_dir, 'tasks.jsonl'), 'w', encoding='utf-8') as tasks_file:
+            def write(list_id: str, task: Dict[str, Any]):
+                line = json.dumps({'list_id': list_id, 'task': task}, default=str)
+                with write_lock:
+                    tasks_file.write(line + '\n')
+                    task_counts[list_id] = task_counts.get(list_id, 0) + 1
             
-            data['spaces'].append(space_data)
+            export = _WorkspaceExport(self, include_archived=include_archived, max_workers=max_workers,
+                                      sweep=sweep, updated_since=updated_since,
+                                      include_comments=include_comments,
+                                      include_time_entries=include_time_entries)
+            data = export.run(team_id, write)
+        
+        for list_data in _iter_exported_lists(data):
+            list_data['task_count'] = task_counts.get(str(list_data.get('id')), 0)
         
-        self.logger.info(f"Export complete: {data['total_lists']} lists, {data['total_tasks']} tasks")
+        with open(os.path.join(output_dir, 'hierarchy.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)
         
+        export.raise_for_errors()
         return data
     
     # ============= CREATE OPERATIONS =============
@@ -715,6 +747,211 @@ class ClickUpProductionClient:
         return hierarchy
 
 
+class _WorkspaceExport:
+    """
+    One bounded-concurrency walk of a ClickUp workspace.
+    
+    Spaces, then folders, then lists are each fetched across a worker pool.
+    Each list worker pages its tasks to the end and hands every page to a
+    second pool for the per-task enrichment calls, waiting for that page
+    before fetching the next, so at most one page per list is held in memory
+    and its tasks reach ``on_task`` in ClickUp's order. Both pools share the
+    client's rate limiter. A failed item is logged and recorded rather than
+    stopping the walk; ``raise_for_errors`` reports them at the end.
+    
+    With ``sweep`` the list workers fetch only list metadata, and the tasks
+    are then paged once through the team endpoint and bucketed by their
+    ``list.id``. Tasks in lists outside the export (archived ones, unless
+    ``include_archived``) are skipped and counted in ``skipped_tasks``.
+    """
+    
+    def __init__(self, client: ClickUpProductionClient, include_archived: bool = False,
+                 max_workers: Optional[int] = None, sweep: bool = False,
+                 updated_since: Union[datetime, int, None] = None,
+                 include_comments: bool = True, include_time_entries: bool = True):
+        self.client = client
+        self.include_archived = include_archived
+        self.max_workers = max_workers or configured_concurrency()
+        self.sweep = sweep
+        self.updated_since = updated_since
+        self.include_comments = include_comments
+        self.include_time_entries = include_time_entries
+        self.errors: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._task_pool: Optional[ThreadPoolExecutor] = None
+        self._task_total = 0
+        self._skipped_tasks = 0
+    
+    def run(self, team_id: str, on_task: Callable[[str, Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Walk the workspace, passing each enriched task to ``on_task(list_id, task)``"""
+        client = self.client
+        client.logger.info("Starting complete ClickUp data export")
+        
+        team = client.get_team(team_id) or {}
+        data = {
+            'export_date': datetime.utcnow().isoformat(),
+            'team': team,
+            'spaces': [s for s in client.get_spaces(team_id, archived=self.include_archived)
+                       if self._keep(s)],
+            'members': (team.get('team') or team).get('members', []),
+            'goals': client.get_goals(team_id),
+            'tags': [],
+            'total_lists': 0,
+            'total_tasks': 0,
+            'total_folders': 0,
+            'errors': self.errors
+        }
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as task_pool:
+            self._task_pool = task_pool
+            self._expand(pool, [data], 'spaces', self._space)
+            self._expand(pool, data['spaces'], 'folders', self._folder)
+            folders = [folder for space in data['spaces'] for folder in space['folders']]
+            if self.sweep:
+                self._expand(pool, data['spaces'] + folders, 'lists', self._list)
+                list_ids = {str(list_data['id']) for list_data in _iter_exported_lists(data)}
+                self._attempt(f"team {team_id} task sweep", self._sweep_tasks, team_id, list_ids, on_task)
+            else:
+                self._expand(pool, data['spaces'] + folders, 'lists',
+                             lambda list_item: self._list(list_item, on_task))
+        
+        data['total_folders'] = len(folders)
+        data['total_lists'] = sum(1 for _ in _iter_exported_lists(data))
+        data['total_tasks'] = self._task_total
+        if self.sweep:
+            data['skipped_tasks'] = self._skipped_tasks
+        client.logger.info(f"Export complete: {data['total_lists']} lists, {data['total_tasks']} tasks")
+        return data
+    
+    def raise_for_errors(self):
+        if self.errors:
+            items = ', '.join(error['item'] for error in self.errors[:10])
+            raise ClickUpExportError(
+                f"{len(self.errors)} item(s) could not be exported: {items}", list(self.errors)
+            )
+    
+    def _keep(self, item: Dict[str, Any]) -> bool:
+        return self.include_archived or not item.get('archived')
+    
+    def _expand(self, pool: ThreadPoolExecutor, containers: List[Dict[str, Any]], key: str,
+                fetch: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]):
+        """Replace each container's ``key`` items with ``fetch(item)``, fetched across the pool"""
+        pending = [(container, item) for container in containers for item in container[key]]
+        results = pool.map(lambda pair: fetch(pair[1]), pending)
+        for container in containers:
+            container[key] = []
+        for (container, _), result in zip(pending, results):
+            if result is not None:
+                container[key].append(result)
+    
+    def _attempt(self, what: str, fn: Callable, *args) -> Any:
+        try:
+            return fn(*args)
+        except ClickUpAuthError:
+            raise
+        except Exception as e:
+            self.client.logger.error(f"Export failed for {what}: {e}")
+            with self._lock:
+                self.errors.append({'item': what, 'error': str(e)})
+            return None
+    
+    def _space(self, space: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._attempt(f"space {space['id']}", self._fetch_space, space)
+    
+    def _folder(self, folder: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._attempt(f"folder {folder['id']}", self._fetch_folder, folder)
+    
+    def _list(self, list_item: Dict[str, Any], on_task: Optional[Callable] = None) -> Optional[Dict[str, Any]]:
+        return self._attempt(f"list {list_item['id']}", self._fetch_list, list_item, on_task)
+    
+    def _task(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._attempt(f"task {task['id']}", self.client.enrich_task, task,
+                             not self.sweep, self.include_comments, self.include_time_entries)
+    
+    def _fetch_space(self, space: Dict[str, Any]) -> Dict[str, Any]:
+        client = self.client
+        self.client.logger.info(f"Processing space: {space.get('name')}")
+        space_data = client.get_space(space['id']) or dict(space)
+        space_data['tags'] = client.get_tags(space['id'])
+        space_data['folders'] = [f for f in client.get_folders(space['id'], archived=self.include_archived)
+                                 if self._keep(f)]
+        # Folderless lists
+        space_data['lists'] = [l for l in client.get_lists(space_id=space['id'], archived=self.include_archived)
+                               if self._keep(l)]
+        return space_data
+    
+    def _fetch_folder(self, folder: Dict[str, Any]) -> Dict[str, Any]:
+        client = self.client
+        folder_data = client.get_folder(folder['id']) or dict(folder)
+        folder_data['lists'] = [l for l in client.get_lists(folder_id=folder['id'], archived=self.include_archived)
+                                if self._keep(l)]
+        return folder_data
+    
+    def _fetch_list(self, list_item: Dict[str, Any], on_task: Optional[Callable]) -> Dict[str, Any]:
+        client = self.client
+        list_id = str(list_item['id'])
+        list_data = client.get_list(list_id) or dict(list_item)
+        list_data['custom_fields'] = client.get_custom_fields(list_id)
+        list_data['views'] = client.get_views(list_id=list_id)
+        list_data['automations'] = client.get_automations(list_id)
+        
+        if on_task is not None:
+            task_count = 0
+            for tasks in client.iter_task_pages(list_id, date_updated_gt=self.updated_since):
+                task_count += self._emit(tasks, lambda task: list_id, on_task)
+            client.logger.info(f"Processed list {list_item.get('name')}: {task_count} tasks")
+        return list_data
+    
+    def _sweep_tasks(self, team_id: str, list_ids: set, on_task: Callable):
+        client = self.client
+        client.logger.info("Sweeping workspace tasks through the team endpoint")
+        
+        def list_of(task: Dict[str, Any]) -> str:
+            return str((task.get('list') or {}).get('id'))
+        
+        for tasks in client.iter_task_pages(team_id=team_id, include_subtasks=True,
+                                            date_updated_gt=self.updated_since):
+            wanted = [task for task in tasks if list_of(task) in list_ids]
+            self._skipped_tasks += len(tasks) - len(wanted)
+            self._emit(wanted, list_of, on_task)
+    
+    def _emit(self, tasks: List[Dict[str, Any]], list_of: Callable[[Dict[str, Any]], str],
+              on_task: Callable) -> int:
+        """Enrich one page across the task pool and hand it on in order"""
+        task_count = 0
+        for task, task_detail in zip(tasks, self._task_pool.map(self._task, tasks)):
+            if task_detail is not None:
+                on_task(list_of(task), task_detail)
+                task_count += 1
+        with self._lock:
+            self._task_total += task_count
+        return task_count
+
+
+def task_dependencies(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    A task's dependencies, in ``get_dependencies``' shape, from the
+    ``dependencies`` and ``linked_tasks`` a full task object carries
+    """
+    task_id = task.get('id')
+    dependencies = task.get('dependencies') or []
+    linked = task.get('linked_tasks') or []
+    return {
+        'depends_on': [d.get('depends_on') for d in dependencies if d.get('task_id') == task_id],
+        'dependency_of': [d.get('task_id') for d in dependencies if d.get('depends_on') == task_id],
+        'links_to': [l.get('link_id') for l in linked if l.get('task_id') == task_id],
+        'linked_to': [l.get('task_id') for l in linked if l.get('link_id') == task_id]
+    }
+
+
+def _iter_exported_lists(data: Dict[str, Any]) -> Generator[Dict[str, Any], None, None]:
+    for space in data['spaces']:
+        for folder in space['folders']:
+            yield from folder['lists']
+        yield from space['lists']
+
+
 # ============= USAGE EXAMPLE =============
 
 if __name__ == "__main__":
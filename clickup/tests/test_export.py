@@ -0,0 +1,367 @@
+"""Tests for the ClickUp production client's workspace export.
+
+The export fans out across lists and across the per-task enrichment calls, so
+these tests drive it against an in-memory workspace served through
+`_make_request` and pin what the old sequential walk got wrong or could not
+do: every list is paged to the end (folderless lists included), enrichment
+calls overlap, tasks stream to disk in each list's order, and one failed task
+is reported without losing the rest. The team sweep must bucket tasks to their
+lists without fetching any task again. The rate limiter is tested on its own
+against a fake clock, since every request, from any thread, goes through it.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api import clickup_client_production as production
+from src.api.clickup_client_production import (
+    ClickUpExportError,
+    ClickUpProductionClient,
+    task_dependencies,
+)
+
+
+def make_tasks(prefix, count, list_id=None):
+    tasks = [{'id': f'{prefix}-{i}', 'name': f'Task {i}'} for i in range(count)]
+    if list_id:
+        for task in tasks:
+            task['list'] = {'id': list_id}
+    return tasks
+
+
+class FakeWorkspace(ClickUpProductionClient):
+    """One space with a foldered list and a folderless list, served from memory."""
+
+    ENRICHMENT = ('comment', 'time', 'dependency')
+
+    def __init__(self, tasks_by_list, flag_last_page=True, failing_task=None, latency=0.0,
+                 team_tasks=None):
+        with patch.dict(os.environ, {'CLICKUP_API_KEY': 'pk_test'}):
+            super().__init__()
+        self.tasks_by_list = tasks_by_list
+        self.team_tasks = team_tasks or []
+        self.flag_last_page = flag_last_page
+        self.failing_task = failing_task
+        self.latency = latency
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._count_lock = threading.Lock()
+
+    def _make_request(self, method, endpoint, params=None, data=None, files=None):
+        with self._count_lock:
+            self.calls.append((endpoint, dict(params or {})))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency and endpoint.startswith('/task/'):
+                time.sleep(self.latency)
+            return self._route(endpoint, params or {})
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+
+    def _route(self, endpoint, params):
+        parts = endpoint.strip('/').split('/')
+        if parts == ['team', 'T1']:
+            return {'team': {'id': 'T1', 'members': [{'user': {'id': 1}}]}}
+        if parts == ['team', 'T1', 'goal']:
+            return {'goals': []}
+        if parts == ['team', 'T1', 'space']:
+            return {'spaces': [{'id': 'S1', 'name': 'Space'}]}
+        if parts == ['space', 'S1']:
+            return {'id': 'S1', 'name': 'Space'}
+        if parts == ['space', 'S1', 'tag']:
+            return {'tags': []}
+        if parts == ['space', 'S1', 'folder']:
+            return {'folders': [{'id': 'F1', 'name': 'Folder'},
+                                {'id': 'F2', 'name': 'Old', 'archived': True}]}
+        if parts == ['space', 'S1', 'list']:
+            return {'lists': [{'id': 'L2', 'name': 'Folderless'}]}
+        if parts == ['folder', 'F1']:
+            return {'id': 'F1', 'name': 'Folder'}
+        if parts == ['folder', 'F1', 'list']:
+            return {'lists': [{'id': 'L1', 'name': 'Foldered'}]}
+        if parts[0] == 'list' and len(parts) == 2:
+            return {'id': parts[1]}
+        if parts == ['team', 'T1', 'task'] or (parts[0] == 'list' and parts[2] == 'task'):
+            tasks = self.team_tasks if parts[0] == 'team' else self.tasks_by_list[parts[1]]
+            page = params['page']
+            chunk = tasks[page * 100:(page + 1) * 100]
+            response = {'tasks': chunk}
+            if self.flag_last_page:
+                response['last_page'] = (page + 1) * 100 >= len(tasks)
+            return response
+        if parts[0] == 'list':
+            return {'fields': [], 'views': [], 'automations': []}
+        if parts[0] == 'task':
+            if parts[1] == self.failing_task:
+                raise RuntimeError('500 Server Error')
+            if len(parts) == 2:
+                return {'id': parts[1], 'detail': True}
+            return {'comments': [], 'data': []}
+        raise AssertionError(f'unexpected endpoint {endpoint}')
+
+    def task_pages_requested(self, list_id):
+        return [params['page'] for endpoint, params in self.calls
+                if endpoint == f'/list/{list_id}/task']
+
+    def requests_to(self, suffix):
+        return [endpoint for endpoint, _ in self.calls
+                if endpoint.startswith('/task/') and endpoint.endswith(suffix)]
+
+
+class TestExportPaging(unittest.TestCase):
+
+    def test_every_list_is_paged_to_completion(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 250), 'L2': make_tasks('b', 130)})
+
+        data = client.get_all_data('T1', max_workers=4)
+
+        self.assertEqual(client.task_pages_requested('L1'), [0, 1, 2])
+        self.assertEqual(client.task_pages_requested('L2'), [0, 1])
+        self.assertEqual(data['total_tasks'], 380)
+        self.assertEqual(data['total_lists'], 2)
+        self.assertEqual(data['total_folders'], 1)
+        folderless = data['spaces'][0]['lists'][0]
+        self.assertEqual([t['id'] for t in folderless['tasks']], [t['id'] for t in make_tasks('b', 130)])
+        # Folderless lists are enriched like every other list
+        self.assertTrue(all('comments' in t and t['detail'] for t in folderless['tasks']))
+
+    def test_short_page_ends_a_list_without_last_page_flag(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 200), 'L2': make_tasks('b', 30)},
+                               flag_last_page=False)
+
+        data = client.get_all_data('T1')
+
+        # A full final page needs one more (empty) request to prove it is the last
+        self.assertEqual(client.task_pages_requested('L1'), [0, 1, 2])
+        self.assertEqual(client.task_pages_requested('L2'), [0])
+        self.assertEqual(data['total_tasks'], 230)
+
+    def test_archived_folders_are_skipped(self):
+        client = FakeWorkspace({'L1': [], 'L2': []})
+
+        client.get_all_data('T1')
+
+        self.assertNotIn(('/folder/F2', {}), client.calls)
+
+
+class TestExportConcurrency(unittest.TestCase):
+
+    def test_enrichment_calls_overlap_within_the_worker_bound(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 40), 'L2': make_tasks('b', 40)}, latency=0.01)
+
+        client.get_all_data('T1', max_workers=4)
+
+        self.assertGreater(client.max_in_flight, 1)
+        # One pool for lists, one for enrichment
+        self.assertLessEqual(client.max_in_flight, 8)
+
+    def test_export_does_not_sleep_between_pages(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 300), 'L2': make_tasks('b', 10)})
+
+        with patch.object(production.time, 'sleep') as sleep:
+            client.get_all_data('T1')
+
+        sleep.assert_not_called()
+
+
+class TestExportToDirectory(unittest.TestCase):
+
+    def test_tasks_stream_to_jsonl_in_list_order(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 120), 'L2': make_tasks('b', 5)})
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            summary = client.export_to_directory('T1', output_dir, max_workers=3)
+            with open(os.path.join(output_dir, 'tasks.jsonl')) as f:
+                lines = [json.loads(line) for line in f]
+            with open(os.path.join(output_dir, 'hierarchy.json')) as f:
+                hierarchy = json.load(f)
+
+        self.assertEqual(len(lines), 125)
+        by_list = {}
+        for line in lines:
+            by_list.setdefault(line['list_id'], []).append(line['task']['id'])
+        self.assertEqual(by_list['L1'], [t['id'] for t in make_tasks('a', 120)])
+        self.assertEqual(by_list['L2'], [t['id'] for t in make_tasks('b', 5)])
+
+        foldered = hierarchy['spaces'][0]['folders'][0]['lists'][0]
+        self.assertEqual(foldered['task_count'], 120)
+        self.assertNotIn('tasks', foldered)
+        self.assertEqual(hierarchy['total_tasks'], summary['total_tasks'])
+
+    def test_failed_task_is_reported_after_the_rest_are_written(self):
+        client = FakeWorkspace({'L1': make_tasks('a', 10), 'L2': make_tasks('b', 10)},
+                               failing_task='a-3')
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            with self.assertRaises(ClickUpExportError) as raised:
+                client.export_to_directory('T1', output_dir)
+            with open(os.path.join(output_dir, 'tasks.jsonl')) as f:
+                written = [json.loads(line)['task']['id'] for line in f]
+            with open(os.path.join(output_dir, 'hierarchy.json')) as f:
+                hierarchy = json.load(f)
+
+        self.assertEqual([e['item'] for e in raised.exception.errors], ['task a-3'])
+        self.assertEqual(len(written), 19)
+        self.assertNotIn('a-3', written)
+        self.assertEqual(hierarchy['errors'][0]['item'], 'task a-3')
+
+
+class TestTeamSweep(unittest.TestCase):
+
+    def sweep_workspace(self):
+        team_tasks = (make_tasks('a', 150, 'L1') + make_tasks('b', 60, 'L2')
+                      + make_tasks('x', 3, 'L-archived'))
+        # Interleave lists the way the team endpoint orders by update time
+        team_tasks.sort(key=lambda task: task['id'].split('-')[1])
+        return FakeWorkspace({}, team_tasks=team_tasks)
+
+    def test_tasks_are_bucketed_to_lists_without_refetching(self):
+        client = self.sweep_workspace()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            summary = client.export_to_directory('T1', output_dir, sweep=True)
+            with open(os.path.join(output_dir, 'tasks.jsonl')) as f:
+                lines = [json.loads(line) for line in f]
+
+        counts = {}
+        for line in lines:
+            self.assertEqual(line['task']['list']['id'], line['list_id'])
+            counts[line['list_id']] = counts.get(line['list_id'], 0) + 1
+        self.assertEqual(counts, {'L1': 150, 'L2': 60})
+        self.assertEqual(summary['skipped_tasks'], 3)
+        self.assertEqual(summary['total_tasks'], 210)
+        # Full detail comes with the sweep: no per-task GET /task/{id} or dependency call
+        self.assertFalse([e for e, _ in client.calls if e.count('/') == 2 and e.startswith('/task/')])
+        self.assertFalse(client.requests_to('/dependency'))
+        self.assertEqual(len(client.requests_to('/comment')), 210)
+        # Lists are not paged at all
+        self.assertFalse(client.task_pages_requested('L1'))
+
+    def test_sweep_without_comments_or_time_costs_one_request_per_page(self):
+        client = self.sweep_workspace()
+
+        data = client.get_all_data('T1', sweep=True, include_comments=False, include_time_entries=False)
+
+        team_pages = [params for endpoint, params in client.calls if endpoint == '/team/T1/task']
+        self.assertEqual([params['page'] for params in team_pages], [0, 1, 2])
+        self.assertTrue(all(params['subtasks'] for params in team_pages))
+        self.assertFalse([e for e, _ in client.calls if e.startswith('/task/')])
+        foldered = data['spaces'][0]['folders'][0]['lists'][0]
+        self.assertEqual(len(foldered['tasks']), 150)
+        self.assertEqual(foldered['tasks'][0]['dependencies']['depends_on'], [])
+
+    def test_updated_since_is_sent_as_milliseconds(self):
+        client = self.sweep_workspace()
+        since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+        client.get_all_data('T1', sweep=True, updated_since=since,
+                            include_comments=False, include_time_entries=False)
+
+        team_pages = [params for endpoint, params in client.calls if endpoint == '/team/T1/task']
+        self.assertTrue(all(params['date_updated_gt'] == 1767225600000 for params in team_pages))
+
+    def test_team_endpoint_includes_the_team_id(self):
+        client = FakeWorkspace({}, team_tasks=make_tasks('a', 2, 'L1'))
+
+        client.get_tasks(team_id='T1')
+
+        self.assertEqual(client.calls[-1][0], '/team/T1/task')
+
+    def test_dependencies_are_read_from_the_task(self):
+        task = {
+            'id': 't2',
+            'dependencies': [{'task_id': 't2', 'depends_on': 't1'},
+                             {'task_id': 't3', 'depends_on': 't2'}],
+            'linked_tasks': [{'task_id': 't2', 'link_id': 't9'}],
+        }
+
+        self.assertEqual(task_dependencies(task), {
+            'depends_on': ['t1'],
+            'dependency_of': ['t3'],
+            'links_to': ['t9'],
+            'linked_to': [],
+        })
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimit(unittest.TestCase):
+
+    def book(self, client, count):
+        clock = FakeClock()
+        starts = []
+        with patch.object(production.time, 'monotonic', clock.monotonic), \
+                patch.object(production.time, 'sleep', clock.sleep):
+            for _ in range(count):
+                client._check_rate_limit()
+                starts.append(clock.now)
+        return starts
+
+    def test_requests_stay_within_the_minute_and_second_budgets(self):
+        client = FakeWorkspace({})
+
+        starts = self.book(client, 250)
+
+        for i in range(100, len(starts)):
+            self.assertGreaterEqual(starts[i] - starts[i - 100], 60 - 1e-9)
+        for i in range(10, len(starts)):
+            self.assertGreaterEqual(starts[i] - starts[i - 10], 1 - 1e-9)
+        # ...and no slower than that: bursts of 10 per second, 100 per minute,
+        # so request 250 starts 2 minutes and 4 seconds after the first
+        self.assertEqual(starts[-1] - starts[0], 124)
+
+    def test_threads_share_one_budget(self):
+        client = FakeWorkspace({})
+        client._minute_slots = production.deque(maxlen=20)
+        booked = []
+        booked_lock = threading.Lock()
+
+        real_sleep = time.sleep
+        with patch.object(production.time, 'sleep') as sleep:
+            sleep.side_effect = lambda seconds: real_sleep(0)
+
+            def worker():
+                for _ in range(10):
+                    client._check_rate_limit()
+                with booked_lock:
+                    booked.append(1)
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        slots = sorted(client._minute_slots)
+        self.assertEqual(len(booked), 4)
+        # 40 requests against a 20-per-minute budget: the last 20 are a minute apart
+        # from the first 20, which needs every booking to have seen the others.
+        waits = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(sum(1 for w in waits if w > 59), 20)
+        self.assertEqual(len(slots), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,16 @@ from datetime import datetime, timezone
 import time
 import base64
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,7 +47,7 @@ class CognitoFormsClient:
         if not self.organization:
             raise ValueError("Cognito Forms organization is required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         
         # Cognito Forms uses Basic Auth with API key as password
         auth_string = f"{self.api_key}:"
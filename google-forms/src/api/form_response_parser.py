@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Google Forms response parsing, compiled once per form
+
+``GoogleFormsProductionClient.parse_response_answers`` used to rebuild the
+form's question map from every item for every response it parsed, then test
+each answer for every answer kind in turn. ``FormResponseParser`` does the
+per-form work once: each question ID is mapped to the answer kind its
+question produces, so parsing an answer is one lookup and the expected kind's
+extraction. The output is identical to the old per-response parse, including
+for answers whose kind does not match their question.
+"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+_SKIP = object()
+
+
+def _text_answers(answer: Dict[str, Any]) -> Any:
+    answers = answer['textAnswers'].get('answers', [])
+    if len(answers) == 1:
+        return answers[0].get('value')
+    return [a.get('value') for a in answers]
+
+
+def _file_upload_answers(answer: Dict[str, Any]) -> Any:
+    return [a.get('fileId') for a in answer['fileUploadAnswers'].get('answers', [])]
+
+
+def _grade(answer: Dict[str, Any]) -> Any:
+    grade = answer['grade']
+    return {
+        'score': grade.get('score'),
+        'correct': grade.get('correct'),
+        'feedback': grade.get('feedback')
+    }
+
+
+def parse_answer(answer: Dict[str, Any]) -> Any:
+    """Parse one answer by the kinds it carries; ``_SKIP`` when it has none"""
+    if 'textAnswers' in answer:
+        return _text_answers(answer)
+    if 'fileUploadAnswers' in answer:
+        return _file_upload_answers(answer)
+    if 'grade' in answer:
+        return _grade(answer)
+    return _SKIP
+
+
+def _question_ids(item: Dict[str, Any]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    if 'questionItem' in item:
+        question = item['questionItem']['question']
+        yield question['questionId'], question
+    for question in item.get('questionGroupItem', {}).get('questions', []):
+        yield question['questionId'], question
+
+
+class FormResponseParser:
+    """
+    Answer parsing for one form, compiled from its definition
+
+    Usage::
+
+        parser = FormResponseParser(form)
+        parsed = parser.parse_batch(responses)
+
+    Build a new parser if the form's questions change.
+    """
+
+    def __init__(self, form: Dict[str, Any]):
+        self.form_id = form.get('formId')
+        # question ID -> the answer key its question produces
+        self._answer_keys: Dict[str, str] = {}
+        for item in form.get('items', []):
+            for question_id, question in _question_ids(item):
+                if 'fileUploadQuestion' in question:
+                    self._answer_keys[question_id] = 'fileUploadAnswers'
+                else:
+                    self._answer_keys[question_id] = 'textAnswers'
+
+    def parse(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse one response's answers, keyed by question ID, plus ``_metadata``"""
+        parsed = {}
+        answer_keys = self._answer_keys
+
+        for answer in response.get('answers', {}).values():
+            question_id = answer.get('questionId')
+            expected = answer_keys.get(question_id)
+            # The expected kind is handled inline; anything else (a kind the
+            # question does not produce, or an unknown question) goes through
+            # parse_answer, which applies the same precedence.
+            if expected == 'textAnswers' and 'textAnswers' in answer:
+                answers = answer['textAnswers'].get('answers', [])
+                if len(answers) == 1:
+                    parsed[question_id] = answers[0].get('value')
+                else:
+                    parsed[question_id] = [a.get('value') for a in answers]
+            elif expected == 'fileUploadAnswers' and 'fileUploadAnswers' in answer \
+                    and 'textAnswers' not in answer:
+                parsed[question_id] = [a.get('fileId') for a in answer['fileUploadAnswers'].get('answers', [])]
+            else:
+                value = parse_answer(answer)
+                if value is not _SKIP:
+                    parsed[question_id] = value
+
+        parsed['_metadata'] = {
+            'response_id': response.get('responseId'),
+            'form_id': response.get('formId'),
+            'created_time': response.get('createTime'),
+            'last_submitted_time': response.get('lastSubmittedTime'),
+            'respondent_email': response.get('respondentEmail')
+        }
+
+        return parsed
+
+    def parse_batch(self, responses: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Parse a batch of responses, in order"""
+        parse = self.parse
+        return [parse(response) for response in responses]
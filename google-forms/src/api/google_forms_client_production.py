@@ -18,6 +18,11 @@ from googleapiclient.errors import HttpError
 import logging
 from enum import Enum
 
+try:
+    from .form_response_parser import FormResponseParser
+except ImportError:  # run as a script
+    from form_response_parser import FormResponseParser
+
 
 class GoogleFormsRateLimitError(Exception):
     """Google Forms rate limit exceeded"""
@@ -60,6 +65,14 @@ class GoogleFormsProductionClient:
         'requests_per_second': 10
     }
     
+    # Forms exported per batch request. Each needs three calls (form, watches,
+    # first response page), kept under the batch endpoint's 100-call limit.
+    FORMS_PER_BATCH = 30
+    BATCH_CALL_LIMIT = 100
+    
+    # The responses endpoint's maximum page size
+    RESPONSE_PAGE_SIZE = 5000
+    
     # OAuth2 scopes required
     SCOPES = [
         'https://www.googleapis.com/auth/forms.body',
@@ -88,6 +101,7 @@ class GoogleFormsProductionClient:
         
         # Cache for frequently used data
         self.form_cache = {}
+        self._response_parsers: Dict[tuple, FormResponseParser] = {}
         
         self.logger = logging.getLogger(__name__)
     
@@ -181,6 +195,69 @@ class GoogleFormsProductionClient:
                 self.logger.error(f"API error: {error}")
                 raise
     
+    def _execute_batch(self, requests: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute independent requests through Google's batch endpoint
+        
+        Args:
+            requests: ``{request_id: HttpRequest}``
+            
+        Returns:
+            ``{request_id: response}``, where a failed call's value is its
+            exception. Calls rate limited inside a batch are retried in the
+            next batch after a pause; each call counts against the rate limit.
+            When a whole batch fails, every call in it gets that exception.
+            
+        Raises:
+            GoogleFormsAuthError: When the batch or any call in it is
+                rejected with a 401
+        """
+        results: Dict[str, Any] = {}
+        pending = dict(requests)
+        
+        for attempt in range(3):
+            throttled: Dict[str, Any] = {}
+            answered = set()
+            
+            def callback(request_id, response, exception):
+                answered.add(request_id)
+                if isinstance(exception, HttpError) and exception.resp.status == 429:
+                    throttled[request_id] = pending[request_id]
+                results[request_id] = exception if exception is not None else response
+            
+            items = list(pending.items())
+            for start in range(0, len(items), self.BATCH_CALL_LIMIT):
+                chunk = items[start:start + self.BATCH_CALL_LIMIT]
+                batch = self.forms_service.new_batch_http_request(callback=callback)
+                for request_id, request in chunk:
+                    self._check_rate_limit()
+                    batch.add(request, request_id=request_id)
+                try:
+                    batch.execute()
+                except Exception as error:
+                    self._raise_if_unauthorized(error)
+                    self.logger.error(f"Batch of {len(chunk)} call(s) failed: {error}")
+                    for request_id, _ in chunk:
+                        if request_id not in answered:
+                            results[request_id] = error
+            
+            for request_id in answered:
+                self._raise_if_unauthorized(results[request_id])
+            
+            if not throttled or attempt == 2:
+                break
+            self.logger.warning(f"Rate limited on {len(throttled)} batched call(s). Waiting 60s")
+            time.sleep(60)
+            pending = throttled
+        
+        return results
+    
+    @staticmethod
+    def _raise_if_unauthorized(error: Any):
+        """Raise ``GoogleFormsAuthError`` for a 401, as ``_execute_request`` does"""
+        if isinstance(error, HttpError) and error.resp.status == 401:
+            raise GoogleFormsAuthError(f"Authentication failed: {error}")
+    
     # ============= ACTUAL GOOGLE FORMS API ENDPOINTS =============
     
     def test_connection(self) -> bool:
@@ -265,12 +342,16 @@ class GoogleFormsProductionClient:
     
     # ============= FORM STRUCTURE ANALYSIS =============
     
-    def analyze_form_complexity(self, form_id: str) -> Dict[str, Any]:
+    def analyze_form_complexity(self, form_id: str, form: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analyze form complexity for transformation
         Google Forms has simpler structure than other form builders
+        
+        Pass ``form`` when it has already been fetched; otherwise it is
+        fetched by ID.
         """
-        form = self.get_form(form_id)
+        if form is None:
+            form = self.get_form(form_id)
         
         analysis = {
             'item_count': len(form.get('items', [])),
@@ -388,8 +469,6 @@ class GoogleFormsProductionClient:
             page_token = result.get('nextPageToken')
             if not page_token:
                 break
-            
-            time.sleep(0.5)  # Rate limit pause
     
     def batch_get_responses(self, form_id: str, 
                            batch_size: int = 100) -> Generator[List[Dict], None, None]:
@@ -413,15 +492,98 @@ class GoogleFormsProductionClient:
             page_token = result.get('nextPageToken')
             if not page_token:
                 break
-            
-            time.sleep(0.5)  # Rate limit pause
+    
+    def _responses_request(self, form_id: str, page_token: str = None):
+        return self.forms_service.forms().responses().list(
+            formId=form_id,
+            pageSize=self.RESPONSE_PAGE_SIZE,
+            pageToken=page_token
+        )
+    
+    def _export_form_group(self, forms_metadata: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Export a group of forms through batch requests
+        
+        The first batch fetches every form's definition, watches and first
+        response page together; each later batch fetches the next response
+        page of every form that has one. Each form's wall time runs from the
+        group's start to its last page.
+        
+        Returns:
+            ``(form_metadata, form_data, error)`` per form, in input order;
+            ``form_data`` is None when ``error`` is set
+        """
+        started = time.perf_counter()
+        forms = self.forms_service.forms()
+        requests = {}
+        for metadata in forms_metadata:
+            form_id = metadata['id']
+            requests[f'form:{form_id}'] = forms.get(formId=form_id)
+            requests[f'watches:{form_id}'] = forms.watches().list(formId=form_id)
+            requests[f'responses:{form_id}'] = self._responses_request(form_id)
+        results = self._execute_batch(requests)
+        
+        exported: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, Exception] = {}
+        page_tokens: Dict[str, str] = {}
+        
+        def add_page(form_id: str, page: Any):
+            if isinstance(page, Exception):
+                errors[form_id] = page
+                exported.pop(form_id, None)
+                return
+            page = page or {}
+            exported[form_id]['responses'].extend(page.get('responses', []))
+            if page.get('nextPageToken'):
+                page_tokens[form_id] = page['nextPageToken']
+            else:
+                exported[form_id]['export_seconds'] = round(time.perf_counter() - started, 3)
+        
+        for metadata in forms_metadata:
+            form_id = metadata['id']
+            form = results.get(f'form:{form_id}')
+            watches = results.get(f'watches:{form_id}')
+            failed = next((r for r in (form, watches) if isinstance(r, Exception)), None)
+            if failed is not None:
+                errors[form_id] = failed
+                continue
+            form = form or {}
+            form['metadata'] = metadata
+            form['watches'] = (watches or {}).get('watches', [])
+            form['responses'] = []
+            exported[form_id] = form
+            add_page(form_id, results.get(f'responses:{form_id}'))
+        
+        while page_tokens:
+            requests = {
+                f'responses:{form_id}': self._responses_request(form_id, token)
+                for form_id, token in page_tokens.items()
+            }
+            page_tokens = {}
+            results = self._execute_batch(requests)
+            for request_id, page in results.items():
+                add_page(request_id.split(':', 1)[1], page)
+        
+        return [
+            (metadata, exported.get(metadata['id']), errors.get(metadata['id']))
+            for metadata in forms_metadata
+        ]
     
     def get_all_data(self) -> Dict[str, Any]:
         """
         Get all data for migration
         
+        Each form definition is fetched once, and forms are exported in
+        groups through batch requests. Every response is included, and each
+        form records its export wall time in ``export_seconds``. A form whose
+        calls fail, including a batch that fails as a whole, is listed in
+        ``failed_forms`` and the export carries on.
+        
         Returns:
             Complete data structure for migration
+            
+        Raises:
+            GoogleFormsAuthError: When a call is rejected with a 401
         """
         self.logger.info("Starting complete Google Forms data export")
         
@@ -430,53 +592,39 @@ class GoogleFormsProductionClient:
             'forms': [],
             'total_forms': 0,
             'total_responses': 0,
-            'total_items': 0
+            'total_items': 0,
+            'failed_forms': []
         }
         
         # Get all forms
         self.logger.info("Fetching forms...")
         
         for form_batch in self.batch_get_forms():
-            for form_metadata in form_batch:
-                self.logger.info(f"Processing form: {form_metadata['name']}")
+            for start in range(0, len(form_batch), self.FORMS_PER_BATCH):
+                group = form_batch[start:start + self.FORMS_PER_BATCH]
                 
-                try:
-                    # Get full form details
-                    form_data = self.get_form(form_metadata['id'])
+                for form_metadata, form_data, error in self._export_form_group(group):
+                    if error is not None:
+                        self.logger.error(f"  Error processing form {form_metadata['id']}: {error}")
+                        data['failed_forms'].append({'id': form_metadata['id'], 'error': str(error)})
+                        continue
                     
                     # Analyze complexity
-                    form_data['complexity_analysis'] = self.analyze_form_complexity(form_metadata['id'])
+                    form_data['complexity_analysis'] = self.analyze_form_complexity(
+                        form_metadata['id'], form=form_data
+                    )
                     data['total_items'] += form_data['complexity_analysis']['item_count']
                     
-                    # Get watches (webhooks)
-                    form_data['watches'] = self.get_form_watches(form_metadata['id'])
-                    
-                    # Get responses
-                    form_data['responses'] = []
-                    response_count = 0
-                    
-                    for response_batch in self.batch_get_responses(form_metadata['id']):
-                        form_data['responses'].extend(response_batch)
-                        response_count += len(response_batch)
-                        
-                        # Limit responses to avoid huge exports
-                        if response_count >= 5000:
-                            self.logger.warning(f"  Limiting responses to 5000 for form {form_metadata['id']}")
-                            break
-                    
+                    response_count = len(form_data['responses'])
                     data['total_responses'] += response_count
                     
                     data['forms'].append(form_data)
                     data['total_forms'] += 1
                     
-                    self.logger.info(f"  Processed {response_count} responses")
-                    
-                except Exception as e:
-                    self.logger.error(f"  Error processing form {form_metadata['id']}: {e}")
-                    continue
-                
-                # Rate limit pause
-                time.sleep(1)
+                    self.logger.info(
+                        f"Processed form {form_metadata['name']}: {response_count} responses "
+                        f"in {form_data['export_seconds']:.2f}s"
+                    )
         
         self.logger.info(f"Export complete: {data['total_forms']} forms, {data['total_responses']} responses")
         
@@ -484,54 +632,29 @@ class GoogleFormsProductionClient:
     
     # ============= RESPONSE PARSING =============
     
+    def response_parser(self, form: Dict[str, Any]) -> FormResponseParser:
+        """
+        The compiled answer parser for a form
+        
+        Cached per form ID and revision, so a form edited since the last
+        parse gets a fresh parser.
+        """
+        if not form.get('formId'):
+            return FormResponseParser(form)
+        key = (form['formId'], form.get('revisionId'))
+        parser = self._response_parsers.get(key)
+        if parser is None:
+            parser = self._response_parsers[key] = FormResponseParser(form)
+        return parser
+    
     def parse_response_answers(self, response: Dict[str, Any], form: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse response answers based on question types
-        """
-        parsed = {}
-        
-        # Create question map
-        question_map = {}
-        for item in form.get('items', []):
-            if 'questionItem' in item:
-                question_id = item['questionItem']['question']['questionId']
-                question_map[question_id] = item['questionItem']['question']
         
-        # Parse answers
-        for answer in response.get('answers', {}).values():
-            question_id = answer.get('questionId')
-            
-            if 'textAnswers' in answer:
-                # Text response
-                answers = answer['textAnswers'].get('answers', [])
-                if len(answers) == 1:
-                    parsed[question_id] = answers[0].get('value')
-                else:
-                    parsed[question_id] = [a.get('value') for a in answers]
-            
-            elif 'fileUploadAnswers' in answer:
-                # File upload response
-                answers = answer['fileUploadAnswers'].get('answers', [])
-                parsed[question_id] = [a.get('fileId') for a in answers]
-            
-            elif 'grade' in answer:
-                # Graded response
-                parsed[question_id] = {
-                    'score': answer['grade'].get('score'),
-                    'correct': answer['grade'].get('correct'),
-                    'feedback': answer['grade'].get('feedback')
-                }
-        
-        # Add metadata
-        parsed['_metadata'] = {
-            'response_id': response.get('responseId'),
-            'form_id': response.get('formId'),
-            'created_time': response.get('createTime'),
-            'last_submitted_time': response.get('lastSubmittedTime'),
-            'respondent_email': response.get('respondentEmail')
-        }
-        
-        return parsed
+        For many responses, parse them together with
+        ``response_parser(form).parse_batch(responses)``.
+        """
+        return self.response_parser(form).parse(response)
     
     # ============= CREATE OPERATIONS =============
     
@@ -0,0 +1,260 @@
+"""Tests for exporting Google Forms through batch requests.
+
+`get_all_data` used to fetch every form twice -- once directly and again
+inside `analyze_form_complexity` -- then its watches and responses one call
+at a time, stopping at 5000 responses. It now exports forms in groups through
+the batch endpoint. These drive it against a fake `forms_service` whose
+`new_batch_http_request` records every batch, and pin that each form is
+fetched once, that groups and batches are split at their limits, that
+response pages are followed to the end, that throttled calls are retried in
+a later batch, and that a form whose calls fail -- or whose whole batch
+fails -- is listed in `failed_forms` while its siblings export.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import httplib2
+    from googleapiclient.errors import HttpError
+    from src.api import google_forms_client_production as production
+except ImportError:  # the Google API client is not installed
+    production = None
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({'status': status}), b'{}')
+
+
+class FakeRequest:
+
+    def __init__(self, kind, form_id, page_token=None, page_size=None):
+        self.kind = kind
+        self.form_id = form_id
+        self.page_token = page_token
+        self.page_size = page_size
+
+
+class FakeBatch:
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        service = self.service
+        service.batches.append([request_id for request_id, _ in self.requests])
+        failure = service.batch_failures.pop(len(service.batches) - 1, None)
+        if failure is not None:
+            raise failure
+        for request_id, request in self.requests:
+            response, exception = service.answer(request_id, request)
+            self.callback(request_id, response, exception)
+
+
+class FakeForms:
+
+    def __init__(self, service):
+        self.service = service
+
+    def get(self, formId):
+        return FakeRequest('form', formId)
+
+    def watches(self):
+        return self
+
+    def responses(self):
+        return FakeResponses()
+
+    def list(self, formId):
+        return FakeRequest('watches', formId)
+
+
+class FakeResponses:
+
+    def list(self, formId, pageSize, pageToken=None):
+        return FakeRequest('responses', formId, pageToken, pageSize)
+
+
+class FakeFormsService:
+    """
+    Serves forms from ``{form_id: [response page sizes]}``.
+
+    ``errors`` maps a request id (``'form:f1'``, ``'responses:f1:2'`` for the
+    third page) to the statuses it fails with, one per attempt;
+    ``batch_failures`` maps a batch's index to what its ``execute`` raises.
+    """
+
+    def __init__(self, pages, errors=None, batch_failures=None):
+        self.pages = pages
+        self.errors = {key: list(statuses) for key, statuses in (errors or {}).items()}
+        self.batch_failures = dict(batch_failures or {})
+        self.batches = []
+        self.requests = []
+
+    def forms(self):
+        return FakeForms(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def answer(self, request_id, request):
+        self.requests.append(request)
+        page = int(request.page_token or 0)
+        key = f'{request_id}:{page}' if request.kind == 'responses' and page else request_id
+        statuses = self.errors.get(key)
+        if statuses:
+            return None, http_error(statuses.pop(0))
+
+        form_id = request.form_id
+        if request.kind == 'form':
+            items = [{'questionItem': {'question': {'questionId': 'q1', 'textQuestion': {}}}}]
+            return {'formId': form_id, 'items': items}, None
+        if request.kind == 'watches':
+            return {'watches': [{'id': f'watch-{form_id}'}]}, None
+
+        sizes = self.pages[form_id]
+        response = {'responses': [
+            {'responseId': f'{form_id}-{page}-{n}'} for n in range(sizes[page] if sizes else 0)
+        ]}
+        if page + 1 < len(sizes):
+            response['nextPageToken'] = str(page + 1)
+        return response, None
+
+
+@unittest.skipIf(production is None, 'google-forms requirements are not installed')
+class BatchedExportTest(unittest.TestCase):
+
+    def setUp(self):
+        sleep = patch.object(production.time, 'sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def export(self, service, form_ids, **limits):
+        client = production.GoogleFormsProductionClient.__new__(production.GoogleFormsProductionClient)
+        client.forms_service = service
+        client.request_times = []
+        client.minute_start = production.datetime.now()
+        client.requests_this_minute = 0
+        client.form_cache = {}
+        client._response_parsers = {}
+        client.logger = production.logging.getLogger(__name__)
+        for name, value in limits.items():
+            setattr(client, name, value)
+        listing = [{'id': form_id, 'name': f'Form {form_id}'} for form_id in form_ids]
+        with patch.object(client, 'batch_get_forms', return_value=iter([listing])), \
+                patch.object(client, 'get_form', side_effect=AssertionError('fetched again')) as get_form:
+            data = client.get_all_data()
+        self.assertFalse(get_form.called)
+        return data
+
+    def test_each_form_is_fetched_once(self):
+        service = FakeFormsService({'f1': [2], 'f2': []})
+        data = self.export(service, ['f1', 'f2'])
+
+        fetched = [request.form_id for request in service.requests if request.kind == 'form']
+        self.assertEqual(fetched, ['f1', 'f2'])
+        self.assertEqual(data['total_forms'], 2)
+        self.assertEqual(data['total_responses'], 2)
+        self.assertEqual(data['total_items'], 2)
+        self.assertEqual(data['forms'][0]['watches'], [{'id': 'watch-f1'}])
+        self.assertEqual(data['forms'][0]['metadata']['name'], 'Form f1')
+        self.assertEqual(data['forms'][0]['complexity_analysis']['item_count'], 1)
+        for form in data['forms']:
+            self.assertIsInstance(form['export_seconds'], float)
+            self.assertGreaterEqual(form['export_seconds'], 0)
+
+    def test_groups_split_at_forms_per_batch(self):
+        form_ids = [f'f{n}' for n in range(65)]
+        service = FakeFormsService({form_id: [1] for form_id in form_ids})
+        data = self.export(service, form_ids)
+
+        self.assertEqual([len(batch) for batch in service.batches], [90, 90, 15])
+        self.assertEqual(data['total_forms'], 65)
+        self.assertEqual([form['formId'] for form in data['forms']], form_ids)
+
+    def test_batches_split_at_the_call_limit(self):
+        form_ids = [f'f{n}' for n in range(35)]
+        service = FakeFormsService({form_id: [1] for form_id in form_ids})
+        data = self.export(service, form_ids, BATCH_CALL_LIMIT=40)
+
+        self.assertEqual([len(batch) for batch in service.batches], [40, 40, 10, 15])
+        self.assertEqual(data['total_forms'], 35)
+
+    def test_response_pages_are_followed_to_the_end(self):
+        service = FakeFormsService({'big': [5000, 5000, 2000], 'small': [3]})
+        data = self.export(service, ['big', 'small'])
+
+        big, small = data['forms']
+        self.assertEqual(len(big['responses']), 12000)
+        self.assertEqual(big['responses'][-1]['responseId'], 'big-2-1999')
+        self.assertEqual(len(small['responses']), 3)
+        self.assertEqual(data['total_responses'], 12003)
+
+        pages = [(r.page_token, r.page_size) for r in service.requests
+                 if r.kind == 'responses' and r.form_id == 'big']
+        self.assertEqual(pages, [(None, 5000), ('1', 5000), ('2', 5000)])
+        # The second and third pages are fetched in batches of their own.
+        self.assertEqual(service.batches[1:], [['responses:big'], ['responses:big']])
+
+    def test_a_throttled_call_is_retried_in_the_next_batch(self):
+        service = FakeFormsService({'f1': [1], 'f2': [1]}, errors={'form:f1': [429]})
+        data = self.export(service, ['f1', 'f2'])
+
+        self.assertEqual(service.batches[1], ['form:f1'])
+        self.sleep.assert_called_once_with(60)
+        self.assertEqual(data['total_forms'], 2)
+        self.assertEqual(data['failed_forms'], [])
+
+    def test_calls_still_throttled_after_three_attempts_come_back_as_errors(self):
+        service = FakeFormsService({'f1': [1], 'f2': [1]}, errors={'watches:f2': [429] * 3})
+        data = self.export(service, ['f1', 'f2'])
+
+        self.assertEqual(service.batches[1:], [['watches:f2'], ['watches:f2']])
+        self.assertEqual([form['formId'] for form in data['forms']], ['f1'])
+        self.assertEqual([failed['id'] for failed in data['failed_forms']], ['f2'])
+        self.assertIn('429', data['failed_forms'][0]['error'])
+
+    def test_a_failed_call_fails_only_its_form(self):
+        service = FakeFormsService(
+            {'bad_form': [1], 'bad_watches': [1], 'bad_page': [1, 1], 'good': [1, 1]},
+            errors={'form:bad_form': [404], 'watches:bad_watches': [500], 'responses:bad_page:1': [403]},
+        )
+        data = self.export(service, ['bad_form', 'bad_watches', 'bad_page', 'good'])
+
+        self.assertEqual([form['formId'] for form in data['forms']], ['good'])
+        self.assertEqual(len(data['forms'][0]['responses']), 2)
+        self.assertEqual([failed['id'] for failed in data['failed_forms']],
+                         ['bad_form', 'bad_watches', 'bad_page'])
+        self.assertEqual(data['total_responses'], 2)
+
+    def test_a_failed_batch_fails_only_its_forms(self):
+        form_ids = [f'f{n}' for n in range(35)]
+        service = FakeFormsService({form_id: [1] for form_id in form_ids},
+                                   batch_failures={0: httplib2.ServerNotFoundError('unreachable')})
+        data = self.export(service, form_ids)
+
+        self.assertEqual([failed['id'] for failed in data['failed_forms']], form_ids[:30])
+        self.assertIn('unreachable', data['failed_forms'][0]['error'])
+        self.assertEqual([form['formId'] for form in data['forms']], form_ids[30:])
+
+    def test_a_401_stops_the_export(self):
+        service = FakeFormsService({'f1': [1]}, batch_failures={0: http_error(401)})
+        with self.assertRaises(production.GoogleFormsAuthError):
+            self.export(service, ['f1'])
+
+        service = FakeFormsService({'f1': [1], 'f2': [1]}, errors={'responses:f2': [401]})
+        with self.assertRaises(production.GoogleFormsAuthError):
+            self.export(service, ['f1', 'f2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,16 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 import logging
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class JotFormRateLimitError(Exception):
     """JotForm rate limit exceeded"""
@@ -86,7 +96,7 @@ class JotFormProductionClient:
         else:
             self.base_url = self.BASE_URL
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.params = {'apiKey': self.api_key}
         self.session.headers.update({
             'Accept': 'application/json',
@@ -157,8 +167,7 @@ class JotFormProductionClient:
                 method=method,
                 url=url,
                 params=params,
-                json=data,
-                timeout=30
+                json=data
             )
             
             # Check for rate limit response
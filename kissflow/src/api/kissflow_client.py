@@ -6,10 +6,19 @@ import logging
 import json
 from typing import Dict, List, Optional, Any, Generator
 from datetime import datetime
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from urllib.parse import urljoin
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,8 +45,6 @@ class KissflowClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries with exponential backoff
         retry_strategy = Retry(
             total=5,
@@ -45,9 +52,7 @@ class KissflowClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT", "DELETE", "PATCH"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=10)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set authentication headers
         session.headers.update({
@@ -84,8 +89,7 @@ class KissflowClient:
                 method=method,
                 url=url,
                 json=data,
-                params=params,
-                timeout=10
+                params=params
             )
             
             # Handle rate limiting
@@ -98,8 +102,7 @@ class KissflowClient:
                     method=method,
                     url=url,
                     json=data,
-                    params=params,
-                    timeout=10
+                    params=params
                 )
             
             response.raise_for_status()
@@ -15,6 +15,16 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 import logging
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class KissflowRateLimitError(Exception):
     """Kissflow rate limit exceeded"""
@@ -87,7 +97,7 @@ class KissflowProductionClient:
         if not self.api_key or not self.account_id:
             raise KissflowAuthError("KISSFLOW_API_KEY and KISSFLOW_ACCOUNT_ID required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'api-key': self.api_key,
             'Accept': 'application/json',
@@ -158,8 +168,7 @@ class KissflowProductionClient:
                 method=method,
                 url=url,
                 params=params,
-                json=data,
-                timeout=30
+                json=data
             )
             
             # Check for rate limit response
@@ -16,8 +16,8 @@ _sys.path.insert(
     _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_captures
+from shared.http_transport import create_session
 
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 # Vendor entry points run as scripts, so only the vendor root is on sys.path and
@@ -28,7 +28,6 @@ if _REPO_ROOT not in sys.path:
     sys.path.insert(0, _REPO_ROOT)
 
 from shared.kickoff_fields import KickoffFieldCache
-from shared.prerun_encoder import build_prerun_payload
 
 logger = logging.getLogger(__name__)
 
@@ -70,17 +69,13 @@ class TallyfyClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries
         retry_strategy = Retry(
             total=5,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set headers
         session.headers.update({
@@ -279,10 +274,10 @@ class TallyfyClient:
 
         Kissflow keys its values by field NAME, which is the identifier shared
         with the Tallyfy kick-off field's label; the encoder resolves those to
-        timeline_ids and encodes each value for its field type.
+        timeline_ids and encodes each value for its field type. The encoding is
+        compiled once per template and reused for every launch against it.
         """
-        kickoff_fields = self._kickoff_field_cache.require(checklist_id)
-        return build_prerun_payload(data, kickoff_fields, strict=True)
+        return self._kickoff_field_cache.plan(checklist_id).build(data, strict=True)
     
     def update_task(self, task_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a task.
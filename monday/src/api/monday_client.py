@@ -3,11 +3,20 @@
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, Generator
+from typing import Dict, List, Optional, Any, Generator, Tuple
 import requests
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,17 +46,13 @@ class MondayClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries
         retry_strategy = Retry(
             total=5,
             backoff_factor=2,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set headers
         session.headers.update({
@@ -240,16 +245,46 @@ class MondayClient:
             page += 1
     
     def get_board_items(self, board_id: int,
-                       limit: int = 1000) -> Generator[Dict[str, Any], None, None]:
+                       limit: Optional[int] = None) -> Generator[Dict[str, Any], None, None]:
         """Get items from a board with pagination.
         
         Args:
             board_id: Board ID
-            limit: Maximum number of items
+            limit: Maximum number of items (None pages the board to completion)
             
         Yields:
             Item objects with column values
         """
+        items_yielded = 0
+        
+        for items, _cursor in self.iter_board_item_pages(board_id):
+            for item in items:
+                yield item
+                items_yielded += 1
+                if limit is not None and items_yielded >= limit:
+                    return
+    
+    def iter_board_item_pages(self, board_id: int, cursor: Optional[str] = None,
+                              page_size: Optional[int] = None
+                              ) -> Generator[Tuple[List[Dict[str, Any]], Optional[str]], None, None]:
+        """Page through a board's items one ``items_page`` at a time.
+        
+        Each page is yielded together with the cursor that fetches the page
+        AFTER it, so a caller can checkpoint the cursor once the page has been
+        fully handled and resume from exactly there. Only one page is held in
+        memory at a time.
+        
+        Monday.com cursors expire 60 minutes after they are issued, so a cursor
+        saved by an interrupted run is only useful for a prompt resume.
+        
+        Args:
+            board_id: Board ID
+            cursor: Cursor to resume from (None starts at the first page)
+            page_size: Items per page (max 500)
+            
+        Yields:
+            ``(items, next_cursor)`` tuples; ``next_cursor`` is None on the last page
+        """
         query = """
         query GetBoardItems($board_id: ID!, $limit: Int!, $cursor: String) {
             boards(ids: [$board_id]) {
@@ -314,36 +349,31 @@ class MondayClient:
         }
         """
         
-        cursor = None
-        items_yielded = 0
+        page_size = min(page_size or self.DEFAULT_PAGE_SIZE, self.DEFAULT_PAGE_SIZE)
         
-        while items_yielded < limit:
+        while True:
             variables = {
                 'board_id': board_id,
-                'limit': min(self.DEFAULT_PAGE_SIZE, limit - items_yielded),
+                'limit': page_size,
                 'cursor': cursor
             }
             
             result = self.execute_query(query, variables)
             
             if not result.get('boards'):
-                break
+                return
             
-            items_page = result['boards'][0].get('items_page', {})
-            items = items_page.get('items', [])
+            items_page = result['boards'][0].get('items_page') or {}
+            items = items_page.get('items') or []
+            cursor = items_page.get('cursor')
             
             if not items:
-                break
+                return
             
-            for item in items:
-                yield item
-                items_yielded += 1
-                if items_yielded >= limit:
-                    return
+            yield items, cursor
             
-            cursor = items_page.get('cursor')
             if not cursor:
-                break
+                return
     
     def get_users(self) -> List[Dict[str, Any]]:
         """Get all users in the account.
@@ -15,6 +15,16 @@ import logging
 from enum import Enum
 from dataclasses import dataclass
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class MondayRateLimitError(Exception):
     """Monday.com rate limit exceeded"""
@@ -109,7 +119,7 @@ class MondayProductionClient:
         if not self.api_key:
             raise MondayAuthError("MONDAY_API_KEY required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': self.api_key,
             'API-Version': '2024-01',
@@ -151,8 +161,7 @@ class MondayProductionClient:
         try:
             response = self.session.post(
                 self.BASE_URL,
-                json=payload,
-                timeout=30
+                json=payload
             )
             
             # Update complexity tracking
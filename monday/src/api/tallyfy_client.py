@@ -2,6 +2,7 @@
 
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 
 # The repo root holds the shared package. This module is imported both via
@@ -13,8 +14,8 @@ _sys.path.insert(
     _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_captures
+from shared.http_transport import create_session
 
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,11 @@ class TallyfyClient:
         'assignees_form' # User/guest assignment
     }
     
+    # Launches kept in flight at once by batch_create_processes. The session's
+    # connection pool is sized to match, so concurrent launches reuse sockets
+    # instead of opening (and discarding) one per request.
+    MAX_CONCURRENT_LAUNCHES = 8
+    
     def __init__(self, api_token: str, organization_id: str,
                  base_url: str = "https://go.tallyfy.com/api"):
         """Initialize Tallyfy client.
@@ -53,17 +59,13 @@ class TallyfyClient:
         
     def _create_session(self) -> requests.Session:
         """Create HTTP session with retry strategy."""
-        session = requests.Session()
-        
         # Configure retries
         retry_strategy = Retry(
             total=5,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy, concurrency=self.MAX_CONCURRENT_LAUNCHES)
         
         # Set headers
         session.headers.update({
@@ -232,6 +234,109 @@ class TallyfyClient:
         response.raise_for_status()
         return response.json()
     
+    def batch_create_processes(self, processes: List[Dict[str, Any]],
+                               max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Launch a batch of processes concurrently.
+        
+        Each entry is a transformed process as produced by
+        ``InstanceTransformer.transform_item_to_process``. Its ``comments``
+        (the item's updates) are posted onto the launched process as part of
+        the same unit of work, so a batch returns with both done.
+        
+        Results are correlated by the source item's ``metadata.original_id``,
+        never by list position: one launch failing does not shift or abort
+        its siblings, it just comes back with ``error`` set.
+        
+        Args:
+            processes: Transformed processes to launch
+            max_workers: Launches in flight at once (defaults to
+                MAX_CONCURRENT_LAUNCHES)
+            
+        Returns:
+            One result per input, in input order::
+            
+                {'original_id': ..., 'process': {...} or None,
+                 'error': str or None, 'comments_posted': int,
+                 'comment_errors': [str, ...]}
+        """
+        if not processes:
+            return []
+        
+        workers = min(max_workers or self.MAX_CONCURRENT_LAUNCHES, len(processes))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._launch_process, processes))
+    
+    def _launch_process(self, process: Dict[str, Any]) -> Dict[str, Any]:
+        """Launch one process and post its comments; never raises."""
+        result = {
+            'original_id': (process.get('metadata') or {}).get('original_id'),
+            'process': None,
+            'error': None,
+            'comments_posted': 0,
+            'comment_errors': []
+        }
+        
+        try:
+            created = self.create_process(
+                checklist_id=process['checklist_id'],
+                name=process['name'],
+                data=process.get('data')
+            )
+        except Exception as e:
+            result['error'] = str(e)
+            return result
+        
+        run = created.get('data', created) if isinstance(created, dict) else created
+        result['process'] = run
+        
+        comments = process.get('comments') or []
+        if not comments:
+            return result
+        
+        try:
+            task_id = self._first_task_id(run)
+        except Exception as e:
+            result['comment_errors'].append(f"Could not resolve a task for comments: {e}")
+            return result
+        
+        if task_id is None:
+            result['comment_errors'].append(
+                f"Process {run.get('id')} has no tasks; {len(comments)} comment(s) not migrated"
+            )
+            return result
+        
+        for comment in comments:
+            try:
+                self.add_comment(task_id, comment["text"])
+                result['comments_posted'] += 1
+            except Exception as e:
+                original_id = (comment.get('metadata') or {}).get('original_id')
+                result['comment_errors'].append(f"Comment {original_id}: {e}")
+        
+        return result
+    
+    def _first_task_id(self, run: Dict[str, Any]) -> Optional[str]:
+        """Return the id of a launched process's first task.
+        
+        Uses the tasks embedded in the launch response when present, and only
+        fetches them when they are not.
+        """
+        tasks = run.get('tasks')
+        if tasks is None:
+            response = self.session.get(
+                f"{self.base_url}/organizations/{self.organization_id}/runs/{run['id']}/tasks"
+            )
+            response.raise_for_status()
+            tasks = response.json()
+        
+        if isinstance(tasks, dict):
+            tasks = tasks.get('data') or []
+        
+        for task in tasks:
+            if isinstance(task, dict) and task.get('id'):
+                return task['id']
+        return None
+    
     def update_task(self, task_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a task.
         
@@ -1,11 +1,12 @@
 """Main migration orchestrator for Monday.com to Tallyfy."""
 
 import argparse
+import itertools
 import json
 import logging
 import sys
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 
 from .api.monday_client import MondayClient
@@ -18,6 +19,8 @@ from .utils.progress_tracker import ProgressTracker
 from .utils.validator import Validator
 from .utils.checkpoint_manager import CheckpointManager
 from .utils.error_handler import ErrorHandler
+# Importable once the API clients above have put the repo root on sys.path.
+from shared.transform_pool import TransformStage
 
 # Configure logging
 logging.basicConfig(
@@ -115,7 +118,8 @@ class MondayMigrator:
             logger.info("\n" + "=" * 60)
             logger.info("PHASE 4: PROCESS MIGRATION")
             logger.info("=" * 60)
-            process_results = self._phase_processes(discovery_data['items'], blueprint_results)
+            process_results = self._phase_processes(discovery_data['boards'], blueprint_results)
+            discovery_data['stats']['items'] = process_results['items_seen']
             
             # Phase 5: Validation
             logger.info("\n" + "=" * 60)
@@ -170,7 +174,6 @@ class MondayMigrator:
             'boards': [],
             'users': [],
             'teams': [],
-            'items': [],
             'stats': {}
         }
         
@@ -213,29 +216,24 @@ class MondayMigrator:
             
             logger.info(f"Found {len(discovery['users'])} users and {len(discovery['teams'])} teams")
             
-            # Get items from boards
-            logger.info("Fetching items from boards...")
-            total_items = 0
-            for board in discovery['boards']:
-                board_id = board.get('id')
-                items = self.monday.get_items(
-                    board_id=board_id,
-                    include_column_values=True,
-                    include_subitems=True,
-                    include_updates=True
-                )
-                
-                # Add board reference to items
-                for item in items:
-                    item['board_id'] = board_id
-                    item['board_name'] = board.get('name')
-                
-                discovery['items'].extend(items)
-                total_items += len(items)
+            # Items are deliberately NOT collected here. They stream board by
+            # board, one page at a time, straight into process creation (see
+            # _phase_processes), so the account's items are never all held in
+            # memory. A report-only run still needs the total, so it pages
+            # through each board keeping nothing but the count.
+            total_items = None
+            if self.report_only:
+                logger.info("Counting items on boards...")
+                total_items = 0
+                for board in discovery['boards']:
+                    board_count = sum(
+                        len(items) for items, _ in
+                        self.monday.iter_board_item_pages(board.get('id'))
+                    )
+                    total_items += board_count
+                    logger.info(f"  Board '{board.get('name')}': {board_count} items")
                 
-                logger.info(f"  Board '{board.get('name')}': {len(items)} items")
-            
-            logger.info(f"Total items found: {total_items}")
+                logger.info(f"Total items found: {total_items}")
             
             # Calculate statistics
             discovery['stats'] = {
@@ -243,9 +241,9 @@ class MondayMigrator:
                 'boards': len(discovery['boards']),
                 'users': len(discovery['users']),
                 'teams': len(discovery['teams']),
-                'items': len(discovery['items']),
-                'complexity_estimate': self._estimate_complexity(discovery)
+                'items': total_items
             }
+            discovery['stats']['complexity_estimate'] = self._estimate_complexity(discovery)
             
             self.progress.update('discovery', discovery['stats'])
             
@@ -462,85 +460,98 @@ class MondayMigrator:
             self.error_handler.handle_error(e, context="blueprints_phase")
             raise
     
-    def _phase_processes(self, items: List[Dict[str, Any]],
+    def _phase_processes(self, boards: List[Dict[str, Any]],
                         blueprint_results: Dict[str, Any]) -> Dict[str, Any]:
         """Phase 4: Migrate items as processes.
         
+        Items are streamed board by board: each page from the Monday.com
+        cursor flows through the transformer into process creation before the
+        next page is fetched, so peak memory tracks one page rather than the
+        whole account. The cursor is checkpointed past a page, and the board
+        marked done, only once every item on it has a process mapping; items
+        that already have one are skipped, so a resumed run picks up where the
+        last one stopped and retries only the items that failed.
+        
         Args:
-            items: Monday.com items
+            boards: Monday.com boards
             blueprint_results: Blueprint creation results
             
         Returns:
             Process migration results
         """
         results = {
+            'items_seen': 0,
             'processes_created': 0,
             'processes_skipped': 0,
+            'boards_skipped': 0,
             'comments_migrated': 0,
             'errors': []
         }
         
+        # Items are transformed in worker processes when TRANSFORM_PROCESSES
+        # is above 1, and in this one otherwise.
+        transform_stage = TransformStage()
+        
         try:
-            logger.info(f"Migrating {len(items)} items as processes...")
+            logger.info(f"Streaming items from {len(boards)} boards into processes...")
             
             # Get user mapping
             user_mapping = self.id_mapper.get_mappings('user')
             
-            # Group items by board
-            items_by_board = {}
-            for item in items:
-                board_id = item.get('board_id')
-                if board_id not in items_by_board:
-                    items_by_board[board_id] = []
-                items_by_board[board_id].append(item)
-            
-            # Process items by board
-            for board_id, board_items in items_by_board.items():
-                # Get blueprint ID
+            for board in boards:
+                board_id = board.get('id')
+                
+                if self.checkpoint.is_processed('board_items', board_id):
+                    logger.info(f"  Items of board {board_id} already migrated, skipping...")
+                    continue
+                
+                # Get blueprint ID. Without one there is nothing to launch, so
+                # the board's items are not fetched at all.
                 checklist_id = self.id_mapper.get_mapping('board', board_id)
                 if not checklist_id:
                     logger.warning(f"  No blueprint found for board {board_id}, skipping items...")
-                    results['processes_skipped'] += len(board_items)
+                    results['boards_skipped'] += 1
                     continue
                 
-                logger.info(f"  Processing {len(board_items)} items for board {board_id}")
-                
-                # Use batch transformer
-                batch_generator = self.instance_transformer.batch_transform_items(
-                    board_items, checklist_id, user_mapping, batch_size=50
-                )
+                logger.info(f"  Processing items for board '{board.get('name')}'")
                 
-                for batch in batch_generator:
-                    if not self.dry_run:
-                        try:
-                            # Create processes in batch
+                board_migrated = True
+                for items in self._stream_board_items(board):
+                    results['items_seen'] += len(items)
+                    
+                    pending = [
+                        item for item in items
+                        if not self.id_mapper.has_mapping('item', item.get('id'))
+                    ]
+                    results['processes_skipped'] += len(items) - len(pending)
+                    
+                    # Use batch transformer
+                    batch_generator = self.instance_transformer.batch_transform_items(
+                        pending, checklist_id, user_mapping, batch_size=50,
+                        stage=transform_stage
+                    )
+                    
+                    for batch in batch_generator:
+                        if not self.dry_run:
+                            # Launch the batch concurrently; each result carries
+                            # its item's ID, so a failure never shifts the mapping
                             logger.info(f"    Creating batch of {len(batch)} processes...")
-                            created_processes = self.tallyfy.batch_create_processes(batch)
-                            
-                            # Map items to processes
-                            for i, process in enumerate(created_processes):
-                                if i < len(batch):
-                                    original_id = batch[i]['metadata']['original_id']
-                                    self.id_mapper.add_mapping('item', original_id, process['id'])
-                            
-                            results['processes_created'] += len(created_processes)
-                            
-                        except Exception as e:
-                            error_msg = f"Failed to create process batch: {e}"
-                            logger.error(error_msg)
-                            results['errors'].append(error_msg)
-                    else:
-                        results['processes_created'] += len(batch)
+                            for launch in self.tallyfy.batch_create_processes(batch):
+                                self._record_launch(launch, results)
+                        else:
+                            results['processes_created'] += len(batch)
+                            results['comments_migrated'] += sum(
+                                len(process.get('comments', [])) for process in batch
+                            )
+                        
+                        self.progress.add('processes_processed', len(batch))
                     
-                    self.progress.add('processes_processed', len(batch))
+                    board_migrated = board_migrated and self._page_migrated(items)
                 
-                # Migrate item updates as comments
-                for item in board_items:
-                    if item.get('updates'):
-                        comments = self.instance_transformer.transform_updates(
-                            item['updates'], user_mapping
-                        )
-                        results['comments_migrated'] += len(comments)
+                # A board with a failed transform or launch stays unmarked, so
+                # the next run re-reads it and retries just those items.
+                if not self.dry_run and board_migrated:
+                    self.checkpoint.mark_processed('board_items', board_id)
             
             logger.info(f"Process migration complete: {results['processes_created']} created, "
                        f"{results['processes_skipped']} skipped")
@@ -554,6 +565,82 @@ class MondayMigrator:
         except Exception as e:
             self.error_handler.handle_error(e, context="processes_phase")
             raise
+        finally:
+            transform_stage.close()
+    
+    def _record_launch(self, launch: Dict[str, Any], results: Dict[str, Any]):
+        """Fold one batch launch result into the phase results.
+        
+        Args:
+            launch: Result entry from ``TallyfyClient.batch_create_processes``
+            results: Process phase results to update
+        """
+        item_id = launch['original_id']
+        
+        if launch['error']:
+            error_msg = f"Failed to create process for item {item_id}: {launch['error']}"
+            logger.error(error_msg)
+            results['errors'].append(error_msg)
+            return
+        
+        self.id_mapper.add_mapping('item', item_id, launch['process']['id'])
+        results['processes_created'] += 1
+        results['comments_migrated'] += launch['comments_posted']
+        
+        for comment_error in launch['comment_errors']:
+            error_msg = f"Item {item_id}: {comment_error}"
+            logger.warning(error_msg)
+            results['errors'].append(error_msg)
+    
+    def _page_migrated(self, items: List[Dict[str, Any]]) -> bool:
+        """Whether every item of a page has a process mapping."""
+        return all(self.id_mapper.has_mapping('item', item.get('id')) for item in items)
+    
+    def _stream_board_items(self, board: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield a board's items one page at a time, checkpointing the cursor.
+        
+        The cursor of the next page is saved only after the caller has finished
+        with the current one (i.e. when it asks for the next page), so an
+        interruption mid-page resumes at that page, never after it. A page with
+        an item that failed to migrate holds the cursor where it is for the rest
+        of the board, so the next run reads that page again.
+        
+        Args:
+            board: Monday.com board
+            
+        Yields:
+            Lists of items, each tagged with its board
+        """
+        board_id = board.get('id')
+        cursor = None if self.dry_run else self.checkpoint.get_board_cursor(board_id)
+        
+        pages = self.monday.iter_board_item_pages(board_id, cursor=cursor)
+        if cursor:
+            logger.info(f"    Resuming board {board_id} from saved cursor")
+            try:
+                first_page = next(pages, None)
+            except Exception as e:
+                # Monday.com cursors expire after 60 minutes. Restart the board;
+                # items that were already migrated are skipped by their mapping.
+                logger.warning(f"    Saved cursor for board {board_id} was rejected ({e}); "
+                               f"restarting the board")
+                pages = self.monday.iter_board_item_pages(board_id)
+                first_page = next(pages, None)
+            if first_page is None:
+                return
+            pages = itertools.chain([first_page], pages)
+        
+        advance = not self.dry_run
+        for items, next_cursor in pages:
+            for item in items:
+                item['board_id'] = board_id
+                item['board_name'] = board.get('name')
+            
+            yield items
+            
+            advance = advance and self._page_migrated(items)
+            if advance and next_cursor:
+                self.checkpoint.save_board_cursor(board_id, next_cursor)
     
     def _phase_validation(self) -> Dict[str, Any]:
         """Phase 5: Validate migration results.
@@ -626,7 +713,7 @@ class MondayMigrator:
         Returns:
             Complexity level
         """
-        total_items = discovery['stats']['items']
+        total_items = discovery['stats'].get('items') or 0
         total_boards = discovery['stats']['boards']
         total_users = discovery['stats']['users']
         
@@ -701,7 +788,7 @@ class MondayMigrator:
             })
         
         # Add recommendations
-        if discovery['stats']['items'] > 10000:
+        if (discovery['stats'].get('items') or 0) > 10000:
             report['recommendations'].append(
                 "Consider migrating in batches due to high item count"
             )
@@ -2,6 +2,7 @@
 
 import json
 import logging
+from functools import partial
 from typing import Dict, Any, Generator, List, Optional
 from datetime import datetime
 from .field_transformer import FieldTransformer
@@ -85,6 +86,10 @@ class InstanceTransformer:
         if item.get('assets'):
             tallyfy_process['attachments'] = self._transform_assets(item['assets'])
         
+        # Item updates become comments on the launched process
+        if item.get('updates'):
+            tallyfy_process['comments'] = self.transform_updates(item['updates'], user_mapping)
+        
         return tallyfy_process
     
     def _transform_column_values(self, column_values: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -406,32 +411,57 @@ class InstanceTransformer:
     def batch_transform_items(self, items: List[Dict[str, Any]],
                             checklist_id: str,
                             user_mapping: Dict[str, str],
-                            batch_size: int = 50) -> Generator[List[Dict[str, Any]], None, None]:
+                            batch_size: int = 50,
+                            stage: Optional[Any] = None) -> Generator[List[Dict[str, Any]], None, None]:
         """Transform items in batches.
         
+        Without a stage each batch is transformed as it is asked for. With a
+        ``TransformStage`` the whole list is transformed by the stage first --
+        across worker processes when it is parallel -- and then batched; the
+        batches are the same either way.
+        
         Args:
             items: List of Monday.com items
             checklist_id: Tallyfy blueprint ID
             user_mapping: User ID mapping
             batch_size: Items per batch
+            stage: Optional ``shared.transform_pool.TransformStage``
             
         Yields:
             Batches of transformed processes
         """
+        if stage is not None:
+            processes = stage.map(
+                partial(self._transform_or_skip, checklist_id=checklist_id, user_mapping=user_mapping),
+                items
+            )
+            processes = [process for process in processes if process is not None]
+            for start in range(0, len(processes), batch_size):
+                yield processes[start:start + batch_size]
+            return
+        
         batch = []
         
         for item in items:
-            try:
-                process = self.transform_item_to_process(item, checklist_id, user_mapping)
-                batch.append(process)
-                
-                if len(batch) >= batch_size:
-                    yield batch
-                    batch = []
-                    
-            except Exception as e:
-                logger.error(f"Failed to transform item {item.get('id')}: {e}")
+            process = self._transform_or_skip(item, checklist_id, user_mapping)
+            if process is None:
+                continue
+            batch.append(process)
+            
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
         
         # Yield remaining items
         if batch:
-            yield batch
\ No newline at end of file
+            yield batch
+    
+    def _transform_or_skip(self, item: Dict[str, Any],
+                          checklist_id: str,
+                          user_mapping: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Transform one item, or log the failure and return None."""
+        try:
+            return self.transform_item_to_process(item, checklist_id, user_mapping)
+        except Exception as e:
+            logger.error(f"Failed to transform item {item.get('id')}: {e}")
+            return None
\ No newline at end of file
@@ -25,10 +25,14 @@ class CheckpointManager:
         self.checkpoint_file = self.checkpoint_dir / "checkpoint.json"
         self.processed_file = self.checkpoint_dir / "processed_items.json"
         self.error_log_file = self.checkpoint_dir / "error_log.json"
+        self.cursor_file = self.checkpoint_dir / "board_cursors.json"
         
         # In-memory cache of processed items
         self.processed_items = self._load_processed_items()
         
+        # Last fully handled page cursor per board
+        self.board_cursors = self._load_board_cursors()
+        
         logger.debug(f"Checkpoint manager initialized at {self.checkpoint_dir}")
     
     def save(self, state: Dict[str, Any]):
@@ -106,8 +110,14 @@ class CheckpointManager:
                 self.error_log_file.unlink()
                 logger.info("Error log file removed")
             
+            # Clear board cursors
+            if self.cursor_file.exists():
+                self.cursor_file.unlink()
+                logger.info("Board cursor file removed")
+            
             # Clear in-memory cache
             self.processed_items.clear()
+            self.board_cursors.clear()
             
             logger.info("All checkpoint data cleared")
             
@@ -196,6 +206,66 @@ class CheckpointManager:
         except Exception as e:
             logger.error(f"Failed to save processed items: {e}")
     
+    def save_board_cursor(self, board_id: str, cursor: Optional[str]):
+        """Record the cursor of the next unhandled page of a board's items.
+        
+        Called after a page has been fully migrated, so a resumed run starts
+        at the page after it rather than re-fetching the whole board.
+        
+        Args:
+            board_id: Monday.com board ID
+            cursor: Cursor for the next page (None once the board is exhausted)
+        """
+        self.board_cursors[str(board_id)] = cursor
+        self._save_board_cursors()
+    
+    def get_board_cursor(self, board_id: str) -> Optional[str]:
+        """Get the saved resume cursor for a board.
+        
+        Args:
+            board_id: Monday.com board ID
+            
+        Returns:
+            Cursor of the next unhandled page, or None to start from the top
+        """
+        return self.board_cursors.get(str(board_id))
+    
+    def _load_board_cursors(self) -> Dict[str, Optional[str]]:
+        """Load board cursors from file.
+        
+        Returns:
+            Mapping of board ID to resume cursor
+        """
+        try:
+            if not self.cursor_file.exists():
+                return {}
+            
+            with open(self.cursor_file, 'r') as f:
+                return json.load(f).get('cursors', {})
+                
+        except Exception as e:
+            logger.error(f"Failed to load board cursors: {e}")
+            return {}
+    
+    def _save_board_cursors(self):
+        """Save board cursors to file."""
+        try:
+            data = {
+                'timestamp': datetime.now().isoformat(),
+                'cursors': self.board_cursors
+            }
+            
+            # Write to temporary file first
+            temp_file = self.cursor_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(data, f)
+            
+            # Atomic rename
+            temp_file.rename(self.cursor_file)
+            
+        except Exception as e:
+            logger.error(f"Failed to save board cursors: {e}")
+    
     def log_error(self, error: Exception, context: Dict[str, Any]):
         """Log error to checkpoint error log.
         
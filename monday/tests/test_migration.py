@@ -0,0 +1,300 @@
+"""Tests for the Monday.com orchestrator's streaming process phase.
+
+Items flow page by page from the board cursor into process creation; nothing
+collects a whole board (let alone the account) first. These tests drive
+`_phase_processes` against in-memory fakes and pin the two properties that make
+that safe to resume: the cursor is checkpointed only after every item of a page
+has a process, and items that already have a process are not launched twice.
+
+The batch launcher is tested against the real client with its session mocked:
+results must be correlated to items by ID, and one failed launch must not
+disturb the rest of the batch.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.tallyfy_client import TallyfyClient
+from src.main import MondayMigrator
+
+
+class FakeMondayClient:
+    """Serves a board's items as fixed pages, keyed by cursor."""
+
+    def __init__(self, pages):
+        # [(items, next_cursor), ...]; page N is fetched with cursor N-1's value.
+        self.pages = pages
+        self.requested_cursors = []
+
+    def iter_board_item_pages(self, board_id, cursor=None, page_size=None):
+        self.requested_cursors.append(cursor)
+        start = 0
+        if cursor is not None:
+            start = [next_cursor for _, next_cursor in self.pages].index(cursor) + 1
+        for items, next_cursor in self.pages[start:]:
+            yield [dict(item) for item in items], next_cursor
+
+
+class FakeTallyfyClient:
+    def __init__(self, failing=()):
+        self.launched = []
+        self.batches = []
+        self.failing = set(failing)
+
+    def batch_create_processes(self, batch):
+        self.batches.append(json.dumps(batch))
+        results = []
+        # Reversed on purpose: callers must correlate by ID, not by position.
+        for process in reversed(batch):
+            original_id = process['metadata']['original_id']
+            self.launched.append(original_id)
+            failed = original_id in self.failing
+            results.append({
+                'original_id': original_id,
+                'process': None if failed else {'id': f'run_{original_id}'},
+                'error': 'HTTP 422' if failed else None,
+                'comments_posted': len(process.get('comments', [])),
+                'comment_errors': [],
+            })
+        return results
+
+
+def item(item_id):
+    return {'id': item_id, 'name': f'Item {item_id}', 'column_values': []}
+
+
+class TestStreamingProcessPhase(unittest.TestCase):
+
+    BOARD = {'id': 'b1', 'name': 'Board'}
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+        self.pages = [
+            ([item('1'), item('2')], 'c1'),
+            ([item('3')], 'c2'),
+            ([item('4')], None),
+        ]
+        self.monday = FakeMondayClient(self.pages)
+        self.tallyfy = FakeTallyfyClient()
+        self.migrator = MondayMigrator(self.monday, self.tallyfy)
+        self.migrator.id_mapper.add_mapping('board', 'b1', 'checklist_1')
+
+    def tearDown(self):
+        self.migrator.id_mapper.close()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_every_page_is_launched_and_mapped_by_item_id(self):
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(sorted(self.tallyfy.launched), ['1', '2', '3', '4'])
+        self.assertEqual(results['items_seen'], 4)
+        self.assertEqual(results['processes_created'], 4)
+        self.assertEqual(self.migrator.id_mapper.get_mapping('item', '3'), 'run_3')
+
+    def test_the_cursor_is_saved_only_after_its_page_is_handled(self):
+        saved = []
+        original = self.migrator.checkpoint.save_board_cursor
+
+        def record(board_id, cursor):
+            saved.append((cursor, list(self.tallyfy.launched)))
+            original(board_id, cursor)
+
+        self.migrator.checkpoint.save_board_cursor = record
+        self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(
+            [(cursor, sorted(launched)) for cursor, launched in saved],
+            [('c1', ['1', '2']), ('c2', ['1', '2', '3'])],
+        )
+
+    def test_a_resumed_run_starts_at_the_saved_cursor_and_skips_mapped_items(self):
+        self.migrator.checkpoint.save_board_cursor('b1', 'c1')
+        # Item 3 was launched before the interruption but its page never finished.
+        self.migrator.id_mapper.add_mapping('item', '3', 'run_3')
+
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(self.monday.requested_cursors, ['c1'])
+        self.assertEqual(self.tallyfy.launched, ['4'])
+        self.assertEqual(results['processes_skipped'], 1)
+
+    def test_a_failed_launch_is_reported_without_mislabelling_its_siblings(self):
+        self.migrator.tallyfy = FakeTallyfyClient(failing={'1'})
+
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertIsNone(self.migrator.id_mapper.get_mapping('item', '1'))
+        self.assertEqual(self.migrator.id_mapper.get_mapping('item', '2'), 'run_2')
+        self.assertEqual(results['processes_created'], 3)
+        self.assertEqual(len(results['errors']), 1)
+        self.assertIn('item 1', results['errors'][0])
+
+    def test_a_failed_item_holds_the_cursor_and_its_board_is_retried(self):
+        self.migrator.tallyfy = FakeTallyfyClient(failing={'3'})
+        self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(self.migrator.checkpoint.get_board_cursor('b1'), 'c1')
+        self.assertFalse(self.migrator.checkpoint.is_processed('board_items', 'b1'))
+
+        retry = self.migrator.tallyfy = FakeTallyfyClient()
+        self.monday.requested_cursors.clear()
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(self.monday.requested_cursors, ['c1'])
+        self.assertEqual(retry.launched, ['3'])
+        self.assertEqual(results['processes_skipped'], 1)
+        self.assertEqual(self.migrator.id_mapper.get_mapping('item', '3'), 'run_3')
+        self.assertTrue(self.migrator.checkpoint.is_processed('board_items', 'b1'))
+
+    def test_a_failed_transform_leaves_the_board_unmarked(self):
+        self.pages[2][0][0]['column_values'] = None  # not iterable
+
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(results['processes_created'], 3)
+        self.assertEqual(self.migrator.checkpoint.get_board_cursor('b1'), 'c2')
+        self.assertFalse(self.migrator.checkpoint.is_processed('board_items', 'b1'))
+
+    def test_item_updates_are_counted_as_migrated_comments(self):
+        self.pages[0][0][0]['updates'] = [
+            {'id': 'u1', 'body': 'First', 'creator': {'id': '9', 'name': 'Ann'}},
+            {'id': 'u2', 'body': 'Second', 'creator': {'id': '9', 'name': 'Ann'}},
+        ]
+
+        results = self.migrator._phase_processes([self.BOARD], {})
+
+        self.assertEqual(results['comments_migrated'], 2)
+
+    def test_worker_processes_launch_byte_identical_batches(self):
+        # Pages above the stage's batch size are the ones sent to workers.
+        self.pages[1] = ([dict(item(str(n)), state=['active', 'archived'][n % 2])
+                          for n in range(100, 330)], 'c2')
+        batches = {}
+        for processes in ('1', '3'):
+            self.tallyfy = self.migrator.tallyfy = FakeTallyfyClient()
+            self.migrator.id_mapper.clear_entity_type('item')
+            self.migrator.checkpoint.clear()
+            with patch.dict(os.environ, {'TRANSFORM_PROCESSES': processes}):
+                self.migrator._phase_processes([self.BOARD], {})
+            batches[processes] = self.tallyfy.batches
+
+        self.assertEqual(len(batches['3']), 7)
+        self.assertEqual(batches['3'], batches['1'])
+
+    def test_a_board_without_a_blueprint_is_never_fetched(self):
+        results = self.migrator._phase_processes([{'id': 'b2', 'name': 'Other'}], {})
+
+        self.assertEqual(self.monday.requested_cursors, [])
+        self.assertEqual(results['boards_skipped'], 1)
+
+
+def response(payload, status=200):
+    mocked = MagicMock()
+    mocked.status_code = status
+    mocked.json.return_value = payload
+    if status >= 400:
+        mocked.raise_for_status.side_effect = Exception(f'HTTP {status}')
+    return mocked
+
+
+def process(item_id, comments=()):
+    return {
+        'checklist_id': 'checklist_1',
+        'name': f'Item {item_id}',
+        'data': {},
+        'comments': [{'text': text, 'metadata': {'original_id': text}} for text in comments],
+        'metadata': {'original_id': item_id},
+    }
+
+
+class TestBatchCreateProcesses(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TallyfyClient(api_token='token', organization_id='org')
+        self.client.session = MagicMock()
+
+    def test_results_are_keyed_by_item_id_in_input_order(self):
+        def post(url, json=None, **kwargs):
+            if url.endswith('/runs'):
+                # Finish out of order: the second launch returns first.
+                time.sleep(0.05 if json['name'] == 'Item a' else 0)
+                return response({'data': {'id': f"run_{json['name'][-1]}", 'tasks': []}})
+            return response({})
+
+        self.client.session.post.side_effect = post
+
+        results = self.client.batch_create_processes([process('a'), process('b')])
+
+        self.assertEqual([r['original_id'] for r in results], ['a', 'b'])
+        self.assertEqual([r['process']['id'] for r in results], ['run_a', 'run_b'])
+
+    def test_one_failed_launch_does_not_abort_the_batch(self):
+        def post(url, json=None, **kwargs):
+            if json['name'] == 'Item bad':
+                return response({}, status=422)
+            return response({'data': {'id': 'run_ok', 'tasks': []}})
+
+        self.client.session.post.side_effect = post
+
+        results = self.client.batch_create_processes([process('bad'), process('ok')])
+
+        self.assertIn('422', results[0]['error'])
+        self.assertIsNone(results[0]['process'])
+        self.assertIsNone(results[1]['error'])
+        self.assertEqual(results[1]['process']['id'], 'run_ok')
+
+    def test_launches_overlap(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def post(url, json=None, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.05)
+            with lock:
+                in_flight.pop()
+            return response({'data': {'id': 'run', 'tasks': []}})
+
+        self.client.session.post.side_effect = post
+
+        self.client.batch_create_processes([process(str(i)) for i in range(6)])
+
+        self.assertGreater(max(peak), 1)
+
+    def test_comments_are_posted_to_the_first_task_of_the_launched_process(self):
+        def post(url, json=None, **kwargs):
+            if url.endswith('/runs'):
+                return response({'data': {'id': 'run_1', 'tasks': {'data': [{'id': 'task_1'}]}}})
+            return response({'id': 'comment'})
+
+        self.client.session.post.side_effect = post
+
+        results = self.client.batch_create_processes([process('a', comments=['hi', 'there'])])
+
+        comment_bodies = [
+            call.kwargs['json'] for call in self.client.session.post.call_args_list
+            if call.args[0].endswith('/comments')
+        ]
+        self.assertEqual(comment_bodies, [
+            {'task_id': 'task_1', 'text': 'hi'},
+            {'task_id': 'task_1', 'text': 'there'},
+        ])
+        self.assertEqual(results[0]['comments_posted'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
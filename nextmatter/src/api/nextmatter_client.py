@@ -11,6 +11,16 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
 import time
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +41,7 @@ class NextMatterClient:
         if not self.api_key:
             raise ValueError("NextMatter API key is required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Api-Key {self.api_key}',
             'Content-Type': 'application/json',
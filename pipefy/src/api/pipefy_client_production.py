@@ -15,6 +15,16 @@ import logging
 from enum import Enum
 from dataclasses import dataclass
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class PipefyRateLimitError(Exception):
     """Pipefy rate limit exceeded"""
@@ -86,7 +96,7 @@ class PipefyProductionClient:
         if not self.api_token:
             raise PipefyAuthError("PIPEFY_API_TOKEN required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.api_token}',
             'Content-Type': 'application/json'
@@ -136,8 +146,7 @@ class PipefyProductionClient:
         try:
             response = self.session.post(
                 self.BASE_URL,
-                json=payload,
-                timeout=30
+                json=payload
             )
             
             # Check for rate limit
@@ -34,9 +34,11 @@ from utils.database_migrator import DatabaseMigrator
 # pipefy vendor root, so `import shared` would fail without this.
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from shared.form_field_values import (
+    FormFieldLayoutCache,
     build_task_form_field_payloads,
     extract_run_form_fields,
     reshape_assignee_values,
+    write_task_form_field_values,
 )
 from shared.kickoff_fields import KickoffFieldCache
 from shared.prerun_encoder import build_prerun_payload, resolve_capture
@@ -121,6 +123,10 @@ class PipefyMigrationOrchestrator:
         # Kick-off field definitions, read once per template. Needed to resolve
         # a card's values to timeline_ids before launch -- see _split_kickoff_values.
         self.kickoff_cache = KickoffFieldCache(self.tallyfy_client)
+
+        # Step form-field layout, read once per template. Later launches are
+        # bound to their tasks from the launch response -- see FormFieldLayoutCache.
+        self.form_field_layouts = FormFieldLayoutCache(self.tallyfy_client)
         
         # Initialize transformers
         self.phase_transformer = PhaseToStepTransformer(self.id_mapper)
@@ -583,7 +589,9 @@ class PipefyMigrationOrchestrator:
                     # Values already sent as `prerun` are excluded: they have
                     # no task to belong to, so the strict resolver would raise
                     # on values that in fact migrated correctly.
-                    self._migrate_card_fields(card, run_id, only_values=task_values)
+                    self._migrate_card_fields(card, run_id, only_values=task_values,
+                                              checklist_id=checklist_id,
+                                              launched=created_process)
                     
                     # Migrate comments
                     if card.get('comments'):
@@ -860,7 +868,9 @@ class PipefyMigrationOrchestrator:
         return build_prerun_payload(kickoff_raw, captures, strict=True), task_values
 
     def _migrate_card_fields(self, card: Dict[str, Any], run_id: str,
-                             only_values: Optional[Dict[str, Any]] = None):
+                             only_values: Optional[Dict[str, Any]] = None,
+                             checklist_id: Optional[str] = None,
+                             launched: Optional[Dict[str, Any]] = None):
         """
         Write a card's field values onto the process that was created from it.
 
@@ -879,6 +889,9 @@ class PipefyMigrationOrchestrator:
         anything already sent as ``prerun`` removed. Kick-off values have no
         task to belong to, so leaving them in would make the strict resolver
         raise on values that in fact migrated correctly.
+
+        ``checklist_id`` and ``launched`` (the launch response) let the field
+        layout come from ``form_field_layouts`` instead of a read per card.
         """
         raw_values, labels = self._collect_card_field_values(card)
         if only_values is not None:
@@ -886,9 +899,12 @@ class PipefyMigrationOrchestrator:
         if not raw_values:
             return
 
-        form_fields = extract_run_form_fields(
-            self.tallyfy_client.get_run_form_fields(run_id)
-        )
+        if checklist_id:
+            form_fields = self.form_field_layouts.fields(run_id, checklist_id, launched)
+        else:
+            form_fields = extract_run_form_fields(
+                self.tallyfy_client.get_run_form_fields(run_id)
+            )
 
         reshape_assignee_values(
             raw_values, form_fields,
@@ -900,10 +916,9 @@ class PipefyMigrationOrchestrator:
             raw_values, form_fields, strict=True, fallback_keys=labels
         )
 
-        for task_id, taskdata in payloads.items():
-            self.tallyfy_client.update_task_form_field_values(
-                run_id, task_id, taskdata
-            )
+        # One PUT per task, sent concurrently; a failed task is reported after
+        # its siblings have been written.
+        write_task_form_field_values(self.tallyfy_client, run_id, payloads)
 
         logger.debug(
             "Migrated %d field value(s) across %d task(s) for process %s",
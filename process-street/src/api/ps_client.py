@@ -15,6 +15,16 @@ import backoff
 from dataclasses import dataclass
 from enum import Enum
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,7 +62,7 @@ class ProcessStreetClient:
         self.organization_id = organization_id
         
         # Create session with authentication
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'X-API-KEY': api_key,
             'Content-Type': 'application/json',
@@ -135,7 +145,7 @@ class ProcessStreetClient:
         self.stats['api_calls'] += 1
         
         try:
-            response = self.session.request(method, url, timeout=30, **kwargs)
+            response = self.session.request(method, url, **kwargs)
             
             # Handle rate limiting
             if response.status_code == 429:
@@ -589,9 +599,9 @@ class ProcessStreetClient:
             Success status
         """
         try:
-            # Attachments may require authentication
-            headers = {'X-API-KEY': self.api_key}
-            response = requests.get(attachment_url, headers=headers, stream=True, timeout=60)
+            # Attachments may require authentication; the session carries the
+            # API key and applies the download timeout to streamed requests.
+            response = self.session.get(attachment_url, stream=True)
             response.raise_for_status()
             
             with open(destination, 'wb') as f:
@@ -6,6 +6,7 @@ Handles all interactions with Tallyfy API for data import
 import sys
 import os
 import requests
+import threading
 import time
 import json
 import logging
@@ -23,6 +24,7 @@ sys.path.insert(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_capture, normalize_captures
+from shared.http_transport import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +64,7 @@ class TallyfyClient:
         self.organization_id = organization_id
         self.organization_slug = organization_slug
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             
@@ -72,10 +74,12 @@ class TallyfyClient:
         # OAuth2 token management
         self.access_token = None
         self.token_expires_at = None
+        self._auth_lock = threading.Lock()
         
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 0.6  # 100 requests per minute
+        self._rate_lock = threading.Lock()
         
         # Statistics
         self.stats = {
@@ -84,6 +88,7 @@ class TallyfyClient:
             'errors': 0,
             'data_imported': {}
         }
+        self._stats_lock = threading.Lock()
         
         # Authenticate on initialization
         self._authenticate()
@@ -123,7 +128,10 @@ class TallyfyClient:
         }
         
         try:
-            response = requests.post(auth_url, json=auth_data)
+            # Through the pooled session, but without a stale bearer token.
+            response = self.session.post(
+                auth_url, json=auth_data, headers={'Authorization': None}
+            )
             response.raise_for_status()
             
             token_data = response.json()
@@ -142,10 +150,34 @@ class TallyfyClient:
     def _ensure_authenticated(self) -> None:
         """
         Ensure we have a valid authentication token
-        """
-        if not self.access_token or datetime.utcnow() >= self.token_expires_at:
-            self._authenticate()
-    
+        
+        Threads sharing the client refresh an expired token once: the first
+        takes the lock and re-authenticates, the rest find the new token.
+        """
+        if self._token_valid():
+            return
+        with self._auth_lock:
+            if not self._token_valid():
+                self._authenticate()
+    
+    def _token_valid(self) -> bool:
+        return bool(self.access_token) and datetime.utcnow() < self.token_expires_at
+    
+    def _count(self, stat: str) -> None:
+        """Increment a request counter; safe across threads sharing this client"""
+        with self._stats_lock:
+            self.stats[stat] += 1
+    
+    def _rate_limit(self) -> None:
+        """Enforce rate limiting across all threads sharing this client"""
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self.last_request_time + self.min_request_interval)
+            self.last_request_time = slot
+        # Sleep outside the lock so other threads can book later slots.
+        if slot > now:
+            time.sleep(slot - now)
+
     @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=3)
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
@@ -161,10 +193,7 @@ class TallyfyClient:
         """
         self._ensure_authenticated()
         
-        # Rate limiting
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
+        self._rate_limit()
         
         # Build URL with organization path
         if not endpoint.startswith('/'):
@@ -177,14 +206,13 @@ class TallyfyClient:
         url = urljoin(self.api_url, endpoint)
         
         logger.debug(f"Making {method} request to {url}")
-        self.stats['api_calls'] += 1
+        self._count('api_calls')
         
         try:
             response = self.session.request(method, url, **kwargs)
-            self.last_request_time = time.time()
             
             if response.status_code == 429:
-                self.stats['rate_limits_hit'] += 1
+                self._count('rate_limits_hit')
                 retry_after = int(response.headers.get('Retry-After', 60))
                 logger.warning(f"Rate limit hit, waiting {retry_after} seconds")
                 time.sleep(retry_after)
@@ -199,7 +227,7 @@ class TallyfyClient:
             return response.json()
             
         except requests.exceptions.RequestException as e:
-            self.stats['errors'] += 1
+            self._count('errors')
             logger.error(f"API request failed: {e}")
             raise
     
@@ -656,23 +684,17 @@ class TallyfyClient:
             files = {"file": f}
             endpoint = f'/{entity_type}s/{entity_id}/attachments'
             
-            # Temporarily remove JSON content type for file_upload upload
-            original_content_type = self.session.headers.get('Content-Type')
-            del self.session.headers['Content-Type']
+            # Unset the JSON content type for this request only; mutating the
+            # shared session's headers would race with concurrent callers.
+            result = self._make_request(
+                'POST', endpoint, files=files, headers={'Content-Type': None}
+            )
             
-            try:
-                result = self._make_request('POST', endpoint, files=files)
-                
-                self.stats['data_imported'].setdefault('files', 0)
-                self.stats['data_imported']['files'] += 1
-                
-                logger.info(f"Uploaded file: {file_path}")
-                return result
-                
-            finally:
-                # Restore content type
-                if original_content_type:
-                    self.session.headers['Content-Type'] = original_content_type
+            self.stats['data_imported'].setdefault('files', 0)
+            self.stats['data_imported']['files'] += 1
+            
+            logger.info(f"Uploaded file: {file_path}")
+            return result
     
     # Webhook Methods
     def create_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,9 +35,11 @@ from dotenv import load_dotenv
 # process-street vendor root, so `import shared` would fail without this.
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from shared.form_field_values import (
+    FormFieldLayoutCache,
     build_task_form_field_payloads,
     extract_run_form_fields,
     reshape_assignee_values,
+    write_task_form_field_values,
 )
 from shared.kickoff_fields import KickoffFieldCache
 from shared.prerun_encoder import build_prerun_payload, resolve_capture
@@ -129,6 +131,10 @@ class MigrationOrchestrator:
         # a run's values to timeline_ids before launch -- see _split_kickoff_values.
         self.kickoff_cache = KickoffFieldCache(self.tallyfy_client)
 
+        # Step form-field layout, read once per template. Later launches are
+        # bound to their tasks from the launch response -- see FormFieldLayoutCache.
+        self.form_field_layouts = FormFieldLayoutCache(self.tallyfy_client)
+
         # Initialize transformers
         self.user_transformer = UserTransformer(self.id_mapper)
         self.template_transformer = TemplateTransformer(self.id_mapper)
@@ -525,7 +531,8 @@ class MigrationOrchestrator:
                 # Migrate the values that belong to STEP fields. Anything already
                 # placed in `prerun` is excluded, or it would be looked up among
                 # the task fields, not found, and raise.
-                self._migrate_form_values(ps_run, run_id, form_values=task_values)
+                self._migrate_form_values(ps_run, run_id, form_values=task_values,
+                                          checklist_id=checklist_id, launched=created_process)
                 
                 successful += 1
                 logger.debug(f"Created process: {process_data['title']}")
@@ -729,7 +736,9 @@ class MigrationOrchestrator:
         return prerun, task_values
 
     def _migrate_form_values(self, ps_run: Dict, run_id: str,
-                             form_values: Optional[Dict[str, Any]] = None):
+                             form_values: Optional[Dict[str, Any]] = None,
+                             checklist_id: Optional[str] = None,
+                             launched: Optional[Dict[str, Any]] = None):
         """
         Write a run's form values onto the process that was created from it.
 
@@ -749,6 +758,9 @@ class MigrationOrchestrator:
         values, with anything already sent as ``prerun`` removed. Kick-off values
         have no task to belong to, so leaving them in would make the strict
         resolver raise on values that in fact migrated correctly.
+
+        ``checklist_id`` and ``launched`` (the launch response) let the field
+        layout come from ``form_field_layouts`` instead of a read per run.
         """
         if form_values is None:
             form_values = ps_run.get('formValues', {}) or {}
@@ -778,9 +790,12 @@ class MigrationOrchestrator:
         if not raw_values:
             return
 
-        form_fields = extract_run_form_fields(
-            self.tallyfy_client.get_run_form_fields(run_id)
-        )
+        if checklist_id:
+            form_fields = self.form_field_layouts.fields(run_id, checklist_id, launched)
+        else:
+            form_fields = extract_run_form_fields(
+                self.tallyfy_client.get_run_form_fields(run_id)
+            )
 
         reshape_assignee_values(
             raw_values, form_fields,
@@ -792,10 +807,9 @@ class MigrationOrchestrator:
             raw_values, form_fields, strict=True, fallback_keys=hints
         )
 
-        for task_id, taskdata in payloads.items():
-            self.tallyfy_client.update_task_form_field_values(
-                run_id, task_id, taskdata
-            )
+        # One PUT per task, sent concurrently; a failed task is reported after
+        # its siblings have been written.
+        write_task_form_field_values(self.tallyfy_client, run_id, payloads)
 
         logger.debug(
             "Migrated %d form value(s) across %d task(s) for process %s",
@@ -8,9 +8,18 @@ import logging
 import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,17 +34,13 @@ class RocketLaneClient:
         
     def _create_session(self) -> requests.Session:
         """Create requests session with retry logic"""
-        session = requests.Session()
-        
         # Configure retries with exponential backoff
         retry_strategy = Retry(
             total=5,
             backoff_factor=2,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        session = create_session(max_retries=retry_strategy)
         
         # Set authentication headers
         session.headers.update({
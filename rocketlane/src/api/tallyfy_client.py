@@ -5,6 +5,7 @@ Handles all interactions with Tallyfy API using CORRECT field types and endpoint
 
 import requests
 import logging
+import threading
 import time
 import hashlib
 from typing import Dict, List, Optional, Any
@@ -20,6 +21,7 @@ _sys.path.insert(
     _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_captures
+from shared.http_transport import create_session
 
 
 logger = logging.getLogger(__name__)
@@ -56,7 +58,7 @@ class TallyfyClient:
         self.organization_id = self._generate_org_id(organization)
         self.base_url = base_url.rstrip('/')
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json',
@@ -64,9 +66,11 @@ class TallyfyClient:
             # Note: X-Tallyfy-Client header is NOT required
         })
         
-        # Rate limiting
+        # Rate limiting. The budget is shared by every thread using this
+        # client: each request books the next free slot under the lock.
         self.last_request_time = 0
         self.min_request_interval = 0.5  # 2 requests per second
+        self._rate_lock = threading.Lock()
         
     def _generate_org_id(self, org_name: str) -> str:
         """Generate a 32-character organization ID"""
@@ -78,11 +82,14 @@ class TallyfyClient:
         return hashlib.md5(timestamp).hexdigest()
     
     def _rate_limit(self):
-        """Enforce rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        """Enforce rate limiting across all threads sharing this client"""
+        with self._rate_lock:
+            now = time.time()
+            slot = max(now, self.last_request_time + self.min_request_interval)
+            self.last_request_time = slot
+        # Sleep outside the lock so other threads can book later slots.
+        if slot > now:
+            time.sleep(slot - now)
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
@@ -355,6 +362,31 @@ class TallyfyClient:
             data['author_id'] = author
         
         return self._make_request('POST', f'/runs/{run_id}/tasks/{task_id}/comments', json=data)
+
+    def get_run_tasks(self, run_id: str) -> List[Dict[str, Any]]:
+        """Get the tasks of a run"""
+        response = self._make_request('GET', f'/runs/{run_id}/tasks')
+        if isinstance(response, dict):
+            response = response.get('data') or []
+        return [task for task in response if isinstance(task, dict)]
+
+    def create_comment(self, run_id: str, comment: str,
+                       task_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add a comment to a run
+
+        Tallyfy comments belong to a task; when ``task_id`` is not given the
+        comment goes on the run's first task.
+
+        Raises:
+            ValueError: If the run has no tasks to comment on
+        """
+        if task_id is None:
+            tasks = self.get_run_tasks(run_id)
+            task_id = next((task['id'] for task in tasks if task.get('id')), None)
+            if task_id is None:
+                raise ValueError(f"Run {run_id} has no tasks to comment on")
+        return self.add_comment(run_id, task_id, comment)
     
     def upload_file(self, run_id: str, task_id: str,
                    file_path: str, file_name: str) -> Dict[str, Any]:
@@ -362,13 +394,11 @@ class TallyfyClient:
         with open(file_path, 'rb') as f:
             files = {'file': (file_name, f)}
             
-            # Temporarily remove JSON content type for file upload
-            headers = self.session.headers.copy()
-            del headers['Content-Type']
-            
-            response = requests.post(
+            # Unset the session's JSON content type so requests writes the
+            # multipart boundary itself.
+            response = self.session.post(
                 f"{self.base_url}/api/organizations/{self.organization_id}/runs/{run_id}/tasks/{task_id}/files",
-                headers=headers,
+                headers={'Content-Type': None},
                 files=files
             )
             response.raise_for_status()
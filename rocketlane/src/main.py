@@ -10,9 +10,11 @@ import json
 import logging
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 
 # Add src to path
@@ -33,11 +35,23 @@ from utils.logger_config import setup_logging
 # The repo root holds the shared package; the sys.path line above only adds
 # rocketlane/src, so `import shared` would fail without this.
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared.discovery_snapshot import DISCOVERY_MODES, DiscoverySnapshot, configured_discovery_mode
+from shared.http_transport import configured_concurrency
 from shared.kickoff_fields import KickoffFieldCache
 
 logger = logging.getLogger(__name__)
 
 
+def _batches(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split a record stream into lists of at most ``size``"""
+    records = iter(records)
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
 class RocketLaneMigrationOrchestrator:
     """Orchestrates the 5-phase migration from RocketLane to Tallyfy"""
     
@@ -58,6 +72,12 @@ class RocketLaneMigrationOrchestrator:
         self.checkpoint_manager = CheckpointManager(self.migration_id)
         self.error_handler = ErrorHandler()
         
+        # Discovery is kept at a stable path rather than under the per-run
+        # migration ID, so a later run can reuse it.
+        self.discovery_snapshot = DiscoverySnapshot(
+            os.getenv('DISCOVERY_SNAPSHOT', 'data/rocketlane_discovery.db')
+        )
+        
         logger.info(f"RocketLane Migration Orchestrator initialized")
         logger.info(f"Migration ID: {self.migration_id}")
         logger.info(f"Customer Portal Handling: {os.getenv('CUSTOMER_PORTAL_HANDLING', 'guest_users')}")
@@ -105,7 +125,8 @@ class RocketLaneMigrationOrchestrator:
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         return f"rl_migration_{timestamp}"
     
-    def run(self, dry_run: bool = False, resume: bool = False, phases: Optional[List[str]] = None):
+    def run(self, dry_run: bool = False, resume: bool = False, phases: Optional[List[str]] = None,
+            discovery_mode: Optional[str] = None):
         """
         Run the 5-phase migration
         
@@ -113,6 +134,8 @@ class RocketLaneMigrationOrchestrator:
             dry_run: If True, simulate without making changes
             resume: If True, resume from last checkpoint
             phases: Specific phases to run (None for all)
+            discovery_mode: 'auto', 'reuse' or 'refresh' the discovery
+                snapshot (defaults to DISCOVERY_MODE, then 'auto')
         """
         logger.info("=" * 80)
         logger.info("Starting RocketLane to Tallyfy Migration")
@@ -124,12 +147,25 @@ class RocketLaneMigrationOrchestrator:
         if dry_run:
             logger.info("🔍 DRY RUN MODE - No data will be migrated")
         
-        # Load checkpoint if resuming
+        # Load checkpoint if resuming. The run continues under the resumed
+        # migration's ID, so its phases and ID mappings carry over.
         checkpoint = {}
         if resume:
             checkpoint = self.checkpoint_manager.load_checkpoint()
             if checkpoint:
-                logger.info(f"Resuming from phase: {checkpoint.get('last_phase', 'unknown')}")
+                self.migration_id = checkpoint['migration_id']
+                logger.info(f"Resuming migration {self.migration_id} "
+                            f"from phase: {checkpoint.get('last_phase') or 'start'}")
+            else:
+                logger.info("No unfinished migration to resume; starting a new one")
+        
+        # Only a run that actually resumes an unfinished migration reuses the
+        # snapshot by default.
+        reuse_discovery = self.discovery_snapshot.should_reuse(
+            discovery_mode or configured_discovery_mode(),
+            resume=bool(checkpoint),
+            params=self._discovery_params()
+        )
         
         # Define all phases
         all_phases = [
@@ -146,16 +182,20 @@ class RocketLaneMigrationOrchestrator:
         else:
             phases_to_run = all_phases
         
-        # Skip completed phases if resuming
+        # Skip completed phases if resuming. Discovery runs again when its
+        # snapshot is not to be reused.
         if checkpoint:
             completed_phases = checkpoint.get('completed_phases', [])
-            phases_to_run = [p for p in phases_to_run if p not in completed_phases]
+            phases_to_run = [
+                p for p in phases_to_run
+                if p not in completed_phases or (p == 'discovery' and not reuse_discovery)
+            ]
         
         logger.info(f"Phases to run: {', '.join(phases_to_run)}")
         
         # Execute migration phases
         results = {}
-        completed_phases = checkpoint.get('completed_phases', []) if checkpoint else []
+        completed_phases = list(checkpoint.get('completed_phases', [])) if checkpoint else []
         
         try:
             for phase in phases_to_run:
@@ -166,7 +206,7 @@ class RocketLaneMigrationOrchestrator:
                 phase_start = time.time()
                 
                 if phase == 'discovery':
-                    results[phase] = self._phase_1_discovery(dry_run)
+                    results[phase] = self._phase_1_discovery(dry_run, reuse=reuse_discovery)
                 elif phase == 'users_customers':
                     results[phase] = self._phase_2_users_customers(dry_run)
                 elif phase == 'templates':
@@ -179,17 +219,18 @@ class RocketLaneMigrationOrchestrator:
                 phase_duration = time.time() - phase_start
                 results[phase]['duration'] = phase_duration
                 
-                completed_phases.append(phase)
+                if phase not in completed_phases:
+                    completed_phases.append(phase)
                 
-                # Save checkpoint after each phase
-                self.checkpoint_manager.save_checkpoint({
-                    'last_phase': phase,
-                    'completed_phases': completed_phases,
-                    'results': results,
-                    'timestamp': datetime.utcnow().isoformat()
-                })
+                # Save checkpoint after each phase. A dry run migrates
+                # nothing, so its phases are not recorded as done.
+                if not dry_run:
+                    self.checkpoint_manager.save_phase(phase, {'duration': phase_duration})
                 
                 logger.info(f"✓ Phase {phase} completed in {phase_duration:.1f} seconds")
+            
+            if not dry_run and set(all_phases) <= set(completed_phases):
+                self.checkpoint_manager.mark_migration_complete()
                 
         except Exception as e:
             self.error_handler.handle_error(e, phase)
@@ -204,7 +245,7 @@ class RocketLaneMigrationOrchestrator:
         logger.info(f"Total time: {self._get_elapsed_time()}")
         logger.info("=" * 80)
     
-    def _phase_1_discovery(self, dry_run: bool) -> Dict[str, Any]:
+    def _phase_1_discovery(self, dry_run: bool, reuse: bool = False) -> Dict[str, Any]:
         """
         Phase 1: Discovery (5-10 minutes)
         - Connect to RocketLane API
@@ -212,71 +253,26 @@ class RocketLaneMigrationOrchestrator:
         - Analyze data complexity and volume
         - Generate migration plan with estimates
         - Identify paradigm shifts needed
+        
+        Everything fetched goes into the discovery snapshot, which the later
+        phases stream from. With ``reuse``, the snapshot an earlier run took
+        is read instead of fetching the workspace again.
         """
         logger.info("📊 Phase 1: Discovering RocketLane data...")
-        
-        discovery = {
-            'customers': [],
-            'projects': [],
-            'templates': [],
-            'forms': [],
-            'users': [],
-            'custom_fields': [],
-            'time_entries': [],
-            'counts': {},
-            'paradigm_shifts': [],
-            'complexity_analysis': {}
-        }
+        snapshot = self.discovery_snapshot
         
         try:
-            # Fetch customers
-            logger.info("Fetching customers...")
-            discovery['customers'] = self.rocketlane_client.get_customers()
-            discovery['counts']['customers'] = len(discovery['customers'])
-            
-            # Fetch projects
-            logger.info("Fetching projects...")
-            discovery['projects'] = self.rocketlane_client.get_projects(
-                include_archived=os.getenv('MIGRATE_ARCHIVED', 'false').lower() == 'true'
-            )
-            discovery['counts']['projects'] = len(discovery['projects'])
-            discovery['counts']['active_projects'] = len([p for p in discovery['projects'] if p.get('status') == 'active'])
-            
-            # Fetch project templates
-            logger.info("Fetching project templates...")
-            discovery['templates'] = self.rocketlane_client.get_project_templates()
-            discovery['counts']['templates'] = len(discovery['templates'])
-            
-            # Fetch forms and surveys
-            logger.info("Fetching forms and surveys...")
-            discovery['forms'] = self.rocketlane_client.get_forms()
-            discovery['counts']['forms'] = len(discovery['forms'])
-            
-            # Fetch users and resources
-            logger.info("Fetching users and resources...")
-            discovery['users'] = self.rocketlane_client.get_users()
-            discovery['counts']['users'] = len(discovery['users'])
-            
-            # Fetch custom fields
-            logger.info("Fetching custom fields...")
-            discovery['custom_fields'] = self.rocketlane_client.get_custom_fields()
-            discovery['counts']['custom_fields'] = len(discovery['custom_fields'])
-            
-            # Analyze paradigm shifts needed
-            logger.info("Analyzing paradigm shifts...")
-            discovery['paradigm_shifts'] = self._analyze_paradigm_shifts(discovery)
-            
-            # Analyze complexity
-            logger.info("Analyzing data complexity...")
-            discovery['complexity_analysis'] = self._analyze_complexity(discovery)
-            
-            # Save discovery results
-            discovery_file = Path('data') / f'{self.migration_id}_discovery.json'
-            discovery_file.parent.mkdir(exist_ok=True)
-            with open(discovery_file, 'w') as f:
-                json.dump(discovery, f, indent=2, default=str)
-            
-            logger.info(f"Discovery saved to: {discovery_file}")
+            if reuse:
+                logger.info(f"Reusing discovery snapshot taken {snapshot.created_at}: {snapshot.path}")
+                discovery = {
+                    'counts': snapshot.value('counts', {}),
+                    'paradigm_shifts': list(snapshot.records('paradigm_shifts')),
+                    'complexity_analysis': snapshot.value('complexity_analysis', {})
+                }
+            else:
+                discovery = self._fetch_discovery()
+                snapshot.write(discovery, params=self._discovery_params())
+                logger.info(f"Discovery saved to: {snapshot.path}")
             
             # Log summary
             logger.info("\n📈 Discovery Summary:")
@@ -300,6 +296,79 @@ class RocketLaneMigrationOrchestrator:
             logger.error(f"Discovery phase failed: {e}")
             raise
         
+        # The records themselves stay in the snapshot; the phase result that
+        # goes into the checkpoint and report carries only the analysis.
+        return {
+            'snapshot': snapshot.path,
+            'reused': reuse,
+            'counts': discovery['counts'],
+            'paradigm_shifts': discovery['paradigm_shifts'],
+            'complexity_analysis': discovery['complexity_analysis']
+        }
+    
+    def _discovery_params(self) -> Dict[str, Any]:
+        """What decides the contents of a discovery snapshot"""
+        return {
+            'base_url': self.rocketlane_client.base_url,
+            'include_archived': os.getenv('MIGRATE_ARCHIVED', 'false').lower() == 'true'
+        }
+    
+    def _fetch_discovery(self) -> Dict[str, Any]:
+        """Fetch the RocketLane workspace and analyze it"""
+        discovery = {
+            'customers': [],
+            'projects': [],
+            'templates': [],
+            'forms': [],
+            'users': [],
+            'custom_fields': [],
+            'time_entries': [],
+            'counts': {},
+            'paradigm_shifts': [],
+            'complexity_analysis': {}
+        }
+        
+        # Fetch customers
+        logger.info("Fetching customers...")
+        discovery['customers'] = self.rocketlane_client.get_customers()
+        discovery['counts']['customers'] = len(discovery['customers'])
+        
+        # Fetch projects
+        logger.info("Fetching projects...")
+        discovery['projects'] = self.rocketlane_client.get_projects(
+            include_archived=os.getenv('MIGRATE_ARCHIVED', 'false').lower() == 'true'
+        )
+        discovery['counts']['projects'] = len(discovery['projects'])
+        discovery['counts']['active_projects'] = len([p for p in discovery['projects'] if p.get('status') == 'active'])
+        
+        # Fetch project templates
+        logger.info("Fetching project templates...")
+        discovery['templates'] = self.rocketlane_client.get_project_templates()
+        discovery['counts']['templates'] = len(discovery['templates'])
+        
+        # Fetch forms and surveys
+        logger.info("Fetching forms and surveys...")
+        discovery['forms'] = self.rocketlane_client.get_forms()
+        discovery['counts']['forms'] = len(discovery['forms'])
+        
+        # Fetch users and resources
+        logger.info("Fetching users and resources...")
+        discovery['users'] = self.rocketlane_client.get_users()
+        discovery['counts']['users'] = len(discovery['users'])
+        
+        # Fetch custom fields
+        logger.info("Fetching custom fields...")
+        discovery['custom_fields'] = self.rocketlane_client.get_custom_fields()
+        discovery['counts']['custom_fields'] = len(discovery['custom_fields'])
+        
+        # Analyze paradigm shifts needed
+        logger.info("Analyzing paradigm shifts...")
+        discovery['paradigm_shifts'] = self._analyze_paradigm_shifts(discovery)
+        
+        # Analyze complexity
+        logger.info("Analyzing data complexity...")
+        discovery['complexity_analysis'] = self._analyze_complexity(discovery)
+        
         return discovery
     
     def _phase_2_users_customers(self, dry_run: bool) -> Dict[str, Any]:
@@ -325,12 +394,12 @@ class RocketLaneMigrationOrchestrator:
             return results
         
         try:
-            # Load discovery data
+            # Stream records from the discovery snapshot
             discovery = self._load_discovery_data()
             
             # Migrate internal users first
             logger.info("Migrating internal users...")
-            for user in discovery['users']:
+            for user in discovery.records('users'):
                 results['users']['total'] += 1
                 try:
                     transformed_user = self.user_transformer.transform_user(user)
@@ -348,7 +417,7 @@ class RocketLaneMigrationOrchestrator:
             customer_handling = os.getenv('CUSTOMER_PORTAL_HANDLING', 'guest_users')
             logger.info(f"Migrating customers as: {customer_handling}")
             
-            for customer in discovery['customers']:
+            for customer in discovery.records('customers'):
                 results['customers']['total'] += 1
                 try:
                     if customer_handling == 'guest_users':
@@ -399,16 +468,15 @@ class RocketLaneMigrationOrchestrator:
             return results
         
         try:
-            # Load discovery data
+            # Stream records from the discovery snapshot
             discovery = self._load_discovery_data()
             
             # Process templates in batches
             batch_size = int(os.getenv('TEMPLATE_BATCH_SIZE', '10'))
-            templates = discovery['templates']
+            batch_count = (discovery.count('templates') - 1) // batch_size + 1
             
-            for i in range(0, len(templates), batch_size):
-                batch = templates[i:i+batch_size]
-                logger.info(f"Processing template batch {i//batch_size + 1}/{(len(templates)-1)//batch_size + 1}")
+            for batch_number, batch in enumerate(_batches(discovery.records('templates'), batch_size), 1):
+                logger.info(f"Processing template batch {batch_number}/{batch_count}")
                 
                 for template in batch:
                     results['templates']['total'] += 1
@@ -460,7 +528,7 @@ class RocketLaneMigrationOrchestrator:
             
             # Process forms
             logger.info("Migrating forms...")
-            for form in discovery['forms']:
+            for form in discovery.records('forms'):
                 results['forms']['total'] += 1
                 try:
                     # Assess form complexity with AI
@@ -511,9 +579,10 @@ class RocketLaneMigrationOrchestrator:
         logger.info("🚀 Phase 4: Migrating projects...")
         
         results = {
-            'projects': {'total': 0, 'successful': 0, 'failed': 0},
+            'projects': {'total': 0, 'successful': 0, 'failed': 0, 'resumed': 0},
             'tasks': {'total': 0, 'successful': 0, 'failed': 0},
-            'time_entries': {'total': 0, 'successful': 0, 'failed': 0}
+            'time_entries': {'total': 0, 'successful': 0, 'failed': 0},
+            'time_entry_groups': {'total': 0, 'successful': 0, 'failed': 0, 'skipped': 0}
         }
         
         if dry_run:
@@ -521,113 +590,215 @@ class RocketLaneMigrationOrchestrator:
             return results
         
         try:
-            # Load discovery data
+            # Stream records from the discovery snapshot
             discovery = self._load_discovery_data()
             
             # Filter projects based on configuration
-            projects = discovery['projects']
+            projects = discovery.records('projects')
             if not os.getenv('MIGRATE_ARCHIVED', 'false').lower() == 'true':
-                projects = [p for p in projects if p.get('status') != 'archived']
+                projects = (p for p in projects if p.get('status') != 'archived')
             
+            # Template and user mappings are read once for the whole phase;
+            # the checkpoint manager keeps these dicts current as mappings
+            # are saved, so no project re-reads the mapping table.
+            template_mapping = self.checkpoint_manager.mapping_snapshot('template')
+            user_mapping = self.checkpoint_manager.mapping_snapshot('user')
+            project_mapping = self.checkpoint_manager.mapping_snapshot('project')
+
+            # Time entries are posted as one comment per group by a worker
+            # pool, so they overlap with creating the remaining projects and
+            # with each other. Pacing comes from the Tallyfy client's rate
+            # limiter, which every worker shares.
+            migrate_time = os.getenv('MIGRATE_TIME_TRACKING', 'true').lower() == 'true'
+            time_entry_jobs = []
+            executor = ThreadPoolExecutor(max_workers=configured_concurrency())
+
             # Process projects in batches
             batch_size = int(os.getenv('PROJECT_BATCH_SIZE', '20'))
             
-            for i in range(0, len(projects), batch_size):
-                batch = projects[i:i+batch_size]
-                logger.info(f"Processing project batch {i//batch_size + 1}/{(len(projects)-1)//batch_size + 1}")
-                
-                for project in batch:
-                    results['projects']['total'] += 1
-                    
-                    try:
-                        # Get full project details
-                        full_project = self.rocketlane_client.get_project_details(project['id'])
-
-                        # Resolve the target template FIRST: transforming the
-                        # project needs the template's kick-off field definitions
-                        # to key prerun values by timeline_id.
-                        source_template_id = project.get('template_id')
-                        template_id = self.checkpoint_manager.get_id_mapping(
-                            source_template_id, 'template'
-                        )
-                        if not template_id:
-                            logger.warning(f"Template not found for project {project['name']}, skipping")
-                            continue
-
-                        # Kick-off field definitions for this template, fetched
-                        # once and cached. Without them the prerun values would
-                        # be keyed by RocketLane ids and silently discarded.
-                        kickoff_fields = self.kickoff_fields.get(template_id)
-
-                        # Transform project to process. transform_project requires
-                        # the template and user mappings; calling it with only the
-                        # project raised TypeError before any prerun data existed.
-                        transformed = self.instance_transformer.transform_project(
-                            full_project,
-                            {source_template_id: template_id},
-                            self.checkpoint_manager.get_all_id_mappings('user'),
-                            kickoff_fields,
-                        )
+            try:
+                for batch_number, batch in enumerate(_batches(projects, batch_size), 1):
+                    logger.info(f"Processing project batch {batch_number}")
 
-                        # Create process in Tallyfy. create_run takes discrete
-                        # arguments, and the transformer emits `name`/`prerun`.
-                        # The source project id is preserved via the checkpoint
-                        # mapping recorded below.
-                        created_process = self.tallyfy_client.create_run(
-                            checklist_id=template_id,
-                            name=transformed['name'],
-                            prerun_data=transformed.get('prerun', {})
-                        )
-                        
-                        # Task-state migration is disabled: the loop body
-                        # uses Rocketlane ids as Tallyfy task ids (no mapping
-                        # exists), passes an unsupported `data=` kwarg to
-                        # complete_task, checks a non-existent `completed`
-                        # flag, and calls update_task_assignees which is not
-                        # implemented.  Re-enable once proper task-id mapping
-                        # and correct Tallyfy calls are in place.
-                        # tasks = self.rocketlane_client.get_tasks(project['id'])
-                        
-                        # Migrate time tracking if enabled
-                        if os.getenv('MIGRATE_TIME_TRACKING', 'true').lower() == 'true':
-                            time_entries = self.rocketlane_client.get_time_entries(project['id'])
-                            for entry in time_entries:
-                                results['time_entries']['total'] += 1
-                                try:
-                                    # Convert to comment with structured time notation
-                                    comment = self.instance_transformer.transform_time_entry_to_comment(entry)
-                                    self.tallyfy_client.create_comment(
-                                        run_id=created_process['id'],
-                                        comment=comment
-                                    )
-                                    results['time_entries']['successful'] += 1
-                                except Exception as e:
-                                    logger.error(f"Failed to migrate time entry: {e}")
-                                    results['time_entries']['failed'] += 1
-                        
-                        # Store mapping
-                        self.checkpoint_manager.save_id_mapping(project['id'], created_process['id'], 'project')
-                        results['projects']['successful'] += 1
-                        
-                        logger.debug(f"✓ Migrated project: {project.get('name')}")
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to migrate project {project.get('name')}: {e}")
-                        results['projects']['failed'] += 1
-                
-                # Rate limiting between batches
-                time.sleep(3)
+                    for project in batch:
+                        results['projects']['total'] += 1
+
+                        # A project migrated by an earlier run keeps its
+                        # process; only its unposted time entry groups are
+                        # retried.
+                        run_id = project_mapping.get(str(project['id']))
+                        if run_id:
+                            results['projects']['resumed'] += 1
+                        else:
+                            run_id = self._migrate_project(project, template_mapping, user_mapping, results)
+                            if not run_id:
+                                continue
+
+                        if migrate_time:
+                            time_entry_jobs.append(
+                                executor.submit(self._migrate_time_entries, project, run_id)
+                            )
+
+                for job in time_entry_jobs:
+                    counts = job.result()
+                    for section in ('time_entries', 'time_entry_groups'):
+                        for key, value in counts[section].items():
+                            results[section][key] += value
+            finally:
+                executor.shutdown(wait=True)
             
             logger.info(f"✓ Projects migrated: {results['projects']['successful']}/{results['projects']['total']}")
             logger.info(f"✓ Tasks updated: {results['tasks']['successful']}/{results['tasks']['total']}")
-            logger.info(f"✓ Time entries migrated: {results['time_entries']['successful']}/{results['time_entries']['total']}")
+            logger.info(f"✓ Time entries migrated: {results['time_entries']['successful']}/{results['time_entries']['total']} "
+                        f"in {results['time_entry_groups']['successful']} comment(s)")
             
         except Exception as e:
             logger.error(f"Projects phase failed: {e}")
             raise
+        finally:
+            self.checkpoint_manager.release_mapping_snapshots()
         
         return results
     
+    def _migrate_project(self, project: Dict[str, Any], template_mapping: Dict[str, str],
+                         user_mapping: Dict[str, str], results: Dict[str, Any]) -> Optional[str]:
+        """Create the process for one project; returns its run id, or None if skipped or failed"""
+        try:
+            # Get full project details
+            full_project = self.rocketlane_client.get_project_details(project['id'])
+
+            # Resolve the target template FIRST: transforming the
+            # project needs the template's kick-off field definitions
+            # to key prerun values by timeline_id.
+            source_template_id = project.get('template_id')
+            template_id = template_mapping.get(str(source_template_id))
+            if not template_id:
+                logger.warning(f"Template not found for project {project['name']}, skipping")
+                return None
+
+            # Kick-off field definitions for this template, fetched
+            # once and cached. Without them the prerun values would
+            # be keyed by RocketLane ids and silently discarded.
+            kickoff_fields = self.kickoff_fields.get(template_id)
+
+            # Transform project to process. transform_project requires
+            # the template and user mappings; calling it with only the
+            # project raised TypeError before any prerun data existed.
+            transformed = self.instance_transformer.transform_project(
+                full_project,
+                {source_template_id: template_id},
+                user_mapping,
+                kickoff_fields,
+            )
+
+            # Create process in Tallyfy. create_run takes discrete
+            # arguments, and the transformer emits `name`/`prerun`.
+            # The source project id is preserved via the checkpoint
+            # mapping recorded below.
+            created_process = self.tallyfy_client.create_run(
+                checklist_id=template_id,
+                name=transformed['name'],
+                prerun_data=transformed.get('prerun', {})
+            )
+
+            # Task-state migration is disabled: the loop body
+            # uses Rocketlane ids as Tallyfy task ids (no mapping
+            # exists), passes an unsupported `data=` kwarg to
+            # complete_task, checks a non-existent `completed`
+            # flag, and calls update_task_assignees which is not
+            # implemented.  Re-enable once proper task-id mapping
+            # and correct Tallyfy calls are in place.
+            # tasks = self.rocketlane_client.get_tasks(project['id'])
+
+            # Store mapping
+            self.checkpoint_manager.save_id_mapping(project['id'], created_process['id'], 'project')
+            results['projects']['successful'] += 1
+
+            logger.debug(f"✓ Migrated project: {project.get('name')}")
+            return created_process['id']
+
+        except Exception as e:
+            logger.error(f"Failed to migrate project {project.get('name')}: {e}")
+            results['projects']['failed'] += 1
+            return None
+
+    def _migrate_time_entries(self, project: Dict[str, Any], run_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Post a project's time entries as consolidated comments
+
+        Entries are grouped per task (or per day when they have no task) and
+        each group is posted as one comment. A posted group is checkpointed
+        with its entry IDs, so a resumed migration posts the groups that are
+        still missing, and entries added to a posted group since then as a
+        follow-up comment. Runs on a worker thread and never raises.
+        """
+        counts = {
+            'time_entries': {'total': 0, 'successful': 0, 'failed': 0},
+            'time_entry_groups': {'total': 0, 'successful': 0, 'failed': 0, 'skipped': 0}
+        }
+
+        try:
+            time_entries = self.rocketlane_client.get_time_entries(project['id'])
+            comments = self.instance_transformer.transform_time_entries_to_comments(time_entries)
+            entries_by_id = {entry.get('id'): entry for entry in time_entries}
+        except Exception as e:
+            logger.error(f"Failed to load time entries for project {project.get('name')}: {e}")
+            return counts
+
+        task_id = None
+        for comment in comments:
+            entry_count = comment['metadata']['entry_count']
+            group_id = f"{project['id']}:{comment['key']}"
+            counts['time_entries']['total'] += entry_count
+            counts['time_entry_groups']['total'] += 1
+
+            # A failed group is retried in full. A posted one only gets the
+            # entries logged in the source since, as a follow-up comment.
+            posted = None
+            checkpoint = self.checkpoint_manager.get_checkpoint('projects', 'time_entry_group', group_id)
+            if checkpoint and checkpoint['status'] == 'completed':
+                posted = (checkpoint['data'] or {}).get('entry_ids') or []
+                posted_ids = set(posted)
+                new_ids = [i for i in comment['metadata']['entry_ids'] if i not in posted_ids]
+                counts['time_entries']['successful'] += entry_count - len(new_ids)
+                if not new_ids:
+                    counts['time_entry_groups']['skipped'] += 1
+                    continue
+                comment = self.instance_transformer.time_entry_group_comment(
+                    comment['key'], [entries_by_id[i] for i in new_ids], follow_up=True
+                )
+                entry_count = len(new_ids)
+
+            try:
+                # Every group goes on the run's first task; it is looked up
+                # once per project rather than once per comment.
+                if task_id is None:
+                    tasks = self.tallyfy_client.get_run_tasks(run_id)
+                    task_id = next((task['id'] for task in tasks if task.get('id')), None)
+                    if task_id is None:
+                        raise ValueError(f"Run {run_id} has no tasks to comment on")
+
+                self.tallyfy_client.create_comment(run_id=run_id, comment=comment['text'], task_id=task_id)
+                self.checkpoint_manager.save_checkpoint(
+                    'projects', 'time_entry_group', group_id,
+                    data={'run_id': run_id, 'entry_ids': (posted or []) + comment['metadata']['entry_ids']},
+                    durable=True
+                )
+                counts['time_entries']['successful'] += entry_count
+                counts['time_entry_groups']['successful'] += 1
+            except Exception as e:
+                logger.error(f"Failed to migrate time entries {group_id}: {e}")
+                # A failed follow-up keeps the group's completed checkpoint,
+                # which still lists the entries that were posted.
+                if posted is None:
+                    self.checkpoint_manager.save_checkpoint(
+                        'projects', 'time_entry_group', group_id, status='failed', data={'error': str(e)}
+                    )
+                counts['time_entries']['failed'] += entry_count
+                counts['time_entry_groups']['failed'] += 1
+
+        return counts
+    
     def _phase_5_validation(self, dry_run: bool) -> Dict[str, Any]:
         """
         Phase 5: Validation (10-20 minutes)
@@ -771,14 +942,12 @@ class RocketLaneMigrationOrchestrator:
         else:
             return f"{minutes} minutes"
     
-    def _load_discovery_data(self) -> Dict[str, Any]:
-        """Load discovery data from saved file"""
-        discovery_file = Path('data') / f'{self.migration_id}_discovery.json'
-        if not discovery_file.exists():
-            raise FileNotFoundError(f"Discovery data not found: {discovery_file}")
-        
-        with open(discovery_file, 'r') as f:
-            return json.load(f)
+    def _load_discovery_data(self) -> DiscoverySnapshot:
+        """Return the discovery snapshot; records are read from it lazily"""
+        if not self.discovery_snapshot.complete:
+            raise FileNotFoundError(f"Discovery data not found: {self.discovery_snapshot.path}")
+        
+        return self.discovery_snapshot
     
     def _get_user_mapping(self, rocketlane_user_id: str) -> Optional[str]:
         """Get Tallyfy user ID from RocketLane user ID"""
@@ -883,6 +1052,9 @@ def main():
                       help='Simulate migration without making changes')
     parser.add_argument('--resume', action='store_true',
                       help='Resume from last checkpoint')
+    parser.add_argument('--discovery', choices=DISCOVERY_MODES,
+                      help='Reuse or refresh the discovery snapshot; auto reuses it '
+                           'only when resuming (default: DISCOVERY_MODE or auto)')
     parser.add_argument('--phases', nargs='+',
                       help='Specific phases to run')
     parser.add_argument('--readiness-check', action='store_true',
@@ -919,7 +1091,7 @@ def main():
         
         # Report only mode
         if args.report_only:
-            orchestrator.run(dry_run=True, phases=['discovery'])
+            orchestrator.run(dry_run=True, phases=['discovery'], discovery_mode=args.discovery)
             sys.exit(0)
         
         # Determine phases
@@ -931,7 +1103,8 @@ def main():
         orchestrator.run(
             dry_run=args.dry_run,
             resume=args.resume,
-            phases=phases
+            phases=phases,
+            discovery_mode=args.discovery
         )
         
     except KeyboardInterrupt:
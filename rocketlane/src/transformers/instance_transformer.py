@@ -434,7 +434,85 @@ class InstanceTransformer:
             parts.append(f"Activity: {entry['activity_type']}")
         
         return ' | '.join(parts)
-    
+
+    @staticmethod
+    def _time_entry_group_key(entry: Dict[str, Any]) -> str:
+        """Group key for a time entry: its task, else the day it was logged"""
+        if entry.get('task_id'):
+            return f"task:{entry['task_id']}"
+        day = entry.get('date') or (entry.get('created_at') or '')[:10]
+        return f"day:{day or 'undated'}"
+
+    def transform_time_entries_to_comments(self, time_entries: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Consolidate time entries into one structured comment per group
+
+        Entries are grouped by task, and entries without a task by the day
+        they were logged, so migrating a project costs one comment per group
+        rather than one per entry. Groups keep the order in which their first
+        entry appears.
+
+        Args:
+            time_entries: RocketLane time entries for one project
+
+        Returns:
+            One comment per group::
+
+                {'key': 'task:<id>' or 'day:<YYYY-MM-DD>', 'text': str,
+                 'metadata': {'entry_ids': [...], 'entry_count': int,
+                              'hours': float, 'billable_hours': float}}
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in time_entries:
+            groups.setdefault(self._time_entry_group_key(entry), []).append(entry)
+
+        comments = [self.time_entry_group_comment(key, entries) for key, entries in groups.items()]
+
+        self.transformation_stats['time_entries_preserved'] += len(time_entries)
+        return comments
+
+    def time_entry_group_comment(self, key: str, entries: List[Dict],
+                                 follow_up: bool = False) -> Dict[str, Any]:
+        """
+        Build the comment for one group of time entries
+
+        Args:
+            key: The group's key, ``'task:<id>'`` or ``'day:<YYYY-MM-DD>'``
+            entries: The group's entries, in order
+            follow_up: Mark the comment as adding entries to a group that was
+                already posted
+
+        Returns:
+            One comment, shaped as by ``transform_time_entries_to_comments``
+        """
+        hours = sum(float(e.get('hours') or 0) for e in entries)
+        billable = sum(float(e.get('hours') or 0) for e in entries if e.get('billable'))
+
+        scope, _, value = key.partition(':')
+        label = (entries[0].get('task_name') or value) if scope == 'task' else value
+        if follow_up:
+            label += ', follow-up'
+        header = (f"⏱️ Time Entries ({'Task' if scope == 'task' else 'Day'}: {label}): "
+                  f"{len(entries)} entries, {hours:g} hours")
+        if billable:
+            header += f", {billable:g} billable"
+
+        lines = [header]
+        for entry in entries:
+            prefix = f"{entry['date']}: " if scope == 'task' and entry.get('date') else ''
+            lines.append(f"- {prefix}{self._format_time_entry(entry)}")
+
+        return {
+            'key': key,
+            'text': '\n'.join(lines),
+            'metadata': {
+                'entry_ids': [e.get('id') for e in entries],
+                'entry_count': len(entries),
+                'hours': hours,
+                'billable_hours': billable
+            }
+        }
+
     def _transform_documents(self, process: Dict, documents: List[Dict]):
         """Transform documents to external references"""
         process['external_documents'] = []
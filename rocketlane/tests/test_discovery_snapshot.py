@@ -0,0 +1,177 @@
+"""Tests for reading Rocketlane discovery from the shared snapshot.
+
+Discovery used to be written to ``data/{migration_id}_discovery.json`` and
+``json.load``-ed whole by every later phase, and a new run -- including a
+resumed one -- fetched the workspace again because its migration id was new.
+These pin that discovery now lands in a snapshot at a stable path, that a
+resumed run reuses it without a single RocketLane request, that ``refresh``
+fetches again, and that the later phases stream their records from it.
+
+A resumed run only skips discovery if ``--resume`` works at all, so the
+resume path is driven through ``run`` too: it continues the unfinished
+migration under that migration's ID, skipping the phases it completed.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, VENDOR_ROOT)
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+from src.utils.checkpoint_manager import CheckpointManager
+
+try:
+    from src import main
+except ImportError:  # anthropic, via the AI client, is not installed
+    main = None
+
+if main is not None:
+    from shared.discovery_snapshot import DiscoverySnapshot
+
+
+class FakeRocketlane:
+    base_url = 'https://api.rocketlane.example/api/1.0'
+
+    def __init__(self):
+        self.calls = 0
+
+    def _fetched(self, records):
+        self.calls += 1
+        return records
+
+    def get_customers(self):
+        return self._fetched([{'id': 'c1', 'name': 'Acme'}])
+
+    def get_projects(self, include_archived=False):
+        return self._fetched([{'id': 'p1', 'status': 'active'}, {'id': 'p2', 'status': 'archived'}])
+
+    def get_project_templates(self):
+        return self._fetched([{'id': 't1', 'phases': [{}, {}]}])
+
+    def get_forms(self):
+        return self._fetched([])
+
+    def get_users(self):
+        return self._fetched([{'id': f'u{n}', 'email': f'u{n}@example.com'} for n in range(3)])
+
+    def get_custom_fields(self):
+        return self._fetched([])
+
+
+@unittest.skipIf(main is None, 'rocketlane requirements are not installed')
+class DiscoverySnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.snapshot_path = os.path.join(workdir.name, 'data', 'discovery.db')
+        self.checkpoint_path = os.path.join(workdir.name, 'cp.db')
+        self.checkpoints = CheckpointManager('rl_test', os.path.join(workdir.name, 'phases.db'))
+        self.addCleanup(self.checkpoints.close)
+
+        report = patch.object(main.RocketLaneMigrationOrchestrator, '_generate_report')
+        report.start()
+        self.addCleanup(report.stop)
+
+    def orchestrator(self, migration_id=None):
+        orchestrator = main.RocketLaneMigrationOrchestrator.__new__(main.RocketLaneMigrationOrchestrator)
+        orchestrator.rocketlane_client = FakeRocketlane()
+        if migration_id is None:
+            orchestrator.checkpoint_manager = self.checkpoints
+        else:
+            # A new run: a new migration ID on the same checkpoint database.
+            orchestrator.migration_id = migration_id
+            orchestrator.checkpoint_manager = CheckpointManager(migration_id, self.checkpoint_path)
+            self.addCleanup(orchestrator.checkpoint_manager.close)
+        orchestrator.discovery_snapshot = DiscoverySnapshot(self.snapshot_path)
+        self.addCleanup(orchestrator.discovery_snapshot.close)
+        orchestrator.error_handler = Mock()
+        orchestrator.start_time = datetime.utcnow()
+        orchestrator.user_transformer = Mock()
+        orchestrator.user_transformer.transform_user.side_effect = lambda user: user
+        orchestrator.tallyfy_client = Mock()
+        orchestrator.tallyfy_client.create_user.side_effect = lambda user: {'id': 'tf-' + user['id']}
+        orchestrator.tallyfy_client.create_guest.return_value = {'id': 'guest-c1'}
+        return orchestrator
+
+    def test_resumed_run_reuses_the_snapshot(self):
+        first = self.orchestrator()
+        fetched = first._phase_1_discovery(dry_run=False)
+        self.assertEqual(first.rocketlane_client.calls, 6)
+        self.assertFalse(fetched['reused'])
+        self.assertNotIn('projects', fetched)
+
+        resumed = self.orchestrator()
+        snapshot = resumed.discovery_snapshot
+        self.assertFalse(snapshot.should_reuse('auto', params=resumed._discovery_params()))
+        self.assertTrue(snapshot.should_reuse('auto', resume=True, params=resumed._discovery_params()))
+
+        reused = resumed._phase_1_discovery(dry_run=False, reuse=True)
+        self.assertEqual(resumed.rocketlane_client.calls, 0)
+        self.assertTrue(reused['reused'])
+        self.assertEqual(reused['counts'], fetched['counts'])
+        self.assertEqual(reused['paradigm_shifts'], fetched['paradigm_shifts'])
+
+        resumed._phase_1_discovery(dry_run=False, reuse=False)
+        self.assertEqual(resumed.rocketlane_client.calls, 6)
+
+    def test_phases_stream_records_from_the_snapshot(self):
+        orchestrator = self.orchestrator()
+        with self.assertRaises(FileNotFoundError):
+            orchestrator._load_discovery_data()
+
+        orchestrator._phase_1_discovery(dry_run=False)
+        results = orchestrator._phase_2_users_customers(dry_run=False)
+
+        self.assertEqual(results['users'], {'total': 3, 'successful': 3, 'failed': 0})
+        self.assertEqual(results['customers']['successful'], 1)
+        self.assertEqual(self.checkpoints.get_id_mapping('u2', 'user'), 'tf-u2')
+
+    def test_run_resume_skips_discovery_and_continues_the_migration(self):
+        first = self.orchestrator('rl_first')
+        first.run(phases=['discovery'])
+        self.assertEqual(first.rocketlane_client.calls, 6)
+
+        resumed = self.orchestrator('rl_second')
+        resumed.run(resume=True, phases=['discovery', 'users_customers'])
+
+        self.assertEqual(resumed.rocketlane_client.calls, 0)
+        self.assertEqual(resumed.migration_id, 'rl_first')
+        self.assertEqual(resumed.tallyfy_client.create_user.call_count, 3)
+        manager = resumed.checkpoint_manager
+        self.assertEqual(manager.get_id_mapping('u0', 'user'), 'tf-u0')
+        self.assertEqual(manager.load_checkpoint(), None, 'the second run left no migration of its own')
+
+        again = self.orchestrator('rl_third')
+        again.run(resume=True, phases=['discovery', 'users_customers'])
+        self.assertEqual(again.migration_id, 'rl_first')
+        self.assertEqual(again.rocketlane_client.calls, 0)
+        self.assertEqual(again.tallyfy_client.create_user.call_count, 0)
+
+    def test_run_resume_with_refresh_fetches_again(self):
+        self.orchestrator('rl_first').run(phases=['discovery'])
+
+        resumed = self.orchestrator('rl_second')
+        resumed.run(resume=True, phases=['discovery'], discovery_mode='refresh')
+
+        self.assertEqual(resumed.migration_id, 'rl_first')
+        self.assertEqual(resumed.rocketlane_client.calls, 6)
+
+    def test_a_fresh_run_does_not_reuse_by_default(self):
+        self.orchestrator('rl_first').run(phases=['discovery'])
+        self.orchestrator('rl_first').checkpoint_manager.mark_migration_complete()
+
+        fresh = self.orchestrator('rl_second')
+        fresh.run(resume=True, phases=['discovery'])
+
+        self.assertEqual(fresh.migration_id, 'rl_second')
+        self.assertEqual(fresh.rocketlane_client.calls, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+"""Tests for migrating Rocketlane time entries as consolidated comments.
+
+Every time entry used to cost its own comment POST. These tests pin the
+request economy that replaced it: entries are grouped per task, or per day
+when they have no task, into one structured comment per group; the Tallyfy
+client's rate limiter hands out one shared budget to every thread using it;
+and the orchestrator posts each group once, checkpointing it so a resumed
+migration posts only the groups still missing, plus any entries added to a
+posted group since, as a follow-up comment.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+VENDOR_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, VENDOR_ROOT)
+sys.path.insert(0, os.path.join(VENDOR_ROOT, 'src'))
+
+from src.api import tallyfy_client as tallyfy_module
+from src.api.tallyfy_client import TallyfyClient
+from src.transformers.instance_transformer import InstanceTransformer
+from src.utils.checkpoint_manager import CheckpointManager
+
+try:
+    from src import main
+except ImportError:  # anthropic, via the AI client, is not installed
+    main = None
+
+
+def entry(entry_id, hours, task_id=None, date='2024-03-01', **extra):
+    return dict(id=entry_id, hours=hours, task_id=task_id, date=date, **extra)
+
+
+ENTRIES = [
+    entry('e1', 2, task_id='t1', task_name='Kick-off call', billable=True),
+    entry('e2', 1.5, date='2024-03-01', description='Prep'),
+    entry('e3', 3, task_id='t1', date='2024-03-02'),
+    entry('e4', 0.5, task_id='t2'),
+    entry('e5', 1, date='2024-03-02'),
+    entry('e6', 4, date='2024-03-01', activity_type='Review'),
+]
+
+
+class TimeEntryGroupingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comments = InstanceTransformer().transform_time_entries_to_comments(ENTRIES)
+
+    def test_one_comment_per_task_or_day(self):
+        self.assertEqual(
+            [c['key'] for c in self.comments],
+            ['task:t1', 'day:2024-03-01', 'task:t2', 'day:2024-03-02'],
+        )
+        self.assertEqual(self.comments[0]['metadata']['entry_ids'], ['e1', 'e3'])
+        self.assertEqual(self.comments[1]['metadata']['entry_ids'], ['e2', 'e6'])
+
+    def test_every_entry_is_in_exactly_one_group(self):
+        ids = [i for c in self.comments for i in c['metadata']['entry_ids']]
+        self.assertEqual(sorted(ids), sorted(e['id'] for e in ENTRIES))
+
+    def test_comment_totals_and_lines(self):
+        task = self.comments[0]
+        self.assertEqual(task['metadata']['hours'], 5)
+        self.assertEqual(task['metadata']['billable_hours'], 2)
+        lines = task['text'].split('\n')
+        self.assertIn('Task: Kick-off call', lines[0])
+        self.assertIn('2 entries, 5 hours, 2 billable', lines[0])
+        self.assertEqual(lines[1], '- 2024-03-01: ⏱️ Time Entry: 2 hours | (Billable)')
+        self.assertEqual(lines[2], '- 2024-03-02: ⏱️ Time Entry: 3 hours')
+
+        day = self.comments[1]
+        self.assertIn('Day: 2024-03-01', day['text'])
+        self.assertIn('Prep', day['text'])
+        self.assertIn('Activity: Review', day['text'])
+
+    def test_entry_without_date_falls_back_to_created_at(self):
+        comments = InstanceTransformer().transform_time_entries_to_comments([
+            {'id': 'a', 'hours': 1, 'created_at': '2024-05-06T10:00:00Z'},
+            {'id': 'b', 'hours': 1},
+        ])
+        self.assertEqual([c['key'] for c in comments], ['day:2024-05-06', 'day:undated'])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.lock = threading.Lock()
+
+    def time(self):
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+
+class SharedRateBudgetTest(unittest.TestCase):
+
+    def test_threads_book_distinct_slots(self):
+        client = TallyfyClient('key', 'org')
+        clock = FakeClock()
+        slots = []
+
+        def request():
+            client._rate_limit()
+            slots.append(client.last_request_time)
+
+        with patch.object(tallyfy_module.time, 'time', clock.time), \
+                patch.object(tallyfy_module.time, 'sleep', clock.sleep):
+            threads = [threading.Thread(target=request) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        slots.sort()
+        gaps = [b - a for a, b in zip(slots, slots[1:])]
+        self.assertEqual(len(set(slots)), 20)
+        self.assertTrue(all(gap >= client.min_request_interval - 1e-9 for gap in gaps))
+
+
+class FakeRocketlane:
+    def __init__(self, entries_by_project):
+        self.entries_by_project = entries_by_project
+
+    def get_time_entries(self, project_id):
+        return list(self.entries_by_project[project_id])
+
+
+class FakeTallyfy:
+    def __init__(self, fail_keys=()):
+        self.fail_keys = set(fail_keys)
+        self.comments = []
+        self.task_lookups = 0
+        self.lock = threading.Lock()
+
+    def get_run_tasks(self, run_id):
+        with self.lock:
+            self.task_lookups += 1
+        return [{'id': f'{run_id}-task-1'}, {'id': f'{run_id}-task-2'}]
+
+    def create_comment(self, run_id, comment, task_id=None):
+        if any(key in comment for key in self.fail_keys):
+            raise RuntimeError('server error')
+        with self.lock:
+            self.comments.append((run_id, task_id, comment.split('\n')[0]))
+        return {'id': len(self.comments)}
+
+
+@unittest.skipIf(main is None, 'rocketlane requirements are not installed')
+class MigrateTimeEntriesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        self.checkpoints = CheckpointManager('rl_test', os.path.join(self.workdir.name, 'cp.db'))
+        self.addCleanup(self.checkpoints.close)
+
+    def orchestrator(self, tallyfy, entries=ENTRIES):
+        orchestrator = main.RocketLaneMigrationOrchestrator.__new__(main.RocketLaneMigrationOrchestrator)
+        orchestrator.rocketlane_client = FakeRocketlane({'p1': entries})
+        orchestrator.tallyfy_client = tallyfy
+        orchestrator.instance_transformer = InstanceTransformer()
+        orchestrator.checkpoint_manager = self.checkpoints
+        return orchestrator
+
+    def test_one_request_per_group_on_the_first_task(self):
+        tallyfy = FakeTallyfy()
+        counts = self.orchestrator(tallyfy)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+
+        self.assertEqual(len(tallyfy.comments), 4)
+        self.assertEqual(tallyfy.task_lookups, 1)
+        self.assertEqual({task for _, task, _ in tallyfy.comments}, {'run1-task-1'})
+        self.assertEqual(counts['time_entries'], {'total': 6, 'successful': 6, 'failed': 0})
+        self.assertEqual(counts['time_entry_groups'],
+                         {'total': 4, 'successful': 4, 'failed': 0, 'skipped': 0})
+
+    def test_resume_posts_only_missing_groups(self):
+        failing = FakeTallyfy(fail_keys=['Day: 2024-03-02'])
+        first = self.orchestrator(failing)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(first['time_entry_groups']['failed'], 1)
+        self.assertEqual(first['time_entries']['failed'], 1)
+
+        retry = FakeTallyfy()
+        second = self.orchestrator(retry)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(len(retry.comments), 1)
+        self.assertIn('Day: 2024-03-02', retry.comments[0][2])
+        self.assertEqual(second['time_entry_groups'],
+                         {'total': 4, 'successful': 1, 'failed': 0, 'skipped': 3})
+        self.assertEqual(second['time_entries']['successful'], 6)
+
+    def test_resume_posts_entries_added_to_a_posted_group(self):
+        self.orchestrator(FakeTallyfy())._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        grown = ENTRIES + [entry('e7', 2, task_id='t1', date='2024-03-03'),
+                           entry('e8', 1, task_id='t1', date='2024-03-04')]
+
+        retry = FakeTallyfy()
+        second = self.orchestrator(retry, grown)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(len(retry.comments), 1)
+        self.assertIn('Task: t1, follow-up', retry.comments[0][2])
+        self.assertIn('2 entries, 3 hours', retry.comments[0][2])
+        self.assertEqual(second['time_entries'], {'total': 8, 'successful': 8, 'failed': 0})
+        self.assertEqual(second['time_entry_groups'],
+                         {'total': 4, 'successful': 1, 'failed': 0, 'skipped': 3})
+        checkpoint = self.checkpoints.get_checkpoint('projects', 'time_entry_group', 'p1:task:t1')
+        self.assertEqual(checkpoint['data']['entry_ids'], ['e1', 'e3', 'e7', 'e8'])
+
+        again = FakeTallyfy()
+        self.orchestrator(again, grown)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(again.comments, [])
+
+    def test_a_failed_follow_up_is_retried_without_reposting_the_group(self):
+        self.orchestrator(FakeTallyfy())._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        grown = ENTRIES + [entry('e7', 2, task_id='t1', date='2024-03-03')]
+
+        failing = FakeTallyfy(fail_keys=['follow-up'])
+        counts = self.orchestrator(failing, grown)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(counts['time_entries'], {'total': 7, 'successful': 6, 'failed': 1})
+
+        retry = FakeTallyfy()
+        self.orchestrator(retry, grown)._migrate_time_entries({'id': 'p1', 'name': 'P'}, 'run1')
+        self.assertEqual(len(retry.comments), 1)
+        self.assertIn('1 entries, 2 hours', retry.comments[0][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,406 @@
+"""
+Asyncio Tallyfy client for high-concurrency launches and taskdata writes.
+
+WHY THIS EXISTS
+---------------
+Every vendor ``tallyfy_client.py`` is synchronous ``requests`` code, so the only
+way to overlap requests is a thread per request in flight. That tops out at a
+few dozen threads; launching 100k runs needs hundreds of requests in flight,
+and on one core those are almost all waiting on the network. A single event
+loop does that with one thread.
+
+This client speaks the same endpoints, with the same semantics, as the sync
+clients' ``create_process``, ``get_run_form_fields``,
+``update_task_form_field_values``, ``create_comment`` and ``upload_file``:
+
+* launch bodies carry kick-off data under ``prerun`` as an OBJECT keyed by
+  ``timeline_id``; a legacy ``prerun_data`` key or a list of
+  ``{"field_id", "value"}`` pairs is rewritten before sending (see
+  :mod:`shared.prerun_encoder`);
+* taskdata is written per task with ``PUT /runs/{run}/tasks/{task}`` and an
+  empty write is refused rather than sent.
+
+THROUGHPUT CONTROLS
+-------------------
+``max_concurrency``      an ``asyncio.Semaphore`` caps requests in flight; the
+                         connection pool is sized to match.
+``requests_per_second``  one :class:`TokenBucket` shared by every coroutine on
+                         the client paces the whole batch, not each task.
+``max_retries``          429, 5xx, timeouts and connection errors are retried
+                         with exponential backoff (``Retry-After`` wins when
+                         sent). A request that is backing off does not hold a
+                         concurrency slot.
+
+SYNCHRONOUS CALLERS
+-------------------
+The orchestrators are synchronous. :class:`SyncBatchAdapter` runs the client on
+a private event loop in a background thread and exposes blocking batch methods
+that return one result per input, in input order::
+
+    with SyncBatchAdapter(token, org) as tallyfy:
+        results = tallyfy.create_processes(processes)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:  # imported as part of the `shared` package
+    from .prerun_encoder import LEGACY_PRERUN_KEY, PRERUN_KEY, normalize_prerun_object
+except ImportError:  # imported as a top-level module (sys.path includes shared/)
+    from prerun_encoder import LEGACY_PRERUN_KEY, PRERUN_KEY, normalize_prerun_object
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = 'https://go.tallyfy.com/api'
+DEFAULT_MAX_CONCURRENCY = 100
+DEFAULT_REQUESTS_PER_SECOND = 20.0
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TallyfyAPIError(RuntimeError):
+    """A request failed with a non-retryable status, or ran out of retries."""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: str = ''):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate`` tokens per second, bursting to ``capacity``.
+
+    Waiters are served in arrival order. The lock is created on first use so
+    the bucket can be built outside the event loop that will drive it.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncTallyfyClient:
+    """
+    Asyncio client for the Tallyfy endpoints a bulk migration hammers.
+
+    Use as an async context manager; the connection pool, semaphore and
+    pacing state belong to the event loop that opens it::
+
+        async with AsyncTallyfyClient(token, org) as tallyfy:
+            runs = await tallyfy.create_processes(processes)
+    """
+
+    def __init__(self, api_token: str, organization_id: str,
+                 base_url: str = DEFAULT_BASE_URL,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+                 burst: Optional[float] = None,
+                 max_retries: int = 5,
+                 backoff_base: float = 0.5,
+                 max_backoff: float = 60.0,
+                 timeout: float = 120.0):
+        """
+        Args:
+            api_token: Tallyfy bearer token.
+            organization_id: Organization ID.
+            base_url: API base URL, already ending in ``/api``.
+            max_concurrency: Requests in flight at once.
+            requests_per_second: Pace for the whole client; ``None`` disables it.
+            burst: Token bucket capacity. Defaults to one second's worth.
+            max_retries: Retries per request after the first attempt.
+            backoff_base: First backoff delay in seconds; doubles per retry.
+            max_backoff: Upper bound for any single backoff delay.
+            timeout: Total seconds allowed per attempt.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError('AsyncTallyfyClient requires aiohttp: pip install aiohttp')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        self.api_token = api_token
+        self.organization_id = organization_id
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second else None
+
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limits_hit': 0, 'failures': 0}
+
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncTallyfyClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Create the connection pool and semaphore on the running loop."""
+        if self._session is not None:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            limit_per_host=self.max_concurrency,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                'Authorization': f'Bearer {self.api_token}',
+                'Accept': 'application/json',
+                'Accept-Encoding': 'gzip, deflate',
+            },
+        )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # Transport
+
+    def _url(self, path: str) -> str:
+        return f'{self.base_url}/organizations/{self.organization_id}{path}'
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        delay = self.backoff_base * (2 ** attempt)
+        return min(self.max_backoff, delay + random.uniform(0, delay / 2))
+
+    async def _request(self, method: str, path: str, json_body: Any = None,
+                       form: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """
+        Send one request with pacing, bounded concurrency and retry.
+
+        ``form`` is a factory rather than a value because a multipart body is
+        consumed by sending it, and every retry needs a fresh one.
+        """
+        if self._session is None:
+            raise RuntimeError('AsyncTallyfyClient is not open; use "async with".')
+
+        url = self._url(path)
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+
+            status, body, retry_after, error = None, '', None, None
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                try:
+                    kwargs = {'data': form()} if form is not None else {'json': json_body}
+                    async with self._session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        body = await response.text()
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    error = exc
+
+            if status is not None and status < 400:
+                if status == 204 or not body:
+                    return {'success': True}
+                return json.loads(body)
+
+            if status == 429:
+                self.stats['rate_limits_hit'] += 1
+            retryable = error is not None or status in RETRYABLE_STATUSES
+            if not retryable or attempt >= self.max_retries:
+                self.stats['failures'] += 1
+                reason = f'HTTP {status}' if status is not None else repr(error)
+                raise TallyfyAPIError(f'{method} {path} failed: {reason}', status=status, body=body)
+
+            delay = self._backoff(attempt, retry_after)
+            logger.debug(f"{method} {path}: {status or error}; retrying in {delay:.2f}s")
+            self.stats['retries'] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    # Endpoints
+
+    async def create_process(self, process_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Launch a process: ``POST /organizations/{org}/runs``.
+
+        Kick-off data is sent as ``prerun``, an object keyed by timeline_id.
+        A ``prerun_data`` key is accepted on input and rewritten; the caller's
+        dict is not modified.
+        """
+        body = dict(process_data)
+        legacy_prerun = body.pop(LEGACY_PRERUN_KEY, None)
+        prerun = body.get(PRERUN_KEY, legacy_prerun)
+        if prerun:
+            body[PRERUN_KEY] = normalize_prerun_object(prerun)
+        return await self._request('POST', '/runs', json_body=body)
+
+    async def get_run_form_fields(self, run_id: str) -> Dict[str, Any]:
+        """Read every form field on a process: ``GET /runs/{run_id}/form-fields``."""
+        return await self._request('GET', f'/runs/{run_id}/form-fields')
+
+    async def update_task_form_field_values(self, run_id: str, task_id: str,
+                                            taskdata: Dict[str, Any]) -> Dict[str, Any]:
+        """Write ``{timeline_id: value}`` onto one task: ``PUT /runs/{run}/tasks/{task}``."""
+        if not taskdata:
+            raise ValueError('taskdata is empty: nothing to write.')
+        return await self._request('PUT', f'/runs/{run_id}/tasks/{task_id}',
+                                   json_body={'taskdata': taskdata})
+
+    async def create_comment(self, entity_type: str, entity_id: str,
+                             comment_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Comment on an entity: ``POST /{entity_type}s/{entity_id}/comments``."""
+        return await self._request('POST', f'/{entity_type}s/{entity_id}/comments',
+                                   json_body=comment_data)
+
+    async def upload_file(self, file_path: str, entity_type: str, entity_id: str) -> Dict[str, Any]:
+        """Attach a file to an entity: ``POST /{entity_type}s/{entity_id}/attachments``."""
+        loop = asyncio.get_running_loop()
+        with open(file_path, 'rb') as f:
+            content = await loop.run_in_executor(None, f.read)
+        file_name = os.path.basename(file_path)
+
+        def form():
+            data = aiohttp.FormData()
+            data.add_field('file', content, filename=file_name)
+            return data
+
+        return await self._request('POST', f'/{entity_type}s/{entity_id}/attachments', form=form)
+
+    # Batches
+
+    async def gather_results(self, calls: Iterable[Awaitable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Await ``calls`` together; one ``{'result', 'error'}`` per call, in order.
+
+        One failure does not cancel or mislabel the rest of the batch.
+        """
+        outcomes = await asyncio.gather(*calls, return_exceptions=True)
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                results.append({'result': None, 'error': str(outcome)})
+            else:
+                results.append({'result': outcome, 'error': None})
+        return results
+
+    async def create_processes(self, processes: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self.gather_results(self.create_process(p) for p in processes)
+
+    async def update_task_form_field_values_batch(
+            self, writes: Sequence[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return await self.gather_results(
+            self.update_task_form_field_values(run_id, task_id, taskdata)
+            for run_id, task_id, taskdata in writes
+        )
+
+    async def create_comments(
+            self, comments: Sequence[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return await self.gather_results(
+            self.create_comment(entity_type, entity_id, data)
+            for entity_type, entity_id, data in comments
+        )
+
+
+class SyncBatchAdapter:
+    """
+    Blocking facade over :class:`AsyncTallyfyClient` for synchronous orchestrators.
+
+    The client lives on a private event loop in a daemon thread for the life of
+    the adapter, so its connection pool and pacing carry across batches.
+    """
+
+    def __init__(self, api_token: str, organization_id: str, **client_kwargs):
+        self.client = AsyncTallyfyClient(api_token, organization_id, **client_kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name='tallyfy-async', daemon=True)
+        self._thread.start()
+        self._run(self.client.open())
+
+    def __enter__(self) -> 'SyncBatchAdapter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        self._run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.client.stats)
+
+    def create_processes(self, processes: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Launch every process; ``[{'result', 'error'}, ...]`` in input order."""
+        return self._run(self.client.create_processes(processes))
+
+    def update_task_form_field_values(
+            self, writes: Sequence[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Apply ``(run_id, task_id, taskdata)`` writes; results in input order."""
+        return self._run(self.client.update_task_form_field_values_batch(writes))
+
+    def create_comments(
+            self, comments: Sequence[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Post ``(entity_type, entity_id, comment_data)`` comments; results in input order."""
+        return self._run(self.client.create_comments(comments))
+
+
+__all__ = [
+    'AIOHTTP_AVAILABLE',
+    'AsyncTallyfyClient',
+    'SyncBatchAdapter',
+    'TallyfyAPIError',
+    'TokenBucket',
+]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared checkpoint store vs. the old per-vendor checkpoint managers.
+
+Measures, per item:
+  * checkpoint writes -- the old commit-per-write pattern against the store's
+    group commit (the old pattern is sampled; at 1M rows it would run for hours);
+  * bulk ID mappings -- ``save_id_mappings`` against one ``save_id_mapping``
+    per row;
+  * the resume and progress queries at full table size, with and without the
+    store's indexes.
+
+Usage::
+
+    python shared/benchmarks/checkpoint_store_bench.py --rows 1000000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.checkpoint_store import CheckpointStore  # noqa: E402
+
+STATUSES = ('completed', 'completed', 'completed', 'failed', 'pending')
+ENTITY_TYPES = ('user', 'template', 'process', 'task')
+
+
+def per_item_us(seconds, count):
+    return seconds / max(count, 1) * 1e6
+
+
+def legacy_writes(db_path, count):
+    """The old managers: rollback journal, commit after every write."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE checkpoints (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, migration_id TEXT NOT NULL,
+            phase TEXT NOT NULL, item_type TEXT NOT NULL, item_id TEXT NOT NULL,
+            status TEXT NOT NULL, created_at TEXT NOT NULL, data TEXT,
+            UNIQUE(migration_id, phase, item_type, item_id))
+    """)
+    conn.execute("CREATE TABLE migrations (migration_id TEXT PRIMARY KEY, phase TEXT, updated_at TEXT)")
+    conn.execute("INSERT INTO migrations VALUES ('bench', NULL, NULL)")
+    conn.commit()
+
+    started = time.perf_counter()
+    for i in range(count):
+        conn.execute(
+            "INSERT OR REPLACE INTO checkpoints (migration_id, phase, item_type, item_id, status, "
+            "created_at, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ('bench', 'instances', 'run', str(i), 'completed', 'now', None),
+        )
+        conn.execute("UPDATE migrations SET phase = ?, updated_at = ? WHERE migration_id = ?",
+                      ('instances', 'now', 'bench'))
+        conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def store_writes(store, count):
+    started = time.perf_counter()
+    for i in range(count):
+        store.save_checkpoint('instances', 'run', str(i), status=STATUSES[i % len(STATUSES)])
+    store.flush()
+    return time.perf_counter() - started
+
+
+def timed(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def queries(store):
+    return {
+        'get_phase_progress': timed(lambda: store.get_phase_progress('instances')),
+        'get_pending_items(limit=100)': timed(lambda: store.get_pending_items('instances', 'run')),
+        'get_resume_point': timed(store.get_resume_point),
+        "get_all_id_mappings('user')": timed(lambda: store.get_all_id_mappings('user')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='checkpoint rows to write')
+    parser.add_argument('--legacy-sample', type=int, default=2_000,
+                        help='rows written with the old commit-per-write pattern')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        legacy = legacy_writes(os.path.join(workdir, 'legacy.db'), args.legacy_sample)
+
+        store = CheckpointStore('bench', os.path.join(workdir, 'store.db'))
+        written = store_writes(store, args.rows)
+
+        mappings = {f's{i}': f't{i}' for i in range(args.rows // 4)}
+        started = time.perf_counter()
+        for entity_type in ENTITY_TYPES:
+            store.save_id_mappings(
+                {f'{entity_type}:{k}': v for k, v in mappings.items()}, entity_type
+            )
+        store.flush()
+        bulk = time.perf_counter() - started
+        bulk_rows = len(mappings) * len(ENTITY_TYPES)
+
+        sample = {f'one:{i}': str(i) for i in range(args.legacy_sample)}
+        started = time.perf_counter()
+        for source_id, target_id in sample.items():
+            store.save_id_mapping(source_id, target_id, 'sample')
+        store.flush()
+        single = time.perf_counter() - started
+
+        indexed = queries(store)
+        for index in ('idx_checkpoints_status', 'idx_checkpoints_recent', 'idx_id_mappings_entity'):
+            store.conn.execute(f'DROP INDEX {index}')
+        unindexed = queries(store)
+        store.close()
+
+    print(f'Checkpoint writes ({args.rows:,} rows)')
+    print(f'  commit per write (old, {args.legacy_sample:,} sampled) '
+          f'{per_item_us(legacy, args.legacy_sample):10.1f} us/item')
+    print(f'  group commit (store)                 {per_item_us(written, args.rows):10.1f} us/item')
+    print(f'ID mappings ({bulk_rows:,} rows)')
+    print(f'  save_id_mapping per row              {per_item_us(single, len(sample)):10.1f} us/item')
+    print(f'  save_id_mappings bulk                {per_item_us(bulk, bulk_rows):10.1f} us/item')
+    print('Queries at full size                        indexed    no index')
+    for name in indexed:
+        print(f'  {name:<36} {indexed[name] * 1e3:8.2f} ms {unindexed[name] * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,742 @@
+"""
+SQLite checkpoint and ID-mapping store shared by every vendor migrator.
+
+WHY THIS EXISTS
+---------------
+Fourteen vendors shipped their own copy of ``src/utils/checkpoint_manager.py``,
+identical apart from the default ``source_system`` and whitespace. Every copy
+had the same two costs that dominate a large migration:
+
+* ``save_checkpoint``, ``save_id_mapping`` and ``log_error`` each ended with
+  ``conn.commit()``. In SQLite's default rollback-journal mode a commit is
+  several fsyncs, so recording one migrated item cost milliseconds -- more
+  than the item's own transform.
+* Nothing indexed ``checkpoints.status`` or ``id_mappings.entity_type``, so
+  ``get_pending_items``, ``get_phase_progress`` and
+  ``get_all_id_mappings(entity_type)`` scanned the whole table, and got
+  slower with every item recorded.
+
+This store keeps the same schema and method names, and changes three things:
+
+1. The database runs in WAL mode with ``synchronous=NORMAL``. A commit
+   appends to the log instead of rewriting pages, and readers do not block
+   the writer.
+2. Checkpoint and error-log writes are GROUP COMMITTED. A commit happens
+   once ``commit_batch`` writes are pending, or on the first write after
+   ``commit_interval`` seconds have passed since the last commit; there is no
+   timer, so an idle store holds its window until the next write.
+   :meth:`flush`, :meth:`close`, and the migration-status writes always
+   commit. Reads on the same store see pending writes, because they share
+   the connection. A crash loses at most one window of checkpoints, so they
+   must only record work that is safe to redo. Pass ``commit_batch=1`` for
+   the old commit-per-write behaviour.
+
+   ID mappings are NOT group committed. A mapping records an object already
+   created in Tallyfy, and a resume that lost it would create the object a
+   second time, so :meth:`save_id_mapping(s) <save_id_mappings>` commits
+   before returning, taking any pending checkpoints with it. A checkpoint
+   that likewise stands for a create -- a posted comment, say -- is saved
+   with ``durable=True``.
+3. Indexes serve the resume and progress queries directly:
+
+   ==========================  =============================================
+   index                       serves
+   ==========================  =============================================
+   idx_checkpoints_status      get_phase_progress (covering),
+                               get_pending_items
+   idx_checkpoints_recent      get_resume_point (last checkpoint)
+   idx_id_mappings_entity      get_all_id_mappings(entity_type) (covering)
+   ==========================  =============================================
+
+   They are created with ``IF NOT EXISTS``, so an existing checkpoint database
+   from an interrupted run gains them on its next open.
+
+:meth:`save_id_mappings` writes many mappings in one statement and one
+transaction. A phase that creates a batch of objects should record their IDs
+with it.
+
+MAPPING SNAPSHOTS
+-----------------
+An instance phase looks up the same user and template mappings for every
+item. Re-reading them per item is one query per lookup, or worse, a full
+``get_all_id_mappings`` per item. :meth:`mapping_snapshot` loads one entity
+type's mappings into a dict once. The store keeps that dict current as
+``save_id_mapping(s)`` writes land, so it never needs reloading, and while it
+is held ``get_id_mapping`` for that type is answered from memory. Pass the
+dict straight to the transformers. :meth:`release_mapping_snapshots` drops
+the snapshots when the phase is done.
+
+Vendors subclass this and set ``SOURCE_SYSTEM``. The subclass is their
+``CheckpointManager``.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMMIT_BATCH = 500
+DEFAULT_COMMIT_INTERVAL = 1.0
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS migrations (
+        migration_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        phase TEXT,
+        started_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        completed_at TEXT,
+        metadata TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS checkpoints (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        migration_id TEXT NOT NULL,
+        phase TEXT NOT NULL,
+        item_type TEXT NOT NULL,
+        item_id TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        data TEXT,
+        FOREIGN KEY (migration_id) REFERENCES migrations (migration_id),
+        UNIQUE(migration_id, phase, item_type, item_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS id_mappings (
+        migration_id TEXT NOT NULL,
+        source_system TEXT NOT NULL,
+        source_id TEXT NOT NULL,
+        target_system TEXT NOT NULL,
+        target_id TEXT NOT NULL,
+        entity_type TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (migration_id, source_system, source_id),
+        FOREIGN KEY (migration_id) REFERENCES migrations (migration_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS error_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        migration_id TEXT NOT NULL,
+        phase TEXT,
+        item_type TEXT,
+        item_id TEXT,
+        error_type TEXT,
+        error_message TEXT,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (migration_id) REFERENCES migrations (migration_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_checkpoints_status
+    ON checkpoints (migration_id, phase, status, item_type)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_checkpoints_recent
+    ON checkpoints (migration_id, id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_id_mappings_entity
+    ON id_mappings (migration_id, entity_type, source_id, target_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_error_log_migration
+    ON error_log (migration_id, phase)
+    """,
+)
+
+IdMappings = Union[Mapping[Any, Any], Iterable[Tuple[Any, Any]]]
+
+
+class CheckpointStore:
+    """Migration checkpoints, ID mappings and error log in one SQLite file."""
+
+    SOURCE_SYSTEM = 'source'
+    TARGET_SYSTEM = 'tallyfy'
+    DEFAULT_DB_PATH = 'checkpoints.db'
+
+    def __init__(self, migration_id: str, db_path: Optional[str] = None, *,
+                 commit_batch: int = DEFAULT_COMMIT_BATCH,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL):
+        """
+        Initialize checkpoint manager
+
+        Args:
+            migration_id: Unique migration identifier
+            db_path: Path to SQLite database (``DEFAULT_DB_PATH`` when omitted)
+            commit_batch: Commit once this many writes are pending
+            commit_interval: Commit once this many seconds have passed since
+                the last commit, even if fewer writes are pending
+        """
+        self.migration_id = migration_id
+        self.db_path = db_path or self.DEFAULT_DB_PATH
+        self.commit_batch = max(1, commit_batch)
+        self.commit_interval = commit_interval
+        self.conn = None
+        self.cursor = None
+
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._pending_phase: Optional[Tuple[str, str]] = None
+        self._snapshots: Dict[str, Dict[str, str]] = {}
+
+        self._initialize_database()
+        logger.info(f"Checkpoint manager initialized for migration: {migration_id}")
+
+    def _initialize_database(self):
+        """Initialize SQLite database with required tables and indexes"""
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Writes are serialised by self._lock, so worker threads may share it.
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        for statement in SCHEMA:
+            self.cursor.execute(statement)
+        self.conn.commit()
+
+        self._initialize_migration()
+
+    def _initialize_migration(self):
+        """Initialize migration record"""
+        now = datetime.utcnow().isoformat()
+
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO migrations
+            (migration_id, status, started_at, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, (self.migration_id, 'in_progress', now, now))
+
+        self.conn.commit()
+
+    # ============= COMMIT WINDOW =============
+
+    def _wrote(self, count: int = 1):
+        """Account for ``count`` pending writes and commit if the window is full."""
+        self._pending += count
+        if (self._pending >= self.commit_batch
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self._commit()
+
+    def _apply_pending_phase(self):
+        """Write the latest checkpointed phase onto the migration record."""
+        if self._pending_phase is None:
+            return
+        phase, now = self._pending_phase
+        self.cursor.execute("""
+            UPDATE migrations
+            SET phase = ?, updated_at = ?
+            WHERE migration_id = ?
+        """, (phase, now, self.migration_id))
+        self._pending_phase = None
+
+    def _commit(self):
+        self._apply_pending_phase()
+        self.conn.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def flush(self):
+        """Commit every pending write now."""
+        with self._lock:
+            if self.conn is not None:
+                self._commit()
+
+    # ============= CHECKPOINTS =============
+
+    def save_checkpoint(self, phase: str, item_type: str, item_id: str,
+                        status: str = 'completed', data: Optional[Dict] = None,
+                        durable: bool = False):
+        """
+        Save a checkpoint for an item
+
+        Args:
+            phase: Migration phase (discovery, users, templates, instances, validation)
+            item_type: Type of item (user, template, process, etc.)
+            item_id: Unique identifier for the item
+            status: Status of the item (pending, in_progress, completed, failed)
+            data: Optional data to store with checkpoint
+            durable: Commit before returning instead of with the window; for
+                checkpoints a resume must not lose, because redoing the
+                item would create something twice
+        """
+        now = datetime.utcnow().isoformat()
+        data_json = json.dumps(data) if data else None
+
+        with self._lock:
+            try:
+                self.cursor.execute("""
+                    INSERT OR REPLACE INTO checkpoints
+                    (migration_id, phase, item_type, item_id, status, created_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (self.migration_id, phase, item_type, item_id, status, now, data_json))
+            except Exception as e:
+                # A failed statement is undone on its own; rolling back here
+                # would also discard the other writes in this commit window.
+                logger.error(f"Failed to save checkpoint: {e}")
+                raise
+
+            # The migration's current phase is written once per commit, not
+            # once per item.
+            self._pending_phase = (phase, now)
+            if durable:
+                self._commit()
+            else:
+                self._wrote()
+
+    def get_checkpoint(self, phase: str, item_type: str,
+                       item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get checkpoint for a specific item
+
+        Args:
+            phase: Migration phase
+            item_type: Type of item
+            item_id: Item identifier
+
+        Returns:
+            Checkpoint data or None
+        """
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT status, created_at, data
+                FROM checkpoints
+                WHERE migration_id = ? AND phase = ? AND item_type = ? AND item_id = ?
+            """, (self.migration_id, phase, item_type, item_id)).fetchone()
+
+        if row:
+            return {
+                'status': row[0],
+                'created_at': row[1],
+                'data': json.loads(row[2]) if row[2] else None
+            }
+        return None
+
+    def is_item_processed(self, phase: str, item_type: str, item_id: str) -> bool:
+        """Check if an item has been processed"""
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT status
+                FROM checkpoints
+                WHERE migration_id = ? AND phase = ? AND item_type = ? AND item_id = ?
+            """, (self.migration_id, phase, item_type, item_id)).fetchone()
+        return row is not None and row[0] in ('completed', 'failed')
+
+    def get_phase_progress(self, phase: str) -> Dict[str, int]:
+        """
+        Get progress statistics for a phase
+
+        Args:
+            phase: Migration phase
+
+        Returns:
+            Dictionary with counts by status
+        """
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT status, COUNT(*) as count
+                FROM checkpoints
+                WHERE migration_id = ? AND phase = ?
+                GROUP BY status
+            """, (self.migration_id, phase)).fetchall()
+
+        return {status: count for status, count in rows}
+
+    def get_pending_items(self, phase: str, item_type: Optional[str] = None,
+                          limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get pending items for a phase
+
+        Args:
+            phase: Migration phase
+            item_type: Optional filter by item type
+            limit: Maximum number of items to return
+
+        Returns:
+            List of pending items
+        """
+        query = """
+            SELECT item_type, item_id, data
+            FROM checkpoints
+            WHERE migration_id = ? AND phase = ? AND status = 'pending'
+        """
+        params: List[Any] = [self.migration_id, phase]
+
+        if item_type:
+            query += " AND item_type = ?"
+            params.append(item_type)
+
+        query += " LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'item_type': row[0],
+                'item_id': row[1],
+                'data': json.loads(row[2]) if row[2] else None
+            }
+            for row in rows
+        ]
+
+    # ============= ID MAPPINGS =============
+
+    def save_id_mapping(self, source_id: str, target_id: str, entity_type: str,
+                        source_system: Optional[str] = None,
+                        target_system: Optional[str] = None):
+        """
+        Save ID mapping between systems
+
+        Args:
+            source_id: Source system ID
+            target_id: Target system ID
+            entity_type: Type of entity (user, template, process, etc.)
+            source_system: Source system name (``SOURCE_SYSTEM`` when omitted)
+            target_system: Target system name (``TARGET_SYSTEM`` when omitted)
+        """
+        self.save_id_mappings({source_id: target_id}, entity_type,
+                              source_system=source_system, target_system=target_system)
+
+    def save_id_mappings(self, mappings: IdMappings, entity_type: str,
+                         source_system: Optional[str] = None,
+                         target_system: Optional[str] = None) -> int:
+        """
+        Save many ID mappings of one entity type in a single statement
+
+        Args:
+            mappings: ``{source_id: target_id}``, or ``(source_id, target_id)`` pairs
+            entity_type: Type of entity (user, template, process, etc.)
+            source_system: Source system name (``SOURCE_SYSTEM`` when omitted)
+            target_system: Target system name (``TARGET_SYSTEM`` when omitted)
+
+        Returns:
+            Number of mappings written
+        """
+        now = datetime.utcnow().isoformat()
+        source_system = source_system or self.SOURCE_SYSTEM
+        target_system = target_system or self.TARGET_SYSTEM
+        pairs = mappings.items() if isinstance(mappings, Mapping) else mappings
+        rows = [
+            (self.migration_id, source_system, str(source_id), target_system,
+             str(target_id), entity_type, now)
+            for source_id, target_id in pairs
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            try:
+                self.cursor.executemany("""
+                    INSERT OR REPLACE INTO id_mappings
+                    (migration_id, source_system, source_id, target_system, target_id,
+                     entity_type, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            except Exception as e:
+                logger.error(f"Failed to save ID mapping: {e}")
+                raise
+            # Committed now, not with the window: the target objects exist.
+            self._commit()
+            if self._snapshots:
+                self._update_snapshots(entity_type, rows)
+
+        return len(rows)
+
+    def _update_snapshots(self, entity_type: str, rows: List[Tuple]):
+        """Apply written mapping rows to the snapshots that hold them."""
+        for snapshot_type, snapshot in self._snapshots.items():
+            if snapshot_type == entity_type:
+                snapshot.update((row[2], row[4]) for row in rows)
+            else:
+                # INSERT OR REPLACE moved these source ids to entity_type.
+                for row in rows:
+                    snapshot.pop(row[2], None)
+
+    def mapping_snapshot(self, entity_type: str) -> Dict[str, str]:
+        """
+        Get one entity type's mappings as a dict kept current by later writes
+
+        Loaded with a single query on first use. The same dict is returned on
+        every call and updated in place by ``save_id_mapping(s)``; treat it as
+        read-only.
+
+        Args:
+            entity_type: Type of entity (user, template, process, etc.)
+
+        Returns:
+            Dictionary of source_id -> target_id mappings
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(entity_type)
+            if snapshot is None:
+                snapshot = self.get_all_id_mappings(entity_type)
+                self._snapshots[entity_type] = snapshot
+            return snapshot
+
+    def release_mapping_snapshots(self):
+        """Drop every mapping snapshot; lookups go back to the database"""
+        with self._lock:
+            self._snapshots = {}
+
+    def get_id_mapping(self, source_id: str, entity_type: Optional[str] = None,
+                       source_system: Optional[str] = None) -> Optional[str]:
+        """
+        Get target ID for a source ID
+
+        Args:
+            source_id: Source system ID
+            entity_type: Optional entity type filter
+            source_system: Source system name (``SOURCE_SYSTEM`` when omitted)
+
+        Returns:
+            Target ID or None
+        """
+        snapshot = self._snapshots.get(entity_type) if entity_type else None
+        if snapshot is not None and source_system in (None, self.SOURCE_SYSTEM):
+            return snapshot.get(str(source_id)) if source_id is not None else None
+
+        query = """
+            SELECT target_id
+            FROM id_mappings
+            WHERE migration_id = ? AND source_system = ? AND source_id = ?
+        """
+        params: List[Any] = [self.migration_id, source_system or self.SOURCE_SYSTEM, source_id]
+
+        if entity_type:
+            query += " AND entity_type = ?"
+            params.append(entity_type)
+
+        with self._lock:
+            row = self.conn.execute(query, params).fetchone()
+
+        return row[0] if row else None
+
+    def get_all_id_mappings(self, entity_type: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get all ID mappings
+
+        Args:
+            entity_type: Optional filter by entity type
+
+        Returns:
+            Dictionary of source_id -> target_id mappings
+        """
+        query = """
+            SELECT source_id, target_id
+            FROM id_mappings
+            WHERE migration_id = ?
+        """
+        params: List[Any] = [self.migration_id]
+
+        if entity_type:
+            query += " AND entity_type = ?"
+            params.append(entity_type)
+
+        with self._lock:
+            return dict(self.conn.execute(query, params).fetchall())
+
+    # ============= ERRORS =============
+
+    def log_error(self, phase: str, item_type: str, item_id: str,
+                  error_type: str, error_message: str):
+        """
+        Log an error during migration
+
+        Args:
+            phase: Migration phase
+            item_type: Type of item
+            item_id: Item identifier
+            error_type: Type of error
+            error_message: Error message
+        """
+        now = datetime.utcnow().isoformat()
+
+        with self._lock:
+            try:
+                self.cursor.execute("""
+                    INSERT INTO error_log
+                    (migration_id, phase, item_type, item_id, error_type, error_message, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (self.migration_id, phase, item_type, item_id, error_type,
+                      error_message, now))
+                self._wrote()
+            except Exception as e:
+                logger.error(f"Failed to log error: {e}")
+
+    def get_errors(self, phase: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get errors from the migration
+
+        Args:
+            phase: Optional filter by phase
+
+        Returns:
+            List of errors
+        """
+        query = """
+            SELECT phase, item_type, item_id, error_type, error_message, created_at
+            FROM error_log
+            WHERE migration_id = ?
+        """
+        params: List[Any] = [self.migration_id]
+
+        if phase:
+            query += " AND phase = ?"
+            params.append(phase)
+
+        query += " ORDER BY created_at DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        return [
+            {
+                'phase': row[0],
+                'item_type': row[1],
+                'item_id': row[2],
+                'error_type': row[3],
+                'error_message': row[4],
+                'created_at': row[5]
+            }
+            for row in rows
+        ]
+
+    # ============= MIGRATION STATUS =============
+
+    def mark_migration_complete(self):
+        """Mark migration as completed"""
+        now = datetime.utcnow().isoformat()
+
+        with self._lock:
+            self._apply_pending_phase()
+            self.cursor.execute("""
+                UPDATE migrations
+                SET status = 'completed', completed_at = ?, updated_at = ?
+                WHERE migration_id = ?
+            """, (now, now, self.migration_id))
+            self._commit()
+
+    def mark_migration_failed(self, error_message: str):
+        """Mark migration as failed"""
+        now = datetime.utcnow().isoformat()
+
+        with self._lock:
+            self._apply_pending_phase()
+            self.cursor.execute("""
+                UPDATE migrations
+                SET status = 'failed', updated_at = ?, metadata = ?
+                WHERE migration_id = ?
+            """, (now, json.dumps({'error': error_message}), self.migration_id))
+            self._commit()
+
+    def get_migration_status(self) -> Optional[Dict[str, Any]]:
+        """Get current migration status"""
+        with self._lock:
+            self._apply_pending_phase()
+            row = self.conn.execute("""
+                SELECT status, phase, started_at, updated_at, completed_at, metadata
+                FROM migrations
+                WHERE migration_id = ?
+            """, (self.migration_id,)).fetchone()
+
+        if row:
+            return {
+                'migration_id': self.migration_id,
+                'status': row[0],
+                'phase': row[1],
+                'started_at': row[2],
+                'updated_at': row[3],
+                'completed_at': row[4],
+                'metadata': json.loads(row[5]) if row[5] else None
+            }
+        return None
+
+    def can_resume(self) -> bool:
+        """Check if migration can be resumed"""
+        status = self.get_migration_status()
+        return status is not None and status['status'] == 'in_progress'
+
+    def get_resume_point(self) -> Optional[Dict[str, Any]]:
+        """Get the point to resume migration from"""
+        status = self.get_migration_status()
+        if not status:
+            return None
+
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT phase, item_type, item_id, status
+                FROM checkpoints
+                WHERE migration_id = ?
+                ORDER BY id DESC
+                LIMIT 1
+            """, (self.migration_id,)).fetchone()
+
+        if row:
+            return {
+                'phase': row[0],
+                'last_item_type': row[1],
+                'last_item_id': row[2],
+                'last_status': row[3]
+            }
+
+        return {'phase': status['phase'] or 'discovery'}
+
+    def cleanup(self, keep_mappings: bool = True):
+        """
+        Clean up migration data
+
+        Args:
+            keep_mappings: Whether to keep ID mappings
+        """
+        tables = ['error_log', 'checkpoints']
+        if not keep_mappings:
+            tables += ['id_mappings', 'migrations']
+
+        with self._lock:
+            self._pending_phase = None
+            if not keep_mappings:
+                self._snapshots = {}
+            for table in tables:
+                self.cursor.execute(f"DELETE FROM {table} WHERE migration_id = ?",
+                                    (self.migration_id,))
+            self._commit()
+
+    def close(self):
+        """Commit pending writes and close the database connection"""
+        with self._lock:
+            if self.conn:
+                try:
+                    self._commit()
+                finally:
+                    self.conn.close()
+                    self.conn = None
+                    self.cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        """Cleanup on deletion"""
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,251 @@
+"""
+Persistent discovery snapshot shared by the migration phases and across runs.
+
+WHY THIS EXISTS
+---------------
+Discovery fetches the whole source workspace -- every customer, project,
+template, form and user -- before anything is migrated. Orchestrators kept the
+result in two places, and both were expensive:
+
+* The run wrote it to ``data/{migration_id}_discovery.json`` and every later
+  phase ``json.load``-ed the whole file again, so a phase that only needs the
+  users parsed every project too, and held all of it in memory.
+* ``migration_id`` is regenerated per run, so a resumed run never found the
+  previous file and fetched the workspace again. Resuming a long migration
+  that failed in the project phase paid discovery a second time.
+
+A ``DiscoverySnapshot`` is one SQLite file at a stable path. :meth:`write`
+stores each list section of the discovery dict as one compact JSON row per
+record, keyed by entity type, position and record id, and everything else
+(counts, analyses) as a value. Later phases stream a section with
+:meth:`records`, which decodes one row at a time in the original order, or
+look a record up with :meth:`get`, which the ``(entity_type, record_id)``
+index answers without a scan.
+
+The whole snapshot is written in one transaction, and its ``complete`` marker
+with it, so an interrupted discovery leaves the previous snapshot intact
+rather than half of a new one.
+
+REFRESH OR REUSE
+----------------
+Whether a run fetches again is an explicit switch, one of ``DISCOVERY_MODES``
+(``DISCOVERY_MODE`` in the environment):
+
+==========  =================================================================
+mode        behaviour
+==========  =================================================================
+auto        reuse only when resuming and the snapshot is complete and was
+            taken with the same parameters; otherwise fetch
+reuse       reuse any complete snapshot; fetch only if there is none
+refresh     always fetch and replace the snapshot
+==========  =================================================================
+
+``params`` are whatever changes what discovery fetches -- the source base URL,
+whether archived items are included. ``auto`` never reuses a snapshot taken
+with different ones.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_MODES = ('auto', 'reuse', 'refresh')
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS records (
+        entity_type TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        record_id TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (entity_type, position)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_records_id
+    ON records (entity_type, record_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sections (
+        name TEXT PRIMARY KEY,
+        position INTEGER NOT NULL,
+        is_records INTEGER NOT NULL,
+        value TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS snapshot (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+
+def configured_discovery_mode(default: str = 'auto') -> str:
+    """Discovery refresh-or-reuse mode from ``DISCOVERY_MODE``."""
+    mode = os.getenv('DISCOVERY_MODE', default).strip().lower()
+    if mode not in DISCOVERY_MODES:
+        logger.warning(f"Unknown DISCOVERY_MODE {mode!r}; using {default!r}")
+        return default
+    return mode
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+class DiscoverySnapshot:
+    """A discovery result stored record-per-row for lazy, indexed reads."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite file holding the snapshot; created if missing
+        """
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self.conn.execute(statement)
+        self.conn.commit()
+
+    def _info(self, key: str) -> Optional[Any]:
+        row = self.conn.execute("SELECT value FROM snapshot WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @property
+    def complete(self) -> bool:
+        """True once a full discovery has been written."""
+        return bool(self._info('complete'))
+
+    @property
+    def params(self) -> Optional[Dict[str, Any]]:
+        """The parameters the snapshot was taken with."""
+        return self._info('params')
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return self._info('created_at')
+
+    def should_reuse(self, mode: str, resume: bool = False,
+                     params: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Decide whether a run should read this snapshot instead of fetching.
+
+        Args:
+            mode: One of ``DISCOVERY_MODES``
+            resume: Whether the run is resuming an earlier migration
+            params: The parameters this run would fetch with
+        """
+        if mode not in DISCOVERY_MODES:
+            raise ValueError(f"Unknown discovery mode {mode!r}; expected one of {DISCOVERY_MODES}")
+        if mode == 'refresh' or not self.complete:
+            return False
+
+        same_params = params is None or _encode(params) == _encode(self.params)
+        if mode == 'reuse':
+            if not same_params:
+                logger.warning(f"Reusing discovery snapshot {self.path} taken with {self.params}, "
+                               f"not {params}")
+            return True
+        return resume and same_params
+
+    def write(self, discovery: Dict[str, Any], params: Optional[Dict[str, Any]] = None):
+        """
+        Replace the snapshot with ``discovery``, in one transaction.
+
+        List values are stored one row per record; anything else is stored
+        whole and read back with :meth:`value`.
+        """
+        with self.conn:
+            for table in ('records', 'sections', 'snapshot'):
+                self.conn.execute(f"DELETE FROM {table}")
+
+            for position, (name, value) in enumerate(discovery.items()):
+                is_records = isinstance(value, list)
+                self.conn.execute(
+                    "INSERT INTO sections (name, position, is_records, value) VALUES (?, ?, ?, ?)",
+                    (name, position, int(is_records), None if is_records else _encode(value)),
+                )
+                if is_records:
+                    self.conn.executemany(
+                        "INSERT INTO records (entity_type, position, record_id, data) VALUES (?, ?, ?, ?)",
+                        (
+                            (name, index, self._record_id(record), _encode(record))
+                            for index, record in enumerate(value)
+                        ),
+                    )
+
+            self.conn.executemany(
+                "INSERT INTO snapshot (key, value) VALUES (?, ?)",
+                [
+                    ('params', _encode(params)),
+                    ('created_at', _encode(datetime.utcnow().isoformat())),
+                    ('complete', _encode(True)),
+                ],
+            )
+
+    @staticmethod
+    def _record_id(record: Any) -> Optional[str]:
+        if isinstance(record, dict) and record.get('id') is not None:
+            return str(record['id'])
+        return None
+
+    def records(self, entity_type: str) -> Iterator[Any]:
+        """Yield one section's records in their discovered order, decoding lazily."""
+        cursor = self.conn.execute(
+            "SELECT data FROM records WHERE entity_type = ? ORDER BY position",
+            (entity_type,),
+        )
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def get(self, entity_type: str, record_id: Any) -> Optional[Any]:
+        """Return one record by its ``id``, or None."""
+        row = self.conn.execute(
+            "SELECT data FROM records WHERE entity_type = ? AND record_id = ? ORDER BY position LIMIT 1",
+            (entity_type, str(record_id)),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self, entity_type: str) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM records WHERE entity_type = ?", (entity_type,)
+        ).fetchone()[0]
+
+    def value(self, name: str, default: Any = None) -> Any:
+        """Return a non-list section, such as the counts or an analysis."""
+        row = self.conn.execute(
+            "SELECT value FROM sections WHERE name = ? AND is_records = 0", (name,)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def load(self) -> Dict[str, Any]:
+        """Rebuild the whole discovery dict. Reads every record; prefer :meth:`records`."""
+        sections = self.conn.execute(
+            "SELECT name, is_records, value FROM sections ORDER BY position"
+        ).fetchall()
+        return {
+            name: list(self.records(name)) if is_records else json.loads(value)
+            for name, is_records, value in sections
+        }
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self) -> 'DiscoverySnapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -42,6 +42,15 @@ value to one of them, encode it for its type, group by ``task_id``, and send one
 ``taskdata`` write per task. That is what :func:`build_task_form_field_payloads`
 produces.
 
+Everything in that response except ``task_id`` comes from the template, so it is
+the same for every run launched from it. :class:`FormFieldLayoutCache` reads it
+for the first run of a template and binds later runs to their own tasks from the
+launch response, instead of spending a GET per run.
+
+The per-task writes of one run are independent, so
+:func:`write_task_form_field_values` sends them concurrently, under one cap per
+organisation shared by every run writing to it.
+
 FAILING LOUDLY IS THE POINT
 ---------------------------
 An unresolved field is invisible at runtime -- the write still returns 200 for
@@ -51,9 +60,19 @@ rather than being logged and skipped.
 """
 
 import logging
-from typing import Any, Dict, List, Mapping, Optional, Sequence
-
-from .prerun_encoder import EMAIL_REGEX, PrerunEncodingError, encode_field_value, resolve_capture
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .http_transport import configured_concurrency
+from .prerun_encoder import (
+    EMAIL_REGEX,
+    CaptureIndex,
+    FieldEncoder,
+    PrerunEncodingError,
+    compile_field_encoder,
+    resolve_capture,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +104,22 @@ class MissingTaskBindingError(FormFieldValueError):
     """
 
 
+class TaskFormFieldWriteError(RuntimeError):
+    """
+    One or more per-task ``taskdata`` writes of a run failed.
+
+    Raised only after every write of the run has finished, so the tasks that
+    did succeed are known: ``written`` lists them, and ``failed`` maps each
+    failed ``task_id`` to its last error.
+    """
+
+    def __init__(self, message: str, failed: Mapping[str, BaseException],
+                 written: Sequence[str] = ()):
+        super().__init__(message)
+        self.failed = dict(failed)
+        self.written = list(written)
+
+
 def _is_emptied_assignees(field: Dict[str, Any], raw_value: Any, encoded: Any) -> bool:
     """
     True when an assignees_form field had a source value but encoded to nobody.
@@ -147,6 +182,132 @@ def extract_run_form_fields(response: Any) -> List[Dict[str, Any]]:
     return fields
 
 
+def _unwrap_list(value: Any) -> List[Dict[str, Any]]:
+    """A list of dicts, possibly under a ``{"data": [...]}`` include envelope."""
+    if isinstance(value, Mapping):
+        value = value.get('data')
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+
+def extract_launched_tasks(response: Any) -> Dict[str, str]:
+    """
+    Map ``step_id`` to ``task_id`` for the tasks in a ``POST /runs`` response.
+
+    Tasks are read from ``tasks`` on the run, inside or outside a ``data``
+    envelope, as a plain list or a ``{"data": [...]}`` include. Returns an empty
+    dict when the response carries no tasks.
+    """
+    if not isinstance(response, Mapping):
+        return {}
+    run = response.get('data', response)
+    if not isinstance(run, Mapping):
+        return {}
+
+    tasks: Dict[str, str] = {}
+    for task in _unwrap_list(run.get('tasks')):
+        step = task.get('step')
+        step_id = task.get('step_id')
+        if step_id in (None, '') and isinstance(step, Mapping):
+            step_id = step.get('id') or (step.get('data') or {}).get('id')
+        if step_id in (None, '') or task.get('id') in (None, ''):
+            continue
+        tasks.setdefault(str(step_id), str(task['id']))
+    return tasks
+
+
+class FormFieldLayoutCache:
+    """
+    Reads a template's form-field layout once and binds it to each launched run.
+
+    ``GET /runs/{id}/form-fields`` returns the same ``timeline_id``s, types,
+    options and columns for every run of a template; only each field's
+    ``task_id`` differs. The first run of a template is read with that GET, and
+    each field is tied to the template step its task was launched from. Later
+    runs are bound from their own launch response, which lists the new tasks
+    with their ``step_id``, so they cost no read at all.
+
+    A run falls back to the GET whenever the binding is not certain: no
+    template id, a launch response without tasks, or a step missing from it.
+    A wrong ``task_id`` would write a value onto another run's task, so a guess
+    is never made.
+
+    Usage::
+
+        layouts = FormFieldLayoutCache(tallyfy_client)
+        launched = tallyfy_client.create_process(process_data)
+        fields = layouts.fields(launched['id'], checklist_id, launched)
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+        # checklist_id -> [(field without task_id, step_id or None for kick-off)]
+        self._layouts: Dict[str, List[Tuple[Dict[str, Any], Optional[str]]]] = {}
+
+    def _read(self, run_id: str) -> List[Dict[str, Any]]:
+        return extract_run_form_fields(self.client.get_run_form_fields(run_id))
+
+    def fields(self, run_id: str, checklist_id: Optional[str] = None,
+               launched: Any = None) -> List[Dict[str, Any]]:
+        """
+        Return the run's form fields, each carrying this run's ``task_id``.
+
+        Args:
+            run_id: The launched process.
+            checklist_id: The template it was launched from. Without it the
+                run is always read with the GET.
+            launched: The ``POST /runs`` response for ``run_id``.
+        """
+        tasks = extract_launched_tasks(launched)
+        layout = self._layouts.get(str(checklist_id)) if checklist_id else None
+
+        if layout is not None:
+            if all(step_id is None or step_id in tasks for _, step_id in layout):
+                return [
+                    dict(field, task_id=tasks[step_id]) if step_id is not None else dict(field)
+                    for field, step_id in layout
+                ]
+            logger.debug(
+                'Launch response for run %s does not list every step of template %s; '
+                'reading its form fields instead', run_id, checklist_id,
+            )
+            return self._read(run_id)
+
+        fields = self._read(run_id)
+        if checklist_id:
+            layout = self._learn(fields, tasks)
+            if layout is not None:
+                self._layouts[str(checklist_id)] = layout
+        return fields
+
+    @staticmethod
+    def _learn(fields: Sequence[Dict[str, Any]],
+               tasks: Mapping[str, str]) -> Optional[List[Tuple[Dict[str, Any], Optional[str]]]]:
+        """The run-independent layout of ``fields``, or None when a step is unknown."""
+        step_of_task = {task_id: step_id for step_id, task_id in tasks.items()}
+        layout = []
+        for field in fields:
+            task_id = field.get('task_id')
+            if task_id in (None, ''):
+                layout.append((dict(field), None))
+                continue
+            step_id = field.get('step_id') or step_of_task.get(str(task_id))
+            if step_id in (None, ''):
+                return None
+            template_field = dict(field)
+            del template_field['task_id']
+            layout.append((template_field, str(step_id)))
+        return layout
+
+    def clear(self, checklist_id: Optional[str] = None) -> None:
+        """Drop cached layouts (all, or one template)."""
+        if checklist_id is None:
+            self._layouts.clear()
+        else:
+            self._layouts.pop(str(checklist_id), None)
+
+
 def _candidate_keys(source_key: Any, *extra: Any) -> List[Any]:
     """Build an ordered, de-duplicated list of identifiers to resolve against."""
     keys: List[Any] = []
@@ -321,6 +482,170 @@ def reshape_assignee_values(
         raw_values[key] = {'users': users, 'guests': guests, 'groups': []}
 
 
+class TaskFormFieldPlan:
+    """
+    Form-field resolution and encoding for one set of fields, compiled once.
+
+    :func:`build_task_form_field_payloads` re-resolves every source key against
+    every field and re-derives each field's type, options and columns for every
+    value. A plan indexes the fields once (:class:`~prerun_encoder.CaptureIndex`),
+    remembers which field each source key resolved to, and compiles one encoder
+    per field on first use, so applying it to a record is a single loop.
+    ``build_task_form_field_payloads`` is implemented on a plan, so the output
+    is the same by construction.
+
+    Usage::
+
+        plan = TaskFormFieldPlan(form_fields, fallback_keys=labels_by_key)
+        payloads = plan.build(values)
+    """
+
+    def __init__(
+        self,
+        form_fields: Sequence[Dict[str, Any]],
+        *,
+        fallback_keys: Optional[Mapping[Any, Sequence[Any]]] = None,
+        **options: Any,
+    ):
+        """
+        Args:
+            form_fields: The process's live form fields, as returned by
+                ``GET /runs/{id}/form-fields`` (see :func:`extract_run_form_fields`).
+            fallback_keys: Extra identifiers to try per source key, e.g.
+                ``{source_field_id: [label]}``.
+            **options: Forwarded to ``prerun_encoder.compile_field_encoder``.
+        """
+        self.form_fields = form_fields
+        self.fallback_keys = fallback_keys or {}
+        self.options = options
+        self._index = CaptureIndex(form_fields)
+        self._resolved: Dict[Any, Optional[Dict[str, Any]]] = {}
+        self._encoders: Dict[int, FieldEncoder] = {}
+
+    def resolve(self, source_key: Any) -> Optional[Dict[str, Any]]:
+        """:func:`resolve_form_field` for ``source_key`` and its fallbacks, memoized."""
+        try:
+            return self._resolved[source_key]
+        except KeyError:
+            pass
+        field = None
+        for key in _candidate_keys(source_key, *(self.fallback_keys.get(source_key) or ())):
+            field = self._index.resolve(key)
+            if field is not None:
+                break
+        self._resolved[source_key] = field
+        return field
+
+    def encoder(self, field: Dict[str, Any]) -> FieldEncoder:
+        encode = self._encoders.get(id(field))
+        if encode is None:
+            encode = compile_field_encoder(field, **self.options)
+            self._encoders[id(field)] = encode
+        return encode
+
+    def build(self, values: Mapping[Any, Any], *, strict: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Group one record's values into per-task payloads; see :func:`build_task_form_field_payloads`."""
+        if not values:
+            return {}
+
+        form_fields = self.form_fields
+        if not form_fields:
+            if strict:
+                raise UnresolvedFormFieldError(
+                    'The target process exposes no form fields, so none of these '
+                    'values can be written and all of them would be discarded: '
+                    f'{sorted(map(str, values))}',
+                    list(values),
+                )
+            logger.warning(
+                'No form fields on the target process; %d value(s) will not be migrated',
+                len(values),
+            )
+            return {}
+
+        payloads: Dict[str, Dict[str, Any]] = {}
+        unresolved: List[Any] = []
+
+        for source_key, raw_value in values.items():
+            field = self.resolve(source_key)
+            if field is None:
+                unresolved.append(source_key)
+                logger.warning(
+                    'No form field on the process matches %r; its value will not be migrated',
+                    source_key,
+                )
+                continue
+
+            timeline_id = field.get('timeline_id') or field.get('id')
+            if timeline_id is None:
+                unresolved.append(source_key)
+                logger.warning(
+                    'Form field matching %r has no timeline_id; its value will not be migrated',
+                    source_key,
+                )
+                continue
+
+            task_id = field.get('task_id')
+            if task_id in (None, ''):
+                raise MissingTaskBindingError(
+                    f'Form field {field.get("label") or field.get("alias") or timeline_id!r} '
+                    'has no task_id, so there is no task to write its value to. '
+                    'Fetch the fields from GET /runs/{run_id}/form-fields, which '
+                    'includes task_id for every field.'
+                )
+
+            encoded = self.encoder(field)(raw_value)
+
+            # The encoder returns None when it cannot represent the value -- a
+            # choice value matching no option, for instance (a list handed to a
+            # dropdown, which is what a Pipefy label field produces). Writing that
+            # None stores an empty field and returns 200: silent loss, and the
+            # encoder's own log line claims it is "omitting" a value it was in fact
+            # still passing through. Treat it as unresolved so strict mode raises.
+            # `[]` counts as unencodable too: a multiselect whose every entry failed
+            # option matching returns an empty list, which would otherwise be
+            # written and store the selections as empty with a 200.
+            if encoded in (None, []) and raw_value not in (None, '', [], {}):
+                unresolved.append(source_key)
+                logger.warning(
+                    'Value %r for %r could not be encoded for field_type %r; it will '
+                    'not be migrated rather than written as an empty value.',
+                    raw_value, source_key, field.get('field_type') or field.get('type'),
+                )
+                continue
+
+            # `assignees_form` resolves only email-shaped candidates (deliberately --
+            # it mirrors the middleware). Source systems key assignee fields by user
+            # ID or display name, so a non-empty source value can encode to an EMPTY
+            # assignee payload. Writing that returns 200 with the assignees gone,
+            # which is precisely the silent loss this module exists to prevent.
+            if _is_emptied_assignees(field, raw_value, encoded):
+                unresolved.append(source_key)
+                logger.warning(
+                    'Assignee value %r for %r resolved to nobody. assignees_form '
+                    'matches on email; map source user IDs to emails (or to '
+                    '{"users": [...]}) before encoding.',
+                    raw_value, source_key,
+                )
+                continue
+
+            payloads.setdefault(str(task_id), {})[str(timeline_id)] = encoded
+
+        if unresolved and strict:
+            available = [
+                str(f.get('label') or f.get('alias') or f.get('id'))
+                for f in form_fields if isinstance(f, dict)
+            ]
+            raise UnresolvedFormFieldError(
+                f'{len(unresolved)} form-field value(s) could not be matched to a field on '
+                f'the target process and would be silently discarded: '
+                f'{sorted(map(str, unresolved))}. Available fields: {available}',
+                unresolved,
+            )
+
+        return payloads
+
+
 def build_task_form_field_payloads(
     values: Mapping[Any, Any],
     form_fields: Sequence[Dict[str, Any]],
@@ -345,6 +670,9 @@ def build_task_form_field_payloads(
             ``{source_field_id: [label]}``.
         **options: Forwarded to ``prerun_encoder.encode_field_value``.
 
+    To apply the same fields to many records, build a :class:`TaskFormFieldPlan`
+    once and call its ``build`` per record.
+
     Returns:
         ``{task_id: {timeline_id: encoded_value}}`` -- one entry per task that
         has at least one value to write.
@@ -355,104 +683,98 @@ def build_task_form_field_payloads(
         MissingTaskBindingError: When a matched field carries no ``task_id``.
         TableShapeError: When a table value does not match its column count.
     """
-    if not values:
-        return {}
+    return TaskFormFieldPlan(
+        form_fields, fallback_keys=fallback_keys, **options
+    ).build(values, strict=strict)
 
-    if not form_fields:
-        if strict:
-            raise UnresolvedFormFieldError(
-                'The target process exposes no form fields, so none of these '
-                'values can be written and all of them would be discarded: '
-                f'{sorted(map(str, values))}',
-                list(values),
-            )
-        logger.warning(
-            'No form fields on the target process; %d value(s) will not be migrated',
-            len(values),
-        )
-        return {}
 
-    fallbacks = fallback_keys or {}
-    payloads: Dict[str, Dict[str, Any]] = {}
-    unresolved: List[Any] = []
+_organization_slots: Dict[Any, threading.BoundedSemaphore] = {}
+_organization_slots_lock = threading.Lock()
 
-    for source_key, raw_value in values.items():
-        field = resolve_form_field(
-            form_fields, source_key, *(fallbacks.get(source_key) or ())
-        )
-        if field is None:
-            unresolved.append(source_key)
-            logger.warning(
-                'No form field on the process matches %r; its value will not be migrated',
-                source_key,
-            )
-            continue
 
-        timeline_id = field.get('timeline_id') or field.get('id')
-        if timeline_id is None:
-            unresolved.append(source_key)
-            logger.warning(
-                'Form field matching %r has no timeline_id; its value will not be migrated',
-                source_key,
-            )
-            continue
+def organization_write_slots(organization_id: Any, limit: Optional[int] = None) -> threading.BoundedSemaphore:
+    """
+    The semaphore capping concurrent ``taskdata`` writes to one organisation.
 
-        task_id = field.get('task_id')
-        if task_id in (None, ''):
-            raise MissingTaskBindingError(
-                f'Form field {field.get("label") or field.get("alias") or timeline_id!r} '
-                'has no task_id, so there is no task to write its value to. '
-                'Fetch the fields from GET /runs/{run_id}/form-fields, which '
-                'includes task_id for every field.'
-            )
+    Every writer for the same organisation gets the same semaphore, so runs
+    written from several threads still share one cap. ``limit`` only applies
+    when the semaphore is first created; it defaults to ``MAX_WORKERS``.
+    """
+    with _organization_slots_lock:
+        slots = _organization_slots.get(organization_id)
+        if slots is None:
+            slots = threading.BoundedSemaphore(limit or configured_concurrency())
+            _organization_slots[organization_id] = slots
+        return slots
+
+
+def write_task_form_field_values(
+    client: Any,
+    run_id: str,
+    payloads: Mapping[str, Dict[str, Any]],
+    *,
+    max_concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Send a run's per-task ``taskdata`` writes concurrently.
 
-        encoded = encode_field_value(raw_value, field, **options)
-
-        # The encoder returns None when it cannot represent the value -- a
-        # choice value matching no option, for instance (a list handed to a
-        # dropdown, which is what a Pipefy label field produces). Writing that
-        # None stores an empty field and returns 200: silent loss, and the
-        # encoder's own log line claims it is "omitting" a value it was in fact
-        # still passing through. Treat it as unresolved so strict mode raises.
-        # `[]` counts as unencodable too: a multiselect whose every entry failed
-        # option matching returns an empty list, which would otherwise be
-        # written and store the selections as empty with a 200.
-        if encoded in (None, []) and raw_value not in (None, '', [], {}):
-            unresolved.append(source_key)
-            logger.warning(
-                'Value %r for %r could not be encoded for field_type %r; it will '
-                'not be migrated rather than written as an empty value.',
-                raw_value, source_key, field.get('field_type') or field.get('type'),
-            )
-            continue
+    Each write is ``client.update_task_form_field_values(run_id, task_id,
+    taskdata)``, as produced by :func:`build_task_form_field_payloads`. Writes
+    to different tasks do not depend on each other, so they run on a thread
+    pool, holding a slot of :func:`organization_write_slots` for
+    ``client.organization_id`` while in flight.
 
-        # `assignees_form` resolves only email-shaped candidates (deliberately --
-        # it mirrors the middleware). Source systems key assignee fields by user
-        # ID or display name, so a non-empty source value can encode to an EMPTY
-        # assignee payload. Writing that returns 200 with the assignees gone,
-        # which is precisely the silent loss this module exists to prevent.
-        if _is_emptied_assignees(field, raw_value, encoded):
-            unresolved.append(source_key)
-            logger.warning(
-                'Assignee value %r for %r resolved to nobody. assignees_form '
-                'matches on email; map source user IDs to emails (or to '
-                '{"users": [...]}) before encoding.',
-                raw_value, source_key,
-            )
-            continue
+    Each task is sent once: retrying is the client's job, which already backs
+    off on transport errors and waits out 429s, so a retry here would only
+    multiply its attempts. A failed task never cancels its siblings.
 
-        payloads.setdefault(str(task_id), {})[str(timeline_id)] = encoded
-
-    if unresolved and strict:
-        available = [
-            str(f.get('label') or f.get('alias') or f.get('id'))
-            for f in form_fields if isinstance(f, dict)
-        ]
-        raise UnresolvedFormFieldError(
-            f'{len(unresolved)} form-field value(s) could not be matched to a field on '
-            f'the target process and would be silently discarded: '
-            f'{sorted(map(str, unresolved))}. Available fields: {available}',
-            unresolved,
-        )
+    The client is shared by every worker, so its token refresh and request
+    counters must be thread-safe, as the Tallyfy clients' are.
+
+    Args:
+        client: A Tallyfy client with ``update_task_form_field_values``.
+        run_id: The process the tasks belong to.
+        payloads: ``{task_id: {timeline_id: encoded_value}}``.
+        max_concurrency: Writes in flight per organisation. Defaults to
+            ``MAX_WORKERS``.
+
+    Returns:
+        ``{task_id: response}`` for every task, in ``payloads`` order.
+
+    Raises:
+        TaskFormFieldWriteError: When any task failed, once all writes
+            have finished.
+    """
+    if not payloads:
+        return {}
 
-    return payloads
+    slots = organization_write_slots(getattr(client, 'organization_id', None), max_concurrency)
+
+    def write(task_id: str, taskdata: Dict[str, Any]) -> Any:
+        with slots:
+            return client.update_task_form_field_values(run_id, task_id, taskdata)
+
+    workers = min(len(payloads), max_concurrency or configured_concurrency())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            task_id: pool.submit(write, task_id, taskdata)
+            for task_id, taskdata in payloads.items()
+        }
+
+    results: Dict[str, Any] = {}
+    failed: Dict[str, BaseException] = {}
+    for task_id, future in futures.items():
+        try:
+            results[task_id] = future.result()
+        except Exception as exc:
+            failed[task_id] = exc
+
+    if failed:
+        details = '; '.join(f'{task_id}: {error}' for task_id, error in failed.items())
+        raise TaskFormFieldWriteError(
+            f'{len(failed)} of {len(payloads)} task write(s) failed for process '
+            f'{run_id}: {details}',
+            failed,
+            written=list(results),
+        )
+    return results
@@ -6,14 +6,17 @@ Shared functionality for form-based migration tools (Typeform, Jotform, Google F
 import json
 import os
 import logging
+from functools import partial
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from abc import ABC, abstractmethod
 
 try:  # imported as part of the `shared` package
-    from .prerun_encoder import build_prerun_payload
+    from .prerun_encoder import PrerunPlan
+    from .transform_pool import TransformStage
 except ImportError:  # imported as a top-level module (sys.path includes shared/)
-    from prerun_encoder import build_prerun_payload
+    from prerun_encoder import PrerunPlan
+    from transform_pool import TransformStage
 
 logger = logging.getLogger(__name__)
 
@@ -447,7 +450,8 @@ class FormMigratorBase(ABC):
     
     def transform_responses_to_processes(self, form_id: str, blueprint_id: str,
                                         limit: Optional[int] = None,
-                                        kickoff_fields: Optional[List[Dict[str, Any]]] = None
+                                        kickoff_fields: Optional[List[Dict[str, Any]]] = None,
+                                        stage: Optional[TransformStage] = None
                                         ) -> List[Dict[str, Any]]:
         """
         Transform form responses to Tallyfy processes.
@@ -459,31 +463,28 @@ class FormMigratorBase(ABC):
             kickoff_fields: The template's kick-off field definitions. Supply
                 these so values are keyed by timeline_id and encoded per field
                 type -- without them the API discards the kick-off data.
+            stage: Where to run the transform; defaults to a ``TransformStage``
+                configured by ``TRANSFORM_PROCESSES`` (in-process unless set).
         """
         responses = self.get_form_responses(form_id)
 
         if limit:
             responses = responses[:limit]
 
-        processes = []
-        for response in responses:
-            process = {
-                'checklist_id': blueprint_id,
-                'name': f"Submission from {response.get('submitter', 'Anonymous')}",
-                'prerun': self._extract_response_data(response, kickoff_fields),
-                'metadata': {
-                    'source': self.vendor_name,
-                    'original_response_id': response.get('id'),
-                    'submitted_at': response.get('submitted_at'),
-                    'submitter': response.get('submitter')
-                }
-            }
-            processes.append(process)
-        
-        return processes
+        # Every response targets the same template: compile its kick-off
+        # encoding once rather than re-deriving it per answer.
+        plan = PrerunPlan(kickoff_fields) if kickoff_fields else None
+
+        transform = partial(response_to_process, blueprint_id=blueprint_id,
+                            vendor_name=self.vendor_name, plan=plan)
+        if stage is not None:
+            return stage.map(transform, responses)
+        with TransformStage() as stage:
+            return stage.map(transform, responses)
     
     def _extract_response_data(self, response: Dict[str, Any],
-                               kickoff_fields: Optional[List[Dict[str, Any]]] = None
+                               kickoff_fields: Optional[List[Dict[str, Any]]] = None,
+                               plan: Optional[PrerunPlan] = None
                                ) -> Dict[str, Any]:
         """
         Build the `prerun` object from a form response.
@@ -494,24 +495,55 @@ class FormMigratorBase(ABC):
 
         Without them the raw keys and values are passed through unchanged; the
         API keys strictly by timeline_id, so those values will not be stored.
+
+        Pass ``plan`` (a ``PrerunPlan`` over ``kickoff_fields``) when converting
+        many responses to the same template.
         """
-        answers = response.get('answers', response.get('data', {}))
+        if plan is None and kickoff_fields:
+            plan = PrerunPlan(kickoff_fields)
+        return extract_response_data(response, self.vendor_name, plan)
 
-        if kickoff_fields:
-            return build_prerun_payload(answers, kickoff_fields)
 
-        logger.warning(
-            "Building prerun data for %s without kick-off field definitions; "
-            "pass kickoff_fields so values are keyed by timeline_id",
-            self.vendor_name,
-        )
+def response_to_process(response: Dict[str, Any], *, blueprint_id: str, vendor_name: str,
+                        plan: Optional[PrerunPlan] = None) -> Dict[str, Any]:
+    """
+    One form response as a Tallyfy process; see ``transform_responses_to_processes``.
 
-        data: Dict[str, Any] = {}
-        for field_id, value in answers.items():
-            if value is not None:
-                if isinstance(value, (list, dict)):
-                    data[field_id] = json.dumps(value)
-                else:
-                    data[field_id] = str(value)
+    A module-level function, so a ``TransformStage`` can run it in a worker.
+    """
+    return {
+        'checklist_id': blueprint_id,
+        'name': f"Submission from {response.get('submitter', 'Anonymous')}",
+        'prerun': extract_response_data(response, vendor_name, plan),
+        'metadata': {
+            'source': vendor_name,
+            'original_response_id': response.get('id'),
+            'submitted_at': response.get('submitted_at'),
+            'submitter': response.get('submitter')
+        }
+    }
+
+
+def extract_response_data(response: Dict[str, Any], vendor_name: str,
+                          plan: Optional[PrerunPlan] = None) -> Dict[str, Any]:
+    """The `prerun` object for a form response; see ``FormMigratorBase._extract_response_data``."""
+    answers = response.get('answers', response.get('data', {}))
+
+    if plan is not None:
+        return plan.build(answers)
+
+    logger.warning(
+        "Building prerun data for %s without kick-off field definitions; "
+        "pass kickoff_fields so values are keyed by timeline_id",
+        vendor_name,
+    )
+
+    data: Dict[str, Any] = {}
+    for field_id, value in answers.items():
+        if value is not None:
+            if isinstance(value, (list, dict)):
+                data[field_id] = json.dumps(value)
+            else:
+                data[field_id] = str(value)
 
-        return data
\ No newline at end of file
+    return data
@@ -0,0 +1,149 @@
+"""
+Connection-pooled HTTP transport for vendor and Tallyfy API clients.
+
+WHY THIS EXISTS
+---------------
+Every client used to build its own ``requests.Session()`` with the default
+adapter: ten host pools of ten connections each, no timeouts at all. That is
+fine for one request at a time. It is not fine once a migrator runs launches,
+taskdata writes or exports on a thread pool -- with more workers than pooled
+connections, urllib3 opens a fresh socket for every overflow request and
+throws it away afterwards ("Connection pool is full, discarding connection"),
+so a concurrent phase pays a TCP and TLS handshake per call. A few call sites
+also bypassed the session completely (bare ``requests.post`` for token
+exchange and file upload, bare ``requests.get`` for attachment download) and
+never reused a connection at all.
+
+``create_session`` returns a session whose adapter is sized to the configured
+concurrency and which applies a default timeout per CALL CLASS, because one
+timeout does not fit every request:
+
+==========  ===================================  =============
+call class  how it is recognised                 (connect, read)
+==========  ===================================  =============
+read        GET / HEAD / OPTIONS                 (10, 30)
+write       any other method                     (10, 60)
+upload      multipart/form-data body             (10, 300)
+download    ``stream=True``                      (10, 300)
+==========  ===================================  =============
+
+An explicit ``timeout=`` on the call always wins over the class default.
+
+Pool size is ``max(concurrency, 10)``. ``concurrency`` defaults to the
+``MAX_WORKERS`` environment setting that the migrators already read, so a
+client does not need to know how it will be driven.
+"""
+
+import os
+from typing import Any, Mapping, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# requests' own default; the pool never shrinks below it.
+DEFAULT_POOL_MAXSIZE = 10
+
+DEFAULT_TIMEOUTS = {
+    'read': (10, 30),
+    'write': (10, 60),
+    'upload': (10, 300),
+    'download': (10, 300),
+}
+
+READ_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def configured_concurrency(default: int = 4) -> int:
+    """Worker count from ``MAX_WORKERS``, as set in each vendor's ``.env``."""
+    try:
+        return max(1, int(os.getenv('MAX_WORKERS', default)))
+    except ValueError:
+        return default
+
+
+def call_class(request: requests.PreparedRequest, stream: bool = False) -> str:
+    """Classify a prepared request as read, write, upload or download."""
+    if stream:
+        return 'download'
+    content_type = request.headers.get('Content-Type') or ''
+    if content_type.startswith('multipart/'):
+        return 'upload'
+    if (request.method or 'GET').upper() in READ_METHODS:
+        return 'read'
+    return 'write'
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` that fills in a per-call-class timeout when none is given."""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['timeouts']
+
+    def __init__(self, timeouts: Optional[Mapping[str, Any]] = None, **kwargs):
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeouts[call_class(request, stream)]
+        return super().send(request, stream=stream, timeout=timeout, **kwargs)
+
+
+def create_session(headers: Optional[Mapping[str, str]] = None,
+                   max_retries: Union[int, Retry] = 0,
+                   concurrency: Optional[int] = None,
+                   timeouts: Optional[Mapping[str, Any]] = None) -> requests.Session:
+    """
+    Build a keep-alive session with a pool sized for ``concurrency`` workers.
+
+    Args:
+        headers: Default headers, merged over the transport defaults.
+        max_retries: Passed to the adapter; an int or a urllib3 ``Retry``.
+        concurrency: Threads that will share the session. Defaults to
+            ``MAX_WORKERS``.
+        timeouts: Per-call-class overrides for ``DEFAULT_TIMEOUTS``.
+
+    Returns:
+        A ``requests.Session`` with ``PooledHTTPAdapter`` mounted for http and https.
+    """
+    if concurrency is None:
+        concurrency = configured_concurrency()
+    maxsize = max(concurrency, DEFAULT_POOL_MAXSIZE)
+
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        timeouts=timeouts,
+        pool_maxsize=maxsize,
+        max_retries=max_retries,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    # requests sends both by default; pinned here so the transport's contract
+    # does not depend on that.
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def pool_maxsize(session: requests.Session, url: str = 'https://') -> Optional[int]:
+    """Connections the session will keep per host for ``url`` (None if unpooled)."""
+    adapter = session.get_adapter(url)
+    return getattr(adapter, '_pool_maxsize', None)
+
+
+__all__ = [
+    'DEFAULT_POOL_MAXSIZE',
+    'DEFAULT_TIMEOUTS',
+    'PooledHTTPAdapter',
+    'call_class',
+    'configured_concurrency',
+    'create_session',
+    'pool_maxsize',
+]
@@ -32,6 +32,11 @@ The adjacent ``alias`` is a TRAP. Keying the launch payload by ``alias`` yields
 import logging
 from typing import Any, Dict, List, Optional, Sequence
 
+try:  # imported as part of the `shared` package
+    from .prerun_encoder import PrerunPlan
+except ImportError:  # imported as a top-level module (sys.path includes shared/)
+    from prerun_encoder import PrerunPlan
+
 logger = logging.getLogger(__name__)
 
 
@@ -135,11 +140,13 @@ class KickoffFieldCache:
         cache = KickoffFieldCache(tallyfy_client)
         fields = cache.get(blueprint_id)          # [] when none are defined
         fields = cache.require(blueprint_id)      # raises when none are defined
+        prerun = cache.plan(blueprint_id).build(values, strict=True)
     """
 
     def __init__(self, client: Any):
         self.client = client
         self._cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._plans: Dict[str, PrerunPlan] = {}
 
     def get(self, checklist_id: str) -> List[Dict[str, Any]]:
         """
@@ -198,9 +205,25 @@ class KickoffFieldCache:
             )
         return fields
 
+    def plan(self, checklist_id: str) -> PrerunPlan:
+        """
+        Return the template's compiled kick-off encoding, building it on first use.
+
+        Resolves the definitions through :meth:`require`, so it raises the same
+        way when the template has none. The plan is cached alongside the
+        definitions and dropped with them by :meth:`clear`.
+        """
+        plan = self._plans.get(checklist_id)
+        if plan is None:
+            plan = PrerunPlan(self.require(checklist_id))
+            self._plans[checklist_id] = plan
+        return plan
+
     def clear(self, checklist_id: Optional[str] = None) -> None:
-        """Drop cached definitions (all, or one template)."""
+        """Drop cached definitions and plans (all, or one template)."""
         if checklist_id is None:
             self._cache.clear()
+            self._plans.clear()
         else:
             self._cache.pop(checklist_id, None)
+            self._plans.pop(checklist_id, None)
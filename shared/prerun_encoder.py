@@ -42,7 +42,7 @@ import json
 import logging
 import re
 from datetime import date, datetime
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -87,33 +87,64 @@ class UnresolvedFieldError(PrerunEncodingError):
 SCALAR_FIELD_TYPES = frozenset({'text', 'textarea', 'email', 'short_text', 'long_text'})
 
 
-def _capture_options(capture: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Return a capture's selectable options as a list of dicts."""
-    options = capture.get('options') or []
-    return [opt for opt in options if isinstance(opt, dict)]
+def _field_name(capture: Dict[str, Any]) -> Any:
+    """The identifier used for a field in log and error messages."""
+    return capture.get('label') or capture.get('alias') or capture.get('id')
 
 
-def _find_option(options: Sequence[Dict[str, Any]], value: Any) -> Optional[Dict[str, Any]]:
+class _OptionIndex:
     """
-    Resolve a raw value to one of a capture's options.
+    A capture's selectable options, indexed once for matching raw values.
 
     Matches on option text first (the middleware's behaviour, and what users'
-    exported data usually contains), then falls back to matching on option id.
+    exported data usually contains), then falls back to matching on option id,
+    tolerating int/str drift between systems. On either key the FIRST option
+    wins, exactly as a front-to-back scan would.
     """
-    if value is None:
+
+    __slots__ = ('options', '_by_text', '_by_id')
+
+    def __init__(self, capture: Dict[str, Any]):
+        self.options = [opt for opt in (capture.get('options') or []) if isinstance(opt, dict)]
+
+        by_text: Optional[Dict[Any, Dict[str, Any]]] = {}
+        for option in self.options:
+            try:
+                by_text.setdefault(option.get('text'), option)
+            except TypeError:
+                # An unhashable option text cannot be indexed; scan instead.
+                by_text = None
+                break
+        self._by_text = by_text
+
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        for option in self.options:
+            option_id = option.get('id')
+            if option_id is not None:
+                self._by_id.setdefault(str(option_id), option)
+
+    def _scan_text(self, value: Any) -> Optional[Dict[str, Any]]:
+        for option in self.options:
+            if option.get('text') == value:
+                return option
         return None
 
-    for option in options:
-        if option.get('text') == value:
-            return option
+    def find(self, value: Any) -> Optional[Dict[str, Any]]:
+        """Resolve a raw value to one of the options, or None."""
+        if value is None:
+            return None
 
-    # Fall back to id matching, tolerating int/str drift between systems.
-    for option in options:
-        option_id = option.get('id')
-        if option_id is not None and str(option_id) == str(value):
+        if self._by_text is None:
+            option = self._scan_text(value)
+        else:
+            try:
+                option = self._by_text.get(value)
+            except TypeError:  # an unhashable value can still equal an option text
+                option = self._scan_text(value)
+        if option is not None:
             return option
 
-    return None
+        return self._by_id.get(str(value))
 
 
 def _option_payload(option: Dict[str, Any], selected: Optional[bool] = None) -> Dict[str, Any]:
@@ -152,7 +183,91 @@ def _format_date(value: Any, date_format: Optional[str] = None) -> Any:
     return value
 
 
-def _encode_table(value: Any, capture: Dict[str, Any]) -> Any:
+# Per-type encoder factories. Each takes what it needs from the capture once,
+# at compile time, and returns a closure that encodes one raw value.
+
+FieldEncoder = Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _dropdown_encoder(capture: Dict[str, Any]) -> FieldEncoder:
+    options = _OptionIndex(capture)
+    name = _field_name(capture)
+
+    def encode(value: Any) -> Any:
+        # Scalar choice types can legitimately arrive wrapped in a one-element
+        # list: several source systems return every choice field as an array
+        # (Pipefy's `array_value` on a label field, for one). One element is
+        # unambiguous, so unwrap it rather than failing to match. Two or more
+        # genuinely cannot fit a single-choice field and are left to fail loudly.
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]
+        option = options.find(value)
+        if option is None:
+            if value not in (None, ''):
+                logger.warning(
+                    "Dropdown value %r does not match any option of field %r; omitting it",
+                    value, name,
+                )
+            return None
+        return _option_payload(option)
+
+    return encode
+
+
+def _radio_encoder(capture: Dict[str, Any]) -> FieldEncoder:
+    options = _OptionIndex(capture)
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]
+        option = options.find(value)
+        if option is not None:
+            # radio takes the option TEXT as a bare scalar (NOT an {id, text} object).
+            return option.get('text')
+        return value
+
+    return encode
+
+
+def _multiselect_encoder(capture: Dict[str, Any]) -> FieldEncoder:
+    options = _OptionIndex(capture)
+    name = _field_name(capture)
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, (list, tuple, set)):
+            raw_values = list(value)
+        elif value in (None, ''):
+            raw_values = []
+        else:
+            raw_values = [value]
+
+        encoded: List[Dict[str, Any]] = []
+        for raw in raw_values:
+            option = options.find(raw)
+            if option is None:
+                logger.warning(
+                    "Multi-select value %r does not match any option of field %r; omitting it",
+                    raw, name,
+                )
+                continue
+            encoded.append(_option_payload(option, selected=True))
+        return encoded
+
+    return encode
+
+
+def _date_encoder(date_format: Optional[str]) -> FieldEncoder:
+    def encode(value: Any) -> Any:
+        return _format_date(value, date_format)
+
+    return encode
+
+
+def _table_encoder(capture: Dict[str, Any]) -> FieldEncoder:
     """
     Encode a table field.
 
@@ -162,46 +277,193 @@ def _encode_table(value: Any, capture: Dict[str, Any]) -> Any:
     and a warning is logged -- it is better for the API to reject the row loudly
     than for this encoder to silently invent or drop cells.
     """
-    if isinstance(value, str):
-        try:
-            value = json.loads(value)
-        except (TypeError, ValueError):
-            logger.warning(
-                "Table field %r has a non-JSON string value; sending it unchanged",
-                capture.get('label') or capture.get('alias') or capture.get('id'),
-            )
+    name = _field_name(capture)
+    columns = capture.get('columns') or []
+    # Keyed by column id/name -> projected onto the declared column order. A
+    # non-dict column is its own key.
+    column_keys = [
+        (True, [column.get(key) for key in ('id', 'name', 'label', 'text')])
+        if isinstance(column, dict) else (False, column)
+        for column in columns
+    ]
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except (TypeError, ValueError):
+                logger.warning(
+                    "Table field %r has a non-JSON string value; sending it unchanged", name,
+                )
+                return value
+
+        if not columns:
             return value
 
-    columns = capture.get('columns') or []
-    if not columns:
+        if isinstance(value, dict):
+            aligned = []
+            for is_dict, keys in column_keys:
+                if not is_dict:
+                    aligned.append(value.get(keys))
+                    continue
+                for key in keys:
+                    if key in value:
+                        aligned.append(value[key])
+                        break
+                else:
+                    aligned.append(None)
+            return aligned
+
+        if isinstance(value, list) and len(value) != len(columns):
+            # The API validates count($values) !== count($capture->columns) and
+            # returns 422. Sending it is a guaranteed failed launch, so fail here
+            # where the field and both counts are known.
+            raise TableShapeError(
+                f"Table field {name!r} "
+                f"has {len(value)} entries but {len(columns)} columns are defined. "
+                "The API requires exactly one entry per column and returns 422 otherwise."
+            )
+
         return value
 
-    if isinstance(value, dict):
-        # Keyed by column id/name -> project onto the declared column order.
-        aligned = []
-        for column in columns:
-            if not isinstance(column, dict):
-                aligned.append(value.get(column))
+    return encode
+
+
+def _assignees_encoder(
+    org_members: Optional[Iterable[Dict[str, Any]]],
+    current_user_id: Any,
+) -> FieldEncoder:
+    members_by_email: Dict[Any, Dict[str, Any]] = {}
+    for member in list(org_members or []):
+        try:
+            members_by_email.setdefault(member.get('email'), member)
+        except TypeError:
+            continue  # an unhashable email can never equal an email string
+
+    def encode(value: Any) -> Dict[str, List[Any]]:
+        if isinstance(value, dict):
+            return {
+                'users': list(value.get('users') or []),
+                'guests': list(value.get('guests') or []),
+                'groups': list(value.get('groups') or []),
+            }
+
+        if isinstance(value, str):
+            candidates = value.split(',')
+        elif isinstance(value, (list, tuple)):
+            candidates = list(value)
+        elif value is None:
+            candidates = []
+        else:
+            candidates = [value]
+
+        users: List[Any] = []
+        guests: List[str] = []
+
+        for candidate in candidates:
+            raw = str(candidate).strip()
+            if not raw:
                 continue
-            for key in ('id', 'name', 'label', 'text'):
-                if column.get(key) in value:
-                    aligned.append(value[column[key]])
-                    break
-            else:
-                aligned.append(None)
-        return aligned
-
-    if isinstance(value, list) and len(value) != len(columns):
-        # The API validates count($values) !== count($capture->columns) and
-        # returns 422. Sending it is a guaranteed failed launch, so fail here
-        # where the field and both counts are known.
-        raise TableShapeError(
-            f"Table field {capture.get('label') or capture.get('alias') or capture.get('id')!r} "
-            f"has {len(value)} entries but {len(columns)} columns are defined. "
-            "The API requires exactly one entry per column and returns 422 otherwise."
-        )
 
-    return value
+            if not EMAIL_REGEX.match(raw):
+                # Deliberately NOT treated as a Tallyfy user id. A bare number here
+                # is a SOURCE-system user id, and the two id spaces are unrelated --
+                # coercing one into the other assigns the task to whichever unrelated
+                # Tallyfy user happens to hold that id, which is worse than dropping
+                # it. Map ids to Tallyfy users upstream (see
+                # ``form_field_values.reshape_assignee_values``); anything still
+                # unmapped is reported by the strict layer rather than invented here.
+                continue
+
+            match = members_by_email.get(raw)
+            if match:
+                member_id = match.get('id')
+                if not any(str(u) == str(member_id) for u in users):
+                    users.append(member_id)
+            elif raw not in guests:
+                guests.append(raw)
+
+        if guests and not users and current_user_id is not None:
+            users.append(current_user_id)
+
+        return {'users': users, 'guests': guests, 'groups': []}
+
+    return encode
+
+
+def _file_encoder(file_subject: Optional[Dict[str, Any]], uploaded_from: str) -> FieldEncoder:
+    def descriptor(url: str) -> Dict[str, Any]:
+        return {
+            'filename': url.split('/')[-1],
+            'source': 'url',
+            'subject': file_subject or {},
+            'uploaded_from': uploaded_from,
+            'url': url,
+        }
+
+    def encode(value: Any) -> Any:
+        if value in (None, ''):
+            return value
+        if isinstance(value, list):
+            return [item if isinstance(item, dict) else descriptor(str(item)) for item in value]
+        return [descriptor(str(value))]
+
+    return encode
+
+
+def _scalar_encoder(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+def compile_field_encoder(
+    capture: Optional[Dict[str, Any]] = None,
+    *,
+    date_format: Optional[str] = None,
+    file_subject: Optional[Dict[str, Any]] = None,
+    uploaded_from: str = '',
+    org_members: Optional[Iterable[Dict[str, Any]]] = None,
+    current_user_id: Any = None,
+) -> FieldEncoder:
+    """
+    Compile a kick-off field definition into a one-argument encoder.
+
+    The field type, option index, table column keys and assignee lookup are
+    derived here, once; the returned closure only does the per-value work.
+    ``compile_field_encoder(capture, **opts)(value)`` is
+    ``encode_field_value(value, capture, **opts)`` -- the latter is implemented
+    on the former.
+
+    The capture is read at compile time: recompile if its options or columns
+    change.
+    """
+    if capture is None:
+        return _identity
+
+    field_type = capture.get('field_type') or capture.get('type')
+
+    if field_type == 'dropdown':
+        return _dropdown_encoder(capture)
+    if field_type == 'multiselect':
+        return _multiselect_encoder(capture)
+    if field_type == 'radio':
+        return _radio_encoder(capture)
+    if field_type == 'date':
+        return _date_encoder(date_format)
+    if field_type == 'table':
+        return _table_encoder(capture)
+    if field_type == 'assignees_form':
+        return _assignees_encoder(org_members, current_user_id)
+    if field_type == 'file':
+        return _file_encoder(file_subject, uploaded_from)
+    if field_type in SCALAR_FIELD_TYPES:
+        return _scalar_encoder
+    return _identity
 
 
 def encode_assignees_form(
@@ -218,53 +480,7 @@ def encode_assignees_form(
     the middleware: guests cannot be the sole assignees, so the current user is
     added when only guests were resolved.
     """
-    if isinstance(value, dict):
-        return {
-            'users': list(value.get('users') or []),
-            'guests': list(value.get('guests') or []),
-            'groups': list(value.get('groups') or []),
-        }
-
-    if isinstance(value, str):
-        candidates = value.split(',')
-    elif isinstance(value, (list, tuple)):
-        candidates = list(value)
-    elif value is None:
-        candidates = []
-    else:
-        candidates = [value]
-
-    members = list(org_members or [])
-    users: List[Any] = []
-    guests: List[str] = []
-
-    for candidate in candidates:
-        raw = str(candidate).strip()
-        if not raw:
-            continue
-
-        if not EMAIL_REGEX.match(raw):
-            # Deliberately NOT treated as a Tallyfy user id. A bare number here
-            # is a SOURCE-system user id, and the two id spaces are unrelated --
-            # coercing one into the other assigns the task to whichever unrelated
-            # Tallyfy user happens to hold that id, which is worse than dropping
-            # it. Map ids to Tallyfy users upstream (see
-            # ``form_field_values.reshape_assignee_values``); anything still
-            # unmapped is reported by the strict layer rather than invented here.
-            continue
-
-        match = next((m for m in members if m.get('email') == raw), None)
-        if match:
-            member_id = match.get('id')
-            if not any(str(u) == str(member_id) for u in users):
-                users.append(member_id)
-        elif raw not in guests:
-            guests.append(raw)
-
-    if guests and not users and current_user_id is not None:
-        users.append(current_user_id)
-
-    return {'users': users, 'guests': guests, 'groups': []}
+    return _assignees_encoder(org_members, current_user_id)(value)
 
 
 def encode_field_value(
@@ -294,108 +510,19 @@ def encode_field_value(
 
     Returns:
         The encoded value, ready to be placed under ``prerun[timeline_id]``.
-    """
-    if capture is None:
-        return value
-
-    field_type = capture.get('field_type') or capture.get('type')
-
-    # Scalar choice types can legitimately arrive wrapped in a one-element list:
-    # several source systems return every choice field as an array (Pipefy's
-    # `array_value` on a label field, for one). One element is unambiguous, so
-    # unwrap it rather than failing to match. Two or more genuinely cannot fit a
-    # single-choice field and are left to fail loudly.
-    if field_type in ('dropdown', 'radio') and isinstance(value, (list, tuple)):
-        if len(value) == 1:
-            value = value[0]
 
-    if field_type == 'dropdown':
-        option = _find_option(_capture_options(capture), value)
-        if option is None:
-            if value not in (None, ''):
-                logger.warning(
-                    "Dropdown value %r does not match any option of field %r; omitting it",
-                    value,
-                    capture.get('label') or capture.get('alias') or capture.get('id'),
-                )
-            return None
-        return _option_payload(option)
-
-    if field_type == 'multiselect':
-        options = _capture_options(capture)
-        if isinstance(value, (list, tuple, set)):
-            raw_values = list(value)
-        elif value in (None, ''):
-            raw_values = []
-        else:
-            raw_values = [value]
-
-        encoded: List[Dict[str, Any]] = []
-        for raw in raw_values:
-            option = _find_option(options, raw)
-            if option is None:
-                logger.warning(
-                    "Multi-select value %r does not match any option of field %r; omitting it",
-                    raw,
-                    capture.get('label') or capture.get('alias') or capture.get('id'),
-                )
-                continue
-            encoded.append(_option_payload(option, selected=True))
-        return encoded
-
-    if field_type == 'radio':
-        option = _find_option(_capture_options(capture), value)
-        if option is not None:
-            # radio takes the option TEXT as a bare scalar (NOT an {id, text} object).
-            return option.get('text')
-        return value
-
-    if field_type == 'date':
-        return _format_date(value, date_format)
-
-    if field_type == 'table':
-        return _encode_table(value, capture)
-
-    if field_type == 'assignees_form':
-        return encode_assignees_form(value, org_members, current_user_id)
-
-    if field_type == 'file':
-        if value in (None, ''):
-            return value
-        if isinstance(value, list):
-            encoded_files = []
-            for item in value:
-                if isinstance(item, dict):
-                    encoded_files.append(item)
-                else:
-                    item_url = str(item)
-                    encoded_files.append({
-                        'filename': item_url.split('/')[-1],
-                        'source': 'url',
-                        'subject': file_subject or {},
-                        'uploaded_from': uploaded_from,
-                        'url': item_url,
-                    })
-            return encoded_files
-        url = str(value)
-        return [{
-            'filename': url.split('/')[-1],
-            'source': 'url',
-            'subject': file_subject or {},
-            'uploaded_from': uploaded_from,
-            'url': url,
-        }]
-
-    if field_type in SCALAR_FIELD_TYPES:
-        if value is None or isinstance(value, str):
-            return value
-        if isinstance(value, bool):
-            return 'yes' if value else 'no'
-        if isinstance(value, (list, dict)):
-            return json.dumps(value)
-        return str(value)
-
-    return value
+    Encoding many values against the same field? Compile it once with
+    :func:`compile_field_encoder`, or a whole template with :class:`PrerunPlan`.
+    """
+    encoder = compile_field_encoder(
+        capture,
+        date_format=date_format,
+        file_subject=file_subject,
+        uploaded_from=uploaded_from,
+        org_members=org_members,
+        current_user_id=current_user_id,
+    )
+    return encoder(value)
 
 
 def resolve_capture(
@@ -452,6 +579,172 @@ def normalize_prerun_object(value: Any) -> Dict[str, Any]:
     return {}
 
 
+class CaptureIndex:
+    """
+    Field definitions indexed for :func:`resolve_capture` lookups.
+
+    ``resolve_capture`` scans every definition for every key. This builds one
+    dict up front, in the same precedence -- ``timeline_id``, then ``id``,
+    ``alias``, ``label``; first definition wins within each -- so resolving a
+    key is one lookup and always returns what the scan would have.
+    """
+
+    __slots__ = ('fields', '_by_key')
+
+    def __init__(self, fields: Optional[Sequence[Dict[str, Any]]]):
+        self.fields = [field for field in (fields or []) if isinstance(field, dict)]
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        for attribute in ('timeline_id', 'id', 'alias', 'label'):
+            for field in self.fields:
+                candidate = field.get(attribute)
+                if candidate is not None:
+                    self._by_key.setdefault(str(candidate), field)
+
+    def resolve(self, key: Any) -> Optional[Dict[str, Any]]:
+        return self._by_key.get(str(key))
+
+
+class PrerunPlan:
+    """
+    Kick-off encoding for one template, compiled once and applied per record.
+
+    :func:`build_prerun_payload` re-derives every field's type, options, table
+    columns and date handling for every value of every record. A plan indexes
+    the template's kick-off fields by every identifier a source key may use and
+    compiles one encoder per field on first use, so :meth:`build` is a single
+    loop of lookups and calls. ``build_prerun_payload`` is itself implemented
+    on a plan, so the two cannot drift apart.
+
+    Usage::
+
+        plan = PrerunPlan(kickoff_fields)
+        for record in records:
+            prerun = plan.build(record, strict=True)
+
+    The definitions are read when the plan is built; build a new plan if the
+    template's kick-off form changes.
+    """
+
+    def __init__(self, captures: Optional[Sequence[Dict[str, Any]]] = None, **options: Any):
+        """
+        Args:
+            captures: The template's kick-off field definitions.
+            **options: Forwarded to :func:`compile_field_encoder`.
+        """
+        self.captures = captures
+        self.options = options
+        self._index = CaptureIndex(captures)
+        # id(capture) -> (timeline_id, field_type, encoder)
+        self._compiled: Dict[int, Tuple[Any, Any, FieldEncoder]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled encoders are closures, and keyed by id() besides: a plan
+        # pickles as its definitions and recompiles on the other side.
+        return {'captures': self.captures, 'options': self.options}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state['captures'], **state['options'])
+
+    def _compile(self, capture: Dict[str, Any]) -> Tuple[Any, Any, FieldEncoder]:
+        compiled = self._compiled.get(id(capture))
+        if compiled is None:
+            compiled = (
+                capture.get('timeline_id') or capture.get('id'),
+                capture.get('field_type') or capture.get('type'),
+                compile_field_encoder(capture, **self.options),
+            )
+            self._compiled[id(capture)] = compiled
+        return compiled
+
+    def build(self, values: Any, *, strict: bool = False) -> Dict[str, Any]:
+        """Build the ``prerun`` object for one record; see :func:`build_prerun_payload`."""
+        normalized = normalize_prerun_object(values)
+        if not normalized:
+            return {}
+
+        captures = self.captures
+        if not captures:
+            if strict:
+                raise UnresolvedFieldError(
+                    "Cannot build prerun data without the template's kick-off field "
+                    "definitions: the API keys strictly by timeline_id, so every "
+                    f"value would be discarded. Unresolvable keys: {sorted(map(str, normalized))}",
+                    list(normalized),
+                )
+            logger.warning(
+                "Building prerun data without kick-off field definitions; keys are sent "
+                "unchanged and the API will discard any that are not a timeline_id"
+            )
+            return normalized
+
+        payload: Dict[str, Any] = {}
+        unresolved: List[Any] = []
+
+        for key, raw_value in normalized.items():
+            capture = self._index.resolve(key)
+            if capture is None:
+                unresolved.append(key)
+                logger.warning(
+                    "No kick-off field matches %r; its value will not be migrated", key
+                )
+                continue
+
+            timeline_id, field_type, encode = self._compile(capture)
+            if timeline_id is None:
+                unresolved.append(key)
+                logger.warning(
+                    "Kick-off field %r has no timeline_id; its value will not be migrated", key
+                )
+                continue
+
+            encoded = encode(raw_value)
+
+            if encoded in (None, []) and raw_value not in (None, '', [], {}):
+                unresolved.append(key)
+                logger.warning(
+                    "Kick-off value %r for %r could not be encoded for field_type %r; "
+                    "it will not be migrated rather than written as an empty value.",
+                    raw_value, key, field_type,
+                )
+                continue
+
+            if field_type == 'assignees_form' and raw_value not in (None, '', [], {}):
+                # A pre-shaped dict with empty lists is legitimately empty, not loss.
+                is_preshaped_empty = (
+                    isinstance(raw_value, dict)
+                    and any(k in raw_value for k in ('users', 'guests', 'groups'))
+                    and not any(raw_value.get(k) for k in ('users', 'guests', 'groups'))
+                )
+                if (
+                    not is_preshaped_empty
+                    and isinstance(encoded, dict)
+                    and not any(encoded.get(k) for k in ('users', 'guests', 'groups'))
+                ):
+                    unresolved.append(key)
+                    logger.warning(
+                        "Kick-off assignee value %r for %r resolved to nobody; "
+                        "it will not be migrated rather than written as empty assignees.",
+                        raw_value, key,
+                    )
+                    continue
+
+            payload[str(timeline_id)] = encoded
+
+        if unresolved and strict:
+            available = [
+                str(c.get('label') or c.get('alias') or c.get('id'))
+                for c in captures if isinstance(c, dict)
+            ]
+            raise UnresolvedFieldError(
+                f"{len(unresolved)} kick-off value(s) could not be matched to a field on "
+                f"the target template and would be silently discarded: "
+                f"{sorted(map(str, unresolved))}. Available kick-off fields: {available}",
+                unresolved,
+            )
+
+        return payload
+
+
 def build_prerun_payload(
     values: Any,
     captures: Optional[Sequence[Dict[str, Any]]] = None,
@@ -484,88 +777,4 @@ def build_prerun_payload(
             value cannot be matched to a kick-off field.
         TableShapeError: When a table value does not match its column count.
     """
-    normalized = normalize_prerun_object(values)
-    if not normalized:
-        return {}
-
-    if not captures:
-        if strict:
-            raise UnresolvedFieldError(
-                "Cannot build prerun data without the template's kick-off field "
-                "definitions: the API keys strictly by timeline_id, so every "
-                f"value would be discarded. Unresolvable keys: {sorted(map(str, normalized))}",
-                list(normalized),
-            )
-        logger.warning(
-            "Building prerun data without kick-off field definitions; keys are sent "
-            "unchanged and the API will discard any that are not a timeline_id"
-        )
-        return normalized
-
-    payload: Dict[str, Any] = {}
-    unresolved: List[Any] = []
-
-    for key, raw_value in normalized.items():
-        capture = resolve_capture(key, captures)
-        if capture is None:
-            unresolved.append(key)
-            logger.warning(
-                "No kick-off field matches %r; its value will not be migrated", key
-            )
-            continue
-
-        timeline_id = capture.get('timeline_id') or capture.get('id')
-        if timeline_id is None:
-            unresolved.append(key)
-            logger.warning(
-                "Kick-off field %r has no timeline_id; its value will not be migrated", key
-            )
-            continue
-
-        encoded = encode_field_value(raw_value, capture, **options)
-
-        if encoded in (None, []) and raw_value not in (None, '', [], {}):
-            unresolved.append(key)
-            logger.warning(
-                "Kick-off value %r for %r could not be encoded for field_type %r; "
-                "it will not be migrated rather than written as an empty value.",
-                raw_value, key, capture.get('field_type') or capture.get('type'),
-            )
-            continue
-
-        field_type = capture.get('field_type') or capture.get('type')
-        if field_type == 'assignees_form' and raw_value not in (None, '', [], {}):
-            # A pre-shaped dict with empty lists is legitimately empty, not loss.
-            is_preshaped_empty = (
-                isinstance(raw_value, dict)
-                and any(k in raw_value for k in ('users', 'guests', 'groups'))
-                and not any(raw_value.get(k) for k in ('users', 'guests', 'groups'))
-            )
-            if (
-                not is_preshaped_empty
-                and isinstance(encoded, dict)
-                and not any(encoded.get(k) for k in ('users', 'guests', 'groups'))
-            ):
-                unresolved.append(key)
-                logger.warning(
-                    "Kick-off assignee value %r for %r resolved to nobody; "
-                    "it will not be migrated rather than written as empty assignees.",
-                    raw_value, key,
-                )
-                continue
-
-        payload[str(timeline_id)] = encoded
-
-    if unresolved and strict:
-        available = [
-            str(c.get('label') or c.get('alias') or c.get('id'))
-            for c in captures if isinstance(c, dict)
-        ]
-        raise UnresolvedFieldError(
-            f"{len(unresolved)} kick-off value(s) could not be matched to a field on "
-            f"the target template and would be silently discarded: "
-            f"{sorted(map(str, unresolved))}. Available kick-off fields: {available}",
-            unresolved,
-        )
-
-    return payload
+    return PrerunPlan(captures, **options).build(values, strict=strict)
@@ -0,0 +1,250 @@
+"""
+Tests for the asyncio Tallyfy client and its synchronous batch adapter.
+
+Each test drives the real client against an in-process aiohttp server that
+records what it received, so the request shapes (``prerun`` object, taskdata
+body, multipart upload) and the throughput controls (concurrency cap, pacing,
+retry) are checked on the wire rather than against a mocked session.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from shared.async_tallyfy_client import (  # noqa: E402
+    AsyncTallyfyClient,
+    SyncBatchAdapter,
+    TallyfyAPIError,
+    TokenBucket,
+)
+
+ORG = 'org1'
+
+
+class FakeTallyfy:
+    """Records requests; per-run behaviour is scripted by process name."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = []
+        self.in_flight = 0
+        self.peak = 0
+        self.attempts = {}
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post(f'/api/organizations/{ORG}/runs', self.launch)
+        app.router.add_get(f'/api/organizations/{ORG}/runs/{{run}}/form-fields', self.form_fields)
+        app.router.add_put(f'/api/organizations/{ORG}/runs/{{run}}/tasks/{{task}}', self.taskdata)
+        app.router.add_post(f'/api/organizations/{ORG}/tasks/{{task}}/attachments', self.attachment)
+        return app
+
+    async def launch(self, request):
+        body = await request.json()
+        self.received.append(body)
+        name = body.get('name', '')
+        self.attempts[name] = self.attempts.get(name, 0) + 1
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if name == 'rejected':
+            return web.json_response({'error': 'invalid'}, status=422)
+        if name == 'flaky' and self.attempts[name] < 3:
+            return web.json_response({}, status=429, headers={'Retry-After': '0'})
+        if name == 'down':
+            return web.json_response({}, status=503)
+        return web.json_response({'data': {'id': f'run_{name}'}})
+
+    async def form_fields(self, request):
+        return web.json_response({'data': {'form_fields': [], 'run': request.match_info['run']}})
+
+    async def taskdata(self, request):
+        self.received.append((request.match_info['run'], request.match_info['task'], await request.json()))
+        return web.json_response({'data': {'id': request.match_info['task']}})
+
+    async def attachment(self, request):
+        reader = await request.multipart()
+        part = await reader.next()
+        self.received.append((part.filename, await part.read()))
+        return web.json_response({'data': {'id': 'file1'}})
+
+
+def run_against(fake, scenario, **client_kwargs):
+    """Start ``fake`` on localhost, open a client against it, run ``scenario``."""
+    async def main():
+        server = TestServer(fake.app())
+        await server.start_server()
+        try:
+            client_kwargs.setdefault('requests_per_second', None)
+            client_kwargs.setdefault('backoff_base', 0.01)
+            async with AsyncTallyfyClient(
+                'token', ORG, base_url=str(server.make_url('/api')), **client_kwargs
+            ) as client:
+                return await scenario(client)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+class TestRequestShapes:
+
+    def test_legacy_prerun_list_is_sent_as_a_prerun_object(self):
+        fake = FakeTallyfy()
+        process = {
+            'checklist_id': 'c1', 'name': 'a',
+            'prerun_data': [{'field_id': 'tl1', 'value': 'x'}],
+        }
+
+        run_against(fake, lambda c: c.create_process(process))
+
+        assert fake.received == [{'checklist_id': 'c1', 'name': 'a', 'prerun': {'tl1': 'x'}}]
+        assert 'prerun_data' in process, 'the caller\'s dict must not be modified'
+
+    def test_taskdata_is_written_per_task(self):
+        fake = FakeTallyfy()
+
+        run_against(fake, lambda c: c.update_task_form_field_values('r1', 't1', {'tl1': 'v'}))
+
+        assert fake.received == [('r1', 't1', {'taskdata': {'tl1': 'v'}})]
+
+    def test_empty_taskdata_is_refused_before_sending(self):
+        with pytest.raises(ValueError):
+            run_against(FakeTallyfy(), lambda c: c.update_task_form_field_values('r1', 't1', {}))
+
+    def test_form_fields_are_read_from_the_run(self):
+        result = run_against(FakeTallyfy(), lambda c: c.get_run_form_fields('r9'))
+        assert result['data']['run'] == 'r9'
+
+    def test_upload_is_multipart(self, tmp_path):
+        path = tmp_path / 'notes.txt'
+        path.write_bytes(b'hello')
+        fake = FakeTallyfy()
+
+        run_against(fake, lambda c: c.upload_file(str(path), 'task', 't1'))
+
+        assert fake.received == [('notes.txt', b'hello')]
+
+
+class TestThroughputControls:
+
+    def test_requests_in_flight_never_exceed_max_concurrency(self):
+        fake = FakeTallyfy(delay=0.02)
+        processes = [{'name': str(i)} for i in range(40)]
+
+        run_against(fake, lambda c: c.create_processes(processes), max_concurrency=8)
+
+        assert 1 < fake.peak <= 8
+
+    def test_one_bucket_paces_the_whole_batch(self):
+        fake = FakeTallyfy()
+        processes = [{'name': str(i)} for i in range(6)]
+
+        started = time.monotonic()
+        run_against(fake, lambda c: c.create_processes(processes), requests_per_second=50, burst=1)
+
+        # The first token is free; the other five wait 1/50s each.
+        assert time.monotonic() - started >= 5 / 50 * 0.9
+
+    def test_rate_limited_requests_are_retried(self):
+        fake = FakeTallyfy()
+        results = run_against(fake, lambda c: c.create_processes([{'name': 'flaky'}]))
+
+        assert results == [{'result': {'data': {'id': 'run_flaky'}}, 'error': None}]
+        assert fake.attempts['flaky'] == 3
+
+    def test_retries_are_bounded(self):
+        fake = FakeTallyfy()
+        with pytest.raises(TallyfyAPIError) as raised:
+            run_against(fake, lambda c: c.create_process({'name': 'down'}), max_retries=2)
+
+        assert raised.value.status == 503
+        assert fake.attempts['down'] == 3
+
+    def test_client_errors_are_not_retried(self):
+        fake = FakeTallyfy()
+        with pytest.raises(TallyfyAPIError):
+            run_against(fake, lambda c: c.create_process({'name': 'rejected'}))
+        assert fake.attempts['rejected'] == 1
+
+
+class TestTokenBucket:
+
+    def test_burst_is_served_without_waiting(self):
+        async def main():
+            bucket = TokenBucket(rate=1, capacity=3)
+            started = time.monotonic()
+            for _ in range(3):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        assert asyncio.run(main()) < 0.1
+
+    def test_rate_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestSyncBatchAdapter:
+    """The orchestrators are synchronous; they submit batches through this."""
+
+    @pytest.fixture
+    def server_url(self):
+        """Serve the fake from its own loop, as a remote API would be."""
+        fake = FakeTallyfy(delay=0.01)
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        served = {}
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            served['server'] = TestServer(fake.app())
+            loop.run_until_complete(served['server'].start_server())
+            ready.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        ready.wait()
+        yield fake, str(served['server'].make_url('/api'))
+        asyncio.run_coroutine_threadsafe(served['server'].close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def test_results_come_back_in_input_order_with_failures_isolated(self, server_url):
+        fake, url = server_url
+        names = ['a', 'rejected', 'b']
+
+        with SyncBatchAdapter('token', ORG, base_url=url, requests_per_second=None) as tallyfy:
+            results = tallyfy.create_processes([{'name': n} for n in names])
+
+        assert [r['result'] and r['result']['data']['id'] for r in results] == ['run_a', None, 'run_b']
+        assert '422' in results[1]['error']
+
+    def test_the_adapter_is_reusable_across_batches(self, server_url):
+        fake, url = server_url
+
+        with SyncBatchAdapter('token', ORG, base_url=url, requests_per_second=None) as tallyfy:
+            tallyfy.create_processes([{'name': 'a'}])
+            results = tallyfy.update_task_form_field_values([('r1', 't1', {'tl': 1})])
+            requests_sent = tallyfy.stats['requests']
+
+        assert results[0]['error'] is None
+        assert requests_sent == 2
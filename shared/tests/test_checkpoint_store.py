@@ -0,0 +1,390 @@
+"""
+Tests for the shared SQLite checkpoint and ID-mapping store.
+
+Three kinds of check:
+  * behaviour -- the store answers every query the vendor checkpoint managers
+    answered, with the same shapes;
+  * cost -- writes are group committed, and the resume, progress and mapping
+    queries are served by an index rather than a table scan (asserted from
+    SQLite's own query plan, so the check does not depend on timing);
+  * adoption -- every vendor's SQLite ``CheckpointManager`` is the shared store.
+"""
+
+import ast
+import glob
+import importlib.util
+import os
+import sqlite3
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.checkpoint_store import CheckpointStore  # noqa: E402
+
+# Vendors whose checkpoint manager is the SQLite store. bpmn, kissflow and
+# monday keep file-based managers with a different interface.
+SQLITE_VENDORS = [
+    'asana', 'basecamp', 'clickup', 'cognito-forms', 'google-forms', 'jotform',
+    'nextmatter', 'pipefy', 'process-street', 'rocketlane', 'surveymonkey',
+    'trello', 'typeform', 'wrike',
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'checkpoints.db')
+
+
+@pytest.fixture
+def store(db_path):
+    store = CheckpointStore('m1', db_path)
+    yield store
+    store.close()
+
+
+def committed_rows(db_path, table):
+    """What another process would see: rows visible to a second connection."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def query_plan(store, sql, params):
+    return ' | '.join(row[-1] for row in store.conn.execute('EXPLAIN QUERY PLAN ' + sql, params))
+
+
+class TestCheckpoints:
+
+    def test_round_trip(self, store):
+        store.save_checkpoint('users', 'user', 'u1', data={'email': 'a@x.com'})
+        checkpoint = store.get_checkpoint('users', 'user', 'u1')
+        assert checkpoint['status'] == 'completed'
+        assert checkpoint['data'] == {'email': 'a@x.com'}
+        assert store.get_checkpoint('users', 'user', 'missing') is None
+
+    def test_processed_means_completed_or_failed(self, store):
+        store.save_checkpoint('users', 'user', 'done')
+        store.save_checkpoint('users', 'user', 'broken', status='failed')
+        store.save_checkpoint('users', 'user', 'waiting', status='pending')
+        assert store.is_item_processed('users', 'user', 'done')
+        assert store.is_item_processed('users', 'user', 'broken')
+        assert not store.is_item_processed('users', 'user', 'waiting')
+        assert not store.is_item_processed('users', 'user', 'never')
+
+    def test_progress_and_pending(self, store):
+        for i in range(5):
+            store.save_checkpoint('instances', 'run', f'r{i}', status='pending' if i % 2 else 'completed')
+        store.save_checkpoint('instances', 'task', 't1', status='pending', data={'n': 1})
+
+        assert store.get_phase_progress('instances') == {'completed': 3, 'pending': 3}
+        assert {p['item_id'] for p in store.get_pending_items('instances')} == {'r1', 'r3', 't1'}
+        assert store.get_pending_items('instances', item_type='task') == [
+            {'item_type': 'task', 'item_id': 't1', 'data': {'n': 1}}
+        ]
+        assert len(store.get_pending_items('instances', limit=1)) == 1
+
+    def test_resaving_an_item_replaces_it(self, store):
+        store.save_checkpoint('users', 'user', 'u1', status='pending')
+        store.save_checkpoint('users', 'user', 'u1', status='completed')
+        assert store.get_phase_progress('users') == {'completed': 1}
+
+    def test_resume_point_is_the_last_checkpoint(self, store):
+        assert store.get_resume_point() == {'phase': 'discovery'}
+        store.save_checkpoint('users', 'user', 'u1')
+        store.save_checkpoint('templates', 'template', 't9', status='failed')
+        assert store.get_resume_point() == {
+            'phase': 'templates', 'last_item_type': 'template',
+            'last_item_id': 't9', 'last_status': 'failed',
+        }
+
+    def test_migration_record_follows_the_latest_phase(self, store):
+        store.save_checkpoint('users', 'user', 'u1')
+        store.save_checkpoint('templates', 'template', 't1')
+        assert store.get_migration_status()['phase'] == 'templates'
+        assert store.can_resume()
+
+        store.mark_migration_complete()
+        assert store.get_migration_status()['status'] == 'completed'
+        assert not store.can_resume()
+
+    def test_failure_keeps_its_message(self, store):
+        store.mark_migration_failed('boom')
+        assert store.get_migration_status()['metadata'] == {'error': 'boom'}
+
+
+class TestIdMappings:
+
+    def test_single_mapping(self, store):
+        store.save_id_mapping('src1', 'tgt1', 'user')
+        assert store.get_id_mapping('src1') == 'tgt1'
+        assert store.get_id_mapping('src1', entity_type='user') == 'tgt1'
+        assert store.get_id_mapping('src1', entity_type='template') is None
+
+    def test_bulk_mappings_from_a_dict_or_pairs(self, store):
+        assert store.save_id_mappings({'u1': 'T1', 'u2': 'T2'}, 'user') == 2
+        assert store.save_id_mappings([('p1', 'P1')], 'template') == 1
+        assert store.save_id_mappings({}, 'user') == 0
+
+        assert store.get_all_id_mappings('user') == {'u1': 'T1', 'u2': 'T2'}
+        assert store.get_all_id_mappings() == {'u1': 'T1', 'u2': 'T2', 'p1': 'P1'}
+
+    def test_source_system_defaults_to_the_subclass(self, store):
+        class VendorManager(CheckpointStore):
+            SOURCE_SYSTEM = 'vendor'
+
+        manager = VendorManager('m1', store.db_path)
+        manager.save_id_mapping('s', 't', 'user')
+        manager.flush()
+        row = manager.conn.execute('SELECT source_system, target_system FROM id_mappings').fetchone()
+        manager.close()
+        assert row == ('vendor', 'tallyfy')
+
+    def test_mappings_are_scoped_to_the_migration(self, db_path):
+        with CheckpointStore('a', db_path) as first:
+            first.save_id_mapping('s', 'from_a', 'user')
+        with CheckpointStore('b', db_path) as second:
+            assert second.get_all_id_mappings() == {}
+
+
+class TestMappingSnapshots:
+    """An instance phase reads its mappings once, not once per item."""
+
+    def test_loaded_once_and_shared(self, store):
+        store.save_id_mappings({'u1': 'T1'}, 'user')
+        snapshot = store.mapping_snapshot('user')
+        assert snapshot == {'u1': 'T1'}
+        assert store.mapping_snapshot('user') is snapshot
+
+    def test_writes_land_in_the_snapshot(self, store):
+        snapshot = store.mapping_snapshot('user')
+        store.save_id_mapping('u2', 'T2', 'user')
+        store.save_id_mappings([('u3', 'T3')], 'user')
+        store.save_id_mapping('t1', 'B1', 'template')
+        assert snapshot == {'u2': 'T2', 'u3': 'T3'}
+        assert snapshot == store.get_all_id_mappings('user')
+
+    def test_a_remapped_source_id_leaves_its_old_type(self, store):
+        store.save_id_mapping('x1', 'T1', 'user')
+        users = store.mapping_snapshot('user')
+        store.save_id_mapping('x1', 'G1', 'customer')
+        assert users == store.get_all_id_mappings('user') == {}
+
+    def test_lookups_are_served_from_memory_while_held(self, store):
+        store.save_id_mapping(42, 'T42', 'user')
+        store.mapping_snapshot('user')
+        with patch.object(store, 'conn') as conn:
+            for _ in range(1000):
+                assert store.get_id_mapping(42, 'user') == 'T42'
+                assert store.get_id_mapping(None, 'user') is None
+        assert not conn.execute.called
+
+    def test_release_goes_back_to_the_database(self, store):
+        snapshot = store.mapping_snapshot('user')
+        store.release_mapping_snapshots()
+        store.save_id_mapping('u1', 'T1', 'user')
+        assert snapshot == {}
+        assert store.get_id_mapping('u1', 'user') == 'T1'
+        assert store.mapping_snapshot('user') is not snapshot
+
+
+def _mapping_reads_in_loops(path):
+    """get_all_id_mappings(...) calls made inside a for/while body."""
+    found = []
+    for loop in ast.walk(ast.parse(open(path).read())):
+        if not isinstance(loop, (ast.For, ast.While, ast.AsyncFor)):
+            continue
+        for stmt in loop.body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) \
+                        and node.func.attr == 'get_all_id_mappings':
+                    found.append(f'{os.path.relpath(path, REPO_ROOT)}:{node.lineno}')
+    return sorted(set(found))
+
+
+class TestNoPerItemMappingTableReads:
+
+    @pytest.mark.parametrize('vendor', SQLITE_VENDORS)
+    def test_mapping_table_is_not_reloaded_per_item(self, vendor):
+        found = _mapping_reads_in_loops(os.path.join(REPO_ROOT, vendor, 'src', 'main.py'))
+        assert not found, (
+            'Each of these re-reads a whole mapping table per item. Take '
+            'checkpoint_manager.mapping_snapshot(entity_type) once before the loop:\n  '
+            + '\n  '.join(found)
+        )
+
+    def test_the_gate_sees_a_read_in_a_loop(self, tmp_path):
+        """Guard the guard."""
+        source = tmp_path / 'main.py'
+        source.write_text('for p in projects:\n    f(cm.get_all_id_mappings("user"))\n')
+        assert _mapping_reads_in_loops(str(source))
+
+
+class TestErrors:
+
+    def test_errors_are_logged_and_filtered_by_phase(self, store):
+        store.log_error('users', 'user', 'u1', 'ValueError', 'bad email')
+        store.log_error('templates', 'template', 't1', 'HTTPError', '422')
+        assert len(store.get_errors()) == 2
+        assert store.get_errors('users')[0]['error_message'] == 'bad email'
+
+    def test_cleanup_can_keep_mappings(self, store):
+        store.save_checkpoint('users', 'user', 'u1')
+        store.save_id_mapping('u1', 'T1', 'user')
+        store.cleanup(keep_mappings=True)
+        assert store.get_phase_progress('users') == {}
+        assert store.get_all_id_mappings() == {'u1': 'T1'}
+
+        store.cleanup(keep_mappings=False)
+        assert store.get_all_id_mappings() == {}
+        assert store.get_migration_status() is None
+
+
+class TestGroupCommit:
+
+    def test_writes_wait_for_the_window(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=10, commit_interval=3600)
+        for i in range(9):
+            store.save_checkpoint('users', 'user', f'u{i}')
+        assert committed_rows(db_path, 'checkpoints') == 0
+        assert store.get_phase_progress('users') == {'completed': 9}, 'pending writes are readable'
+
+        store.save_checkpoint('users', 'user', 'u9')
+        assert committed_rows(db_path, 'checkpoints') == 10
+        store.close()
+
+    def test_interval_bounds_how_long_a_write_waits(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=1000, commit_interval=0)
+        store.save_checkpoint('users', 'user', 'u1')
+        assert committed_rows(db_path, 'checkpoints') == 1
+        store.close()
+
+    def test_mappings_commit_immediately(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=1000, commit_interval=3600)
+        store.save_checkpoint('users', 'user', 'u1')
+        store.save_id_mapping('u1', 'T1', 'user')
+        assert committed_rows(db_path, 'id_mappings') == 1
+        assert committed_rows(db_path, 'checkpoints') == 1, 'pending checkpoints go with it'
+
+        store.save_id_mappings({f's{i}': f't{i}' for i in range(3)}, 'user')
+        assert committed_rows(db_path, 'id_mappings') == 4
+        store.close()
+
+    def test_durable_checkpoints_commit_immediately(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=1000, commit_interval=3600)
+        store.save_checkpoint('projects', 'time_entry_group', 'g1', durable=True)
+        assert committed_rows(db_path, 'checkpoints') == 1
+        store.save_checkpoint('projects', 'time_entry_group', 'g2')
+        assert committed_rows(db_path, 'checkpoints') == 1
+        store.close()
+
+    def test_flush_and_close_commit_everything(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=1000, commit_interval=3600)
+        store.save_checkpoint('users', 'user', 'u1')
+        store.flush()
+        assert committed_rows(db_path, 'checkpoints') == 1
+
+        store.save_id_mapping('u1', 'T1', 'user')
+        store.close()
+        assert committed_rows(db_path, 'id_mappings') == 1
+
+    def test_a_failed_write_does_not_discard_the_window(self, db_path):
+        store = CheckpointStore('m1', db_path, commit_batch=1000, commit_interval=3600)
+        store.save_checkpoint('users', 'user', 'u1')
+        with pytest.raises(sqlite3.Error):
+            store.save_checkpoint('users', 'user', None)  # item_id is NOT NULL
+        store.close()
+        assert committed_rows(db_path, 'checkpoints') == 1
+
+    def test_worker_threads_can_share_a_store(self, store):
+        def work(worker):
+            for i in range(200):
+                store.save_checkpoint('instances', 'run', f'{worker}-{i}')
+
+        threads = [threading.Thread(target=work, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.get_phase_progress('instances') == {'completed': 800}
+
+
+class TestIndexes:
+
+    def test_database_runs_in_wal_mode(self, store):
+        assert store.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    @pytest.mark.parametrize('sql,params,index', [
+        ("SELECT status, COUNT(*) FROM checkpoints WHERE migration_id = ? AND phase = ? "
+         "GROUP BY status", ('m1', 'users'), 'COVERING INDEX idx_checkpoints_status'),
+        ("SELECT item_type, item_id, data FROM checkpoints WHERE migration_id = ? AND phase = ? "
+         "AND status = 'pending' AND item_type = ? LIMIT 100", ('m1', 'users', 'user'),
+         'idx_checkpoints_status'),
+        ("SELECT phase FROM checkpoints WHERE migration_id = ? ORDER BY id DESC LIMIT 1",
+         ('m1',), 'idx_checkpoints_recent'),
+        ("SELECT source_id, target_id FROM id_mappings WHERE migration_id = ? AND entity_type = ?",
+         ('m1', 'user'), 'COVERING INDEX idx_id_mappings_entity'),
+    ])
+    def test_queries_use_an_index(self, store, sql, params, index):
+        plan = query_plan(store, sql, params)
+        assert index in plan, plan
+        assert 'TEMP B-TREE' not in plan, plan
+
+    def test_an_existing_database_gains_the_indexes(self, db_path):
+        # A checkpoint file written by the old per-vendor managers.
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE checkpoints (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                     'migration_id TEXT NOT NULL, phase TEXT NOT NULL, item_type TEXT NOT NULL, '
+                     'item_id TEXT NOT NULL, status TEXT NOT NULL, created_at TEXT NOT NULL, '
+                     'data TEXT, UNIQUE(migration_id, phase, item_type, item_id))')
+        conn.execute("INSERT INTO checkpoints (migration_id, phase, item_type, item_id, status, "
+                     "created_at) VALUES ('m1', 'users', 'user', 'u1', 'completed', 'now')")
+        conn.commit()
+        conn.close()
+
+        with CheckpointStore('m1', db_path) as store:
+            indexes = {row[0] for row in store.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert {'idx_checkpoints_status', 'idx_checkpoints_recent'} <= indexes
+            assert store.is_item_processed('users', 'user', 'u1')
+
+
+def load_checkpoint_manager(vendor):
+    """Import a vendor's checkpoint manager by path.
+
+    It imports nothing from its vendor's src/, so that directory is kept off
+    sys.path -- fourteen vendors' ``api``/``utils`` packages on the path would
+    shadow each other for every test that runs after this one.
+    """
+    path = os.path.join(REPO_ROOT, vendor, 'src', 'utils', 'checkpoint_manager.py')
+    spec = importlib.util.spec_from_file_location(f'_{vendor.replace("-", "_")}_checkpoints', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestEveryVendorUsesTheStore:
+
+    @pytest.mark.parametrize('vendor', SQLITE_VENDORS)
+    def test_checkpoint_manager_is_the_shared_store(self, vendor, tmp_path):
+        manager = load_checkpoint_manager(vendor).CheckpointManager('m1', str(tmp_path / 'c.db'))
+        manager.save_id_mapping('s', 't', 'user')
+        assert isinstance(manager, CheckpointStore)
+        assert manager.get_id_mapping('s') == 't'
+        assert manager.SOURCE_SYSTEM != CheckpointStore.SOURCE_SYSTEM
+        manager.close()
+
+    def test_no_vendor_ships_its_own_sqlite_schema(self):
+        clones = [
+            os.path.relpath(path, REPO_ROOT)
+            for path in glob.glob(os.path.join(REPO_ROOT, '*', 'src', 'utils', 'checkpoint_manager.py'))
+            if 'CREATE TABLE' in open(path).read()
+        ]
+        assert not clones, f'Subclass shared.checkpoint_store.CheckpointStore instead: {clones}'
@@ -0,0 +1,116 @@
+"""
+Tests for the persistent discovery snapshot.
+
+Discovery used to be one JSON file per run that every phase re-read whole, and
+a resumed run, with a new migration id, fetched the workspace again. These pin
+that the snapshot round-trips the discovery dict, streams a section lazily in
+order, finds records by id, survives reopening, keeps the previous snapshot
+when a write fails part-way, and that the refresh-or-reuse switch decides as
+documented.
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
+
+from shared.discovery_snapshot import DiscoverySnapshot, configured_discovery_mode  # noqa: E402
+
+PARAMS = {'base_url': 'https://api.example.com', 'include_archived': False}
+
+
+def discovery(projects=3):
+    return {
+        'customers': [{'id': 'c1', 'name': 'Acme'}],
+        'projects': [{'id': n, 'name': f'Project {n}', 'status': 'active'} for n in range(projects)],
+        'templates': [],
+        'counts': {'customers': 1, 'projects': projects},
+        'paradigm_shifts': [{'type': 'customer_portal', 'description': 'guests'}],
+    }
+
+
+class Unencodable:
+    def __str__(self):
+        raise ValueError('cannot encode')
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    with DiscoverySnapshot(str(tmp_path / 'data' / 'discovery.db')) as snapshot:
+        yield snapshot
+
+
+def test_round_trip(snapshot):
+    assert not snapshot.complete
+    snapshot.write(discovery(), params=PARAMS)
+
+    assert snapshot.complete
+    assert snapshot.params == PARAMS
+    assert snapshot.load() == discovery()
+    assert list(snapshot.load()) == list(discovery())
+    assert snapshot.value('counts') == {'customers': 1, 'projects': 3}
+    assert snapshot.value('missing', {}) == {}
+
+
+def test_records_stream_in_order_and_by_id(snapshot):
+    snapshot.write(discovery(projects=500))
+
+    stream = snapshot.records('projects')
+    assert next(stream) == {'id': 0, 'name': 'Project 0', 'status': 'active'}
+    assert [p['id'] for p in stream] == list(range(1, 500))
+    assert snapshot.count('projects') == 500
+    assert list(snapshot.records('templates')) == []
+
+    assert snapshot.get('projects', 321)['name'] == 'Project 321'
+    assert snapshot.get('projects', '321')['name'] == 'Project 321'
+    assert snapshot.get('customers', 321) is None
+
+
+def test_snapshot_survives_reopening_and_refresh_replaces_it(tmp_path):
+    path = str(tmp_path / 'discovery.db')
+    with DiscoverySnapshot(path) as snapshot:
+        snapshot.write(discovery(projects=5), params=PARAMS)
+
+    with DiscoverySnapshot(path) as snapshot:
+        assert snapshot.complete
+        assert snapshot.count('projects') == 5
+        snapshot.write(discovery(projects=2), params=PARAMS)
+        assert [p['id'] for p in snapshot.records('projects')] == [0, 1]
+
+
+def test_failed_write_keeps_the_previous_snapshot(snapshot):
+    snapshot.write(discovery(), params=PARAMS)
+    broken = dict(discovery(projects=1), users=[{'id': 'u1', 'manager': Unencodable()}])
+
+    with pytest.raises(ValueError):
+        snapshot.write(broken, params=PARAMS)
+
+    assert snapshot.complete
+    assert snapshot.load() == discovery()
+
+
+def test_refresh_or_reuse(snapshot):
+    assert not snapshot.should_reuse('reuse', resume=True, params=PARAMS)
+
+    snapshot.write(discovery(), params=PARAMS)
+    other = dict(PARAMS, include_archived=True)
+
+    assert snapshot.should_reuse('auto', resume=True, params=PARAMS)
+    assert not snapshot.should_reuse('auto', resume=False, params=PARAMS)
+    assert not snapshot.should_reuse('auto', resume=True, params=other)
+    assert snapshot.should_reuse('reuse', params=other)
+    assert not snapshot.should_reuse('refresh', resume=True, params=PARAMS)
+    with pytest.raises(ValueError):
+        snapshot.should_reuse('sometimes')
+
+
+def test_mode_comes_from_the_environment(monkeypatch):
+    monkeypatch.delenv('DISCOVERY_MODE', raising=False)
+    assert configured_discovery_mode() == 'auto'
+    monkeypatch.setenv('DISCOVERY_MODE', 'Refresh')
+    assert configured_discovery_mode() == 'refresh'
+    monkeypatch.setenv('DISCOVERY_MODE', 'never')
+    assert configured_discovery_mode() == 'auto'
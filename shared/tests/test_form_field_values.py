@@ -33,9 +33,12 @@ if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
 from shared.form_field_values import (  # noqa: E402
+    FormFieldLayoutCache,
     MissingTaskBindingError,
+    TaskFormFieldPlan,
     UnresolvedFormFieldError,
     build_task_form_field_payloads,
+    extract_launched_tasks,
     extract_run_form_fields,
     reshape_assignee_values,
 )
@@ -705,6 +708,105 @@ class TestBuildTaskFormFieldPayloads:
         assert build_task_form_field_payloads({}, self.FIELDS) == {}
 
 
+class TestTaskFormFieldPlan:
+    """One plan per process's fields, applied to every record written to it."""
+
+    FIELDS = extract_run_form_fields(run_form_fields_response())
+
+    RECORDS = [
+        {'notes': 'Hello', 'tags': ['Urgent', 'Billing'], 'preferred_plan': 'Enterprise'},
+        {'Notes': 'Again', 'priority': 'High'},
+        {'pipefy_field_77': 'Rescued'},
+        {},
+    ]
+
+    def test_matches_build_task_form_field_payloads_for_every_record(self):
+        fallbacks = {'pipefy_field_77': ['Notes']}
+        plan = TaskFormFieldPlan(self.FIELDS, fallback_keys=fallbacks)
+        for record in self.RECORDS:
+            assert plan.build(record) == build_task_form_field_payloads(
+                record, self.FIELDS, fallback_keys=fallbacks
+            ), record
+
+    def test_a_source_key_is_resolved_once(self):
+        plan = TaskFormFieldPlan(self.FIELDS)
+        with patch.object(type(plan._index), 'resolve', autospec=True,
+                          side_effect=type(plan._index).resolve) as resolve:
+            for _ in range(20):
+                plan.build({'notes': 'Hello', 'priority': 'High'})
+        assert resolve.call_count == 2
+
+    def test_strict_mode_still_raises_on_every_build(self):
+        plan = TaskFormFieldPlan(self.FIELDS)
+        for _ in range(2):
+            with pytest.raises(UnresolvedFormFieldError):
+                plan.build({'nope': 'x'})
+
+
+def launch_response(run_id, task_one, task_two):
+    """A POST /runs response listing the new run's tasks with their steps."""
+    return {'data': {'id': run_id, 'tasks': [
+        {'id': task_one, 'step_id': 'step_a'},
+        {'id': task_two, 'step_id': 'step_b'},
+    ]}}
+
+
+class TestFormFieldLayoutCache:
+    """The field layout is read once per template; each run binds its own tasks."""
+
+    def build(self):
+        client = MagicMock()
+        client.get_run_form_fields.return_value = run_form_fields_response()
+        return client, FormFieldLayoutCache(client)
+
+    def test_later_runs_are_bound_from_their_launch_response(self):
+        client, layouts = self.build()
+        first = layouts.fields('run_1', 'chk_1', launch_response('run_1', TASK_ONE, TASK_TWO))
+        second = layouts.fields('run_2', 'chk_1', launch_response('run_2', 'task_3', 'task_4'))
+
+        client.get_run_form_fields.assert_called_once_with('run_1')
+        assert [f['task_id'] for f in first] == [TASK_ONE, TASK_ONE, TASK_TWO, TASK_TWO]
+        assert [f['task_id'] for f in second] == ['task_3', 'task_3', 'task_4', 'task_4']
+        assert [f['id'] for f in second] == [f['id'] for f in first]
+        assert build_task_form_field_payloads({'notes': 'x', 'tags': ['Urgent']}, second).keys() == {
+            'task_3', 'task_4'}
+
+    def test_binding_a_run_does_not_touch_another_runs_fields(self):
+        _, layouts = self.build()
+        first = layouts.fields('run_1', 'chk_1', launch_response('run_1', TASK_ONE, TASK_TWO))
+        layouts.fields('run_2', 'chk_1', launch_response('run_2', 'task_3', 'task_4'))
+        assert first[0]['task_id'] == TASK_ONE
+
+    @pytest.mark.parametrize('launched', [
+        None,
+        {'data': {'id': 'run_2'}},
+        {'data': {'id': 'run_2', 'tasks': [{'id': 'task_3', 'step_id': 'step_a'}]}},
+    ])
+    def test_an_uncertain_binding_reads_the_run(self, launched):
+        client, layouts = self.build()
+        layouts.fields('run_1', 'chk_1', launch_response('run_1', TASK_ONE, TASK_TWO))
+        layouts.fields('run_2', 'chk_1', launched)
+        assert [c.args for c in client.get_run_form_fields.call_args_list] == [('run_1',), ('run_2',)]
+
+    def test_a_layout_whose_steps_are_unknown_is_not_cached(self):
+        client, layouts = self.build()
+        layouts.fields('run_1', 'chk_1', None)
+        layouts.fields('run_2', 'chk_1', launch_response('run_2', 'task_3', 'task_4'))
+        assert client.get_run_form_fields.call_count == 2
+
+    def test_templates_are_cached_separately(self):
+        client, layouts = self.build()
+        layouts.fields('run_1', 'chk_1', launch_response('run_1', TASK_ONE, TASK_TWO))
+        layouts.fields('run_2', 'chk_2', launch_response('run_2', 'task_3', 'task_4'))
+        assert client.get_run_form_fields.call_count == 2
+
+    def test_launched_tasks_accept_an_include_envelope(self):
+        response = {'id': 'run_1', 'tasks': {'data': [
+            {'id': 't1', 'step_id': 's1'}, {'id': 't2', 'step': {'id': 's2'}}, {'id': 't3'},
+        ]}}
+        assert extract_launched_tasks(response) == {'s1': 't1', 's2': 't2'}
+
+
 # ---------------------------------------------------------------------------
 # Live migration paths -- the orchestrators themselves
 # ---------------------------------------------------------------------------
@@ -787,6 +889,7 @@ def make_orchestrator(orchestrator_cls, mapped_ids=None):
     """Build an orchestrator with a mock Tallyfy client and id mapper."""
     orchestrator = object.__new__(orchestrator_cls)
     orchestrator.tallyfy_client = MagicMock()
+    orchestrator.tallyfy_client.organization_id = 'org_1'
     orchestrator.tallyfy_client.get_run_form_fields.return_value = (
         run_form_fields_response()
     )
@@ -1060,6 +1163,17 @@ class TestProcessStreetFormValues:
         orchestrator._migrate_form_values(self.RUN, 'run_1')
         assert orchestrator.tallyfy_client.update_task_form_field_values.call_count == 2
 
+    def test_the_field_layout_is_read_once_per_template(self):
+        orchestrator = self.build()
+        orchestrator.form_field_layouts = FormFieldLayoutCache(orchestrator.tallyfy_client)
+        for run_id, tasks in (('run_1', (TASK_ONE, TASK_TWO)), ('run_2', ('task_3', 'task_4'))):
+            orchestrator._migrate_form_values(self.RUN, run_id, checklist_id='chk_1',
+                                              launched=launch_response(run_id, *tasks))
+
+        orchestrator.tallyfy_client.get_run_form_fields.assert_called_once_with('run_1')
+        writes = [c.args[:2] for c in orchestrator.tallyfy_client.update_task_form_field_values.call_args_list]
+        assert sorted(writes) == [('run_1', TASK_ONE), ('run_1', TASK_TWO), ('run_2', 'task_3'), ('run_2', 'task_4')]
+
     def test_a_value_with_no_matching_field_fails_loudly(self):
         orchestrator = self.build(mapped_ids={})
         with pytest.raises(UnresolvedFormFieldError):
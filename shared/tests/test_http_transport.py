@@ -0,0 +1,210 @@
+"""
+Tests for the shared connection-pooled HTTP transport.
+
+Two kinds of check:
+  * the transport itself -- pool size follows concurrency, each call class
+    gets its own default timeout, and an explicit timeout still wins;
+  * adoption -- no API client under ``*/src/api/`` builds a bare
+    ``requests.Session()`` or calls ``requests.get``/``requests.post``
+    directly, because either one silently opts that call out of the pool.
+"""
+
+import ast
+import glob
+import importlib.util
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.http_transport import (  # noqa: E402
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUTS,
+    PooledHTTPAdapter,
+    call_class,
+    create_session,
+    pool_maxsize,
+)
+
+URL = 'https://api.example.com/thing'
+
+API_CLIENTS = sorted(
+    os.path.relpath(p, REPO_ROOT)
+    for p in glob.glob(os.path.join(REPO_ROOT, '*', 'src', 'api', '*.py'))
+)
+
+
+def prepared(method='GET', **kwargs):
+    return create_session().prepare_request(requests.Request(method, URL, **kwargs))
+
+
+def timeout_sent(adapter, request, **kwargs):
+    """The timeout the adapter hands down to urllib3 for this request."""
+    with patch.object(HTTPAdapter, 'send', return_value=MagicMock()) as send:
+        adapter.send(request, **kwargs)
+    return send.call_args.kwargs['timeout']
+
+
+class TestPoolSizing:
+
+    def test_pool_grows_to_the_configured_concurrency(self):
+        assert pool_maxsize(create_session(concurrency=32)) == 32
+
+    def test_pool_never_shrinks_below_the_requests_default(self):
+        assert pool_maxsize(create_session(concurrency=2)) == DEFAULT_POOL_MAXSIZE
+
+    def test_concurrency_defaults_to_max_workers(self, monkeypatch):
+        monkeypatch.setenv('MAX_WORKERS', '24')
+        assert pool_maxsize(create_session()) == 24
+
+    def test_unparseable_max_workers_falls_back(self, monkeypatch):
+        monkeypatch.setenv('MAX_WORKERS', 'lots')
+        assert pool_maxsize(create_session()) == DEFAULT_POOL_MAXSIZE
+
+    def test_http_and_https_share_one_adapter(self):
+        session = create_session()
+        assert session.get_adapter('http://x') is session.get_adapter('https://x')
+        assert isinstance(session.get_adapter('https://x'), PooledHTTPAdapter)
+
+    def test_retries_are_passed_to_the_adapter(self):
+        session = create_session(max_retries=5)
+        assert session.get_adapter(URL).max_retries.total == 5
+
+
+class TestHeaders:
+
+    def test_keep_alive_and_compression_are_requested(self):
+        headers = create_session().headers
+        assert headers['Connection'] == 'keep-alive'
+        assert 'gzip' in headers['Accept-Encoding']
+
+    def test_caller_headers_are_merged_over_the_defaults(self):
+        session = create_session(headers={'Accept': 'application/json'})
+        assert session.headers['Accept'] == 'application/json'
+        assert session.headers['Connection'] == 'keep-alive'
+
+
+class TestCallClassTimeouts:
+
+    @pytest.mark.parametrize('method', ['GET', 'HEAD', 'OPTIONS'])
+    def test_reads(self, method):
+        assert call_class(prepared(method)) == 'read'
+
+    @pytest.mark.parametrize('method', ['POST', 'PUT', 'PATCH', 'DELETE'])
+    def test_writes(self, method):
+        assert call_class(prepared(method, json={'a': 1})) == 'write'
+
+    def test_multipart_is_an_upload(self):
+        request = prepared('POST', files={'file': ('a.txt', b'data')})
+        assert call_class(request) == 'upload'
+
+    def test_streamed_is_a_download(self):
+        assert call_class(prepared('GET'), stream=True) == 'download'
+
+    @pytest.mark.parametrize('kwargs,expected', [
+        ({}, 'read'),
+        ({'stream': True}, 'download'),
+    ])
+    def test_class_default_is_applied_when_no_timeout_is_given(self, kwargs, expected):
+        adapter = PooledHTTPAdapter()
+        assert timeout_sent(adapter, prepared('GET'), **kwargs) == DEFAULT_TIMEOUTS[expected]
+
+    def test_upload_gets_the_upload_timeout(self):
+        adapter = PooledHTTPAdapter()
+        request = prepared('POST', files={'file': ('a.txt', b'data')})
+        assert timeout_sent(adapter, request) == DEFAULT_TIMEOUTS['upload']
+
+    def test_an_explicit_timeout_wins(self):
+        adapter = PooledHTTPAdapter()
+        assert timeout_sent(adapter, prepared('GET'), timeout=3) == 3
+
+    def test_overrides_replace_only_their_class(self):
+        adapter = PooledHTTPAdapter(timeouts={'read': 7})
+        assert timeout_sent(adapter, prepared('GET')) == 7
+        assert timeout_sent(adapter, prepared('POST')) == DEFAULT_TIMEOUTS['write']
+
+
+class TestUnsettingTheSessionContentType:
+    """Clients keep ``Content-Type: application/json`` on the session, so an
+    upload has to unset it for that request. Deleting it from a COPY of the
+    session headers does nothing: the session merges its own value back in."""
+
+    def test_none_lets_requests_write_the_multipart_boundary(self):
+        session = create_session(headers={'Content-Type': 'application/json'})
+        request = session.prepare_request(requests.Request(
+            'POST', URL, files={'file': ('a.txt', b'data')},
+            headers={'Content-Type': None},
+        ))
+        assert request.headers['Content-Type'].startswith('multipart/form-data; boundary=')
+
+
+def _bypasses(path):
+    tree = ast.parse(open(os.path.join(REPO_ROOT, path)).read())
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+            continue
+        target = node.func.value
+        if isinstance(target, ast.Name) and target.id == 'requests' and node.func.attr in {
+            'Session', 'get', 'post', 'put', 'patch', 'delete', 'request',
+        }:
+            found.append(f'{path}:{node.lineno} requests.{node.func.attr}(...)')
+    return found
+
+
+class TestEveryClientUsesTheTransport:
+
+    @pytest.mark.parametrize('path', API_CLIENTS)
+    def test_no_bare_sessions_or_module_level_requests(self, path):
+        found = _bypasses(path)
+        assert not found, (
+            'These bypass the pooled transport; use '
+            'shared.http_transport.create_session() and self.session:\n  '
+            + '\n  '.join(found)
+        )
+
+    def test_the_gate_sees_a_bare_call(self, tmp_path):
+        """Guard the guard."""
+        source = tmp_path / 'client.py'
+        source.write_text('import requests\nrequests.post("https://x")\n')
+        assert _bypasses(str(source))
+
+
+def load_vendor_module(vendor, relpath, name):
+    """Import a vendor module by path, with its own src dir on sys.path."""
+    src = os.path.join(REPO_ROOT, vendor, 'src')
+    if src not in sys.path:
+        sys.path.insert(0, src)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(src, relpath))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestTokenExchangeUsesThePool:
+    """pipefy's OAuth exchange used a bare ``requests.post``."""
+
+    def test_authenticate_posts_through_the_session_without_a_stale_token(self):
+        module = load_vendor_module('pipefy', 'api/tallyfy_client.py', '_pipefy_tallyfy_transport')
+        with patch.object(module.TallyfyClient, '_authenticate'):  # the constructor logs in
+            client = module.TallyfyClient(
+                api_url='https://api.tallyfy.com', client_id='id', client_secret='secret',
+                organization_id='org', organization_slug='org',
+            )
+        client.session.headers['Authorization'] = 'Bearer expired'
+        response = MagicMock()
+        response.json.return_value = {'access_token': 'fresh', 'expires_in': 60}
+
+        with patch.object(client.session, 'post', return_value=response) as post:
+            client._authenticate()
+
+        assert post.call_args.kwargs['headers'] == {'Authorization': None}
+        assert client.session.headers['Authorization'] == 'Bearer fresh'
+        assert isinstance(client.session.get_adapter(URL), PooledHTTPAdapter)
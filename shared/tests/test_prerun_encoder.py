@@ -17,6 +17,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from prerun_encoder import (  # noqa: E402
     PRERUN_KEY,
+    CaptureIndex,
+    PrerunPlan,
     build_prerun_payload,
     encode_assignees_form,
     encode_field_value,
@@ -228,3 +230,75 @@ class TestBuildPrerunPayload:
     def test_empty_input_yields_empty_object(self):
         assert build_prerun_payload({}, [capture('text')]) == {}
         assert build_prerun_payload(None, [capture('text')]) == {}
+
+
+class TestCaptureIndex:
+    """The index must answer exactly as the resolve_capture scan does."""
+
+    def test_precedence_matches_resolve_capture(self):
+        # 'shared' is one field's label and another's id: id outranks label.
+        fields = [
+            {'timeline_id': 'tl1', 'id': 'a', 'label': 'shared'},
+            {'timeline_id': 'tl2', 'id': 'shared', 'label': 'other'},
+        ]
+        index = CaptureIndex(fields)
+        for key in ('tl1', 'tl2', 'a', 'shared', 'other', 'missing'):
+            assert index.resolve(key) is resolve_capture(key, fields), key
+
+    def test_first_definition_wins_and_keys_compare_as_strings(self):
+        fields = [{'id': 7, 'label': 'Dup'}, {'id': 8, 'label': 'Dup'}]
+        index = CaptureIndex(fields)
+        assert index.resolve('Dup')['id'] == 7
+        assert index.resolve('7') is fields[0]
+
+
+class TestPrerunPlan:
+    """A plan compiled once must encode every record as build_prerun_payload does."""
+
+    CAPTURES = [
+        capture('text'),
+        capture('dropdown', timeline_id='b' * 32, alias='plan', label='Plan',
+                options=[{'id': 'o1', 'text': 'Pro'}, {'id': 'o2', 'text': 'Team'}]),
+        capture('multiselect', timeline_id='c' * 32, alias='tags', label='Tags',
+                options=[{'id': 1, 'text': 'A'}, {'id': 2, 'text': 'B'}]),
+        capture('table', timeline_id='d' * 32, alias='rows', label='Rows',
+                columns=[{'label': 'Name'}, {'label': 'Qty'}]),
+    ]
+
+    RECORDS = [
+        {'my_field': 'hello', 'plan': 'Pro', 'tags': ['A', 'B'], 'rows': ['x', 1]},
+        {'My Field': 'again', 'Plan': 'o2', 'Tags': 'B'},
+        [{'field_id': 'plan', 'value': 'Team'}],
+        {'plan': 'Missing', 'nope': 'x'},
+        {},
+    ]
+
+    def test_matches_build_prerun_payload_for_every_record(self):
+        plan = PrerunPlan(self.CAPTURES)
+        for record in self.RECORDS:
+            assert plan.build(record) == build_prerun_payload(record, self.CAPTURES), record
+
+    def test_each_field_is_compiled_once_across_records(self, monkeypatch):
+        import prerun_encoder
+
+        compiled = []
+        original = prerun_encoder.compile_field_encoder
+
+        def counting(capture, **options):
+            compiled.append(capture['alias'])
+            return original(capture, **options)
+
+        monkeypatch.setattr(prerun_encoder, 'compile_field_encoder', counting)
+        plan = PrerunPlan(self.CAPTURES)
+        for _ in range(50):
+            plan.build({'plan': 'Pro', 'tags': ['A']})
+
+        assert sorted(compiled) == ['plan', 'tags']
+
+    def test_strict_mode_raises_as_build_prerun_payload_does(self):
+        with pytest.raises(Exception) as from_plan:
+            PrerunPlan(self.CAPTURES).build({'nope': 'x'}, strict=True)
+        with pytest.raises(Exception) as from_function:
+            build_prerun_payload({'nope': 'x'}, self.CAPTURES, strict=True)
+        assert type(from_plan.value) is type(from_function.value)
+        assert str(from_plan.value) == str(from_function.value)
@@ -238,6 +238,22 @@ class TestKickoffFieldCache:
 
     def test_extract_handles_missing_prerun(self):
         assert extract_kickoff_fields({'id': 'chk'}) == []
+
+    def test_plan_is_compiled_once_per_template(self):
+        client = self.FakeClient({'prerun': kickoff_definitions()})
+        cache = KickoffFieldCache(client)
+        plan = cache.plan('chk_1')
+        assert cache.plan('chk_1') is plan
+        assert plan.build({'Company Name': 'Acme'}) == {TL_COMPANY: 'Acme'}
+        assert client.calls == 1
+
+    def test_clear_drops_the_plan_with_the_definitions(self):
+        client = self.FakeClient({'prerun': kickoff_definitions()})
+        cache = KickoffFieldCache(client)
+        plan = cache.plan('chk_1')
+        cache.clear('chk_1')
+        assert cache.plan('chk_1') is not plan
+        assert client.calls == 2
         assert extract_kickoff_fields(None) == []
 
 
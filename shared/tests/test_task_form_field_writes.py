@@ -0,0 +1,246 @@
+"""
+Tests for writing a run's per-task ``taskdata`` concurrently.
+
+The writes are driven through the real process-street Tallyfy client against a
+local HTTP server that records every PUT and how many were in flight at once,
+so the overlap, the per-organisation cap, the failure reporting and the shared
+client's token refresh are checked on the wire. That each task is sent once --
+retrying is the client's job -- is checked against a scripted client.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from shared.form_field_values import (  # noqa: E402
+    TaskFormFieldWriteError,
+    organization_write_slots,
+    write_task_form_field_values,
+)
+
+ORG = 'org_writes'
+
+
+class MockTallyfy(ThreadingHTTPServer):
+    """Serves ``PUT /api/organizations/{org}/runs/{run}/tasks/{task}`` slowly."""
+
+    daemon_threads = True
+
+    def __init__(self, delay=0.1, statuses=None):
+        super().__init__(('127.0.0.1', 0), MockHandler)
+        self.delay = delay
+        self.statuses = statuses or {}
+        self.lock = threading.Lock()
+        self.received = []
+        self.in_flight = 0
+        self.peak = 0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class MockHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_PUT(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        task_id = self.path.rstrip('/').rsplit('/', 1)[-1]
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.received.append((self.path, body))
+
+        status = server.statuses.get(task_id, 200)
+        payload = json.dumps({'data': {'id': task_id}}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def mock_api():
+    servers = []
+
+    def start(**kwargs):
+        server = MockTallyfy(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def process_street_client(api_url, organization_id):
+    path = os.path.join(REPO_ROOT, 'process-street', 'src', 'api', 'tallyfy_client.py')
+    spec = importlib.util.spec_from_file_location('tffw_ps_tallyfy_client', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with patch.object(module.TallyfyClient, '_authenticate', return_value=None):
+        client = module.TallyfyClient(api_url, 'id', 'secret', organization_id, 'slug')
+    client.access_token = 'token'
+    client.token_expires_at = module.datetime.utcnow() + module.timedelta(hours=1)
+    client.min_request_interval = 0
+    return client
+
+
+def payloads(count):
+    return {f'task_{n}': {f'timeline_{n}': f'value {n}'} for n in range(count)}
+
+
+class TestConcurrentWritesOnTheWire:
+
+    def test_writes_overlap_up_to_the_cap(self, mock_api):
+        server = mock_api(delay=0.1)
+        client = process_street_client(server.url, f'{ORG}_overlap')
+
+        started = time.perf_counter()
+        results = write_task_form_field_values(client, 'run_1', payloads(12), max_concurrency=4)
+        elapsed = time.perf_counter() - started
+
+        assert list(results) == list(payloads(12))
+        assert server.peak == 4
+        # 12 writes of 0.1s, four at a time; one at a time would take 1.2s.
+        assert elapsed < 0.9
+        assert sorted(path for path, _ in server.received) == sorted(
+            f'/api/organizations/{ORG}_overlap/runs/run_1/tasks/{task_id}' for task_id in payloads(12))
+        assert {'taskdata': {'timeline_3': 'value 3'}} in [body for _, body in server.received]
+
+    def test_runs_of_one_organisation_share_the_cap(self, mock_api):
+        server = mock_api(delay=0.1)
+        client = process_street_client(server.url, f'{ORG}_shared')
+
+        threads = [
+            threading.Thread(target=write_task_form_field_values,
+                             args=(client, f'run_{n}', payloads(6)), kwargs={'max_concurrency': 3})
+            for n in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(server.received) == 18
+        assert server.peak == 3
+
+    def test_a_rejected_task_does_not_abort_its_siblings(self, mock_api):
+        server = mock_api(delay=0.05, statuses={'task_2': 422})
+        client = process_street_client(server.url, f'{ORG}_rejected')
+
+        with pytest.raises(TaskFormFieldWriteError) as raised:
+            write_task_form_field_values(client, 'run_1', payloads(6), max_concurrency=3)
+
+        assert list(raised.value.failed) == ['task_2']
+        assert isinstance(raised.value.failed['task_2'], requests.HTTPError)
+        assert raised.value.written == ['task_0', 'task_1', 'task_3', 'task_4', 'task_5']
+        assert 'task_2' in str(raised.value)
+        written = {path.rsplit('/', 1)[-1] for path, _ in server.received}
+        assert written == set(payloads(6))
+
+
+class ScriptedClient:
+    """Fails each task with the scripted errors, in order, then succeeds."""
+
+    organization_id = f'{ORG}_scripted'
+
+    def __init__(self, script):
+        self.script = {task_id: list(errors) for task_id, errors in script.items()}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def update_task_form_field_values(self, run_id, task_id, taskdata):
+        with self.lock:
+            self.calls.append(task_id)
+            errors = self.script.get(task_id)
+            error = errors.pop(0) if errors else None
+        if error is not None:
+            raise error
+        return {'data': {'id': task_id}}
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f'{status} error', response=response)
+
+
+class TestRetries:
+
+    def test_each_task_is_sent_once(self):
+        client = ScriptedClient({
+            'task_0': [http_error(503)],
+            'task_1': [requests.ConnectionError('reset')],
+            'task_2': [http_error(422)],
+        })
+        with pytest.raises(TaskFormFieldWriteError) as raised:
+            write_task_form_field_values(client, 'run_1', payloads(4))
+
+        # Retrying is the client's job; a second layer here would multiply it.
+        assert sorted(client.calls) == ['task_0', 'task_1', 'task_2', 'task_3']
+        assert list(raised.value.failed) == ['task_0', 'task_1', 'task_2']
+        assert raised.value.written == ['task_3']
+
+    def test_nothing_to_write_makes_no_calls(self):
+        client = ScriptedClient({})
+        assert write_task_form_field_values(client, 'run_1', {}) == {}
+        assert client.calls == []
+
+
+class TestSharedClient:
+
+    def test_an_expired_token_is_refreshed_once(self, mock_api):
+        server = mock_api(delay=0.05)
+        client = process_street_client(server.url, f'{ORG}_refresh')
+        client.token_expires_at = client.token_expires_at.replace(year=2000)
+        refreshes = []
+
+        def authenticate():
+            time.sleep(0.05)
+            refreshes.append(threading.current_thread().name)
+            client.access_token = 'fresh'
+            client.token_expires_at = client.token_expires_at.replace(year=2999)
+
+        with patch.object(client, '_authenticate', side_effect=authenticate):
+            write_task_form_field_values(client, 'run_1', payloads(8), max_concurrency=8)
+
+        assert len(refreshes) == 1
+        assert len(server.received) == 8
+
+    def test_request_counters_add_up_across_threads(self, mock_api):
+        server = mock_api(delay=0)
+        client = process_street_client(server.url, f'{ORG}_counters')
+
+        write_task_form_field_values(client, 'run_1', payloads(40), max_concurrency=8)
+
+        assert client.stats['api_calls'] == 40
+        assert client.get_import_statistics()['api_calls'] == 40
+
+
+def test_one_semaphore_per_organisation():
+    assert organization_write_slots(f'{ORG}_a', 2) is organization_write_slots(f'{ORG}_a')
+    assert organization_write_slots(f'{ORG}_a') is not organization_write_slots(f'{ORG}_b', 2)
@@ -0,0 +1,127 @@
+"""
+Tests for the opt-in process-pool transform stage.
+
+Transforms run in the orchestrator's own process unless TRANSFORM_PROCESSES
+asks for workers. These pin that the pooled path is a drop-in: results come
+back in input order and serialize to exactly the same bytes as the in-process
+path, kick-off plans survive the trip to a worker, and a failing record fails
+the call the same way.
+"""
+
+import json
+import os
+import pickle
+import sys
+from functools import partial
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
+
+from shared.form_migrator_base import FormMigratorBase, response_to_process  # noqa: E402
+from shared.prerun_encoder import PrerunPlan  # noqa: E402
+from shared.transform_pool import TransformStage, configured_transform_processes  # noqa: E402
+
+TL_TEXT = 'a' * 32
+TL_CHOICE = 'b' * 32
+TL_TABLE = 'c' * 32
+
+KICKOFF_FIELDS = [
+    {'id': TL_TEXT, 'alias': 'company', 'label': 'Company', 'field_type': 'text'},
+    {'id': TL_CHOICE, 'alias': 'plan', 'label': 'Plan', 'field_type': 'dropdown',
+     'options': [{'id': 1, 'text': 'Pro'}, {'id': 2, 'text': 'Enterprise'}]},
+    {'id': TL_TABLE, 'label': 'Items', 'field_type': 'table',
+     'columns': [{'id': 'c1', 'name': 'Item'}, {'id': 'c2', 'name': 'Qty'}]},
+]
+
+
+def responses(count):
+    return [
+        {
+            'id': f'r{n}',
+            'submitter': f'user{n}@example.com',
+            'submitted_at': f'2024-01-{n % 28 + 1:02d}',
+            'answers': {'Company': f'Acme {n}', 'plan': ['Pro', 'Enterprise'][n % 2],
+                        'Items': [f'item {n}', str(n)]},
+        }
+        for n in range(count)
+    ]
+
+
+def fail_on_seven(record):
+    if record == 7:
+        raise ValueError('bad record 7')
+    return record * 2
+
+
+class FormMigrator(FormMigratorBase):
+    def __init__(self, records):
+        super().__init__('testform')
+        self.records = records
+
+    def get_forms(self):
+        return []
+
+    def get_form_details(self, form_id):
+        return {}
+
+    def get_form_responses(self, form_id):
+        return list(self.records)
+
+
+def test_processes_default_to_one(monkeypatch):
+    monkeypatch.delenv('TRANSFORM_PROCESSES', raising=False)
+    assert configured_transform_processes() == 1
+    assert not TransformStage().parallel
+    monkeypatch.setenv('TRANSFORM_PROCESSES', 'lots')
+    assert configured_transform_processes() == 1
+    monkeypatch.setenv('TRANSFORM_PROCESSES', '3')
+    assert TransformStage().processes == 3
+
+
+def test_plan_pickles_as_its_definitions():
+    plan = PrerunPlan(KICKOFF_FIELDS)
+    answers = responses(1)[0]['answers']
+    expected = plan.build(answers)
+
+    copy = pickle.loads(pickle.dumps(plan))
+    assert copy.captures == KICKOFF_FIELDS
+    assert copy.build(answers) == expected
+
+
+def test_pooled_responses_are_byte_identical_and_ordered():
+    records = responses(250)
+    transform = partial(response_to_process, blueprint_id='bp1', vendor_name='testform',
+                        plan=PrerunPlan(KICKOFF_FIELDS))
+
+    local = TransformStage(processes=1).map(transform, records)
+    with TransformStage(processes=3, batch_size=40) as stage:
+        pooled = stage.map(transform, records)
+
+    assert [p['metadata']['original_response_id'] for p in pooled] == [r['id'] for r in records]
+    assert json.dumps(pooled).encode() == json.dumps(local).encode()
+    assert pooled[1]['prerun'] == {TL_TEXT: 'Acme 1', TL_CHOICE: {'id': 2, 'text': 'Enterprise'},
+                                   TL_TABLE: ['item 1', '1']}
+
+
+def test_form_migrator_output_does_not_depend_on_the_stage():
+    migrator = FormMigrator(responses(150))
+    local = migrator.transform_responses_to_processes('f', 'bp1', kickoff_fields=KICKOFF_FIELDS)
+    with TransformStage(processes=2, batch_size=25) as stage:
+        pooled = migrator.transform_responses_to_processes(
+            'f', 'bp1', kickoff_fields=KICKOFF_FIELDS, stage=stage)
+        unkeyed = migrator.transform_responses_to_processes('f', 'bp1', limit=120, stage=stage)
+
+    assert json.dumps(pooled) == json.dumps(local)
+    assert len(unkeyed) == 120
+    assert unkeyed[0]['prerun']['Items'] == json.dumps(['item 0', '0'])
+
+
+def test_a_failing_record_fails_the_call_either_way():
+    for processes in (1, 2):
+        with TransformStage(processes=processes, batch_size=4) as stage:
+            with pytest.raises(ValueError, match='bad record 7'):
+                stage.map(fail_on_seven, range(20))
+            # The pool is still usable afterwards.
+            assert stage.map(fail_on_seven, range(7)) == [0, 2, 4, 6, 8, 10, 12]
@@ -0,0 +1,91 @@
+"""
+Opt-in process-pool stage for CPU-bound record transforms.
+
+Orchestrators transform source records on the main thread, between the network
+calls that fetch them and the ones that launch them, so field mapping and
+kick-off encoding run on one core no matter how many workers the I/O side has.
+A ``TransformStage`` applies one transform to a list of records and returns
+the results in input order -- in-process by default, or across a
+``ProcessPoolExecutor`` when ``TRANSFORM_PROCESSES`` (or ``processes=``) is
+above 1.
+
+The transform is pickled to the workers, so it must be a module-level function,
+a picklable object's bound method, or a ``functools.partial`` of either, and
+everything it closes over -- mappings, kick-off field definitions, encoder
+options -- must pickle too. ``PrerunPlan`` pickles as its definitions and
+recompiles its encoders in each worker. The records are sent ``batch_size`` to
+a task so the pickling overhead is paid per batch, not per record.
+
+Both paths call the same transform on the same records, so their output is
+identical; only where it runs changes. Side effects inside the transform --
+statistics counters on the transformer, caches -- stay in the worker, so a
+transform whose caller reads such state afterwards is not a candidate.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+DEFAULT_BATCH_SIZE = 100
+
+
+def configured_transform_processes(default: int = 1) -> int:
+    """Transform worker processes from ``TRANSFORM_PROCESSES``; 1 keeps transforms in-process."""
+    try:
+        return max(1, int(os.getenv('TRANSFORM_PROCESSES', default)))
+    except ValueError:
+        return default
+
+
+class TransformStage:
+    """
+    Applies a transform to records in order, optionally across worker processes.
+
+    Usage::
+
+        with TransformStage() as stage:
+            for page in pages:
+                processes = stage.map(partial(transform, checklist_id=checklist_id), page)
+
+    The pool is started on the first ``map`` that needs it and reused until
+    :meth:`close`.
+    """
+
+    def __init__(self, processes: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            processes: Worker processes; defaults to ``TRANSFORM_PROCESSES``.
+                1 transforms in the calling process.
+            batch_size: Records per task sent to a worker.
+        """
+        self.processes = configured_transform_processes() if processes is None else max(1, processes)
+        self.batch_size = max(1, batch_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def parallel(self) -> bool:
+        return self.processes > 1
+
+    def map(self, transform: Callable[[Any], Any], records: Iterable[Any]) -> List[Any]:
+        """Return ``[transform(record) for record in records]``, computed by the stage."""
+        records = list(records)
+        # A single batch gains nothing from a worker but the pickling cost.
+        if not self.parallel or len(records) <= self.batch_size:
+            return [transform(record) for record in records]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        # Executor.map yields in submission order and, with chunksize, ships
+        # each batch of records to a worker as one task.
+        return list(self._executor.map(transform, records, chunksize=self.batch_size))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'TransformStage':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -8,6 +8,16 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,7 +29,7 @@ class SurveyMonkeyClient:
         self.access_token = access_token
         self.base_url = "https://api.surveymonkey.com/v3"
 
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json'
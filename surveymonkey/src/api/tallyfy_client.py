@@ -20,6 +20,7 @@ _sys.path.insert(
     _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
 )
 from shared.capture_shapes import normalize_captures
+from shared.http_transport import create_session
 
 
 logger = logging.getLogger(__name__)
@@ -56,7 +57,7 @@ class TallyfyClient:
         self.organization_id = self._generate_org_id(organization)
         self.base_url = base_url.rstrip('/')
 
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json',
@@ -353,13 +354,11 @@ class TallyfyClient:
         with open(file_path, 'rb') as f:
             files = {'file': (file_name, f)}
 
-            # Temporarily remove JSON content type for file upload
-            headers = self.session.headers.copy()
-            del headers['Content-Type']
-
-            response = requests.post(
+            # Unset the session's JSON content type so requests writes the
+            # multipart boundary itself.
+            response = self.session.post(
                 f"{self.base_url}/api/organizations/{self.organization_id}/runs/{run_id}/tasks/{task_id}/files",
-                headers=headers,
+                headers={'Content-Type': None},
                 files=files
             )
             response.raise_for_status()
@@ -8,6 +8,16 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +30,7 @@ class TrelloClient:
         self.api_token = api_token
         self.base_url = "https://api.trello.com/1"
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.params = {
             'key': api_key,
             'token': api_token
@@ -14,6 +14,16 @@ from urllib.parse import urlencode
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import logging
 
+# The repo root holds the shared package. This module is imported both via
+# `main.py` (which bootstraps the path itself) and directly by tests, so it
+# cannot rely on a caller having done it.
+import os as _os, sys as _sys
+_sys.path.insert(
+    0,
+    _os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))),
+)
+from shared.http_transport import create_session
+
 
 class TrelloRateLimitError(Exception):
     """Trello rate limit exceeded"""
@@ -49,7 +59,7 @@ class TrelloProductionClient:
         if not self.api_key or not self.token:
             raise TrelloAuthError("TRELLO_API_KEY and TRELLO_TOKEN required")
         
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'Accept': 'application/json',
             'Content-Type': 'application/json'
@@ -123,8 +133,7 @@ class TrelloProductionClient:
                 method=method,
                 url=url,
                 params=params,
-                json=data,
-                timeout=30
+                json=data
             )
             
             # Check for rate limit response